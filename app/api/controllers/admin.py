@@ -0,0 +1,250 @@
+"""
+Endpoints administrativos.
+
+Protegidos pelo header ``X-Admin-Key`` (setting ``ADMIN_API_KEY``). Sem chave
+configurada os endpoints ficam desabilitados.
+"""
+import asyncio
+import hmac
+import os
+from dataclasses import asdict
+from datetime import date, datetime, time, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
+
+# IMPORTANTE: Importar di_config PRIMEIRO para configurar dependências
+from app.config import di_config  # noqa: F401
+from app.config.settings import get_settings
+from app.core.utils import handle_exceptions
+from app.core.logging import structured_logger
+
+
+router = APIRouter()
+
+ADMIN_KEY_HEADER = "X-Admin-Key"
+
+
+def require_admin(request: Request) -> None:
+    """
+    Valida a chave administrativa enviada no header.
+
+    Raises:
+        HTTPException: 403 se admin desabilitado ou chave inválida
+    """
+    expected_key = get_settings().admin_api_key
+    if not expected_key:
+        raise HTTPException(status_code=403, detail="Admin API desabilitada (ADMIN_API_KEY não configurada)")
+
+    provided_key = request.headers.get(ADMIN_KEY_HEADER, "")
+    if not hmac.compare_digest(provided_key.encode(), expected_key.encode()):
+        raise HTTPException(status_code=403, detail="Chave administrativa inválida")
+
+
+@router.post("/reprocess", status_code=202)
+@handle_exceptions("admin_reprocess_start")
+async def start_reprocessing(
+    request: Request,
+    job_id: Optional[str] = Query(None, description="ID de um job existente para retomar do checkpoint"),
+    email: Optional[str] = Query(None, description="Restringe o reprocessamento a um usuário"),
+    batch_size: Optional[int] = Query(None, ge=1, le=1000, description="Documentos por lote"),
+    max_workers: Optional[int] = Query(None, ge=0, le=32, description="Processos do pool (0 = in-process)"),
+    limit: Optional[int] = Query(None, ge=1, description="Máximo de documentos nesta execução"),
+    dry_run: bool = Query(False, description="Calcula o diff sem gravar")
+) -> dict:
+    """
+    Inicia (ou retoma) o reprocessamento em lote dos responses Azure armazenados.
+
+    Re-executa as fases 3-7 do pipeline sem chamar o Azure e atualiza
+    'analyze_documents'. O job roda em background; acompanhe via GET /admin/reprocess/{job_id}.
+    """
+    require_admin(request)
+
+    from app.core.di_container import container
+    from app.services.core.reprocessing_service import AnalysisReprocessingService
+
+    service = container.resolve(AnalysisReprocessingService)
+    started_job_id = service.start_background(
+        job_id=job_id,
+        user_email=email,
+        batch_size=batch_size,
+        max_workers=max_workers,
+        limit=limit,
+        dry_run=dry_run
+    )
+
+    structured_logger.info(
+        "Reprocessing job started",
+        context={"job_id": started_job_id, "resumed": job_id is not None, "dry_run": dry_run}
+    )
+
+    return {"job_id": started_job_id, "status": "running"}
+
+
+@router.get("/reprocess/{job_id}")
+@handle_exceptions("admin_reprocess_status")
+async def get_reprocessing_status(job_id: str, request: Request) -> dict:
+    """Retorna o checkpoint/relatório (throughput e diff) de um job de reprocessamento."""
+    require_admin(request)
+
+    from app.core.di_container import container
+    from app.services.core.reprocessing_service import AnalysisReprocessingService
+
+    service = container.resolve(AnalysisReprocessingService)
+    job = await service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job de reprocessamento não encontrado")
+
+    job["active"] = service.is_running(job_id)
+    return job
+
+
+@router.get("/mongodb/pool")
+@handle_exceptions("admin_mongodb_pool")
+async def get_mongodb_pool_stats(request: Request) -> dict:
+    """Configuração e estatísticas do pool de conexões MongoDB (monitor de comandos)."""
+    require_admin(request)
+
+    from app.core.di_container import container
+    from app.services.infrastructure import MongoDBConnectionService
+
+    return container.resolve(MongoDBConnectionService).pool_stats()
+
+
+@router.get("/profiles")
+@handle_exceptions("admin_list_profiles")
+async def list_profiles(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500, description="Máximo de perfis listados")
+) -> dict:
+    """
+    Perfis de requisições gravados (mais recentes primeiro), com as funções de
+    maior custo. Perfis são pedidos com ``X-Profile: true`` em POST
+    /analyze/analyze_document ou sorteados por PROFILING_SAMPLE_RATE.
+    """
+    require_admin(request)
+
+    from app.core.di_container import container
+    from app.services.core.request_profiler import RequestProfiler
+
+    profiles = await asyncio.to_thread(container.resolve(RequestProfiler).list_profiles, limit)
+    return {"items": profiles, "count": len(profiles)}
+
+
+@router.get("/profiles/{request_id}")
+@handle_exceptions("admin_get_profile")
+async def download_profile(request_id: str, request: Request) -> FileResponse:
+    """
+    Artefato do perfil de uma requisição (pelo ``X-Request-ID``).
+
+    Modo sampling: pilhas no formato "folded" (speedscope.app, flamegraph.pl);
+    modo cprofile: arquivo pstats (``python -m pstats``, snakeviz).
+    """
+    require_admin(request)
+
+    from app.core.di_container import container
+    from app.services.core.request_profiler import RequestProfiler
+
+    artifact = container.resolve(RequestProfiler).get_artifact_path(request_id)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado")
+
+    path, mode = artifact
+    return FileResponse(
+        path,
+        media_type="text/plain" if mode == "sampling" else "application/octet-stream",
+        filename=os.path.basename(path)
+    )
+
+
+@router.get("/processing-metrics")
+@handle_exceptions("admin_processing_metrics")
+async def get_processing_metrics(
+    request: Request,
+    days: int = Query(7, ge=1, le=90, description="Janela em dias (a partir de hoje, UTC)"),
+    group_by: str = Query("day", description="Dimensões separadas por vírgula: day, page_bucket, stage"),
+    cache_outcome: Literal["miss", "hit"] = Query("miss", description="'miss' (análises) ou 'hit' (duplicatas)")
+) -> dict:
+    """
+    Percentis p50/p95/p99 (segundos) das métricas gravadas a cada análise.
+
+    Com ``stage`` no agrupamento, cada etapa do pipeline (``extraction`` e as
+    fases do orquestrador) aparece separada, além de ``total`` e do tempo nas
+    chamadas ao Azure (``azure.layout``, ``azure.figures``).
+    """
+    require_admin(request)
+
+    from app.core.di_container import container
+    from app.services.persistence import ISimplePersistenceService
+
+    dimensions = [dimension.strip() for dimension in group_by.split(",") if dimension.strip()]
+    since = datetime.combine(datetime.utcnow().date() - timedelta(days=days - 1), time.min)
+    persistence_service = container.resolve(ISimplePersistenceService)
+    try:
+        groups = await persistence_service.get_processing_metrics_percentiles(
+            since, group_by=dimensions, cache_outcome=cache_outcome
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "since": since.isoformat(),
+        "group_by": dimensions,
+        "cache_outcome": cache_outcome,
+        "items": [asdict(group) for group in groups]
+    }
+
+
+@router.get("/export/analyses")
+@handle_exceptions("admin_export_analyses")
+async def export_analyses(
+    request: Request,
+    email: Optional[str] = Query(None, description="Restringe a um usuário"),
+    school: Optional[str] = Query(None, description="Escola do cabeçalho (valor exato)"),
+    start_date: Optional[date] = Query(None, description="Data início (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Data fim (YYYY-MM-DD)"),
+    include_response: bool = Query(False, description="Exporta o response completo (senão apenas resumo)"),
+    gzip: bool = Query(False, description="Comprime a exportação (.ndjson.gz)")
+) -> StreamingResponse:
+    """
+    Exporta análises concluídas em NDJSON (uma análise por linha), em streaming.
+
+    A resposta é gerada direto do cursor MongoDB: a memória não cresce com a
+    quantidade de registros exportados.
+    """
+    require_admin(request)
+
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise HTTPException(status_code=400, detail="Data de início deve ser anterior ou igual à data de fim")
+
+    from app.core.di_container import container
+    from app.services.core.analysis_export_service import AnalysisExportService
+
+    service = container.resolve(AnalysisExportService)
+    structured_logger.info(
+        "Starting analyses export",
+        context={
+            "email": email,
+            "school": school,
+            "start_date": start_date,
+            "end_date": end_date,
+            "include_response": include_response,
+            "gzip": gzip
+        }
+    )
+
+    chunks = service.stream_ndjson(
+        email=email,
+        school=school,
+        start_date=datetime.combine(start_date, time.min) if start_date else None,
+        end_date=datetime.combine(end_date, time.max) if end_date else None,
+        include_response=include_response,
+        compress=gzip
+    )
+    filename = "analyses.ndjson.gz" if gzip else "analyses.ndjson"
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, UploadFile, File, Query, Request
-from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Query, Request, Response
+from typing import Literal, Optional, Union
 from datetime import datetime, date, time
+from uuid import uuid4
 
 # IMPORTANTE: Importar di_config PRIMEIRO para configurar dependências
 from app.config import di_config  # Configura automaticamente todas as dependências
@@ -8,18 +9,48 @@ from app.config import di_config  # Configura automaticamente todas as dependên
 # Importações dos novos serviços e dos existentes
 from app.services.extraction.document_extraction_service import DocumentExtractionService
 from app.services.utils.azure_response_helper import AzureResponseHelper
-from app.models.persistence import AzureResponseRecord
+from app.models.persistence import (
+    AnalyzeDocumentRecord,
+    AzureProcessingDataRecord,
+    AzureResponseRecord,
+    DocumentStatus,
+    DocumentSummary,
+    ProcessingMetrics
+)
 from app.services.core.analyze_service import AnalyzeService
+from app.services.core.duplicate_check_service import DuplicateCheckService
+from app.services.core.document_response_cache import CachedResponse, DocumentResponseCache, compute_etag
+from app.services.core.request_profiler import PROFILE_HEADER, RequestProfiler, should_sample
+from app.services.core.admission_controller import AdmissionController, count_pdf_pages
 from app.validators.analyze_validator import AnalyzeValidator
 from app.dtos.responses.document_response_dto import DocumentResponseDTO
 from app.dtos.responses.analyze_document_response_dto import AnalyzeDocumentResponseDTO
-from app.dtos.responses.document_list_response_dto import DocumentListResponseDTO, PaginationMetadata
+from app.dtos.responses.document_list_response_dto import (
+    DocumentListItemDTO,
+    DocumentListResponseDTO,
+    DocumentSearchItemDTO,
+    DocumentSearchResponseDTO,
+    PaginationMetadata
+)
+from app.dtos.responses.question_list_response_dto import (
+    QuestionItemDTO,
+    QuestionListResponseDTO,
+    SimilarQuestionDTO,
+    SimilarQuestionsResponseDTO
+)
 from app.core.exceptions import (
     DocumentProcessingError,
     ValidationException
 )
 from app.core.utils import handle_exceptions
+from app.core.document_buffer import DocumentBuffer
 from app.core.logging import structured_logger
+from app.core.metrics import ANALYSES_IN_FLIGHT
+from app.core.document_metrics import DocumentMetricsCollector, collect_document_metrics, time_stage
+from app.core.memory import track_document, track_phase
+from app.core.context import get_current_request_id
+from app.config.settings import get_settings
+from app.api.controllers.admin import require_admin
 from fastapi import HTTPException
 
 
@@ -37,84 +68,180 @@ async def analyze_document(
     
     Fluxo:
     1. Valida entrada
-    2. Verifica duplicatas (retorna se já processado)
+    2. Verifica duplicatas por conteúdo (retorna se já processado; requisições
+       simultâneas do mesmo arquivo aguardam a mesma análise)
     3. Extrai dados do documento
     4. Orquestra análise com modelos
     5. Converte para DTO da API
-    6. Persiste resultado no MongoDB
+    6. Agenda a persistência no MongoDB (write-behind): o ``document_id`` do
+       response é o _id do registro e já pode ser consultado
+    
+    Perfil da requisição: header ``X-Profile: true`` ou ``?profile=true`` junto
+    com ``X-Admin-Key`` (ou sorteio por PROFILING_SAMPLE_RATE). O perfil é
+    gravado com o ``X-Request-ID`` da resposta e listado em GET /admin/profiles.
     """
     structured_logger.info(
         "Starting document analysis with SOLID architecture",
         context={"email": email, "filename": file.filename}
     )
     
-    # --- VALIDAÇÃO ---
-    AnalyzeValidator.validate_all(file, email)
+    trigger = _profile_trigger(request)
+    if trigger is None:
+        return await _analyze_upload(email, file)
+    
+    from app.core.di_container import container
+    
+    profiler = container.resolve(RequestProfiler)
+    request_id = get_current_request_id() or str(uuid4())
+    async with profiler.profile(request_id, trigger, context={"email": email, "filename": file.filename}):
+        return await _analyze_upload(email, file)
+
 
-    # --- ETAPA 1: Verificação de Duplicatas ---
+def _profile_trigger(request: Request) -> Optional[str]:
+    """
+    Origem do perfil da requisição ("header", "query" ou "sampled"), ou None.
+
+    Raises:
+        HTTPException: 403 se o perfil foi pedido sem a chave administrativa
+    """
+    for source, value in (("header", request.headers.get(PROFILE_HEADER)), ("query", request.query_params.get("profile"))):
+        if isinstance(value, str) and value.lower() in ("1", "true"):
+            require_admin(request)
+            return source
+    if should_sample(get_settings().profiling_sample_rate):
+        return "sampled"
+    return None
+
+
+async def _analyze_upload(email: str, file: UploadFile) -> Union[DocumentResponseDTO, Response]:
+    """Lê o upload, valida e executa a análise dentro do single-flight."""
+    # Upload lido uma única vez (SHA-256 na mesma passada); todos os consumidores
+    # recebem o buffer, liberado ao final da requisição
+    with await DocumentBuffer.from_upload(file) as document:
+        # --- VALIDAÇÃO ---
+        AnalyzeValidator.validate_all(document, email)
+
+        from app.core.di_container import container
+
+        duplicate_service = container.resolve(DuplicateCheckService)
+        return await duplicate_service.run_single_flight(
+            email,
+            document,
+            lambda: _analyze_document_buffer(email, document, duplicate_service)
+        )
+
+
+async def _analyze_document_buffer(
+    email: str,
+    document: DocumentBuffer,
+    duplicate_service: DuplicateCheckService
+) -> Union[DocumentResponseDTO, Response]:
+    """
+    Verifica duplicatas, analisa e persiste um documento já validado.
+    
+    Executado dentro do single-flight do DuplicateCheckService: requisições
+    simultâneas do mesmo conteúdo recebem este mesmo resultado.
+    """
+    # --- ETAPA 1: Verificação de Duplicatas (por conteúdo) ---
     from app.core.di_container import container
-    from app.services.core.duplicate_check_service import DuplicateCheckService
     from app.services.persistence import ISimplePersistenceService
     from app.core.interfaces import IAnalyzeService
-    
-    duplicate_service = container.resolve(DuplicateCheckService)
-    duplicate_result = await duplicate_service.check_and_handle_duplicate(email, file)
-    
+
+    processing = DocumentMetricsCollector()
+    duplicate_result = await duplicate_service.check_and_handle_duplicate(email, document)
+
     # Se é duplicata processada, retornar dados existentes
     if not duplicate_result.should_process:
+        await _enqueue_processing_metrics(
+            duplicate_result.existing_document_id,
+            email,
+            document.filename,
+            ProcessingMetrics(processing_duration_seconds=round(processing.elapsed, 3), cache_outcome="hit")
+        )
+        if duplicate_result.existing_response_json is not None:
+            return Response(content=duplicate_result.existing_response_json, media_type="application/json")
         return duplicate_result.existing_response
-    
-    # --- ETAPA 2: Extração de Dados ---
-    import time
-    extraction_start = time.time()
-    
-    extracted_data = await DocumentExtractionService.get_extraction_data(file, email)
-    if not extracted_data:
-        raise DocumentProcessingError(
-            "Failed to extract any data from the document. "
-            "The file might be empty, corrupted, or in an unsupported format."
+
+    # Análises simultâneas limitadas por worker (ADMISSION_MAX_IN_FLIGHT): sem
+    # vaga, aguarda na fila justa por usuário ou recebe 429/503 com Retry-After
+    admission = container.resolve(AdmissionController)
+    pages = await count_pdf_pages(document) if admission.enabled else None
+    async with admission.slot(email, pages):
+        # Extração + orquestração contam como análise em andamento (GET /metrics);
+        # cada etapa registra a duração (métricas por documento) e, com
+        # MEMORY_TRACKING_ENABLED, a memória, aplicando o teto por documento
+        with ANALYSES_IN_FLIGHT.track_inprogress(), collect_document_metrics(processing), \
+                track_document(get_settings()) as memory_tracker:
+            # --- ETAPA 2: Extração de Dados ---
+            import time
+            extraction_start = time.time()
+
+            with time_stage("extraction"), track_phase("extraction"):
+                extracted_data = await DocumentExtractionService.get_extraction_data(document, email)
+            if not extracted_data:
+                raise DocumentProcessingError(
+                    "Failed to extract any data from the document. "
+                    "The file might be empty, corrupted, or in an unsupported format."
+                )
+
+            extraction_duration = time.time() - extraction_start
+
+            structured_logger.info(
+                "Data extraction completed",
+                context={
+                    "email": email,
+                    "filename": document.filename,
+                    "extraction_duration_seconds": round(extraction_duration, 2)
+                }
+            )
+
+            # --- ETAPA 3: Orquestração da Análise ---
+            analyze_service = container.resolve(IAnalyzeService)
+            internal_response = await analyze_service.process_document_with_models(
+                extracted_data=extracted_data,
+                email=email,
+                filename=document.filename,
+                file=document
+            )
+
+    memory_report = memory_tracker.report() if memory_tracker is not None else None
+    if memory_report is not None:
+        structured_logger.info(
+            "Document memory usage",
+            context={
+                "document_id": internal_response.document_id,
+                "rss_growth_mb": _to_mb(memory_report.rss_growth_bytes),
+                "process_peak_rss_mb": _to_mb(memory_report.process_peak_rss_bytes),
+                "phases_rss_delta_mb": {
+                    phase.phase: _to_mb(phase.rss_delta_bytes) for phase in memory_report.phases
+                }
+            }
         )
-    
-    extraction_duration = time.time() - extraction_start
-    
-    structured_logger.info(
-        "Data extraction completed",
-        context={
-            "email": email,
-            "filename": file.filename,
-            "extraction_duration_seconds": round(extraction_duration, 2)
-        }
-    )
 
-    # --- ETAPA 3: Orquestração da Análise ---
-    analyze_service = container.resolve(IAnalyzeService)
-    internal_response = await analyze_service.process_document_with_models(
-        extracted_data=extracted_data,
-        email=email,
-        filename=file.filename,
-        file=file
-    )
-    
     # --- ETAPA 4: Conversão para DTO da API ---
     api_response = DocumentResponseDTO.from_internal_response(internal_response)
-    
+
     # --- ETAPA 5: Resolver Persistence Service ---
     persistence_service = container.resolve(ISimplePersistenceService)
-    
-    # --- ETAPA 6: Salvar Response do Azure ---
+
+    # --- ETAPA 6: Agendar gravação do Response do Azure (write-behind) ---
+    page_count = None
+    metrics = {}
+    azure_model_id = azure_api_version = None
     try:
         azure_response = AzureResponseHelper.get_azure_response_from_extracted_data(extracted_data)
-        
+    
         if azure_response:
             # Extrair metadados
             azure_model_id, azure_api_version = AzureResponseHelper.extract_azure_metadata(extracted_data)
             metrics = AzureResponseHelper.extract_metrics(azure_response)
-            
+            page_count = metrics.get("page_count")
+        
             # Criar registro do response do Azure
             azure_response_record = AzureResponseRecord.create_from_azure_processing(
                 document_id=internal_response.document_id,
                 user_email=email,
-                file_name=file.filename,
+                file_name=document.filename,
                 file_size=duplicate_result.file_size,
                 azure_response=azure_response,
                 azure_model_id=azure_model_id,
@@ -122,14 +249,15 @@ async def analyze_document(
                 processing_duration=extraction_duration,
                 azure_operation_id=metrics.get("operation_id"),
                 confidence_score=metrics.get("confidence_score"),
-                status="success"
+                status="success",
+                memory=memory_report
             )
-            
-            # Salvar no MongoDB
-            await persistence_service.save_azure_response(azure_response_record)
-            
+        
+            # Gravado em lote em background
+            await persistence_service.enqueue_write(azure_response_record)
+        
             structured_logger.info(
-                "Azure response saved successfully",
+                "Azure response queued for persistence",
                 context={
                     "document_id": internal_response.document_id,
                     "page_count": metrics.get("page_count", 0),
@@ -150,15 +278,50 @@ async def analyze_document(
                 "error": str(e)
             }
         )
-    
-    # --- ETAPA 7: Persistência do Resultado Final ---
-    await persistence_service.save_completed_analysis(
-        email=email,
-        filename=file.filename,
+
+    # --- ETAPA 7: Persistência do Resultado Final (write-behind, _id = document_id) ---
+    response_dict = api_response.dict()
+    analysis_record = AnalyzeDocumentRecord.create_from_request(
+        user_email=email,
+        file_name=document.filename,
         file_size=duplicate_result.file_size,
-        response_dict=api_response.dict()
+        response=response_dict,
+        status=DocumentStatus.COMPLETED,
+        file_hash=duplicate_result.file_hash,
+        summary=DocumentSummary.from_response(
+            response_dict,
+            grade=internal_response.document_metadata.grade,
+            page_count=page_count
+        ),
+        document_id=internal_response.document_id
     )
-    
+    await persistence_service.enqueue_write(analysis_record)
+
+    # --- ETAPA 8: Métricas de processamento do documento (GET /admin/processing-metrics) ---
+    await _enqueue_processing_metrics(
+        internal_response.document_id,
+        email,
+        document.filename,
+        ProcessingMetrics(
+            processing_duration_seconds=round(processing.elapsed, 3),
+            confidence_score=metrics.get("confidence_score"),
+            pages_count=page_count,
+            context_blocks_count=len(internal_response.context_blocks),
+            questions_count=len(internal_response.questions),
+            azure_operation_id=metrics.get("operation_id"),
+            azure_model_used=azure_model_id,
+            azure_api_version=azure_api_version,
+            cache_outcome="miss",
+            stage_durations_seconds={name: round(s, 3) for name, s in processing.stage_durations.items()},
+            azure_latency_seconds={name: round(s, 3) for name, s in processing.azure_latency.items()},
+            figures_count=processing.figures_count,
+            figures_failed_count=processing.figures_failed_count,
+            image_bytes=processing.image_bytes,
+            rss_growth_bytes=memory_report.rss_growth_bytes if memory_report else None,
+            process_peak_rss_bytes=memory_report.process_peak_rss_bytes if memory_report else None
+        )
+    )
+
     structured_logger.info(
         "Document analysis completed successfully",
         context={
@@ -172,12 +335,42 @@ async def analyze_document(
 
     return api_response
 
+def _to_mb(value: Optional[int]) -> Optional[float]:
+    """Bytes -> MB para o log (None quando o RSS não pôde ser medido)."""
+    return round(value / (1024 * 1024), 1) if value is not None else None
+
+
+async def _enqueue_processing_metrics(
+    document_id: Optional[str],
+    email: str,
+    filename: str,
+    processing_metrics: ProcessingMetrics
+) -> None:
+    """Agenda o registro de métricas do documento; falhas não afetam a resposta."""
+    from app.core.di_container import container
+    from app.services.persistence import ISimplePersistenceService
+
+    try:
+        record = AzureProcessingDataRecord.create_from_document_metrics(
+            document_id=document_id,
+            user_email=email,
+            file_name=filename,
+            processing_metrics=processing_metrics
+        )
+        await container.resolve(ISimplePersistenceService).enqueue_write(record)
+    except Exception as e:
+        structured_logger.error(
+            "Failed to save processing metrics",
+            context={"document_id": document_id, "error": str(e)}
+        )
+
+
 @router.get("/analyze_document/{id}", response_model=AnalyzeDocumentResponseDTO)
 @handle_exceptions("document_retrieval")
 async def get_analyze_document(
     id: str,
     request: Request
-) -> AnalyzeDocumentResponseDTO:
+) -> Response:
     """
     Recupera informações sobre um documento que já foi processado e armazenado.
     
@@ -185,12 +378,15 @@ async def get_analyze_document(
     Se um documento com o 'id' fornecido existir, retorna seus detalhes na resposta.
     Se nenhum documento for encontrado, retorna o status 404 Not Found.
     
+    Análises concluídas são servidas do DocumentResponseCache (JSON já
+    serializado) com ETag forte; ``If-None-Match`` correspondente recebe 304.
+    
     Args:
         id: ID do documento no MongoDB
-        request: Request context para logging
+        request: Request context (If-None-Match)
         
     Returns:
-        Dados do documento analisado
+        JSON do documento analisado (AnalyzeDocumentResponseDTO) ou 304
         
     Raises:
         HTTPException: 404 se documento não encontrado
@@ -213,10 +409,18 @@ async def get_analyze_document(
             detail="ID do documento é obrigatório e não pode estar vazio"
         )
     
-    # Resolver serviço de persistência via DI Container
+    # Resolver serviços via DI Container
     from app.core.di_container import container
     from app.services.persistence import ISimplePersistenceService
     
+    response_cache = container.resolve(DocumentResponseCache)
+    if_none_match = request.headers.get("if-none-match")
+    
+    cached = response_cache.get(id)
+    if cached is not None:
+        structured_logger.debug("Document served from response cache", context={"document_id": id})
+        return _cached_document_response(cached, response_cache.cache_control, if_none_match)
+    
     try:
         structured_logger.debug("Resolving persistence service via DI Container")
         persistence_service = container.resolve(ISimplePersistenceService)
@@ -239,8 +443,14 @@ async def get_analyze_document(
                 detail="Documento não encontrado"
             )
         
-        # Converter para DTO de resposta
-        response_dto = AnalyzeDocumentResponseDTO.from_analyze_document_record(document_record)
+        # Serializar uma única vez (bytes armazenados quando disponíveis)
+        body = AnalyzeDocumentResponseDTO.json_bytes_from_record(document_record)
+        
+        # Apenas análises concluídas são imutáveis o bastante para cache
+        if document_record.status == DocumentStatus.COMPLETED:
+            entry = response_cache.put(id, body)
+        else:
+            entry = CachedResponse(body=body, etag=compute_etag(body), expires_at=0)
         
         structured_logger.info(
             "Document retrieved successfully",
@@ -252,7 +462,7 @@ async def get_analyze_document(
             }
         )
         
-        return response_dto
+        return _cached_document_response(entry, response_cache.cache_control, if_none_match)
         
     except HTTPException:
         # Re-propagar HTTPExceptions (400, 404, etc.)
@@ -269,6 +479,14 @@ async def get_analyze_document(
         )
 
 
+def _cached_document_response(entry: CachedResponse, cache_control: str, if_none_match: Optional[str]) -> Response:
+    """Resposta 200 com o JSON serializado ou 304 quando o ETag do cliente confere."""
+    headers = {"ETag": entry.etag, "Cache-Control": cache_control}
+    if entry.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
 @router.get("/documents", response_model=DocumentListResponseDTO)
 @handle_exceptions("documents_list")
 async def list_documents(
@@ -277,13 +495,20 @@ async def list_documents(
     start_date: Optional[date] = Query(None, description="Data início para filtro (formato YYYY-MM-DD, opcional)"),
     end_date: Optional[date] = Query(None, description="Data fim para filtro (formato YYYY-MM-DD, opcional)"),
     page: int = Query(1, ge=1, description="Número da página (mínimo 1)"),
-    page_size: int = Query(10, ge=1, le=50, description="Itens por página (máximo 50)")
+    page_size: int = Query(10, ge=1, le=50, description="Itens por página (máximo 50)"),
+    cursor: Optional[str] = Query(None, description="Cursor next_cursor da página anterior (opcional)"),
+    include_total: bool = Query(True, description="Inclui total de itens/páginas (dispensável com cursor)"),
+    subject: Optional[str] = Query(None, description="Filtra pela matéria (ignora acentos e maiúsculas)"),
+    sort_by: Literal["created_at", "question_count"] = Query("created_at", description="Ordenação (decrescente)")
 ) -> DocumentListResponseDTO:
     """
     Lista documentos analisados com filtros e paginação.
     
     Retorna uma lista paginada de documentos previamente analisados e armazenados,
     permitindo filtros por email (obrigatório) e intervalo de datas (opcional).
+    Os itens trazem apenas campos de resumo. Para navegar use ``next_cursor``
+    (paginação keyset, custo constante em páginas profundas); ``page`` continua
+    aceito quando nenhum cursor é informado.
     
     Args:
         request: Request context para logging
@@ -292,6 +517,10 @@ async def list_documents(
         end_date: Data fim do intervalo (opcional, requer start_date)
         page: Número da página (1-indexed, padrão 1)
         page_size: Quantidade de itens por página (padrão 10, máximo 50)
+        cursor: Cursor opaco retornado em pagination.next_cursor
+        include_total: Se False, não calcula total_items/total_pages
+        subject: Filtro por matéria (campo summary indexado)
+        sort_by: "created_at" (padrão) ou "question_count"
         
     Returns:
         Lista paginada de documentos com metadados de paginação
@@ -308,7 +537,10 @@ async def list_documents(
             "start_date": start_date,
             "end_date": end_date,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "has_cursor": cursor is not None,
+            "subject": subject,
+            "sort_by": sort_by
         }
     )
     
@@ -370,25 +602,37 @@ async def list_documents(
             }
         )
         
-        documents, total_count = await persistence_service.get_by_user_email_with_filters(
-            email=email,
-            start_date=start_datetime,
-            end_date=end_datetime,
-            page=page,
-            page_size=page_size
-        )
+        try:
+            summaries_page = await persistence_service.get_document_summaries_page(
+                email=email,
+                start_date=start_datetime,
+                end_date=end_datetime,
+                page_size=page_size,
+                cursor=cursor,
+                page=page,
+                include_total=include_total,
+                subject=subject,
+                sort_by=sort_by
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor de paginação inválido")
+        
+        total_count = summaries_page.total_count
         
-        # Converter documentos para DTOs
+        # Converter documentos projetados para itens da lista
         items = [
-            AnalyzeDocumentResponseDTO.from_analyze_document_record(doc)
-            for doc in documents
+            DocumentListItemDTO.from_mongo_record(doc)
+            for doc in summaries_page.items
         ]
         
         # Criar metadados de paginação
         pagination = PaginationMetadata.create(
             current_page=page,
             page_size=page_size,
-            total_items=total_count
+            total_items=total_count,
+            has_next=summaries_page.has_next,
+            next_cursor=summaries_page.next_cursor,
+            has_previous=page > 1 or cursor is not None
         )
         
         # Montar resposta
@@ -430,6 +674,171 @@ async def list_documents(
         )
 
 
+@router.get("/documents/search", response_model=DocumentSearchResponseDTO)
+@handle_exceptions("documents_search")
+async def search_documents(
+    request: Request,
+    email: str = Query(..., description="Email do usuário (obrigatório)"),
+    q: str = Query(..., min_length=2, max_length=200, description="Termos da busca (\"frase exata\", -excluir)"),
+    page: int = Query(1, ge=1, le=50, description="Número da página (máximo 50)"),
+    page_size: int = Query(10, ge=1, le=50, description="Itens por página (máximo 50)")
+) -> DocumentSearchResponseDTO:
+    """
+    Busca por palavra-chave nas provas do usuário.
+    
+    Procura nos enunciados, alternativas e textos dos context blocks das
+    análises concluídas, sem diferenciar acentos e maiúsculas (com stemming em
+    português). Resultados ordenados por relevância.
+    
+    Raises:
+        HTTPException: 400 se email ou termos estiverem vazios
+        HTTPException: 500 para erros internos
+    """
+    structured_logger.info(
+        "Starting documents search",
+        context={"email": email, "query_length": len(q), "page": page, "page_size": page_size}
+    )
+    
+    if not email.strip() or not q.strip():
+        raise HTTPException(status_code=400, detail="Email e termos da busca são obrigatórios")
+    
+    from app.core.di_container import container
+    from app.services.persistence import ISimplePersistenceService
+    
+    persistence_service = container.resolve(ISimplePersistenceService)
+    search_page = await persistence_service.search_documents(
+        email=email,
+        text=q.strip(),
+        page=page,
+        page_size=page_size
+    )
+    
+    items = [DocumentSearchItemDTO.from_mongo_record(doc) for doc in search_page.items]
+    structured_logger.info(
+        "Documents search completed",
+        context={"email": email, "documents_returned": len(items), "has_next": search_page.has_next}
+    )
+    return DocumentSearchResponseDTO(
+        items=items,
+        page=page,
+        page_size=page_size,
+        has_next=search_page.has_next
+    )
+
+
+@router.get("/questions", response_model=QuestionListResponseDTO)
+@handle_exceptions("questions_list")
+async def list_questions(
+    request: Request,
+    email: Optional[str] = Query(None, description="Restringe às questões do usuário (opcional)"),
+    subject: Optional[str] = Query(None, description="Matéria (ignora acentos e maiúsculas)"),
+    grade: Optional[str] = Query(None, description="Série/ano (ignora acentos e maiúsculas)"),
+    multiple_choice: Optional[bool] = Query(None, description="Apenas questões com/sem alternativas"),
+    has_image: Optional[bool] = Query(None, description="Apenas questões com/sem imagem"),
+    document_id: Optional[str] = Query(None, description="Questões de uma análise"),
+    page_size: int = Query(20, ge=1, le=100, description="Itens por página (máximo 100)"),
+    cursor: Optional[str] = Query(None, description="Cursor next_cursor da página anterior (opcional)")
+) -> QuestionListResponseDTO:
+    """
+    Banco de questões: consulta as questões das análises concluídas.
+    
+    As questões ficam na coleção 'questions' (uma por documento MongoDB), com
+    matéria/série normalizadas e índices para os filtros; a paginação é keyset
+    (``next_cursor``), sem contagem total.
+    
+    Raises:
+        HTTPException: 400 para cursor inválido
+        HTTPException: 500 para erros internos
+    """
+    structured_logger.info(
+        "Starting questions list",
+        context={
+            "email": email,
+            "subject": subject,
+            "grade": grade,
+            "multiple_choice": multiple_choice,
+            "has_image": has_image,
+            "document_id": document_id,
+            "page_size": page_size,
+            "has_cursor": cursor is not None
+        }
+    )
+    
+    from app.core.di_container import container
+    from app.services.persistence import ISimplePersistenceService
+    
+    persistence_service = container.resolve(ISimplePersistenceService)
+    try:
+        questions_page = await persistence_service.get_questions_page(
+            email=email,
+            subject=subject,
+            grade=grade,
+            multiple_choice=multiple_choice,
+            has_image=has_image,
+            document_id=document_id,
+            page_size=page_size,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido")
+    
+    items = [QuestionItemDTO.from_mongo_record(doc) for doc in questions_page.items]
+    structured_logger.info(
+        "Questions list retrieved successfully",
+        context={"questions_returned": len(items), "has_next": questions_page.has_next}
+    )
+    return QuestionListResponseDTO(
+        items=items,
+        page_size=page_size,
+        has_next=questions_page.has_next,
+        next_cursor=questions_page.next_cursor
+    )
+
+
+@router.get("/questions/{question_id}/similar", response_model=SimilarQuestionsResponseDTO)
+@handle_exceptions("similar_questions")
+async def list_similar_questions(
+    request: Request,
+    question_id: str,
+    threshold: Optional[float] = Query(None, ge=0.1, le=1.0, description="Similaridade mínima (padrão: configuração)"),
+    limit: int = Query(20, ge=1, le=100, description="Máximo de quase-duplicatas (máximo 100)")
+) -> SimilarQuestionsResponseDTO:
+    """
+    Quase-duplicatas de uma questão (mesma questão com pequenas edições).
+    
+    Usa o índice MinHash/LSH do banco de questões: apenas as questões que
+    colidem em alguma faixa LSH são lidas e pontuadas.
+    
+    Raises:
+        HTTPException: 404 se a questão não existir
+    """
+    from app.core.di_container import container
+    from app.services.core.question_similarity_service import QuestionSimilarityService
+    
+    similarity_service = container.resolve(QuestionSimilarityService)
+    cluster = await similarity_service.find_near_duplicates(question_id, threshold=threshold, limit=limit)
+    if cluster is None:
+        raise HTTPException(status_code=404, detail=f"Questão não encontrada: {question_id}")
+    
+    structured_logger.info(
+        "Similar questions retrieved",
+        context={
+            "question_id": question_id,
+            "matches": len(cluster.matches),
+            "candidates_examined": cluster.candidates_examined
+        }
+    )
+    return SimilarQuestionsResponseDTO(
+        question=QuestionItemDTO.from_mongo_record(cluster.question),
+        threshold=threshold if threshold is not None else similarity_service.threshold,
+        candidates_examined=cluster.candidates_examined,
+        items=[
+            SimilarQuestionDTO.from_mongo_record(doc, similarity=score)
+            for doc, score in cluster.matches
+        ]
+    )
+
+
 # ==================================================================================
 # 🧹 ENDPOINTS REMOVIDOS: analyze_document_mock e analyze_document_with_figures
 # Removidos após confirmação de que o endpoint principal /analyze_document está funcionando
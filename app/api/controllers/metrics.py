@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    📈 Métricas no formato texto do Prometheus (scrape).
+
+    Latências por rota, por fase do orquestrador, do Azure Document
+    Intelligence, da renderização de páginas, do upload de imagens e dos
+    comandos MongoDB; contadores de cache, duplicatas, figuras e páginas.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -3,6 +3,8 @@ from fastapi import APIRouter
 # 🏗️ Importa os módulos de rota
 from app.api.controllers.analyze import router as analyze_router
 from app.api.controllers.health import router as health_router
+from app.api.controllers.admin import router as admin_router
+from app.api.controllers.metrics import router as metrics_router
 
 
 # 🔗 Cria o agrupador de rotas
@@ -11,4 +13,6 @@ router = APIRouter()
 # 📌 Registra cada módulo na API
 router.include_router(health_router, prefix="/health", tags=["Health"])
 router.include_router(analyze_router, prefix="/analyze", tags=["Analyze"])
+router.include_router(admin_router, prefix="/admin", tags=["Admin"])
+router.include_router(metrics_router, tags=["Metrics"])
 
@@ -21,9 +21,15 @@ from app.services.azure.azure_figure_processor import AzureFigureProcessor
 from app.services.core.document_analysis_orchestrator import DocumentAnalysisOrchestrator
 from app.services.core.analyze_service import AnalyzeService
 from app.services.storage.azure_image_upload_service import AzureImageUploadService
-from app.services.persistence import ISimplePersistenceService, MongoDBPersistenceService
+from app.services.persistence import ISimplePersistenceService, MongoDBPersistenceService, MongoDBMigrationManager
 from app.services.infrastructure import MongoDBConnectionService
 from app.services.core.duplicate_check_service import DuplicateCheckService
+from app.services.core.reprocessing_service import AnalysisReprocessingService
+from app.services.core.document_response_cache import DocumentResponseCache
+from app.services.core.analysis_export_service import AnalysisExportService
+from app.services.core.question_similarity_service import QuestionSimilarityService
+from app.services.core.request_profiler import RequestProfiler
+from app.services.core.admission_controller import AdmissionController
 from app.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -96,6 +102,13 @@ def configure_dependencies() -> None:
     )
     logger.debug("ISimplePersistenceService -> MongoDBPersistenceService (Singleton)")
     
+    container.register(
+        interface_type=MongoDBMigrationManager,
+        implementation_type=MongoDBMigrationManager,
+        lifetime=ServiceLifetime.SINGLETON
+    )
+    logger.debug("MongoDBMigrationManager -> MongoDBMigrationManager (Singleton)")
+    
     container.register(
         interface_type=DuplicateCheckService,
         implementation_type=DuplicateCheckService,
@@ -103,6 +116,48 @@ def configure_dependencies() -> None:
     )
     logger.debug("DuplicateCheckService -> DuplicateCheckService (Singleton)")
     
+    container.register(
+        interface_type=DocumentResponseCache,
+        implementation_type=DocumentResponseCache,
+        lifetime=ServiceLifetime.SINGLETON
+    )
+    logger.debug("DocumentResponseCache -> DocumentResponseCache (Singleton)")
+    
+    container.register(
+        interface_type=AnalysisReprocessingService,
+        implementation_type=AnalysisReprocessingService,
+        lifetime=ServiceLifetime.SINGLETON
+    )
+    logger.debug("AnalysisReprocessingService -> AnalysisReprocessingService (Singleton)")
+    
+    container.register(
+        interface_type=AnalysisExportService,
+        implementation_type=AnalysisExportService,
+        lifetime=ServiceLifetime.SINGLETON
+    )
+    logger.debug("AnalysisExportService -> AnalysisExportService (Singleton)")
+    
+    container.register(
+        interface_type=QuestionSimilarityService,
+        implementation_type=QuestionSimilarityService,
+        lifetime=ServiceLifetime.SINGLETON
+    )
+    logger.debug("QuestionSimilarityService -> QuestionSimilarityService (Singleton)")
+    
+    container.register(
+        interface_type=RequestProfiler,
+        implementation_type=RequestProfiler,
+        lifetime=ServiceLifetime.SINGLETON
+    )
+    logger.debug("RequestProfiler -> RequestProfiler (Singleton)")
+    
+    container.register(
+        interface_type=AdmissionController,
+        implementation_type=AdmissionController,
+        lifetime=ServiceLifetime.SINGLETON
+    )
+    logger.debug("AdmissionController -> AdmissionController (Singleton)")
+    
     settings = get_settings()
     logger.info(f"MongoDB configured: {settings.mongodb_database} @ {settings.mongodb_url}")
     logger.info(f"Dependency configuration completed successfully! Total services: {len(container.get_registrations())}")
@@ -38,12 +38,44 @@ class Settings(BaseSettings):
     azure_document_intelligence_api_version: str = os.getenv("AZURE_DOCUMENT_INTELLIGENCE_API_VERSION", "2023-07-31")
     use_azure_ai: bool = os.getenv("USE_AZURE_AI", "true").lower() == "true"
     
+    # Upload buffering: acima deste tamanho (bytes) o PDF é memory-mapped em arquivo temporário
+    document_buffer_mmap_threshold: int = int(os.getenv("DOCUMENT_BUFFER_MMAP_THRESHOLD", str(8 * 1024 * 1024)))
+    
     # ================================
     # 🆕 MONGODB CONFIGURATION  
     # ================================
     mongodb_url: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     mongodb_database: str = os.getenv("MONGODB_DATABASE", "smartquest")
     mongodb_connection_timeout: int = int(os.getenv("MONGODB_CONNECTION_TIMEOUT", "10000"))
+    mongodb_read_timeout_ms: int = int(os.getenv("MONGODB_READ_TIMEOUT_MS", "30000"))
+    mongodb_write_timeout_ms: int = int(os.getenv("MONGODB_WRITE_TIMEOUT_MS", "60000"))
+    mongodb_min_pool_size: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+    mongodb_max_pool_size: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+    mongodb_max_idle_time_ms: int = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+    mongodb_compressors: str = os.getenv("MONGODB_COMPRESSORS", "zstd,snappy,zlib")
+    mongodb_zlib_compression_level: int = int(os.getenv("MONGODB_ZLIB_COMPRESSION_LEVEL", "6"))
+    mongodb_create_indexes_on_startup: bool = os.getenv("MONGODB_CREATE_INDEXES_ON_STARTUP", "true").lower() == "true"
+    mongodb_explain_on_startup: bool = os.getenv("MONGODB_EXPLAIN_ON_STARTUP", "false").lower() == "true"
+    documents_count_cache_ttl_seconds: int = int(os.getenv("DOCUMENTS_COUNT_CACHE_TTL_SECONDS", "30"))
+    azure_response_compression_level: int = int(os.getenv("AZURE_RESPONSE_COMPRESSION_LEVEL", "6"))
+    
+    # Write-behind: gravações da análise em lote, fora do caminho da requisição
+    write_behind_enabled: bool = os.getenv("WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    write_behind_journal_dir: str = os.getenv("WRITE_BEHIND_JOURNAL_DIR", "data/write_behind")
+    write_behind_batch_size: int = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "20"))
+    write_behind_flush_interval_ms: int = int(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_MS", "200"))
+    write_behind_max_pending_bytes: int = int(os.getenv("WRITE_BEHIND_MAX_PENDING_BYTES", str(256 * 1024 * 1024)))
+    write_behind_shutdown_timeout_seconds: int = int(os.getenv("WRITE_BEHIND_SHUTDOWN_TIMEOUT_SECONDS", "30"))
+    
+    # Cache de GET /analyze_document/{id} (JSON serializado + ETag)
+    document_response_cache_max_bytes: int = int(os.getenv("DOCUMENT_RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    document_response_cache_max_entries: int = int(os.getenv("DOCUMENT_RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+    document_response_cache_ttl_seconds: int = int(os.getenv("DOCUMENT_RESPONSE_CACHE_TTL_SECONDS", "300"))
+    document_response_max_age_seconds: int = int(os.getenv("DOCUMENT_RESPONSE_MAX_AGE_SECONDS", "0"))
+    response_json_compress_threshold_bytes: int = int(os.getenv("RESPONSE_JSON_COMPRESS_THRESHOLD_BYTES", str(64 * 1024)))
+    analysis_export_batch_size: int = int(os.getenv("ANALYSIS_EXPORT_BATCH_SIZE", "500"))
+    question_similarity_threshold: float = float(os.getenv("QUESTION_SIMILARITY_THRESHOLD", "0.85"))
+    question_similarity_max_candidates: int = int(os.getenv("QUESTION_SIMILARITY_MAX_CANDIDATES", "1000"))
     
     # ================================
     # 🆕 AZURE BLOB STORAGE CONFIGURATION
@@ -53,6 +85,50 @@ class Settings(BaseSettings):
     azure_blob_sas_token: str = os.getenv("AZURE_BLOB_SAS_TOKEN", "")
     enable_azure_blob_upload: bool = os.getenv("ENABLE_AZURE_BLOB_UPLOAD", "true").lower() == "true"
     
+    # ================================
+    # 🆕 ADMIN / REPROCESSING CONFIGURATION
+    # ================================
+    admin_api_key: str = os.getenv("ADMIN_API_KEY", "")
+    reprocessing_batch_size: int = int(os.getenv("REPROCESSING_BATCH_SIZE", "50"))
+    reprocessing_max_workers: int = int(os.getenv("REPROCESSING_MAX_WORKERS", "2"))
+    
+    # ================================
+    # 🆕 OBSERVABILITY CONFIGURATION
+    # ================================
+    tracing_enabled: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    tracing_file_path: str = os.getenv("TRACING_FILE_PATH", "logs/traces.jsonl")
+    tracing_sample_ratio: float = float(os.getenv("TRACING_SAMPLE_RATIO", "1.0"))
+    tracing_otlp_endpoint: str = os.getenv(
+        "OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+    )
+    profiling_sample_rate: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    profiling_mode: str = os.getenv("PROFILING_MODE", "sampling")
+    profiling_interval_ms: int = int(os.getenv("PROFILING_INTERVAL_MS", "5"))
+    profiling_dir: str = os.getenv("PROFILING_DIR", "data/profiles")
+    profiling_max_artifacts: int = int(os.getenv("PROFILING_MAX_ARTIFACTS", "200"))
+    memory_tracking_enabled: bool = os.getenv("MEMORY_TRACKING_ENABLED", "false").lower() == "true"
+    memory_tracemalloc: bool = os.getenv("MEMORY_TRACEMALLOC", "false").lower() == "true"
+    document_memory_ceiling_mb: int = int(os.getenv("DOCUMENT_MEMORY_CEILING_MB", "0"))
+    loop_watchdog_enabled: bool = os.getenv("LOOP_WATCHDOG_ENABLED", "true").lower() == "true"
+    loop_lag_threshold_ms: int = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "200"))
+    loop_watchdog_interval_ms: int = int(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "50"))
+    log_async_enabled: bool = os.getenv("LOG_ASYNC_ENABLED", "true").lower() == "true"
+    log_queue_size: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    log_sample_rates: str = os.getenv("LOG_SAMPLE_RATES", "")
+    admission_max_in_flight: int = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "4"))
+    admission_max_queue: int = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+    admission_queue_timeout_seconds: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "30"))
+    admission_tenant_key: str = os.getenv("ADMISSION_TENANT_KEY", "email")
+    admission_tenant_max_in_flight: int = int(os.getenv("ADMISSION_TENANT_MAX_IN_FLIGHT", "0"))
+    admission_tenant_weights: str = os.getenv("ADMISSION_TENANT_WEIGHTS", "")
+    admission_drr_quantum_pages: int = int(os.getenv("ADMISSION_DRR_QUANTUM_PAGES", "10"))
+    admission_priority_max_pages: int = int(os.getenv("ADMISSION_PRIORITY_MAX_PAGES", "2"))
+    azure_rate_limit_tps: float = float(os.getenv("AZURE_RATE_LIMIT_TPS", "15"))
+    azure_rate_limit_burst: int = int(os.getenv("AZURE_RATE_LIMIT_BURST", "1"))
+    azure_rate_limit_recovery_seconds: float = float(os.getenv("AZURE_RATE_LIMIT_RECOVERY_SECONDS", "60"))
+    azure_rate_limit_coordination: str = os.getenv("AZURE_RATE_LIMIT_COORDINATION", "none")
+    azure_rate_limit_lock_path: str = os.getenv("AZURE_RATE_LIMIT_LOCK_PATH", "")
+    
     @property
     def azure_blob_sas_url(self) -> str:
         """Constrói URL completa com SAS token para upload"""
@@ -84,11 +160,37 @@ class MockSettings:
     azure_document_intelligence_model = "prebuilt-layout"
     azure_document_intelligence_api_version = "2023-07-31"
     use_azure_ai = False
+    document_buffer_mmap_threshold = 8 * 1024 * 1024
     
     # 🆕 MongoDB Mock Settings
     mongodb_url = "mongodb://localhost:27017"
     mongodb_database = "smartquest"
     mongodb_connection_timeout = 10000
+    mongodb_read_timeout_ms = 30000
+    mongodb_write_timeout_ms = 60000
+    mongodb_min_pool_size = 0
+    mongodb_max_pool_size = 100
+    mongodb_max_idle_time_ms = 300000
+    mongodb_compressors = "zlib"
+    mongodb_zlib_compression_level = 6
+    mongodb_create_indexes_on_startup = False
+    mongodb_explain_on_startup = False
+    documents_count_cache_ttl_seconds = 30
+    azure_response_compression_level = 6
+    write_behind_enabled = False
+    write_behind_journal_dir = "data/write_behind"
+    write_behind_batch_size = 20
+    write_behind_flush_interval_ms = 200
+    write_behind_max_pending_bytes = 256 * 1024 * 1024
+    write_behind_shutdown_timeout_seconds = 30
+    document_response_cache_max_bytes = 64 * 1024 * 1024
+    document_response_cache_max_entries = 1000
+    document_response_cache_ttl_seconds = 300
+    document_response_max_age_seconds = 0
+    response_json_compress_threshold_bytes = 64 * 1024
+    analysis_export_batch_size = 500
+    question_similarity_threshold = 0.85
+    question_similarity_max_candidates = 1000
     
     # 🆕 Azure Blob Storage Mock Settings
     azure_blob_storage_url = ""
@@ -96,6 +198,44 @@ class MockSettings:
     azure_blob_sas_token = ""
     enable_azure_blob_upload = False
     
+    # 🆕 Admin / Reprocessing Mock Settings
+    admin_api_key = ""
+    reprocessing_batch_size = 50
+    reprocessing_max_workers = 2
+    
+    # 🆕 Observability Mock Settings
+    tracing_enabled = False
+    tracing_file_path = ""
+    tracing_sample_ratio = 1.0
+    tracing_otlp_endpoint = ""
+    profiling_sample_rate = 0.0
+    profiling_mode = "sampling"
+    profiling_interval_ms = 5
+    profiling_dir = "data/profiles"
+    profiling_max_artifacts = 200
+    memory_tracking_enabled = False
+    memory_tracemalloc = False
+    document_memory_ceiling_mb = 0
+    loop_watchdog_enabled = False
+    loop_lag_threshold_ms = 200
+    loop_watchdog_interval_ms = 50
+    log_async_enabled = False
+    log_queue_size = 10000
+    log_sample_rates = ""
+    admission_max_in_flight = 4
+    admission_max_queue = 32
+    admission_queue_timeout_seconds = 30.0
+    admission_tenant_key = "email"
+    admission_tenant_max_in_flight = 0
+    admission_tenant_weights = ""
+    admission_drr_quantum_pages = 10
+    admission_priority_max_pages = 2
+    azure_rate_limit_tps = 15.0
+    azure_rate_limit_burst = 1
+    azure_rate_limit_recovery_seconds = 60.0
+    azure_rate_limit_coordination = "none"
+    azure_rate_limit_lock_path = ""
+    
     @property
     def azure_blob_sas_url(self) -> str:
         """Mock sempre retorna string vazia"""
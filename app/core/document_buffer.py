@@ -0,0 +1,188 @@
+"""
+Document Buffer
+
+Buffer do documento com escopo de requisição. O upload é lido UMA vez, em
+streaming, calculando o SHA-256 na mesma passada. Todos os consumidores
+(validação, verificação de duplicatas, Azure, extração de imagens) recebem
+este buffer em vez do UploadFile, evitando cópias completas do PDF a cada leitura.
+
+Abaixo do limiar (``document_buffer_mmap_threshold``) o conteúdo fica em memória
+como ``bytes``; acima dele é gravado em arquivo temporário e mapeado com ``mmap``.
+"""
+import hashlib
+import io
+import logging
+import mmap
+import os
+import tempfile
+from typing import BinaryIO, Optional, Union
+
+from fastapi import UploadFile
+
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+class DocumentBuffer:
+    """
+    Conteúdo imutável de um documento enviado, lido uma única vez.
+
+    Expõe ``filename`` e ``content_type`` como o UploadFile, além de ``size`` e
+    ``sha256`` calculados durante o streaming.
+    """
+
+    def __init__(
+        self,
+        filename: Optional[str],
+        content_type: Optional[str],
+        size: int,
+        sha256: str,
+        data: Optional[bytes] = None,
+        path: Optional[str] = None
+    ):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = size
+        self.sha256 = sha256
+        self._data = data
+        self._path = path
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+
+        if path is not None and size > 0:
+            self._file = open(path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    async def from_upload(
+        cls,
+        file: UploadFile,
+        mmap_threshold: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> "DocumentBuffer":
+        """
+        Lê o UploadFile em chunks, calculando SHA-256 e tamanho na mesma passada.
+
+        Args:
+            file: Upload recebido pelo FastAPI
+            mmap_threshold: Tamanho (bytes) a partir do qual o conteúdo vai para
+                arquivo temporário + mmap. Padrão: settings.document_buffer_mmap_threshold
+            chunk_size: Tamanho de cada leitura do stream
+
+        Returns:
+            DocumentBuffer pronto para uso pelos consumidores
+        """
+        if mmap_threshold is None:
+            mmap_threshold = get_settings().document_buffer_mmap_threshold
+
+        hasher = hashlib.sha256()
+        chunks = []
+        size = 0
+        spill = None
+
+        await file.seek(0)
+        try:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                size += len(chunk)
+
+                if spill is None and size > mmap_threshold:
+                    spill = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+                    spill.writelines(chunks)
+                    chunks = []
+
+                if spill is not None:
+                    spill.write(chunk)
+                else:
+                    chunks.append(chunk)
+        except BaseException:
+            if spill is not None:
+                spill.close()
+                os.unlink(spill.name)
+            raise
+
+        if spill is not None:
+            spill.close()
+            logger.debug(f"DocumentBuffer: {size} bytes memory-mapped from {spill.name}")
+            return cls(file.filename, file.content_type, size, hasher.hexdigest(), path=spill.name)
+
+        return cls(file.filename, file.content_type, size, hasher.hexdigest(), data=b"".join(chunks))
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = "application/pdf"
+    ) -> "DocumentBuffer":
+        """Cria um buffer em memória a partir de bytes já carregados (scripts/testes)."""
+        return cls(filename, content_type, len(data), hashlib.sha256(data).hexdigest(), data=data)
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        return self._mmap is not None
+
+    @property
+    def path(self) -> Optional[str]:
+        """Caminho do arquivo temporário quando memory-mapped (None se em memória)."""
+        return self._path
+
+    def head(self, n: int) -> bytes:
+        """Primeiros ``n`` bytes (ex.: assinatura do arquivo)."""
+        return bytes(self.getbuffer()[:n])
+
+    def getbuffer(self) -> Union[memoryview, mmap.mmap]:
+        """Visão somente-leitura, sem cópia, do conteúdo."""
+        if self._mmap is not None:
+            return self._mmap
+        return memoryview(self._data or b"")
+
+    def open_stream(self) -> BinaryIO:
+        """
+        Stream binário novo, posicionado no início, sem copiar o conteúdo.
+
+        O chamador deve fechá-lo (suporta ``with``).
+        """
+        if self._path is not None:
+            return open(self._path, "rb")
+        return io.BytesIO(self._data or b"")
+
+    def open_pdf(self):
+        """Abre o documento no PyMuPDF (por caminho se memory-mapped, senão pelos bytes)."""
+        import fitz  # PyMuPDF
+
+        if self._path is not None:
+            return fitz.open(self._path)
+        return fitz.open(stream=self._data, filetype="pdf")
+
+    def close(self) -> None:
+        """Libera mmap e remove o arquivo temporário."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except OSError as e:
+                logger.warning(f"DocumentBuffer: failed to remove {self._path}: {e}")
+            self._path = None
+        self._data = None
+
+    def __enter__(self) -> "DocumentBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        storage = "mmap" if self.is_memory_mapped else "memory"
+        return f"DocumentBuffer(filename={self.filename!r}, size={self.size}, storage={storage})"
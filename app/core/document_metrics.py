@@ -0,0 +1,98 @@
+"""
+Métricas de processamento por documento
+
+Enquanto um documento é analisado, o coletor da análise (contextvar) acumula a
+duração de cada etapa, o tempo nas chamadas ao Azure e as figuras extraídas.
+O controller grava o resultado em 'azure_processing_data'
+(AzureProcessingDataRecord), agregado em GET /admin/processing-metrics.
+
+Os mesmos pontos alimentam os histogramas/contadores de GET /metrics; fora de
+uma análise (sem coletor) apenas as métricas Prometheus são registradas.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from app.core.metrics import AZURE_ANALYZE_LATENCY, FIGURES, PHASE_LATENCY
+
+_current_collector: ContextVar[Optional["DocumentMetricsCollector"]] = ContextVar(
+    "document_metrics_collector", default=None
+)
+
+
+class DocumentMetricsCollector:
+    """Acumula as medidas de uma análise de documento."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stage_durations: Dict[str, float] = {}
+        self.azure_latency: Dict[str, float] = {}
+        self.figures_count = 0
+        self.figures_failed_count = 0
+        self.image_bytes = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        self.stage_durations[name] = self.stage_durations.get(name, 0.0) + seconds
+
+    def add_azure_call(self, operation: str, seconds: float) -> None:
+        self.azure_latency[operation] = self.azure_latency.get(operation, 0.0) + seconds
+
+
+@contextmanager
+def collect_document_metrics(
+    collector: Optional[DocumentMetricsCollector] = None
+) -> Iterator[DocumentMetricsCollector]:
+    """Ativa o coletor (novo ou ``collector``) para as etapas da análise atual via contextvar."""
+    collector = collector or DocumentMetricsCollector()
+    token = _current_collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _current_collector.reset(token)
+
+
+@contextmanager
+def time_stage(name: str) -> Iterator[None]:
+    """Duração da etapa no histograma de fases e no coletor da análise."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        PHASE_LATENCY.labels(phase=name).observe(elapsed)
+        collector = _current_collector.get()
+        if collector is not None:
+            collector.add_stage(name, elapsed)
+
+
+@contextmanager
+def time_azure_call(operation: str) -> Iterator[None]:
+    """Duração de uma análise no Azure Document Intelligence."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        AZURE_ANALYZE_LATENCY.labels(operation=operation).observe(elapsed)
+        collector = _current_collector.get()
+        if collector is not None:
+            collector.add_azure_call(operation, elapsed)
+
+
+def record_figure(method: str, image_size: Optional[int]) -> None:
+    """Figura extraída (``image_size`` em bytes) ou falha na extração (None)."""
+    collector = _current_collector.get()
+    if image_size is None:
+        FIGURES.labels(method=method, result="failure").inc()
+        if collector is not None:
+            collector.figures_failed_count += 1
+        return
+    FIGURES.labels(method=method, result="success").inc()
+    if collector is not None:
+        collector.figures_count += 1
+        collector.image_bytes += image_size
@@ -5,11 +5,12 @@ from datetime import datetime
 class SmartQuestException(Exception):
     """Classe base para exceções do SmartQuest"""
     
-    def __init__(self, message: str, status_code: int = 500, error_type: str = "generic_error", context: Dict[str, Any] = None):
+    def __init__(self, message: str, status_code: int = 500, error_type: str = "generic_error", context: Dict[str, Any] = None, headers: Dict[str, str] = None):
         self.message = message
         self.status_code = status_code
         self.error_type = error_type
         self.context = context or {}
+        self.headers = headers
         self.timestamp = datetime.utcnow().isoformat()
         super().__init__(self.message)
     
@@ -27,7 +28,8 @@ class SmartQuestException(Exception):
             
         return HTTPException(
             status_code=self.status_code,
-            detail=detail
+            detail=detail,
+            headers=self.headers
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -32,7 +32,7 @@ class SMTPEmailService:  # Não precisa herdar de IEmailService
 ```
 """
 from typing import Protocol, Dict, Any, List
-from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 from app.models.internal import InternalDocumentResponse, InternalImageData, InternalQuestion
 
 
@@ -188,7 +188,7 @@ class IDocumentAnalysisOrchestrator(Protocol):
                                     extracted_data: Dict[str, Any],
                                     email: str,
                                     filename: str,
-                                    file: UploadFile) -> InternalDocumentResponse:
+                                    file: DocumentBuffer) -> InternalDocumentResponse:
         """
         Orquestra a análise completa do documento.
         
@@ -196,7 +196,7 @@ class IDocumentAnalysisOrchestrator(Protocol):
             extracted_data: Dados brutos extraídos
             email: Email do usuário
             filename: Nome do arquivo
-            file: UploadFile para fallback
+            file: DocumentBuffer para fallback
             
         Returns:
             Resposta estruturada completa
@@ -223,7 +223,7 @@ class IAnalyzeService(Protocol):
                                          extracted_data: Dict[str, Any],
                                          email: str,
                                          filename: str,
-                                         file: UploadFile) -> InternalDocumentResponse:
+                                         file: DocumentBuffer) -> InternalDocumentResponse:
         """
         Processa documento com modelos internos.
         
@@ -231,7 +231,7 @@ class IAnalyzeService(Protocol):
             extracted_data: Dados brutos extraídos
             email: Email do usuário
             filename: Nome do arquivo
-            file: UploadFile para fallback
+            file: DocumentBuffer para fallback
             
         Returns:
             Resposta estruturada completa
@@ -1,9 +1,61 @@
+"""
+Logging estruturado do SmartQuest
+
+As entradas do ``structured_logger`` são montadas apenas quando o nível está
+habilitado e renderizadas em JSON numa única passada (valores não
+serializáveis viram ``str``) no momento da formatação.
+
+``configure_logging`` (startup) troca os handlers dos loggers da aplicação por
+um QueueHandler: a requisição apenas enfileira o record e uma thread
+(QueueListener) formata e grava. A fila é limitada (LOG_QUEUE_SIZE); cheia,
+o record é descartado em vez de bloquear o event loop. LOG_SAMPLE_RATES
+amostra tipos de evento ruidosos (INFO/DEBUG; WARNING e acima nunca).
+Os descartes aparecem em ``smartquest_log_records_dropped_total``.
+"""
 import logging
+import logging.handlers
 import json
+import queue
+import random
+import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import Request
 
+from app.core.metrics import LOG_RECORDS_DROPPED
+
+_SERVICE = "smartquest"
+
+# Loggers com handlers próprios (a raiz recebe os demais por propagação)
+_QUEUED_LOGGERS = ("", _SERVICE, "uvicorn", "uvicorn.access")
+
+
+class StructuredLogEntry:
+    """Entrada estruturada renderizada em JSON apenas quando o record é formatado."""
+
+    __slots__ = ("level", "message", "context", "created")
+
+    def __init__(self, level: str, message: str, context: Optional[Dict[str, Any]] = None):
+        self.level = level
+        self.message = message
+        self.context = context
+        self.created = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {
+            "timestamp": datetime.utcfromtimestamp(self.created).isoformat(),
+            "level": self.level,
+            "message": self.message,
+            "service": _SERVICE
+        }
+        if self.context:
+            entry["context"] = self.context
+        return entry
+
+    def __str__(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+
+
 class StructuredLogger:
     """Logger estruturado para o SmartQuest"""
     
@@ -25,46 +77,30 @@ class StructuredLogger:
     
     def _create_log_entry(self, level: str, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Cria entrada de log estruturada"""
-        entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": level,
-            "message": message,
-            "service": "smartquest"
-        }
-        
-        if context:
-            # Converte valores não serializáveis para string
-            safe_context = {}
-            for key, value in context.items():
-                try:
-                    json.dumps(value)
-                    safe_context[key] = value
-                except (TypeError, ValueError):
-                    safe_context[key] = str(value)
-            entry["context"] = safe_context
-            
-        return entry
+        return StructuredLogEntry(level, message, context).to_dict()
+    
+    @staticmethod
+    def _merge_context(context: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Cópia rasa: o record é renderizado depois, fora da chamada
+        if kwargs:
+            return {**(context or {}), **kwargs}
+        return dict(context) if context else context
     
     def info(self, message: str, context: Dict[str, Any] = None, **kwargs):
         """Log de informação estruturado"""
-        if kwargs:
-            context = {**(context or {}), **kwargs}
-        
-        log_entry = self._create_log_entry("INFO", message, context)
-        self.logger.info(json.dumps(log_entry, ensure_ascii=False))
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(StructuredLogEntry("INFO", message, self._merge_context(context, kwargs)))
     
     def warning(self, message: str, context: Dict[str, Any] = None, **kwargs):
         """Log de warning estruturado"""
-        if kwargs:
-            context = {**(context or {}), **kwargs}
-        
-        log_entry = self._create_log_entry("WARNING", message, context)
-        self.logger.warning(json.dumps(log_entry, ensure_ascii=False))
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(StructuredLogEntry("WARNING", message, self._merge_context(context, kwargs)))
     
     def error(self, message: str, context: Dict[str, Any] = None, exception: Exception = None, **kwargs):
         """Log de erro estruturado"""
-        if kwargs:
-            context = {**(context or {}), **kwargs}
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        context = self._merge_context(context, kwargs)
         
         if exception:
             context = context or {}
@@ -77,19 +113,17 @@ class StructuredLogger:
             if hasattr(exception, 'to_dict'):
                 context["exception_details"] = exception.to_dict()
         
-        log_entry = self._create_log_entry("ERROR", message, context)
-        self.logger.error(json.dumps(log_entry, ensure_ascii=False))
+        self.logger.error(StructuredLogEntry("ERROR", message, context))
     
     def debug(self, message: str, context: Dict[str, Any] = None, **kwargs):
         """Log de debug estruturado"""
-        if kwargs:
-            context = {**(context or {}), **kwargs}
-        
-        log_entry = self._create_log_entry("DEBUG", message, context)
-        self.logger.debug(json.dumps(log_entry, ensure_ascii=False))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(StructuredLogEntry("DEBUG", message, self._merge_context(context, kwargs)))
 
     def log_request_start(self, request: Request, context: Dict[str, Any] = None):
         """Log início de requisição"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         req_context = {
             "method": request.method,
             "url": str(request.url),
@@ -119,6 +153,110 @@ class StructuredLogger:
         else:
             self.info("Request completed successfully", req_context)
 
+
+def _event_type(record: logging.LogRecord) -> Optional[str]:
+    """Tipo do evento: mensagem do structured_logger, chave "event" ou template da mensagem."""
+    msg = record.msg
+    if isinstance(msg, StructuredLogEntry):
+        return msg.message
+    if isinstance(msg, dict):
+        return msg.get("event")
+    return msg if isinstance(msg, str) else None
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """``"evento=taxa,outro evento=taxa"`` (LOG_SAMPLE_RATES) -> {evento: taxa}."""
+    rates = {}
+    for item in (spec or "").split(","):
+        event, separator, rate = item.rpartition("=")
+        if separator and event.strip():
+            rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Mantém uma fração dos records INFO/DEBUG de cada tipo de evento configurado."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self._rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self._rates or record.levelno >= logging.WARNING:
+            return True
+        rate = self._rates.get(_event_type(record))
+        if rate is None or rate >= 1.0 or random.random() < rate:
+            return True
+        LOG_RECORDS_DROPPED.labels(reason="sampled").inc()
+        return False
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que não formata na thread da requisição e nunca bloqueia."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A formatação (e a renderização do JSON) fica com o QueueListener
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(reason="queue_full").inc()
+
+
+_installed: List[Tuple[logging.Logger, Optional[LazyQueueHandler], List[logging.Handler], SamplingFilter]] = []
+_listeners: List[logging.handlers.QueueListener] = []
+
+
+def configure_logging(settings) -> None:
+    """
+    Instala a fila de logging (LOG_ASYNC_ENABLED) e a amostragem (LOG_SAMPLE_RATES).
+
+    Os handlers atuais de cada logger passam para um QueueListener;
+    ``shutdown_logging`` grava o que restou na fila e os devolve.
+    """
+    if _installed:
+        return
+    sampler = SamplingFilter(parse_sample_rates(settings.log_sample_rates))
+    for name in _QUEUED_LOGGERS:
+        target = logging.getLogger(name)
+        handlers = list(target.handlers)
+        if not handlers:
+            continue
+        if not settings.log_async_enabled:
+            # Síncrono: apenas a amostragem, nos handlers existentes
+            for handler in handlers:
+                handler.addFilter(sampler)
+            _installed.append((target, None, handlers, sampler))
+            continue
+
+        queue_handler = LazyQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+        queue_handler.addFilter(sampler)
+        listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        for handler in handlers:
+            target.removeHandler(handler)
+        target.addHandler(queue_handler)
+        listener.start()
+        _listeners.append(listener)
+        _installed.append((target, queue_handler, handlers, sampler))
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila de logging e restaura os handlers originais."""
+    for listener in _listeners:
+        listener.stop()
+    for target, queue_handler, handlers, sampler in _installed:
+        for handler in handlers:
+            handler.removeFilter(sampler)
+        if queue_handler is not None:
+            target.removeHandler(queue_handler)
+            for handler in handlers:
+                target.addHandler(handler)
+    _listeners.clear()
+    _installed.clear()
+
+
 # Instância global do logger
 structured_logger = StructuredLogger()
 
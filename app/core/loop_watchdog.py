@@ -0,0 +1,120 @@
+"""
+Watchdog de atraso do event loop
+
+Uma tarefa no event loop acorda a cada LOOP_WATCHDOG_INTERVAL_MS e mede o
+atraso do próprio agendamento (lag): com o loop livre o atraso é ~0; código
+síncrono no loop (``poller.result()``, renderização PyMuPDF, encode PIL,
+``json.dumps`` grandes) atrasa todas as corrotinas pelo mesmo tempo. O atraso
+vai para o histograma ``smartquest_event_loop_lag_seconds`` de GET /metrics.
+
+Uma thread monitora o último "batimento" da tarefa: quando o loop fica parado
+além de LOOP_LAG_THRESHOLD_MS, ela captura a pilha da thread do loop naquele
+momento (o código que está bloqueando) e, quando o loop volta, registra um
+aviso com a duração do bloqueio e essa pilha. Se a pilha termina no
+``select`` do loop, o atraso veio de outra thread segurando o GIL.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from app.core.metrics import LOOP_LAG, LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+_STACK_LIMIT = 25
+
+
+class LoopLagWatchdog:
+    """Mede o atraso do event loop e reporta a pilha dos bloqueios."""
+
+    def __init__(self, threshold_ms: int = 200, interval_ms: int = 50):
+        self._threshold = threshold_ms / 1000
+        self._interval = interval_ms / 1000
+        self._heartbeat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._monitor: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Inicia a tarefa no loop atual e a thread monitora."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._beat())
+        self._monitor = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._monitor.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._monitor is not None:
+            await asyncio.to_thread(self._monitor.join)
+            self._monitor = None
+
+    async def _beat(self) -> None:
+        while True:
+            expected = time.monotonic() + self._interval
+            await asyncio.sleep(self._interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            LOOP_LAG.observe(max(0.0, now - expected))
+
+    def _watch(self) -> None:
+        stall_heartbeat: Optional[float] = None
+        stall_stack: List[str] = []
+        blocked_for = 0.0
+
+        while not self._stopped.wait(self._interval):
+            heartbeat = self._heartbeat
+            if stall_heartbeat is not None and heartbeat != stall_heartbeat:
+                # O loop voltou: a duração vai até o batimento que encerrou o bloqueio
+                blocked_for = max(blocked_for, heartbeat - stall_heartbeat - self._interval)
+                self._report(blocked_for, stall_stack)
+                stall_heartbeat = None
+                continue
+
+            lag = time.monotonic() - heartbeat - self._interval
+            if lag <= self._threshold:
+                continue
+            if stall_heartbeat is None:
+                stall_heartbeat = heartbeat
+                stall_stack = self._loop_stack()
+            blocked_for = lag
+
+    def _loop_stack(self) -> List[str]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)[-_STACK_LIMIT:]
+
+    def _report(self, blocked_for: float, stack: List[str]) -> None:
+        LOOP_STALLS.inc()
+        logger.warning(
+            f"⚠️ Event loop blocked for {blocked_for * 1000:.0f} ms "
+            f"(threshold {self._threshold * 1000:.0f} ms). Loop thread stack when detected:\n"
+            + "".join(stack)
+        )
+
+
+def start_loop_watchdog(settings) -> Optional[LoopLagWatchdog]:
+    """Inicia o watchdog no loop atual quando LOOP_WATCHDOG_ENABLED (None caso contrário)."""
+    if not settings.loop_watchdog_enabled:
+        return None
+    watchdog = LoopLagWatchdog(
+        threshold_ms=settings.loop_lag_threshold_ms,
+        interval_ms=settings.loop_watchdog_interval_ms
+    )
+    watchdog.start()
+    logger.info(f"✅ Event loop watchdog started (threshold {settings.loop_lag_threshold_ms} ms)")
+    return watchdog
@@ -0,0 +1,208 @@
+"""
+Contabilidade de memória por etapa da análise
+
+Com MEMORY_TRACKING_ENABLED, cada análise de documento mede o RSS do processo
+no início e no fim de cada etapa (extração Azure + imagens e fases do
+orquestrador) e, com MEMORY_TRACEMALLOC, a memória alocada pelo Python
+(variação e pico por etapa). O relatório é gravado com as métricas da análise
+em 'azure_responses', registrado no log e observado nos histogramas de
+GET /metrics.
+
+DOCUMENT_MEMORY_CEILING_MB limita o crescimento do RSS de um documento: ao fim
+de uma etapa acima do teto a análise é interrompida com MemoryCeilingExceeded
+(HTTP 413), antes de a próxima etapa alocar mais.
+
+As medidas são do processo: com análises simultâneas no mesmo worker os
+valores incluem as outras análises. O tracemalloc custa CPU e memória
+(só alocações Python; pixmaps do PyMuPDF aparecem apenas no RSS).
+
+O RSS atual vem de /proc (Linux) ou do ``psutil`` quando instalado; o
+``ru_maxrss`` do módulo ``resource`` só informa o pico do processo e entra
+apenas no relatório. Sem /proc nem psutil (macOS, Windows) os campos de RSS
+ficam None e o teto por documento não é aplicado.
+"""
+import logging
+import mmap
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from app.core.exceptions import SmartQuestException
+from app.core.metrics import DOCUMENT_RSS_GROWTH, MEMORY_CEILING_ABORTS, PHASE_RSS_DELTA, PHASE_TRACED_PEAK
+from app.models.persistence.memory_usage import MemoryUsageReport, PhaseMemoryUsage
+
+try:
+    import resource
+except ImportError:  # Windows: RSS via psutil, se instalado
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+
+_current_tracker: ContextVar[Optional["DocumentMemoryTracker"]] = ContextVar("document_memory_tracker", default=None)
+
+
+class MemoryCeilingExceeded(SmartQuestException):
+    """Análise interrompida por ultrapassar DOCUMENT_MEMORY_CEILING_MB."""
+
+    def __init__(self, phase: str, growth_bytes: int, ceiling_bytes: int):
+        super().__init__(
+            message=(
+                f"Document exceeded the memory ceiling after {phase}: "
+                f"{growth_bytes // _MB} MB > {ceiling_bytes // _MB} MB"
+            ),
+            status_code=413,
+            error_type="memory_ceiling_exceeded",
+            context={"phase": phase, "growth_bytes": growth_bytes, "ceiling_bytes": ceiling_bytes}
+        )
+
+
+def _proc_rss() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            return int(handle.read().split()[1]) * mmap.PAGESIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def rss_available() -> bool:
+    """Se o RSS do processo pode ser medido nesta plataforma."""
+    return current_rss() is not None
+
+
+def current_rss() -> Optional[int]:
+    """RSS atual do processo em bytes (/proc ou psutil; None sem fonte)."""
+    rss = _proc_rss()
+    if rss is not None:
+        return rss
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    # ru_maxrss é o pico do processo, não o RSS atual: não serve para deltas nem para o teto
+    return None
+
+
+def peak_rss() -> Optional[int]:
+    """Pico de RSS do processo em bytes (ru_maxrss: KB no Linux, bytes no macOS; None sem fonte)."""
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        # Windows: peak_wset é o pico do working set
+        return getattr(info, "peak_wset", info.rss)
+    return None
+
+
+def configure_memory_tracking(settings) -> None:
+    """Inicia o tracemalloc no startup quando habilitado."""
+    if settings.memory_tracking_enabled and settings.memory_tracemalloc and not tracemalloc.is_tracing():
+        tracemalloc.start(1)
+        logger.info("✅ tracemalloc started for per-phase memory accounting")
+    if settings.memory_tracking_enabled and not rss_available():
+        logger.warning(
+            "⚠️ Process RSS unavailable on this platform (install psutil): "
+            "memory tracking records tracemalloc only and DOCUMENT_MEMORY_CEILING_MB is not enforced"
+        )
+
+
+class DocumentMemoryTracker:
+    """Mede a memória das etapas de uma análise e aplica o teto por documento."""
+
+    def __init__(self, ceiling_bytes: int = 0):
+        self.ceiling_bytes = ceiling_bytes
+        self.rss_start = current_rss()
+        self.rss_peak = self.rss_start
+        self.phases: List[PhaseMemoryUsage] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        traced = tracemalloc.is_tracing()
+        if traced:
+            traced_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        rss_start = current_rss()
+
+        yield
+
+        rss_end = current_rss()
+        rss_measured = rss_start is not None and rss_end is not None
+        usage = PhaseMemoryUsage(
+            phase=name,
+            rss_start_bytes=rss_start,
+            rss_end_bytes=rss_end,
+            rss_delta_bytes=rss_end - rss_start if rss_measured else None
+        )
+        if traced:
+            traced_end, traced_peak = tracemalloc.get_traced_memory()
+            usage.traced_delta_bytes = traced_end - traced_start
+            usage.traced_peak_bytes = traced_peak - traced_start
+            PHASE_TRACED_PEAK.labels(phase=name).observe(max(0, usage.traced_peak_bytes))
+        self.phases.append(usage)
+        if not rss_measured or self.rss_start is None:
+            return
+        PHASE_RSS_DELTA.labels(phase=name).observe(max(0, usage.rss_delta_bytes))
+        self.rss_peak = max(self.rss_peak, rss_end)
+
+        growth = rss_end - self.rss_start
+        if self.ceiling_bytes and growth > self.ceiling_bytes:
+            MEMORY_CEILING_ABORTS.inc()
+            raise MemoryCeilingExceeded(name, growth, self.ceiling_bytes)
+
+    def rss_growth(self) -> Optional[int]:
+        if self.rss_start is None or self.rss_peak is None:
+            return None
+        return self.rss_peak - self.rss_start
+
+    def report(self) -> MemoryUsageReport:
+        traced_peaks = [p.traced_peak_bytes for p in self.phases if p.traced_peak_bytes is not None]
+        return MemoryUsageReport(
+            rss_start_bytes=self.rss_start,
+            rss_peak_bytes=self.rss_peak,
+            rss_growth_bytes=self.rss_growth(),
+            process_peak_rss_bytes=peak_rss(),
+            traced_peak_bytes=max(traced_peaks) if traced_peaks else None,
+            ceiling_bytes=self.ceiling_bytes or None,
+            phases=self.phases
+        )
+
+
+@contextmanager
+def track_document(settings) -> Iterator[Optional[DocumentMemoryTracker]]:
+    """
+    Tracker da análise atual (None com MEMORY_TRACKING_ENABLED desligado).
+
+    Fica disponível para ``track_phase`` via contextvar, sem passar o tracker
+    pelas camadas do pipeline.
+    """
+    if not settings.memory_tracking_enabled:
+        yield None
+        return
+
+    tracker = DocumentMemoryTracker(ceiling_bytes=settings.document_memory_ceiling_mb * _MB)
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+        growth = tracker.rss_growth()
+        if growth is not None:
+            DOCUMENT_RSS_GROWTH.observe(max(0, growth))
+
+
+@contextmanager
+def track_phase(name: str) -> Iterator[None]:
+    """Mede a etapa no tracker da análise atual (sem tracker, não faz nada)."""
+    tracker = _current_tracker.get()
+    if tracker is None:
+        yield
+        return
+    with tracker.phase(name):
+        yield
@@ -0,0 +1,147 @@
+"""
+Métricas Prometheus
+
+Métricas da aplicação expostas em GET /metrics (formato texto do Prometheus).
+Registrar uma observação é um incremento em memória (ou em arquivo mmap no
+modo multiprocesso), barato o bastante para o caminho da requisição.
+
+Vários workers (uvicorn --workers / gunicorn): definir PROMETHEUS_MULTIPROC_DIR
+com um diretório vazio por implantação, antes de iniciar os processos. Cada
+worker grava os próprios valores e qualquer worker agrega todos na leitura.
+Sem a variável, cada processo expõe apenas os próprios valores.
+"""
+import os
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+_NAMESPACE = "smartquest"
+
+# Análises levam de segundos a minutos (Azure); consultas ficam em milissegundos
+_REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_PHASE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_AZURE_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+_FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+_MEMORY_BUCKETS = tuple(mb * 1024 * 1024 for mb in (1, 4, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP por rota",
+    ["method", "route", "status"], namespace=_NAMESPACE, buckets=_REQUEST_BUCKETS
+)
+PHASE_LATENCY = Histogram(
+    "pipeline_phase_duration_seconds", "Duração de cada fase do orquestrador de análise",
+    ["phase"], namespace=_NAMESPACE, buckets=_PHASE_BUCKETS
+)
+AZURE_ANALYZE_LATENCY = Histogram(
+    "azure_analyze_duration_seconds", "Duração da análise no Azure Document Intelligence",
+    ["operation"], namespace=_NAMESPACE, buckets=_AZURE_BUCKETS
+)
+AZURE_RATE_LIMIT_WAIT = Histogram(
+    "azure_rate_limit_wait_seconds", "Espera no rate limiter antes de uma chamada ao Azure",
+    ["operation"], namespace=_NAMESPACE, buckets=_PHASE_BUCKETS
+)
+PAGE_RENDER_LATENCY = Histogram(
+    "pdf_page_render_duration_seconds", "Renderização de recorte de página do PDF (PyMuPDF)",
+    namespace=_NAMESPACE, buckets=_FAST_BUCKETS
+)
+BLOB_UPLOAD_LATENCY = Histogram(
+    "blob_upload_duration_seconds", "Upload de imagem para o Azure Blob Storage",
+    ["result"], namespace=_NAMESPACE, buckets=_PHASE_BUCKETS
+)
+MONGODB_OPERATION_LATENCY = Histogram(
+    "mongodb_operation_duration_seconds", "Duração dos comandos MongoDB (CommandListener)",
+    ["command", "result"], namespace=_NAMESPACE, buckets=_FAST_BUCKETS
+)
+PHASE_RSS_DELTA = Histogram(
+    "pipeline_phase_rss_delta_bytes", "Crescimento do RSS em cada etapa da análise (MEMORY_TRACKING_ENABLED)",
+    ["phase"], namespace=_NAMESPACE, buckets=_MEMORY_BUCKETS
+)
+PHASE_TRACED_PEAK = Histogram(
+    "pipeline_phase_traced_peak_bytes", "Pico de memória alocada em cada etapa (tracemalloc)",
+    ["phase"], namespace=_NAMESPACE, buckets=_MEMORY_BUCKETS
+)
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Atraso de agendamento do event loop (watchdog)",
+    namespace=_NAMESPACE, buckets=_FAST_BUCKETS
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds", "Espera por uma vaga de análise por faixa e tenant configurado (demais: other)",
+    ["tenant", "lane"], namespace=_NAMESPACE, buckets=_PHASE_BUCKETS
+)
+DOCUMENT_RSS_GROWTH = Histogram(
+    "document_rss_growth_bytes", "Crescimento máximo do RSS durante a análise de um documento",
+    namespace=_NAMESPACE, buckets=_MEMORY_BUCKETS
+)
+
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections", "Análises recusadas pelo controle de admissão",
+    ["reason"], namespace=_NAMESPACE
+)
+AZURE_THROTTLED = Counter(
+    "azure_throttled_responses", "Respostas 429 do Azure Document Intelligence",
+    namespace=_NAMESPACE
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests", "Consultas a caches em memória",
+    ["cache", "result"], namespace=_NAMESPACE
+)
+DUPLICATES = Counter(
+    "duplicates", "Uploads atendidos sem nova análise",
+    ["source"], namespace=_NAMESPACE
+)
+FIGURES = Counter(
+    "figures_extracted", "Figuras extraídas do PDF",
+    ["method", "result"], namespace=_NAMESPACE
+)
+LOOP_STALLS = Counter(
+    "event_loop_stalls", "Bloqueios do event loop acima de LOOP_LAG_THRESHOLD_MS",
+    namespace=_NAMESPACE
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped", "Records de log descartados (fila cheia ou amostragem)",
+    ["reason"], namespace=_NAMESPACE
+)
+MEMORY_CEILING_ABORTS = Counter(
+    "memory_ceiling_aborts", "Análises interrompidas pelo teto de memória por documento",
+    namespace=_NAMESPACE
+)
+PAGES = Counter(
+    "pages_analyzed", "Páginas analisadas pelo Azure Document Intelligence",
+    namespace=_NAMESPACE
+)
+ANALYSES_IN_FLIGHT = Gauge(
+    "analyses_in_flight", "Análises de documento em andamento",
+    namespace=_NAMESPACE, multiprocess_mode="livesum"
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth", "Análises aguardando uma vaga (controle de admissão)",
+    namespace=_NAMESPACE, multiprocess_mode="livesum"
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Corpo e content-type da exposição (agregando os workers no modo multiprocesso)."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_stopped() -> None:
+    """Remove os gauges 'live' deste processo ao encerrar (modo multiprocesso)."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
@@ -3,5 +3,6 @@ Core middleware modules.
 """
 
 from .context_middleware import RequestContextMiddleware
+from .metrics_middleware import MetricsMiddleware
 
-__all__ = ["RequestContextMiddleware"]
+__all__ = ["RequestContextMiddleware", "MetricsMiddleware"]
@@ -2,17 +2,25 @@
 Request context middleware for automatic email tracking.
 
 Middleware that extracts user email from request and sets it in context
-for use by services and cache system.
+for use by services and cache system. It also opens the root tracing span
+of the request (continuing an incoming W3C ``traceparent``) and echoes the
+request id in the ``X-Request-ID`` response header.
 """
 import json
 import logging
 from fastapi import Request, Response
+from opentelemetry.propagate import extract
+from opentelemetry.trace import SpanKind
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.core.context import set_current_email, set_current_request_id, clear_context
+from app.core.tracing import get_tracer
 from uuid import uuid4
 
 logger = logging.getLogger(__name__)
 
+REQUEST_ID_HEADER = "X-Request-ID"
+_MAX_REQUEST_ID_LENGTH = 128
+
 
 class RequestContextMiddleware(BaseHTTPMiddleware):
     """
@@ -33,8 +41,8 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         Returns:
             Response object
         """
-        # Generate request ID
-        request_id = str(uuid4())
+        # Reuse the caller's request ID (e.g. from a gateway) or generate one
+        request_id = self._incoming_request_id(request) or str(uuid4())
         set_current_request_id(request_id)
         
         # Extract email from request
@@ -47,13 +55,35 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             logger.debug(f"No email found in request (request: {request_id})")
         
         try:
-            # Process request
-            response = await call_next(request)
+            # Root span of the request; phases, Azure, blob and Mongo spans nest under it
+            with get_tracer().start_as_current_span(
+                f"HTTP {request.method}",
+                context=extract(request.headers),
+                kind=SpanKind.SERVER,
+                attributes={"http.method": request.method, "http.target": request.url.path}
+            ) as span:
+                response = await call_next(request)
+                
+                route = request.scope.get("route")
+                if route is not None:
+                    span.update_name(f"{request.method} {route.path}")
+                    span.set_attribute("http.route", route.path)
+                span.set_attribute("http.status_code", response.status_code)
+            
+            response.headers[REQUEST_ID_HEADER] = request_id
             return response
         finally:
             # Clear context after request
             clear_context()
     
+    @staticmethod
+    def _incoming_request_id(request: Request) -> str:
+        """Request ID sent by the caller, if short and printable."""
+        value = request.headers.get(REQUEST_ID_HEADER, "")
+        if len(value) <= _MAX_REQUEST_ID_LENGTH and value.isascii() and value.isprintable():
+            return value
+        return ""
+    
     async def _extract_email_from_request(self, request: Request) -> str:
         """
         Extract email from various sources in the request.
@@ -0,0 +1,43 @@
+"""
+Request metrics middleware.
+
+Pure ASGI middleware (no response buffering, works with streaming responses)
+that records request latency per route template in the Prometheus histogram.
+"""
+import time
+
+from app.core.metrics import REQUEST_LATENCY
+
+# Paths without a matching route share one label to keep cardinality bounded
+_UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Observes ``smartquest_http_request_duration_seconds`` for each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=getattr(route, "path", _UNMATCHED_ROUTE),
+                status=str(status_code)
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,106 @@
+"""
+MinHash + LSH para textos de questões
+
+Assinatura MinHash sobre trigramas de palavras do texto normalizado (sem
+acentos, pontuação e maiúsculas) e chaves LSH por faixas (banding): duas
+questões com similaridade de Jaccard ``s`` compartilham ao menos uma faixa com
+probabilidade ``1 - (1 - s**ROWS)**BANDS``. Com 16 faixas de 8 linhas o ponto
+de corte fica em ~0,7; pares com 0,8 colidem com probabilidade ~0,95 e acima de
+0,85 com probabilidade > 0,99 (por isso QUESTION_SIMILARITY_THRESHOLD é 0,85:
+limiares menores perdem parte dos pares verdadeiros no índice).
+
+Os parâmetros fazem parte do formato persistido (coleção 'questions'); alterar
+NUM_PERM/BANDS/ROWS/SEED exige recalcular as assinaturas (backfill 'questions').
+"""
+import hashlib
+import random
+import re
+import struct
+import unicodedata
+from typing import List, Optional, Sequence, Set
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = 8
+SEED = 20261018
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SIGNATURE_FORMAT = f"<{NUM_PERM}I"
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+_rng = random.Random(SEED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+def normalize_text(text: Optional[str]) -> List[str]:
+    """Palavras do texto em minúsculas, sem acentos e sem pontuação."""
+    if not text:
+        return []
+    decomposed = unicodedata.normalize("NFKD", text)
+    without_accents = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", without_accents.lower()).split()
+
+
+def shingles(words: Sequence[str], size: int = SHINGLE_SIZE) -> Set[str]:
+    """Trigramas de palavras (o texto inteiro se tiver menos palavras)."""
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def signature(text: Optional[str]) -> Optional[List[int]]:
+    """
+    Assinatura MinHash (NUM_PERM valores de 32 bits) do texto.
+
+    Returns:
+        None para texto sem palavras (ex.: questão só com imagem)
+    """
+    hashes = [_hash64(shingle) for shingle in shingles(normalize_text(text))]
+    if not hashes:
+        return None
+    rows = [[((a * x + b) % _MERSENNE_PRIME) & _MAX_HASH for a, b in _PERMUTATIONS] for x in hashes]
+    return [min(column) for column in zip(*rows)]
+
+
+def band_keys(sig: Sequence[int]) -> List[str]:
+    """Chaves LSH (uma por faixa), prefixadas pelo índice da faixa."""
+    return [
+        f"{band:02x}" + hashlib.blake2b(
+            struct.pack(f"<{ROWS}I", *sig[band * ROWS:(band + 1) * ROWS]), digest_size=8
+        ).hexdigest()
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimativa da similaridade de Jaccard: fração de posições iguais."""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERM
+
+
+def pack(sig: Sequence[int]) -> bytes:
+    """Assinatura em bytes (little-endian) para persistência."""
+    return struct.pack(_SIGNATURE_FORMAT, *sig)
+
+
+def unpack(data: bytes) -> List[int]:
+    """
+    Assinatura a partir dos bytes persistidos.
+
+    Raises:
+        struct.error: Tamanho incompatível com NUM_PERM
+    """
+    return list(struct.unpack(_SIGNATURE_FORMAT, data))
+
+
+def collision_probability(jaccard: float, bands: int = BANDS, rows: int = ROWS) -> float:
+    """Probabilidade de um par com a similaridade dada ser candidato no LSH."""
+    return 1 - (1 - jaccard ** rows) ** bands
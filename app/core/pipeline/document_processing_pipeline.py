@@ -6,7 +6,7 @@ to process documents using the new stage-based architecture.
 
 import logging
 from typing import Any, Dict, Optional
-from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 
 from app.core.pipeline.interfaces import IPipeline, PipelineResult, PipelineStageWrapper, PipelineConfiguration
 from app.models.internal.processing_context import ProcessingContext
@@ -35,7 +35,7 @@ class DocumentProcessingPipelineInput:
     """Input for the complete document processing pipeline."""
     
     def __init__(self,
-                 file: UploadFile,
+                 file: DocumentBuffer,
                  extracted_data: Dict[str, Any],
                  email: str,
                  filename: str,
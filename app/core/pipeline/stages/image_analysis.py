@@ -5,7 +5,7 @@ categorizing images from the document.
 """
 
 import logging
-from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 from app.core.pipeline.interfaces import IPipelineStage, PipelineResult
 from app.models.internal.processing_context import ProcessingContext
 from app.core.interfaces import IImageExtractor, IImageCategorizer
@@ -15,7 +15,7 @@ from app.utils.processing_constants import get_pipeline_phase_name
 class ImageAnalysisInput:
     """Input data for image analysis stage."""
     
-    def __init__(self, file: UploadFile, document_id: str):
+    def __init__(self, file: DocumentBuffer, document_id: str):
         self.file = file
         self.document_id = document_id
 
@@ -0,0 +1,73 @@
+"""
+Single Flight
+
+Coalescência de requisições concorrentes: chamadas com a mesma chave aguardam
+uma única execução em andamento e recebem o mesmo resultado (ou exceção).
+
+Escopo: um processo/event loop. Com vários workers, cada worker coalesce as
+próprias requisições; entre workers a verificação de duplicatas no MongoDB
+continua sendo a proteção.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Registro de execuções em andamento, indexadas por chave."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Executa ``fn`` uma única vez por chave em andamento.
+
+        Args:
+            key: Chave de coalescência
+            fn: Fábrica da corrotina a executar (chamada apenas pelo líder)
+
+        Returns:
+            Tupla (resultado, shared) - shared=True quando o resultado veio de
+            outra requisição em andamento
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            try:
+                # shield: cancelar o seguidor não cancela o líder
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # Líder cancelado (ex.: cliente desconectou) - tentar assumir
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # marca como consumida quando não há seguidores
+            raise
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+        future.set_result(result)
+        return result, False
@@ -0,0 +1,166 @@
+"""
+Tracing (OpenTelemetry)
+
+Spans do pipeline de análise: requisição HTTP, fases do orquestrador, chamadas
+ao Azure Document Intelligence, renderização de figuras, PUT no Blob Storage e
+comandos MongoDB. Todos os spans de uma requisição compartilham o trace e
+carregam o ``request.id`` do RequestContextMiddleware.
+
+Desabilitado (padrão), a API do OpenTelemetry devolve spans não gravados: o
+custo no caminho da requisição é o de um context manager vazio.
+
+Exportadores (TRACING_ENABLED=true):
+- arquivo JSON Lines local (TRACING_FILE_PATH), um span por linha; use
+  scripts/trace_timeline.py para ver a linha do tempo de uma requisição
+- OTLP/HTTP quando OTEL_EXPORTER_OTLP_ENDPOINT (ou ..._TRACES_ENDPOINT) está
+  definido e o pacote opentelemetry-exporter-otlp-proto-http está instalado
+
+A exportação roda na thread do BatchSpanProcessor, fora do event loop.
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, SpanKind
+
+from app.core.context import get_current_request_id
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "smartquest-api"
+REQUEST_ID_ATTRIBUTE = "request.id"
+
+_tracer = trace.get_tracer("smartquest")
+_provider: Optional[TracerProvider] = None
+
+
+def get_tracer() -> trace.Tracer:
+    return _tracer
+
+
+@contextmanager
+def start_span(name: str, kind: SpanKind = SpanKind.INTERNAL, **attributes: Any) -> Iterator[Span]:
+    """
+    Span filho do span atual. Exceções são registradas no span e propagadas.
+
+    Atributos ``None`` são ignorados (o OpenTelemetry não aceita nulos).
+    """
+    clean = {key: value for key, value in attributes.items() if value is not None}
+    with _tracer.start_as_current_span(name, kind=kind, attributes=clean) as span:
+        yield span
+
+
+class RequestIdSpanProcessor(SpanProcessor):
+    """Copia o request id do contexto da requisição para todos os spans."""
+
+    def on_start(self, span: Span, parent_context=None) -> None:
+        request_id = get_current_request_id()
+        if request_id:
+            span.set_attribute(REQUEST_ID_ATTRIBUTE, request_id)
+
+
+class JsonFileSpanExporter(SpanExporter):
+    """Grava spans finalizados em JSON Lines (um objeto por span)."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(span_to_dict(span), ensure_ascii=False, default=str) + "\n" for span in spans)
+        try:
+            with self._lock, open(self._path, "a", encoding="utf-8") as handle:
+                handle.write(lines)
+        except OSError as e:
+            logger.error(f"❌ Failed to export spans to {self._path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def span_to_dict(span: ReadableSpan) -> dict:
+    """Span no formato do exportador de arquivo (ids em hex, como no OTLP/JSON)."""
+    context = span.get_span_context()
+    return {
+        "trace_id": format(context.trace_id, "032x"),
+        "span_id": format(context.span_id, "016x"),
+        "parent_span_id": format(span.parent.span_id, "016x") if span.parent else None,
+        "name": span.name,
+        "kind": span.kind.name,
+        "start_time_unix_nano": span.start_time,
+        "end_time_unix_nano": span.end_time,
+        "duration_ms": round((span.end_time - span.start_time) / 1e6, 3) if span.end_time else None,
+        "status": span.status.status_code.name,
+        "status_description": span.status.description,
+        "attributes": dict(span.attributes or {}),
+        "events": [
+            {"name": event.name, "time_unix_nano": event.timestamp, "attributes": dict(event.attributes or {})}
+            for event in span.events
+        ],
+        "service": SERVICE_NAME,
+    }
+
+
+def _otlp_exporter(endpoint: str) -> Optional[SpanExporter]:
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        logger.warning(
+            "⚠️ OTLP endpoint configured but opentelemetry-exporter-otlp-proto-http is not installed"
+        )
+        return None
+    # Sem argumentos o exportador lê as variáveis OTEL_EXPORTER_OTLP_* (endpoint, headers, ...)
+    return OTLPSpanExporter()
+
+
+def configure_tracing(settings) -> bool:
+    """
+    Instala o TracerProvider global conforme as configurações.
+
+    Returns:
+        True se o tracing ficou habilitado
+    """
+    global _provider
+    if not settings.tracing_enabled or _provider is not None:
+        return _provider is not None
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio))
+    )
+    provider.add_span_processor(RequestIdSpanProcessor())
+    exporters = []
+    if settings.tracing_file_path:
+        provider.add_span_processor(BatchSpanProcessor(JsonFileSpanExporter(settings.tracing_file_path)))
+        exporters.append(f"file:{settings.tracing_file_path}")
+    if settings.tracing_otlp_endpoint:
+        otlp = _otlp_exporter(settings.tracing_otlp_endpoint)
+        if otlp is not None:
+            provider.add_span_processor(BatchSpanProcessor(otlp))
+            exporters.append(f"otlp:{settings.tracing_otlp_endpoint}")
+
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    logger.info(f"✅ Tracing enabled (sample ratio {settings.tracing_sample_ratio}, exporters: {exporters})")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Exporta os spans pendentes e encerra o provider."""
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
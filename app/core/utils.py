@@ -1,13 +1,16 @@
 import time
 from datetime import datetime
-from typing import Callable
+from typing import Callable, Union
 from functools import wraps
 from fastapi import UploadFile, Request, HTTPException
 from .exceptions import SmartQuestException
 from .logging import structured_logger
+from .document_buffer import DocumentBuffer
 
-def is_pdf(file: UploadFile) -> bool:
+def is_pdf(file: Union[DocumentBuffer, UploadFile]) -> bool:
     """Verifica se o arquivo é um PDF válido"""
+    if isinstance(file, DocumentBuffer):
+        return file.head(5) == b"%PDF-"
     file.file.seek(0)
     header = file.file.read(5)
     file.file.seek(0)
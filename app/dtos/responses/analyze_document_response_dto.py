@@ -8,6 +8,8 @@ from typing import Dict, Any
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from app.models.persistence.stored_response import dumps_compact
+
 
 class AnalyzeDocumentResponseDTO(BaseModel):
     """
@@ -82,4 +84,38 @@ class AnalyzeDocumentResponseDTO(BaseModel):
             analysis_results=record.response,
             created_at=record.created_at,
             user_email=record.user_email
-        )
\ No newline at end of file
+        )
+
+    @classmethod
+    def json_bytes_from_record(cls, record) -> bytes:
+        """
+        JSON da resposta a partir de AnalyzeDocumentRecord.
+
+        Registros com ``response_json`` são montados a partir dos bytes já
+        serializados, sem validar o response no DTO; registros antigos usam
+        ``from_analyze_document_record``.
+
+        Args:
+            record: Instância de AnalyzeDocumentRecord
+
+        Returns:
+            JSON (UTF-8) equivalente a ``from_analyze_document_record(record).json(by_alias=True)``
+        """
+        if record.response_json is None:
+            return cls.from_analyze_document_record(record).json(by_alias=True).encode("utf-8")
+
+        response = record.response or {}
+        status = record.status.value if hasattr(record.status, 'value') else str(record.status)
+        return b"".join((
+            b'{"_id":', dumps_compact(str(record.id)),
+            b',"file_name":', dumps_compact(record.file_name),
+            b',"status":', dumps_compact(status),
+            b',"response":', record.response_json.render(
+                status=response.get("status"),
+                message=response.get("message"),
+                from_database=response.get("from_database", False)
+            ),
+            b',"created_at":', dumps_compact(record.created_at),
+            b',"user_email":', dumps_compact(record.user_email),
+            b'}'
+        ))
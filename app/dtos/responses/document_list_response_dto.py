@@ -2,12 +2,84 @@
 DTO para resposta paginada do endpoint GET /analyze/documents
 
 Representa uma lista paginada de documentos com metadados de paginação.
+Os itens trazem apenas campos de resumo; o resultado completo da análise é
+obtido em GET /analyze/analyze_document/{id}.
 """
 
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
-from app.dtos.responses.analyze_document_response_dto import AnalyzeDocumentResponseDTO
+
+class DocumentSummaryDTO(BaseModel):
+    """Resumo desnormalizado do documento (gravado na persistência)."""
+    
+    question_count: int = Field(default=0, description="Quantidade de questões")
+    context_block_count: int = Field(default=0, description="Quantidade de context blocks")
+    subject: Optional[str] = Field(None, description="Matéria")
+    grade: Optional[str] = Field(None, description="Série/ano")
+    page_count: Optional[int] = Field(None, description="Páginas do PDF")
+
+
+class DocumentListItemDTO(BaseModel):
+    """
+    Item da listagem de documentos (projeção de resumo).
+    
+    Não inclui o response completo (questões, context blocks, imagens).
+    """
+    
+    id: str = Field(..., description="ID do documento no MongoDB", alias="_id")
+    document_name: str = Field(..., description="Nome do arquivo", alias="file_name")
+    status: str = Field(..., description="Status do processamento")
+    created_at: datetime = Field(..., description="Data/hora de criação")
+    user_email: str = Field(..., description="Email do usuário")
+    file_size: int = Field(default=0, description="Tamanho do arquivo em bytes")
+    document_id: Optional[str] = Field(None, description="ID da análise (response.document_id)")
+    summary: Optional[DocumentSummaryDTO] = Field(None, description="Resumo (ausente em registros antigos)")
+
+    class Config:
+        """Configuração do DTO."""
+        allow_population_by_field_name = True
+        schema_extra = {
+            "example": {
+                "_id": "507f1f77bcf86cd799439011",
+                "document_name": "prova_matematica.pdf",
+                "status": "completed",
+                "created_at": "2025-01-15T10:30:00Z",
+                "user_email": "professor@escola.com",
+                "file_size": 245760,
+                "document_id": "doc_123",
+                "summary": {
+                    "question_count": 10,
+                    "context_block_count": 4,
+                    "subject": "Matemática",
+                    "grade": "9º Ano",
+                    "page_count": 3
+                }
+            }
+        }
+
+    @classmethod
+    def from_mongo_record(cls, mongo_record: Dict[str, Any]) -> "DocumentListItemDTO":
+        """
+        Converte registro projetado do MongoDB para item da lista.
+        
+        Args:
+            mongo_record: Documento do MongoDB com SUMMARY_PROJECTION
+            
+        Returns:
+            Item formatado para resposta da API
+        """
+        return cls(
+            id=str(mongo_record.get("_id")),
+            document_name=mongo_record.get("file_name"),
+            status=mongo_record.get("status", "unknown"),
+            created_at=mongo_record.get("created_at"),
+            user_email=mongo_record.get("user_email"),
+            file_size=mongo_record.get("file_size") or 0,
+            document_id=(mongo_record.get("response") or {}).get("document_id"),
+            summary=mongo_record.get("summary")
+        )
 
 
 class PaginationMetadata(BaseModel):
@@ -15,15 +87,17 @@ class PaginationMetadata(BaseModel):
     Metadados de paginação para listas de recursos.
     
     Fornece informações sobre a página atual, total de itens,
-    e navegação entre páginas.
+    e navegação entre páginas. Para páginas seguintes use ``next_cursor``;
+    totais são opcionais (include_total=false dispensa a contagem).
     """
     
     current_page: int = Field(..., ge=1, description="Número da página atual (1-indexed)")
     page_size: int = Field(..., ge=1, le=50, description="Quantidade de itens por página")
-    total_items: int = Field(..., ge=0, description="Total de itens disponíveis")
-    total_pages: int = Field(..., ge=0, description="Total de páginas disponíveis")
+    total_items: Optional[int] = Field(None, ge=0, description="Total de itens disponíveis (se solicitado)")
+    total_pages: Optional[int] = Field(None, ge=0, description="Total de páginas disponíveis (se solicitado)")
     has_next: bool = Field(..., description="Indica se existe próxima página")
     has_previous: bool = Field(..., description="Indica se existe página anterior")
+    next_cursor: Optional[str] = Field(None, description="Cursor opaco para a próxima página")
 
     class Config:
         """Configuração do modelo Pydantic."""
@@ -34,7 +108,8 @@ class PaginationMetadata(BaseModel):
                 "total_items": 25,
                 "total_pages": 3,
                 "has_next": True,
-                "has_previous": False
+                "has_previous": False,
+                "next_cursor": "eyJjIjoiMjAyNS0wMS0xNVQxMDozMDowMCIsImkiOiJkb2NfMTIzIn0"
             }
         }
 
@@ -43,7 +118,10 @@ class PaginationMetadata(BaseModel):
         cls,
         current_page: int,
         page_size: int,
-        total_items: int
+        total_items: Optional[int] = None,
+        has_next: Optional[bool] = None,
+        next_cursor: Optional[str] = None,
+        has_previous: Optional[bool] = None
     ) -> "PaginationMetadata":
         """
         Factory method para criar metadados de paginação.
@@ -51,17 +129,24 @@ class PaginationMetadata(BaseModel):
         Args:
             current_page: Página atual (1-indexed)
             page_size: Itens por página
-            total_items: Total de itens disponíveis
+            total_items: Total de itens disponíveis (None se não calculado)
+            has_next: Existe próxima página (padrão: derivado do total)
+            next_cursor: Cursor opaco da próxima página
+            has_previous: Existe página anterior (padrão: current_page > 1)
             
         Returns:
             Instância de PaginationMetadata com cálculos automáticos
         """
         # Calcular total de páginas (arredondar para cima)
-        total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 0
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 0
         
         # Determinar navegação
-        has_next = current_page < total_pages
-        has_previous = current_page > 1
+        if has_next is None:
+            has_next = next_cursor is not None or (total_pages is not None and current_page < total_pages)
+        if has_previous is None:
+            has_previous = current_page > 1
         
         return cls(
             current_page=current_page,
@@ -69,7 +154,8 @@ class PaginationMetadata(BaseModel):
             total_items=total_items,
             total_pages=total_pages,
             has_next=has_next,
-            has_previous=has_previous
+            has_previous=has_previous,
+            next_cursor=next_cursor
         )
 
 
@@ -81,9 +167,9 @@ class DocumentListResponseDTO(BaseModel):
     de paginação para navegação eficiente.
     """
     
-    items: List[AnalyzeDocumentResponseDTO] = Field(
+    items: List[DocumentListItemDTO] = Field(
         ..., 
-        description="Lista de documentos analisados"
+        description="Lista de documentos analisados (campos de resumo)"
     )
     pagination: PaginationMetadata = Field(
         ..., 
@@ -99,15 +185,10 @@ class DocumentListResponseDTO(BaseModel):
                         "_id": "507f1f77bcf86cd799439011",
                         "document_name": "prova_matematica.pdf",
                         "status": "completed",
-                        "analysis_results": {
-                            "document_id": "doc_123",
-                            "email": "professor@escola.com",
-                            "filename": "prova_matematica.pdf",
-                            "questions": [],
-                            "context_blocks": []
-                        },
                         "created_at": "2025-01-15T10:30:00Z",
-                        "user_email": "professor@escola.com"
+                        "user_email": "professor@escola.com",
+                        "file_size": 245760,
+                        "document_id": "doc_123"
                     }
                 ],
                 "pagination": {
@@ -116,7 +197,28 @@ class DocumentListResponseDTO(BaseModel):
                     "total_items": 25,
                     "total_pages": 3,
                     "has_next": True,
-                    "has_previous": False
+                    "has_previous": False,
+                    "next_cursor": "eyJjIjoiMjAyNS0wMS0xNVQxMDozMDowMCIsImkiOiJkb2NfMTIzIn0"
                 }
             }
         }
+
+
+class DocumentSearchItemDTO(DocumentListItemDTO):
+    """Item da busca textual: resumo do documento e relevância."""
+
+    score: float = Field(..., description="Relevância (textScore do MongoDB)")
+
+    @classmethod
+    def from_mongo_record(cls, mongo_record: Dict[str, Any]) -> "DocumentSearchItemDTO":
+        item = DocumentListItemDTO.from_mongo_record(mongo_record)
+        return cls(**item.dict(), score=mongo_record.get("score") or 0.0)
+
+
+class DocumentSearchResponseDTO(BaseModel):
+    """Resultado paginado da busca textual, ordenado por relevância."""
+
+    items: List[DocumentSearchItemDTO] = Field(..., description="Documentos encontrados")
+    page: int = Field(..., ge=1, description="Página atual (1-indexed)")
+    page_size: int = Field(..., ge=1, description="Quantidade máxima de itens por página")
+    has_next: bool = Field(..., description="Indica se existe próxima página")
@@ -0,0 +1,85 @@
+"""
+DTO para resposta paginada do endpoint GET /analyze/questions
+
+Itens do banco de questões (coleção 'questions'). O documento completo de
+origem é obtido em GET /analyze/analyze_document/{document_id}.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class QuestionAlternativeDTO(BaseModel):
+    """Alternativa de uma questão."""
+
+    letter: str = Field(..., description="Letra da alternativa")
+    text: str = Field(..., description="Texto da alternativa")
+
+
+class QuestionItemDTO(BaseModel):
+    """Questão do banco de questões."""
+
+    id: str = Field(..., description="ID da questão (document_id:posição)", alias="_id")
+    document_id: str = Field(..., description="ID da análise de origem")
+    number: int = Field(..., description="Número da questão")
+    statement: str = Field(default="", description="Enunciado")
+    alternatives: List[QuestionAlternativeDTO] = Field(default_factory=list, description="Alternativas")
+    is_multiple_choice: bool = Field(default=False, description="Questão com alternativas")
+    subject: Optional[str] = Field(None, description="Matéria")
+    grade: Optional[str] = Field(None, description="Série/ano")
+    context_id: Optional[int] = Field(None, description="Context block relacionado")
+    has_image: bool = Field(default=False, description="Questão com imagem")
+    user_email: str = Field(..., description="Email do usuário")
+    created_at: Optional[datetime] = Field(None, description="Data/hora da análise")
+
+    class Config:
+        """Configuração do DTO."""
+        allow_population_by_field_name = True
+        schema_extra = {
+            "example": {
+                "_id": "507f1f77bcf86cd799439011:0000",
+                "document_id": "507f1f77bcf86cd799439011",
+                "number": 1,
+                "statement": "Qual é o resultado de 2 + 2?",
+                "alternatives": [{"letter": "A", "text": "3"}, {"letter": "B", "text": "4"}],
+                "is_multiple_choice": True,
+                "subject": "Matemática",
+                "grade": "9º Ano",
+                "context_id": None,
+                "has_image": False,
+                "user_email": "professor@escola.com",
+                "created_at": "2025-01-15T10:30:00Z"
+            }
+        }
+
+    @classmethod
+    def from_mongo_record(cls, mongo_record: Dict[str, Any], **extra: Any) -> "QuestionItemDTO":
+        """Converte documento da coleção 'questions' para item da lista."""
+        return cls(id=str(mongo_record.get("_id")), **extra, **{
+            key: value for key, value in mongo_record.items() if key in cls.__fields__ and key != "id"
+        })
+
+
+class QuestionListResponseDTO(BaseModel):
+    """Página do banco de questões com cursor para a próxima página."""
+
+    items: List[QuestionItemDTO] = Field(..., description="Questões da página")
+    page_size: int = Field(..., ge=1, description="Quantidade máxima de itens por página")
+    has_next: bool = Field(..., description="Indica se existe próxima página")
+    next_cursor: Optional[str] = Field(None, description="Cursor opaco para a próxima página")
+
+
+class SimilarQuestionDTO(QuestionItemDTO):
+    """Quase-duplicata com a similaridade estimada (MinHash)."""
+
+    similarity: float = Field(..., ge=0, le=1, description="Similaridade de Jaccard estimada")
+
+
+class SimilarQuestionsResponseDTO(BaseModel):
+    """Grupo de quase-duplicatas de uma questão."""
+
+    question: QuestionItemDTO = Field(..., description="Questão de referência")
+    threshold: float = Field(..., description="Similaridade mínima aplicada")
+    candidates_examined: int = Field(..., ge=0, description="Candidatas lidas pelo índice LSH")
+    items: List[SimilarQuestionDTO] = Field(..., description="Quase-duplicatas, da mais similar")
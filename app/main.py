@@ -8,6 +8,12 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import router as api_router
+from app.core.logging import configure_logging, shutdown_logging
+from app.core.loop_watchdog import start_loop_watchdog
+from app.core.memory import configure_memory_tracking
+from app.core.metrics import mark_worker_stopped
+from app.core.middleware import MetricsMiddleware, RequestContextMiddleware
+from app.core.tracing import configure_tracing, shutdown_tracing
 import dotenv
 
 dotenv.load_dotenv()
@@ -35,6 +41,12 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting SmartQuest API...")
     
+    from app.config.settings import get_settings
+    configure_logging(get_settings())
+    configure_tracing(get_settings())
+    configure_memory_tracking(get_settings())
+    loop_watchdog = start_loop_watchdog(get_settings())
+    
     # Inicializa conexão MongoDB via DI Container
     try:
         from app.core.di_container import container
@@ -42,9 +54,10 @@ async def lifespan(app: FastAPI):
         
         if container.is_registered(MongoDBConnectionService):
             mongo_service = container.resolve(MongoDBConnectionService)
-            # Testa conexão durante startup
+            # Testa conexão e abre o pool mínimo antes do primeiro request
             await mongo_service.get_database()
             logger.info("✅ MongoDB connection initialized")
+            await mongo_service.warm_up()
         else:
             logger.warning("⚠️ MongoDBConnectionService not registered in DI Container")
             
@@ -52,6 +65,41 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to initialize MongoDB: {e}")
         # Não bloqueia startup - deixa health check reportar o problema
     
+    # Índices exigidos pelas consultas: verifica/cria e, opcionalmente, checa os planos
+    try:
+        from app.core.di_container import container
+        from app.config.settings import get_settings
+        from app.services.persistence import MongoDBMigrationManager
+        
+        if container.is_registered(MongoDBMigrationManager):
+            settings = get_settings()
+            migration_manager = container.resolve(MongoDBMigrationManager)
+            index_check = await migration_manager.ensure_indexes(
+                create_missing=settings.mongodb_create_indexes_on_startup
+            )
+            if index_check.ok:
+                logger.info(f"✅ MongoDB indexes verified ({len(index_check.created)} created)")
+            else:
+                logger.warning(f"⚠️ MongoDB indexes missing: {index_check.missing or list(index_check.failed)}")
+            if settings.mongodb_explain_on_startup:
+                plans = await migration_manager.check_query_plans()
+                collscans = [plan.query for plan in plans if not plan.ok]
+                if collscans:
+                    logger.warning(f"⚠️ Hot queries without the expected index: {collscans}")
+    except Exception as e:
+        logger.error(f"❌ Failed to verify MongoDB indexes: {e}")
+    
+    # Fila write-behind: regrava o journal pendente e inicia a gravação em lote
+    try:
+        from app.core.di_container import container
+        from app.services.persistence import ISimplePersistenceService
+        
+        if container.is_registered(ISimplePersistenceService):
+            await container.resolve(ISimplePersistenceService).start_write_behind()
+            logger.info("✅ Write-behind persistence queue started")
+    except Exception as e:
+        logger.error(f"❌ Failed to start write-behind queue: {e}")
+    
     logger.info("✅ SmartQuest API started successfully")
     
     yield  # Aplicação rodando
@@ -59,6 +107,17 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down SmartQuest API...")
     
+    # Drena a fila write-behind antes de fechar a conexão
+    try:
+        from app.core.di_container import container
+        from app.services.persistence import ISimplePersistenceService
+        
+        if container.is_registered(ISimplePersistenceService):
+            await container.resolve(ISimplePersistenceService).stop_write_behind()
+            logger.info("✅ Write-behind persistence queue drained")
+    except Exception as e:
+        logger.error(f"❌ Error draining write-behind queue: {e}")
+    
     try:
         from app.core.di_container import container
         from app.services.infrastructure.mongodb_connection_service import MongoDBConnectionService
@@ -71,7 +130,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Error closing MongoDB connection: {e}")
     
+    if loop_watchdog is not None:
+        await loop_watchdog.stop()
+    mark_worker_stopped()
+    shutdown_tracing()
+    
     logger.info("✅ SmartQuest API shutdown complete")
+    shutdown_logging()
 
 
 # Inicializar FastAPI com lifecycle management
@@ -91,6 +156,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request id + span raiz de cada requisição (tracing)
+app.add_middleware(RequestContextMiddleware)
+
+# Latência por rota (Prometheus, exposta em GET /metrics)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router)
 
 # Para debug direto
@@ -6,16 +6,30 @@ de dados no MongoDB conforme prompt original.
 """
 
 from .base_document import BaseDocument
+from .document_summary import DocumentSummary, normalize_subject_key
+from .stored_response import StoredResponseJSON, VOLATILE_RESPONSE_FIELDS
 from .analyze_document_record import AnalyzeDocumentRecord
-from .azure_processing_data_record import AzureProcessingDataRecord, ProcessingMetrics
-from .azure_response_record import AzureResponseRecord
+from .question_record import QuestionRecord, QuestionAlternative
+from .azure_processing_data_record import AzureProcessingDataRecord, ProcessingMetrics, page_count_bucket
+from .memory_usage import MemoryUsageReport, PhaseMemoryUsage
+from .azure_response_record import AzureResponseRecord, AzureResponsePayloadRef
 from .enums import DocumentStatus
 
 __all__ = [
     "BaseDocument",
     "AnalyzeDocumentRecord", 
+    "QuestionRecord",
+    "QuestionAlternative",
+    "DocumentSummary",
+    "normalize_subject_key",
+    "StoredResponseJSON",
+    "VOLATILE_RESPONSE_FIELDS",
     "AzureProcessingDataRecord",
     "ProcessingMetrics",
+    "page_count_bucket",
     "AzureResponseRecord",
+    "AzureResponsePayloadRef",
+    "MemoryUsageReport",
+    "PhaseMemoryUsage",
     "DocumentStatus"
 ]
\ No newline at end of file
@@ -5,10 +5,12 @@ Representa o modelo exato conforme prompt original MongoDB.
 """
 from pydantic import Field
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from .base_document import BaseDocument
 from .enums import DocumentStatus
+from .document_summary import DocumentSummary
+from .stored_response import StoredResponseJSON
 
 
 class AnalyzeDocumentRecord(BaseDocument):
@@ -20,15 +22,23 @@ class AnalyzeDocumentRecord(BaseDocument):
     - created_at: Data hora atual (gerado automaticamente)
     - user_email: Email informado no request
     - file_name: Nome do documento enviado
+    - file_hash: SHA-256 do conteúdo (verificação de duplicatas)
+    - summary: Resumo desnormalizado (contagens, matéria, série, páginas)
     - response: Response no formato JSON
+    - response_json: Response já serializado (análises concluídas)
     - status: Status do processamento (enum)
     """
     
     user_email: str = Field(..., description="Email informado no request")
     file_name: str = Field(..., description="Nome do documento enviado")
     file_size: int = Field(default=0, description="Tamanho do arquivo em bytes")
+    file_hash: Optional[str] = Field(default=None, description="SHA-256 (hex) do conteúdo do arquivo")
     response: Dict[str, Any] = Field(..., description="Response completo em formato JSON")
     status: DocumentStatus = Field(default=DocumentStatus.PENDING, description="Status do processamento")
+    summary: Optional[DocumentSummary] = Field(default=None, description="Resumo indexado para listagens")
+    response_json: Optional[StoredResponseJSON] = Field(
+        default=None, description="Response serializado para leitura sem reconstruir o DTO"
+    )
     
     class Config:
         """Configuração específica para AnalyzeDocumentRecord."""
@@ -37,6 +47,7 @@ class AnalyzeDocumentRecord(BaseDocument):
                 "user_email": "user@example.com",
                 "file_name": "document.pdf",
                 "file_size": 245760,
+                "file_hash": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
                 "response": {
                     "document_id": "123e4567-e89b-12d3-a456-426614174000",
                     "status": "completed",
@@ -48,7 +59,7 @@ class AnalyzeDocumentRecord(BaseDocument):
         }
     
     @classmethod
-    def create_from_request(cls, user_email: str, file_name: str, file_size: int, response: Dict[str, Any], status: DocumentStatus = DocumentStatus.PENDING):
+    def create_from_request(cls, user_email: str, file_name: str, file_size: int, response: Dict[str, Any], status: DocumentStatus = DocumentStatus.PENDING, file_hash: Optional[str] = None, summary: Optional[DocumentSummary] = None, document_id: Optional[str] = None):
         """
         Cria novo registro a partir dos dados da requisição.
         
@@ -58,17 +69,26 @@ class AnalyzeDocumentRecord(BaseDocument):
             file_size: Tamanho do arquivo em bytes
             response: Response JSON completo
             status: Status inicial (padrão: PENDING)
+            file_hash: SHA-256 do conteúdo (opcional)
+            summary: Resumo desnormalizado (opcional)
+            document_id: _id pré-alocado (padrão: novo UUID)
             
         Returns:
             Nova instância de AnalyzeDocumentRecord
         """
-        return cls(
+        record = cls(
             user_email=user_email,
             file_name=file_name,
             file_size=file_size,
+            file_hash=file_hash,
             response=response,
-            status=status
+            status=status,
+            summary=summary,
+            response_json=StoredResponseJSON.encode(response) if status == DocumentStatus.COMPLETED else None
         )
+        if document_id:
+            record.id = document_id
+        return record
     
     def mark_completed(self):
         """Marca o documento como processado com sucesso."""
@@ -2,7 +2,9 @@
 Modelo de persistência para dados de processamento do Azure
 
 Modelo específico para armazenar informações detalhadas do processamento Azure,
-incluindo response completo e métricas Pydantic.
+incluindo métricas Pydantic. Cada análise grava um registro com as durações
+das etapas (base de GET /admin/processing-metrics); o response completo fica
+em 'azure_responses' (GridFS) e não é repetido aqui.
 """
 from pydantic import Field, BaseModel
 from datetime import datetime
@@ -10,6 +12,19 @@ from typing import Dict, Any, Optional, List
 
 from .base_document import BaseDocument
 
+# Faixas de quantidade de páginas usadas na agregação das métricas
+PAGE_COUNT_BUCKETS = ((1, "1"), (5, "2-5"), (10, "6-10"), (20, "11-20"), (50, "21-50"))
+
+
+def page_count_bucket(pages_count: Optional[int]) -> str:
+    """Faixa de páginas do documento ("unknown" sem contagem)."""
+    if not pages_count:
+        return "unknown"
+    for upper, label in PAGE_COUNT_BUCKETS:
+        if pages_count <= upper:
+            return label
+    return "51+"
+
 
 class ProcessingMetrics(BaseModel):
     """
@@ -27,6 +42,19 @@ class ProcessingMetrics(BaseModel):
     azure_model_used: Optional[str] = Field(None, description="Modelo Azure utilizado")
     azure_api_version: Optional[str] = Field(None, description="Versão da API Azure")
     extraction_quality_score: Optional[float] = Field(None, description="Score de qualidade da extração")
+    page_bucket: Optional[str] = Field(None, description="Faixa de páginas (page_count_bucket)")
+    cache_outcome: Optional[str] = Field(None, description="Verificação de duplicata: 'miss' (analisado) ou 'hit'")
+    stage_durations_seconds: Dict[str, float] = Field(
+        default_factory=dict, description="Duração de cada etapa (extraction e fases do orquestrador)"
+    )
+    azure_latency_seconds: Dict[str, float] = Field(
+        default_factory=dict, description="Tempo nas chamadas ao Azure por operação (layout, figures)"
+    )
+    figures_count: Optional[int] = Field(None, description="Figuras extraídas")
+    figures_failed_count: Optional[int] = Field(None, description="Figuras com falha na extração")
+    image_bytes: Optional[int] = Field(None, description="Bytes das imagens extraídas")
+    rss_growth_bytes: Optional[int] = Field(None, description="Crescimento do RSS (MEMORY_TRACKING_ENABLED)")
+    process_peak_rss_bytes: Optional[int] = Field(None, description="Pico de RSS do processo")
     
     def calculate_quality_score(self) -> float:
         """
@@ -71,9 +99,12 @@ class AzureProcessingDataRecord(BaseDocument):
     - metrics: Informações de métricas em modelo Pydantic
     """
     
+    document_id: Optional[str] = Field(None, description="ID do documento em analyze_documents")
     user_email: str = Field(..., description="Email informado no request")
     file_name: str = Field(..., description="Nome do documento enviado")
-    response: Dict[str, Any] = Field(..., description="Response completo do Azure em formato JSON")
+    response: Optional[Dict[str, Any]] = Field(
+        None, description="Response do Azure (registros de métricas referenciam 'azure_responses')"
+    )
     metrics: ProcessingMetrics = Field(..., description="Métricas de processamento Pydantic")
     
     class Config:
@@ -132,6 +163,34 @@ class AzureProcessingDataRecord(BaseDocument):
             metrics=processing_metrics
         )
     
+    @classmethod
+    def create_from_document_metrics(
+        cls,
+        document_id: str,
+        user_email: str,
+        file_name: str,
+        processing_metrics: ProcessingMetrics
+    ) -> "AzureProcessingDataRecord":
+        """
+        Cria o registro de métricas de uma análise (sem o response do Azure).
+        
+        Args:
+            document_id: ID do documento processado
+            user_email: Email do usuário
+            file_name: Nome do arquivo
+            processing_metrics: Métricas de processamento
+            
+        Returns:
+            Nova instância de AzureProcessingDataRecord
+        """
+        processing_metrics.page_bucket = page_count_bucket(processing_metrics.pages_count)
+        return cls(
+            document_id=document_id,
+            user_email=user_email,
+            file_name=file_name,
+            metrics=processing_metrics
+        )
+    
     def get_quality_summary(self) -> Dict[str, Any]:
         """
         Obtém resumo de qualidade do processamento.
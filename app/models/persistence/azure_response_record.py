@@ -3,19 +3,32 @@ Azure Response Record Model
 
 Modelo para persistir responses completos do Azure Document Intelligence.
 Essencial para debugging, auditoria e melhorias futuras do sistema.
+
+O JSON bruto fica comprimido no GridFS (AzureResponsePayloadStore); a coleção
+'azure_responses' guarda apenas metadados e a referência ao payload.
 """
 from typing import Dict, Any, Optional
 from datetime import datetime
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 from .base_document import BaseDocument
+from .memory_usage import MemoryUsageReport
+
+
+class AzureResponsePayloadRef(BaseModel):
+    """Referência ao payload comprimido do Azure no GridFS."""
+
+    file_id: str = Field(..., description="_id do arquivo no bucket azure_response_payloads")
+    codec: str = Field("gzip", description="Compressão do payload")
+    raw_bytes: int = Field(..., description="Tamanho do JSON descomprimido")
+    stored_bytes: int = Field(..., description="Tamanho armazenado (comprimido)")
 
 
 class AzureResponseRecord(BaseDocument):
     """
     Modelo para coleção 'azure_responses'.
     
-    Armazena o response completo do Azure Document Intelligence para:
+    Armazena metadados e a referência ao response do Azure Document Intelligence para:
     - Debugging de problemas de extração
     - Auditoria de processamento
     - Análise de padrões e melhorias
@@ -28,8 +41,11 @@ class AzureResponseRecord(BaseDocument):
     file_name: str = Field(..., description="Nome do arquivo processado")
     file_size: int = Field(..., description="Tamanho do arquivo em bytes")
     
-    # Response do Azure
-    azure_response: Dict[str, Any] = Field(..., description="Response completo do Azure (JSON)")
+    # Response do Azure: em memória até a gravação; persistido via azure_response_ref
+    azure_response: Optional[Dict[str, Any]] = Field(None, description="Response completo do Azure (JSON)")
+    azure_response_ref: Optional[AzureResponsePayloadRef] = Field(
+        None, description="Referência ao payload comprimido no GridFS"
+    )
     
     # Metadados do processamento Azure
     azure_operation_id: Optional[str] = Field(None, description="ID da operação do Azure")
@@ -41,6 +57,9 @@ class AzureResponseRecord(BaseDocument):
     confidence_score: Optional[float] = Field(None, description="Score médio de confiança")
     page_count: int = Field(0, description="Número de páginas processadas")
     paragraph_count: int = Field(0, description="Número de parágrafos extraídos")
+    memory: Optional[MemoryUsageReport] = Field(
+        None, description="Memória por etapa da análise (MEMORY_TRACKING_ENABLED)"
+    )
     
     # Status
     status: str = Field("success", description="Status do processamento (success/error)")
@@ -54,10 +73,11 @@ class AzureResponseRecord(BaseDocument):
                 "user_email": "user@example.com",
                 "file_name": "documento.pdf",
                 "file_size": 1024000,
-                "azure_response": {
-                    "content": "Texto extraído...",
-                    "pages": [],
-                    "paragraphs": []
+                "azure_response_ref": {
+                    "file_id": "123e4567-e89b-12d3-a456-426614174001",
+                    "codec": "gzip",
+                    "raw_bytes": 2048000,
+                    "stored_bytes": 256000
                 },
                 "azure_operation_id": "azure_op_123",
                 "azure_model_id": "prebuilt-layout",
@@ -85,7 +105,8 @@ class AzureResponseRecord(BaseDocument):
         azure_operation_id: Optional[str] = None,
         confidence_score: Optional[float] = None,
         status: str = "success",
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        memory: Optional[MemoryUsageReport] = None
     ) -> "AzureResponseRecord":
         """
         Factory method para criar registro de response do Azure.
@@ -103,6 +124,7 @@ class AzureResponseRecord(BaseDocument):
             confidence_score: Score de confiança (opcional)
             status: Status do processamento
             error_message: Mensagem de erro (opcional)
+            memory: Uso de memória por etapa (opcional)
             
         Returns:
             Nova instância de AzureResponseRecord
@@ -125,5 +147,6 @@ class AzureResponseRecord(BaseDocument):
             page_count=page_count,
             paragraph_count=paragraph_count,
             status=status,
-            error_message=error_message
+            error_message=error_message,
+            memory=memory
         )
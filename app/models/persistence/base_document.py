@@ -6,6 +6,7 @@ Implementa campos básicos para documentos conforme prompt original.
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, Dict, Any
+import base64
 import uuid
 
 
@@ -24,7 +25,8 @@ class BaseDocument(BaseModel):
         populate_by_name = True
         arbitrary_types_allowed = True
         json_encoders = {
-            datetime: lambda v: v.isoformat()
+            datetime: lambda v: v.isoformat(),
+            bytes: lambda v: base64.b64encode(v).decode("ascii")
         }
         
     def dict_for_mongo(self, **kwargs) -> Dict[str, Any]:
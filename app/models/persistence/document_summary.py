@@ -0,0 +1,75 @@
+"""
+Resumo desnormalizado de um documento analisado
+
+Gravado junto ao registro em 'analyze_documents' (campo ``summary``) para que
+listagens e dashboards filtrem/ordenem por índices, sem carregar o ``response``.
+"""
+import unicodedata
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+def normalize_subject_key(subject: Optional[str]) -> Optional[str]:
+    """
+    Chave de comparação da matéria: minúsculas, sem acentos e espaços extras.
+
+    Ex.: "  Língua Portuguesa " -> "lingua portuguesa"
+    """
+    if not subject or not subject.strip():
+        return None
+    decomposed = unicodedata.normalize("NFKD", subject)
+    without_accents = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(without_accents.lower().split())
+
+
+class DocumentSummary(BaseModel):
+    """Campos de resumo extraídos do DocumentResponseDTO no momento da escrita."""
+
+    question_count: int = Field(default=0, ge=0, description="Quantidade de questões")
+    context_block_count: int = Field(default=0, ge=0, description="Quantidade de context blocks")
+    subject: Optional[str] = Field(default=None, description="Matéria (conforme cabeçalho)")
+    subject_key: Optional[str] = Field(default=None, description="Matéria normalizada para filtro")
+    grade: Optional[str] = Field(default=None, description="Série/ano")
+    page_count: Optional[int] = Field(default=None, ge=0, description="Páginas do PDF (Azure)")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "question_count": 10,
+                "context_block_count": 4,
+                "subject": "Língua Portuguesa",
+                "subject_key": "lingua portuguesa",
+                "grade": "9º Ano",
+                "page_count": 3
+            }
+        }
+
+    @classmethod
+    def from_response(
+        cls,
+        response: Dict[str, Any],
+        grade: Optional[str] = None,
+        page_count: Optional[int] = None
+    ) -> "DocumentSummary":
+        """
+        Monta o resumo a partir do response (DocumentResponseDTO.dict()).
+
+        Args:
+            response: Response completo da análise
+            grade: Série/ano (não faz parte do header da API; vem dos metadados internos)
+            page_count: Quantidade de páginas do PDF (response do Azure)
+
+        Returns:
+            DocumentSummary pronto para persistência
+        """
+        header = response.get("header") or {}
+        subject = header.get("subject")
+        return cls(
+            question_count=len(response.get("questions") or []),
+            context_block_count=len(response.get("context_blocks") or []),
+            subject=subject,
+            subject_key=normalize_subject_key(subject),
+            grade=grade or header.get("series"),
+            page_count=page_count
+        )
@@ -0,0 +1,34 @@
+"""
+Uso de memória de uma análise
+
+Gravado junto às métricas de processamento em 'azure_responses' (campo
+``memory``) quando MEMORY_TRACKING_ENABLED está ativo, para planejamento de
+capacidade por tamanho/tipo de documento. Os campos de RSS ficam None em
+plataformas sem fonte de RSS (Windows sem psutil).
+"""
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PhaseMemoryUsage(BaseModel):
+    """Memória de uma etapa (extração ou fase do orquestrador)."""
+
+    phase: str = Field(..., description="Nome da etapa")
+    rss_start_bytes: Optional[int] = Field(None, description="RSS do processo no início da etapa")
+    rss_end_bytes: Optional[int] = Field(None, description="RSS do processo no fim da etapa")
+    rss_delta_bytes: Optional[int] = Field(None, description="Variação do RSS na etapa")
+    traced_delta_bytes: Optional[int] = Field(None, description="Variação da memória alocada (tracemalloc)")
+    traced_peak_bytes: Optional[int] = Field(None, description="Pico de memória alocada na etapa (tracemalloc)")
+
+
+class MemoryUsageReport(BaseModel):
+    """Memória da análise de um documento."""
+
+    rss_start_bytes: Optional[int] = Field(None, description="RSS no início da análise")
+    rss_peak_bytes: Optional[int] = Field(None, description="Maior RSS observado nas fronteiras das etapas")
+    rss_growth_bytes: Optional[int] = Field(None, description="Crescimento máximo do RSS em relação ao início")
+    process_peak_rss_bytes: Optional[int] = Field(None, description="Pico de RSS do processo (desde o início do worker)")
+    traced_peak_bytes: Optional[int] = Field(None, description="Maior pico de alocação entre as etapas (tracemalloc)")
+    ceiling_bytes: Optional[int] = Field(None, description="Teto configurado por documento")
+    phases: List[PhaseMemoryUsage] = Field(default_factory=list)
@@ -0,0 +1,111 @@
+"""
+Modelo para a coleção 'questions'
+
+Cada questão de uma análise concluída é gravada como um documento próprio,
+com matéria/série desnormalizadas do resumo do documento, para que o banco de
+questões seja consultado por índices sem desempacotar 'analyze_documents'.
+
+O _id é derivado do documento e da posição da questão, então regravar as
+questões de uma análise (write-behind, backfill, reprocessamento) é idempotente.
+
+A assinatura MinHash e as chaves LSH do enunciado (app.core.minhash) são
+gravadas com a questão para a busca de quase-duplicatas. O cálculo custa ~2 ms
+por questão: chamadores no event loop devem usar ``asyncio.to_thread``.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core import minhash
+from .base_document import BaseDocument
+from .document_summary import normalize_subject_key
+
+
+class QuestionAlternative(BaseModel):
+    """Alternativa de uma questão."""
+
+    letter: str = Field(..., description="Letra da alternativa")
+    text: str = Field(..., description="Texto da alternativa")
+
+
+class QuestionRecord(BaseDocument):
+    """
+    Questão extraída de uma análise concluída.
+
+    Campos:
+    - document_id: _id da análise em 'analyze_documents'
+    - number / position: número da questão e posição no documento
+    - subject_key / grade_key: matéria e série normalizadas para filtro
+    - is_multiple_choice: possui alternativas
+    - minhash / lsh_bands: assinatura do enunciado e chaves LSH (índice multikey)
+    """
+
+    document_id: str = Field(..., description="_id da análise de origem")
+    user_email: str = Field(..., description="Email do usuário")
+    position: int = Field(..., ge=0, description="Posição da questão no documento")
+    number: int = Field(..., description="Número da questão")
+    statement: str = Field(default="", description="Enunciado")
+    alternatives: List[QuestionAlternative] = Field(default_factory=list, description="Alternativas")
+    is_multiple_choice: bool = Field(default=False, description="Questão com alternativas")
+    subject: Optional[str] = Field(default=None, description="Matéria (cabeçalho do documento)")
+    subject_key: Optional[str] = Field(default=None, description="Matéria normalizada")
+    grade: Optional[str] = Field(default=None, description="Série/ano")
+    grade_key: Optional[str] = Field(default=None, description="Série/ano normalizada")
+    context_id: Optional[int] = Field(default=None, description="Context block relacionado")
+    has_image: bool = Field(default=False, description="Questão com imagem")
+    minhash: Optional[bytes] = Field(default=None, description="Assinatura MinHash do enunciado")
+    lsh_bands: List[str] = Field(default_factory=list, description="Chaves LSH da assinatura")
+
+    @staticmethod
+    def make_id(document_id: str, position: int) -> str:
+        return f"{document_id}:{position:04d}"
+
+    @classmethod
+    def from_analysis(
+        cls,
+        document_id: str,
+        user_email: str,
+        response: Dict[str, Any],
+        summary: Optional[Dict[str, Any]] = None,
+        created_at: Optional[datetime] = None
+    ) -> List["QuestionRecord"]:
+        """
+        Questões de uma análise (response = DocumentResponseDTO.dict()).
+
+        Matéria e série vêm do resumo do documento (ou do cabeçalho, se ausente).
+
+        Returns:
+            Um QuestionRecord por questão, na ordem do documento
+        """
+        header = response.get("header") or {}
+        summary = summary or {}
+        subject = summary.get("subject") or header.get("subject")
+        grade = summary.get("grade") or header.get("series")
+        created_at = created_at or datetime.utcnow()
+
+        records = []
+        for position, question in enumerate(response.get("questions") or []):
+            alternatives = question.get("alternatives") or []
+            statement = question.get("question") or ""
+            signature = minhash.signature(statement)
+            records.append(cls(
+                _id=cls.make_id(document_id, position),
+                created_at=created_at,
+                document_id=document_id,
+                user_email=user_email,
+                position=position,
+                number=question.get("number", position + 1),
+                statement=statement,
+                alternatives=alternatives,
+                is_multiple_choice=bool(alternatives),
+                subject=subject,
+                subject_key=normalize_subject_key(subject),
+                grade=grade,
+                grade_key=normalize_subject_key(grade),
+                context_id=question.get("context_id"),
+                has_image=bool(question.get("hasImage")),
+                minhash=minhash.pack(signature) if signature else None,
+                lsh_bands=minhash.band_keys(signature) if signature else []
+            ))
+        return records
@@ -0,0 +1,67 @@
+"""
+JSON pré-serializado do response de uma análise concluída
+
+Gravado junto ao registro em 'analyze_documents' (campo ``response_json``) no
+formato compacto e determinístico do DocumentResponseDTO, comprimido quando
+grande. Os caminhos de leitura (duplicata e GET /analyze_document/{id})
+devolvem esses bytes direto ao cliente, sem reconstruir modelos Pydantic.
+
+Os campos voláteis (status, message, from_database) ficam fora da codificação
+e são acrescentados na renderização, pois dependem da requisição.
+"""
+import base64
+import gzip
+import json
+from typing import Any, Dict, Literal
+
+from pydantic import BaseModel, Field, validator
+from pydantic.json import pydantic_encoder
+
+from app.config.settings import get_settings
+
+# Campos do DocumentResponseDTO que dependem da requisição (sempre os últimos do DTO)
+VOLATILE_RESPONSE_FIELDS = ("status", "message", "from_database")
+
+
+def dumps_compact(value: Any) -> bytes:
+    """JSON compacto (sem espaços, UTF-8) com os mesmos encoders do Pydantic."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=pydantic_encoder).encode("utf-8")
+
+
+class StoredResponseJSON(BaseModel):
+    """Bytes do response canônico (sem campos voláteis)."""
+
+    data: bytes = Field(..., description="JSON canônico, possivelmente comprimido")
+    encoding: Literal["identity", "gzip"] = Field("identity", description="Compressão de data")
+    raw_bytes: int = Field(..., ge=0, description="Tamanho do JSON descomprimido")
+
+    @validator("data", pre=True)
+    def _decode_base64(cls, value):
+        # Registros serializados em JSON (journal write-behind) trazem data em base64
+        if isinstance(value, str):
+            return base64.b64decode(value)
+        return value
+
+    @classmethod
+    def encode(cls, response: Dict[str, Any]) -> "StoredResponseJSON":
+        """
+        Serializa o response (DocumentResponseDTO.dict()) no formato canônico.
+
+        Comprime com gzip acima de ``response_json_compress_threshold_bytes``.
+        """
+        canonical = dumps_compact({k: v for k, v in response.items() if k not in VOLATILE_RESPONSE_FIELDS})
+        if len(canonical) > get_settings().response_json_compress_threshold_bytes:
+            return cls(data=gzip.compress(canonical, compresslevel=6), encoding="gzip", raw_bytes=len(canonical))
+        return cls(data=canonical, encoding="identity", raw_bytes=len(canonical))
+
+    def canonical(self) -> bytes:
+        """JSON canônico descomprimido."""
+        return gzip.decompress(self.data) if self.encoding == "gzip" else self.data
+
+    def render(self, status: Any = None, message: Any = None, from_database: Any = False) -> bytes:
+        """JSON final do DocumentResponseDTO com os campos voláteis da requisição."""
+        volatile = dumps_compact({"status": status, "message": message, "from_database": from_database})
+        canonical = self.canonical()
+        if canonical == b"{}":
+            return volatile
+        return canonical[:-1] + b"," + volatile[1:]
@@ -1,6 +1,6 @@
 import logging
 from typing import Dict, Any
-from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 from app.services.base.document_extraction_interface import DocumentExtractionInterface
 from app.services.base.text_normalizer import TextNormalizer
 from app.services.azure.azure_document_intelligence_service import AzureDocumentIntelligenceService
@@ -26,12 +26,12 @@ class AzureExtractionAdapter(DocumentExtractionInterface):
             logger.warning(f"Azure Document Intelligence not available: {str(e)}")
             self._available = False
     
-    async def extract_document_data(self, file: UploadFile) -> Dict[str, Any]:
+    async def extract_document_data(self, file: DocumentBuffer) -> Dict[str, Any]:
         """
         Extract document data using Azure Document Intelligence.
         
         Args:
-            file: The uploaded document file
+            file: Request-scoped buffer of the uploaded document
             
         Returns:
             Normalized document data structure
@@ -1,14 +1,17 @@
+import asyncio
 import logging
-import os
-import tempfile
 import json
 import io
 from typing import Dict, Any, List, Optional
-from fastapi import UploadFile
 from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.core.credentials import AzureKeyCredential
 from app.core.exceptions import DocumentProcessingError
+from app.core.document_buffer import DocumentBuffer
+from app.core.document_metrics import time_azure_call
+from app.core.metrics import PAGES
+from app.core.tracing import start_span
 from app.config import settings
+from app.services.azure.azure_rate_limiter import get_azure_rate_limiter
 from app.services.utils.azure_response_serializer import AzureResponseSerializer
 from app.services.utils.pdf_image_extractor import PDFImageExtractor
 
@@ -28,9 +31,12 @@ class AzureDocumentIntelligenceService:
         if not self.endpoint or not self.key:
             raise ValueError("Azure Document Intelligence credentials not configured")
 
+        # O hook observa cada resposta (inclusive as repetidas pelo SDK) para o rate limiter
+        self.rate_limiter = get_azure_rate_limiter()
         self.client = DocumentIntelligenceClient(
             endpoint=self.endpoint,
-            credential=AzureKeyCredential(self.key)
+            credential=AzureKeyCredential(self.key),
+            raw_response_hook=self.rate_limiter.response_hook
         )
     
     def get_provider_name(self) -> str:
@@ -102,7 +108,7 @@ class AzureDocumentIntelligenceService:
             logger.error(f"Error extracting text with coordinates from PDF: {str(e)}")
             raise DocumentProcessingError(f"Error extracting text with coordinates from PDF: {str(e)}")
 
-    async def analyze_document(self, file: UploadFile, document_id: str = None) -> Dict[str, Any]:
+    async def analyze_document(self, file: DocumentBuffer, document_id: str = None) -> Dict[str, Any]:
         """
         Analyzes document using Azure AI Document Intelligence
         Returns structured data compatible with current format
@@ -111,17 +117,23 @@ class AzureDocumentIntelligenceService:
             document_id = self._generate_document_id()
             
         try:
-            file_bytes = await file.read()
-            await file.seek(0)
-
-            # Process document
-            poller = self.client.begin_analyze_document(
-                self.model_id,
-                io.BytesIO(file_bytes),
-                content_type="application/pdf"
-            )
-            
-            result = poller.result()
+            # Process document (stream sobre o buffer, sem cópia do PDF); a chamada
+            # aguarda o rate limiter e o SDK (síncrono) roda fora do event loop
+            await self.rate_limiter.acquire("layout")
+            with file.open_stream() as document_stream, \
+                    start_span("azure.analyze_document", operation="layout", model_id=self.model_id) as span, \
+                    time_azure_call("layout"):
+                poller = await asyncio.to_thread(
+                    self.client.begin_analyze_document,
+                    self.model_id,
+                    document_stream,
+                    content_type="application/pdf"
+                )
+                
+                result = await asyncio.to_thread(poller.result)
+                page_count = len(getattr(result, "pages", None) or [])
+                span.set_attribute("page_count", page_count)
+            PAGES.inc(page_count)
             
             # Converter resultado para dict para armazenamento
             raw_response = self._serialize_azure_response(result)
@@ -321,12 +333,12 @@ class AzureDocumentIntelligenceService:
         except Exception as e:
             logger.error(f"Erro ao salvar resposta JSON: {str(e)}")
 
-    async def extract_document_images(self, file: UploadFile, result: Any) -> Dict[str, str]:
+    async def extract_document_images(self, file: DocumentBuffer, result: Any) -> Dict[str, str]:
         """
         Extrai imagens do documento PDF usando as coordenadas das figuras identificadas pelo Azure
         
         Args:
-            file: Arquivo PDF original
+            file: Buffer do PDF original
             result: Resultado da análise do Azure Document Intelligence
             
         Returns:
@@ -334,34 +346,13 @@ class AzureDocumentIntelligenceService:
         """
         logger.info("🖼️  Iniciando extração de imagens do documento...")
         
-        # Salvar o PDF em um arquivo temporário
-        temp_file = None
         try:
-            # Reposicionar o ponteiro do arquivo
-            await file.seek(0)
-            file_content = await file.read()
+            logger.info(f"📄 Buffer do PDF: {file.size} bytes")
             
-            logger.info(f"📄 Arquivo PDF lido: {len(file_content)} bytes")
-            
-            if not file_content:
+            if not file.size:
                 logger.error("❌ Arquivo PDF está vazio!")
                 return {}
             
-            # Criar arquivo temporário
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                temp_file = tmp.name
-                tmp.write(file_content)
-            
-            logger.info(f"📁 Arquivo temporário criado: {temp_file}")
-            
-            # Verificar se o arquivo temporário foi criado corretamente
-            if not os.path.exists(temp_file):
-                logger.error(f"❌ Arquivo temporário não foi criado: {temp_file}")
-                return {}
-                
-            temp_file_size = os.path.getsize(temp_file)
-            logger.info(f"📊 Tamanho do arquivo temporário: {temp_file_size} bytes")
-            
             # Extrair imagens do PDF
             extracted_images = {}
             
@@ -402,8 +393,8 @@ class AzureDocumentIntelligenceService:
             logger.info("🔧 Iniciando extração com PDFImageExtractor...")
             
             image_bytes_dict = PDFImageExtractor.extract_figures_from_azure_result(
-                pdf_path=temp_file,
-                azure_result=result_dict
+                azure_result=result_dict,
+                document_buffer=file
             )
             
             logger.info(f"📸 PDFImageExtractor retornou {len(image_bytes_dict)} imagens")
@@ -423,12 +414,3 @@ class AzureDocumentIntelligenceService:
         except Exception as e:
             logger.error(f"❌ Erro ao extrair imagens do documento: {str(e)}", exc_info=True)
             return {}
-            
-        finally:
-            # Limpar arquivo temporário
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                    logger.debug(f"🗑️  Arquivo temporário removido: {temp_file}")
-                except Exception as e:
-                    logger.error(f"❌ Erro ao remover arquivo temporário: {str(e)}")
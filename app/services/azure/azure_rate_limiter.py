@@ -0,0 +1,269 @@
+"""
+Rate limiter das chamadas ao Azure Document Intelligence
+
+O recurso do Azure tem uma cota fixa de transações por segundo; rajadas acima
+dela voltam como 429 e o SDK repete a chamada sozinho, com a requisição
+parada. Todas as chamadas ``begin_analyze_document`` e downloads de figuras
+passam antes por um token bucket compartilhado (AZURE_RATE_LIMIT_TPS, com
+rajada de AZURE_RATE_LIMIT_BURST), implementado como GCRA: cada chamada
+reserva o próximo horário livre e aguarda até ele.
+
+Adaptativo: o ``raw_response_hook`` dos clientes vê cada resposta do Azure
+(inclusive as repetidas pelo SDK). Um 429 bloqueia novas chamadas até o fim
+do ``Retry-After`` e corta a taxa pela metade; a taxa volta linearmente à
+configurada em AZURE_RATE_LIMIT_RECOVERY_SECONDS.
+
+Vários workers (AZURE_RATE_LIMIT_COORDINATION):
+
+- ``none``: cada processo tem o próprio bucket (dividir a TPS pelos workers)
+- ``file``: estado num arquivo com lock (fcntl), para workers no mesmo host
+- ``mongodb``: estado num documento MongoDB atualizado atomicamente, para
+  workers em hosts diferentes (relógios sincronizados por NTP)
+"""
+import asyncio
+import email.utils
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Mapping, Optional
+
+from pymongo import ReturnDocument
+
+from app.config.settings import get_settings
+from app.core.metrics import AZURE_RATE_LIMIT_WAIT, AZURE_THROTTLED
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem coordenação por arquivo
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_COLLECTION = "azure_rate_limiter"
+_STATE_ID = "azure_document_intelligence"
+_DEFAULT_RETRY_AFTER_SECONDS = 1.0
+_MAX_RETRY_AFTER_SECONDS = 60.0
+_MIN_RATE_FRACTION = 0.1
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> float:
+    """Espera pedida por um 429 (``retry-after-ms``, ``x-ms-retry-after-ms`` ou ``Retry-After``)."""
+    lowered = {key.lower(): value for key, value in (headers or {}).items()}
+    for header in ("retry-after-ms", "x-ms-retry-after-ms"):
+        try:
+            return min(_MAX_RETRY_AFTER_SECONDS, max(0.0, float(lowered[header]) / 1000))
+        except (KeyError, TypeError, ValueError):
+            pass
+    value = lowered.get("retry-after")
+    if value is None:
+        return _DEFAULT_RETRY_AFTER_SECONDS
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return _DEFAULT_RETRY_AFTER_SECONDS
+    return min(_MAX_RETRY_AFTER_SECONDS, max(0.0, seconds))
+
+
+def gcra_reserve(state: dict, now: float, interval: float, tolerance: float, blocked_until: float) -> float:
+    """
+    Reserva o próximo horário livre no ``state`` (``tat``/``blocked_until``).
+
+    Returns:
+        Segundos até o horário reservado (0 = pode chamar agora)
+    """
+    state["blocked_until"] = max(state.get("blocked_until", 0.0), blocked_until)
+    tat = state.get("tat", 0.0)
+    start = max(now, tat - tolerance, state["blocked_until"])
+    state["tat"] = max(tat, start) + interval
+    return start - now
+
+
+class _LocalBucket:
+    """Estado do bucket em memória (um processo)."""
+
+    def __init__(self):
+        self._state: dict = {}
+        self._lock = threading.Lock()
+
+    async def reserve(self, now: float, interval: float, tolerance: float, blocked_until: float) -> float:
+        with self._lock:
+            return gcra_reserve(self._state, now, interval, tolerance, blocked_until)
+
+
+class _FileLockBucket:
+    """Estado do bucket num arquivo JSON com lock exclusivo (workers no mesmo host)."""
+
+    def __init__(self, path: str):
+        self._path = path
+
+    async def reserve(self, now: float, interval: float, tolerance: float, blocked_until: float) -> float:
+        return await asyncio.to_thread(self._reserve, now, interval, tolerance, blocked_until)
+
+    def _reserve(self, now: float, interval: float, tolerance: float, blocked_until: float) -> float:
+        with open(self._path, "a+", encoding="utf-8") as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                try:
+                    state = json.loads(state_file.read() or "{}")
+                except ValueError:
+                    state = {}
+                delay = gcra_reserve(state, now, interval, tolerance, blocked_until)
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(json.dumps(state))
+                state_file.flush()
+                return delay
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+
+class _MongoBucket:
+    """Estado do bucket num documento MongoDB (update atômico com pipeline)."""
+
+    def __init__(self):
+        self._fallback = _LocalBucket()
+
+    async def reserve(self, now: float, interval: float, tolerance: float, blocked_until: float) -> float:
+        from app.core.di_container import container
+        from app.services.infrastructure import MongoDBConnectionService
+
+        try:
+            database = await container.resolve(MongoDBConnectionService).get_database()
+            state = await database[RATE_LIMIT_COLLECTION].find_one_and_update(
+                {"_id": _STATE_ID},
+                [
+                    {"$set": {"blocked_until": {"$max": [{"$ifNull": ["$blocked_until", 0]}, blocked_until]}}},
+                    {"$set": {"start": {"$max": [
+                        now,
+                        {"$subtract": [{"$ifNull": ["$tat", 0]}, tolerance]},
+                        "$blocked_until"
+                    ]}}},
+                    {"$set": {"tat": {"$add": [{"$max": [{"$ifNull": ["$tat", 0]}, "$start"]}, interval]}}},
+                ],
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return state["start"] - now
+        except Exception as e:
+            # Sem MongoDB o limite continua valendo, por processo
+            logger.warning(f"⚠️ Azure rate limiter: MongoDB coordination failed, using local bucket: {e}")
+            return await self._fallback.reserve(now, interval, tolerance, blocked_until)
+
+
+class AzureRateLimiter:
+    """Token bucket compartilhado e adaptativo para as chamadas ao Azure."""
+
+    def __init__(
+        self,
+        tps: float,
+        burst: int = 1,
+        recovery_seconds: float = 60.0,
+        coordination: str = "none",
+        lock_path: str = ""
+    ):
+        self._tps = tps
+        self._burst = max(1, burst)
+        self._recovery = max(0.001, recovery_seconds)
+        self._reduced_rate = tps
+        self._throttled_at: Optional[float] = None
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self._bucket = self._create_bucket(coordination, lock_path)
+
+    @property
+    def enabled(self) -> bool:
+        return self._tps > 0
+
+    def current_rate(self, now: Optional[float] = None) -> float:
+        """Taxa atual: reduzida após um 429 e recuperada linearmente até a configurada."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._rate_at(now)
+
+    async def acquire(self, operation: str) -> float:
+        """
+        Aguarda a vez de uma chamada ao Azure.
+
+        Args:
+            operation: Tipo da chamada (rótulo da métrica de espera)
+
+        Returns:
+            Segundos aguardados
+        """
+        if not self.enabled:
+            return 0.0
+        now = time.time()
+        with self._lock:
+            interval = 1.0 / self._rate_at(now)
+            blocked_until = self._blocked_until
+        delay = max(0.0, await self._bucket.reserve(now, interval, (self._burst - 1) * interval, blocked_until))
+        AZURE_RATE_LIMIT_WAIT.labels(operation=operation).observe(delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def throttled(self, retry_after: float, now: Optional[float] = None) -> None:
+        """Registra um 429: bloqueia até o ``Retry-After`` e reduz a taxa à metade."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._reduced_rate = max(self._tps * _MIN_RATE_FRACTION, self._rate_at(now) / 2)
+            self._throttled_at = now
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+        AZURE_THROTTLED.inc()
+        logger.warning(
+            f"⚠️ Azure Document Intelligence throttled (429): pausing {retry_after:.1f}s, "
+            f"rate reduced to {self._reduced_rate:.2f} TPS"
+        )
+
+    def response_hook(self, response: Any) -> None:
+        """``raw_response_hook`` dos clientes Azure: observa os 429 (roda na thread da chamada)."""
+        if not self.enabled:
+            return
+        http_response = getattr(response, "http_response", None)
+        if http_response is not None and http_response.status_code == 429:
+            self.throttled(retry_after_seconds(http_response.headers))
+
+    def _rate_at(self, now: float) -> float:
+        if self._throttled_at is None:
+            return self._tps
+        progress = min(1.0, max(0.0, now - self._throttled_at) / self._recovery)
+        return self._reduced_rate + (self._tps - self._reduced_rate) * progress
+
+    @staticmethod
+    def _create_bucket(coordination: str, lock_path: str):
+        if coordination == "file":
+            if fcntl is not None:
+                return _FileLockBucket(lock_path or os.path.join(tempfile.gettempdir(), "smartquest_azure_rate_limit.json"))
+            logger.warning("⚠️ Azure rate limiter: file coordination unavailable on this platform, using local bucket")
+        elif coordination == "mongodb":
+            return _MongoBucket()
+        elif coordination != "none":
+            logger.warning(f"⚠️ Azure rate limiter: unknown coordination '{coordination}', using local bucket")
+        return _LocalBucket()
+
+
+_rate_limiter: Optional[AzureRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_azure_rate_limiter() -> AzureRateLimiter:
+    """Limiter do processo, compartilhado pelos clientes Azure (criado a partir das settings)."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            settings = get_settings()
+            _rate_limiter = AzureRateLimiter(
+                tps=settings.azure_rate_limit_tps,
+                burst=settings.azure_rate_limit_burst,
+                recovery_seconds=settings.azure_rate_limit_recovery_seconds,
+                coordination=settings.azure_rate_limit_coordination,
+                lock_path=settings.azure_rate_limit_lock_path
+            )
+        return _rate_limiter
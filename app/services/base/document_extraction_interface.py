@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
-from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 
 class DocumentExtractionInterface(ABC):
     """
@@ -9,12 +9,12 @@ class DocumentExtractionInterface(ABC):
     """
     
     @abstractmethod
-    async def extract_document_data(self, file: UploadFile) -> Dict[str, Any]:
+    async def extract_document_data(self, file: DocumentBuffer) -> Dict[str, Any]:
         """
         Extract structured data from a document file.
         
         Args:
-            file: The uploaded document file to process
+            file: Request-scoped buffer of the uploaded document
             
         Returns:
             Dict containing:
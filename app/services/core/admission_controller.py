@@ -0,0 +1,330 @@
+"""
+Admission Controller
+
+Controle de admissão das análises de documento (Azure + extração de imagens)
+por worker: no máximo ADMISSION_MAX_IN_FLIGHT análises simultâneas; as demais
+aguardam numa fila limitada (ADMISSION_MAX_QUEUE) por até
+ADMISSION_QUEUE_TIMEOUT_SECONDS.
+
+- Fila cheia: rejeição imediata com 429 e ``Retry-After``
+- Espera além do timeout: 503 com ``Retry-After``
+
+A fila é justa entre usuários (tenant = email, ou o domínio do email com
+ADMISSION_TENANT_KEY=domain): cada tenant tem a própria fila e as vagas são
+distribuídas por deficit round-robin, com custo = páginas do PDF. Um envio em
+massa não bloqueia os demais usuários; ADMISSION_TENANT_MAX_IN_FLIGHT limita
+as vagas de um mesmo tenant e ADMISSION_TENANT_WEIGHTS dá mais peso a alguns.
+Documentos com até ADMISSION_PRIORITY_MAX_PAGES páginas usam uma faixa
+prioritária (também justa entre tenants).
+
+O ``Retry-After`` é estimado pela duração média recente das análises e pelo
+tamanho da fila. Profundidade da fila, espera e rejeições aparecem em GET
+/metrics. O rótulo ``tenant`` da espera só traz os tenants configurados em
+ADMISSION_TENANT_WEIGHTS (os demais viram ``other``): o endpoint não tem
+autenticação e cada rótulo é uma série mantida para sempre. A espera de cada
+usuário fica no log. Duplicatas não passam pela admissão (não chamam o Azure).
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Deque, Dict, Optional
+
+from app.config.settings import get_settings
+from app.core.context import get_current_email
+from app.core.document_buffer import DocumentBuffer
+from app.core.exceptions import SmartQuestException
+from app.core.metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTIONS, ADMISSION_WAIT
+
+logger = logging.getLogger(__name__)
+
+# Estimativa inicial da duração de uma análise (antes da primeira medida)
+_INITIAL_DURATION_SECONDS = 30.0
+_DURATION_SMOOTHING = 0.2
+_MAX_RETRY_AFTER_SECONDS = 300
+# Esperas a partir deste valor são registradas no log com o tenant
+_LOGGED_WAIT_SECONDS = 1.0
+_ANONYMOUS_TENANT = "anonymous"
+OTHER_TENANTS_LABEL = "other"
+
+PRIORITY_LANE = "priority"
+NORMAL_LANE = "normal"
+
+
+class AdmissionRejected(SmartQuestException):
+    """Análise recusada pelo controle de admissão (429 fila cheia, 503 timeout)."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(
+            message=(
+                "Too many documents being analyzed, retry later"
+                if status_code == 429 else
+                "Timed out waiting for an analysis slot, retry later"
+            ),
+            status_code=status_code,
+            error_type="analysis_capacity_exceeded",
+            context={"reason": reason, "retry_after_seconds": retry_after},
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.retry_after = retry_after
+
+
+def parse_tenant_weights(spec: str) -> Dict[str, float]:
+    """``"tenant=peso,outro=peso"`` (ADMISSION_TENANT_WEIGHTS) -> {tenant: peso}."""
+    weights = {}
+    for item in (spec or "").split(","):
+        tenant, separator, weight = item.rpartition("=")
+        if separator and tenant.strip():
+            weights[tenant.strip().lower()] = max(0.1, float(weight))
+    return weights
+
+
+def tenant_of(email: Optional[str], key: str = "email") -> str:
+    """Tenant da análise: o email ou, com ``key="domain"``, o domínio (instituição)."""
+    if not email:
+        return _ANONYMOUS_TENANT
+    email = email.strip().lower()
+    if key == "domain":
+        return email.rpartition("@")[2] or email
+    return email
+
+
+async def count_pdf_pages(document: DocumentBuffer) -> Optional[int]:
+    """Páginas do PDF (lidas da tabela de objetos, fora do event loop); None se ilegível."""
+    def _count() -> int:
+        with document.open_pdf() as pdf:
+            return pdf.page_count
+
+    try:
+        return await asyncio.to_thread(_count)
+    except Exception as e:
+        logger.debug(f"Admission: could not count pages of {document.filename}: {e}")
+        return None
+
+
+@dataclass(eq=False)
+class _Waiter:
+    tenant: str
+    lane: str
+    cost: int
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class _FairQueue:
+    """Filas por tenant atendidas por deficit round-robin (custo = páginas)."""
+
+    def __init__(self, quantum: int, weights: Dict[str, float]):
+        self._quantum = quantum
+        self._weights = weights
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._deficit: Dict[str, float] = {}
+        self._turn: Optional[str] = None
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def push(self, waiter: _Waiter) -> None:
+        if waiter.tenant not in self._queues:
+            self._queues[waiter.tenant] = deque()
+            self._deficit[waiter.tenant] = 0.0
+        self._queues[waiter.tenant].append(waiter)
+
+    def remove(self, waiter: _Waiter) -> bool:
+        queue = self._queues.get(waiter.tenant)
+        if queue is None or waiter not in queue:
+            return False
+        queue.remove(waiter)
+        if not queue:
+            self._drop(waiter.tenant)
+        return True
+
+    def pop(self, eligible: Callable[[str], bool]) -> Optional[_Waiter]:
+        """Próximo waiter pela ordem DRR, pulando tenants não elegíveis (no limite)."""
+        skipped = 0
+        while self._queues and skipped < len(self._queues):
+            tenant, queue = next(iter(self._queues.items()))
+            if not eligible(tenant):
+                self._end_turn(tenant)
+                skipped += 1
+                continue
+            skipped = 0
+            if self._turn != tenant:
+                # Início da vez do tenant: recebe o quantum (ponderado)
+                self._turn = tenant
+                self._deficit[tenant] += self._quantum * self._weights.get(tenant, 1.0)
+            waiter = queue[0]
+            if self._deficit[tenant] < waiter.cost:
+                self._end_turn(tenant)
+                continue
+            self._deficit[tenant] -= waiter.cost
+            queue.popleft()
+            if not queue:
+                self._drop(tenant)
+            return waiter
+        return None
+
+    def _end_turn(self, tenant: str) -> None:
+        self._queues.move_to_end(tenant)
+        if self._turn == tenant:
+            self._turn = None
+
+    def _drop(self, tenant: str) -> None:
+        # Tenant sem fila perde o déficit acumulado (DRR)
+        del self._queues[tenant]
+        del self._deficit[tenant]
+        if self._turn == tenant:
+            self._turn = None
+
+
+class AdmissionController:
+    """Limita as análises simultâneas do worker com fila de espera justa e limitada."""
+
+    def __init__(self):
+        settings = get_settings()
+        self._max_in_flight = settings.admission_max_in_flight
+        self._max_queue = settings.admission_max_queue
+        self._queue_timeout = settings.admission_queue_timeout_seconds
+        self._tenant_key = settings.admission_tenant_key
+        self._tenant_max_in_flight = settings.admission_tenant_max_in_flight
+        self._priority_max_pages = settings.admission_priority_max_pages
+        weights = parse_tenant_weights(settings.admission_tenant_weights)
+        # Conjunto fechado de rótulos de tenant nas métricas (sem emails de usuários)
+        self._labeled_tenants = frozenset(weights)
+        self._lanes = {
+            PRIORITY_LANE: _FairQueue(settings.admission_drr_quantum_pages, weights),
+            NORMAL_LANE: _FairQueue(settings.admission_drr_quantum_pages, weights),
+        }
+        self._in_flight = 0
+        self._tenant_in_flight: Dict[str, int] = {}
+        self._avg_duration = _INITIAL_DURATION_SECONDS
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_in_flight > 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def tenant_in_flight(self, tenant: str) -> int:
+        return self._tenant_in_flight.get(tenant, 0)
+
+    def metrics_label(self, tenant: str) -> str:
+        """Rótulo do tenant nas métricas: só os de ADMISSION_TENANT_WEIGHTS, os demais ``other``."""
+        return tenant if tenant in self._labeled_tenants else OTHER_TENANTS_LABEL
+
+    @asynccontextmanager
+    async def slot(self, email: Optional[str] = None, pages: Optional[int] = None) -> AsyncIterator[None]:
+        """
+        Executa o bloco com uma vaga de análise.
+
+        Args:
+            email: Email do usuário (padrão: o do contexto da requisição)
+            pages: Páginas do documento (custo na fila justa e faixa prioritária)
+
+        Raises:
+            AdmissionRejected: Fila cheia (429) ou espera além do timeout (503)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        tenant = tenant_of(email or get_current_email(), self._tenant_key)
+        await self._acquire(tenant, pages)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            duration = time.monotonic() - started
+            self._avg_duration += _DURATION_SMOOTHING * (duration - self._avg_duration)
+            self._release(tenant)
+
+    def retry_after(self) -> int:
+        """Segundos estimados até uma vaga para quem chegar agora."""
+        slots = max(1, self._max_in_flight)
+        estimate = self._avg_duration * (self.queue_depth + 1) / slots
+        return min(_MAX_RETRY_AFTER_SECONDS, max(1, math.ceil(estimate)))
+
+    def lane_for(self, pages: Optional[int]) -> str:
+        if pages is not None and 0 < pages <= self._priority_max_pages:
+            return PRIORITY_LANE
+        return NORMAL_LANE
+
+    async def _acquire(self, tenant: str, pages: Optional[int]) -> None:
+        lane = self.lane_for(pages)
+        waiter = _Waiter(tenant, lane, max(1, pages or 1), asyncio.get_running_loop().create_future())
+        self._lanes[lane].push(waiter)
+        ADMISSION_QUEUE_DEPTH.inc()
+        self._dispatch()
+        if waiter.future.done():
+            return
+        if self.queue_depth > self._max_queue:
+            self._discard(waiter)
+            ADMISSION_REJECTIONS.labels(reason="queue_full").inc()
+            raise AdmissionRejected(429, "queue_full", self.retry_after())
+
+        try:
+            await asyncio.wait({waiter.future}, timeout=self._queue_timeout)
+        except asyncio.CancelledError:
+            # Cliente desconectou: devolve a vaga se ela já tinha sido concedida
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(tenant)
+            else:
+                self._discard(waiter)
+            raise
+
+        if not waiter.future.done():
+            self._discard(waiter)
+            ADMISSION_REJECTIONS.labels(reason="timeout").inc()
+            raise AdmissionRejected(503, "timeout", self.retry_after())
+
+    def _has_tenant_capacity(self, tenant: str) -> bool:
+        return (
+            self._tenant_max_in_flight <= 0
+            or self._tenant_in_flight.get(tenant, 0) < self._tenant_max_in_flight
+        )
+
+    def _dispatch(self) -> None:
+        # Concede vagas livres: faixa prioritária primeiro, DRR entre tenants em cada faixa
+        while self._in_flight < self._max_in_flight:
+            waiter = (
+                self._lanes[PRIORITY_LANE].pop(self._has_tenant_capacity)
+                or self._lanes[NORMAL_LANE].pop(self._has_tenant_capacity)
+            )
+            if waiter is None:
+                return
+            ADMISSION_QUEUE_DEPTH.dec()
+            if waiter.future.done():
+                continue
+            self._in_flight += 1
+            self._tenant_in_flight[waiter.tenant] = self._tenant_in_flight.get(waiter.tenant, 0) + 1
+            waited = time.monotonic() - waiter.enqueued_at
+            ADMISSION_WAIT.labels(tenant=self.metrics_label(waiter.tenant), lane=waiter.lane).observe(waited)
+            if waited >= _LOGGED_WAIT_SECONDS:
+                logger.info(
+                    f"🚦 Analysis admitted after {waited:.1f}s in the {waiter.lane} lane "
+                    f"(tenant={waiter.tenant}, queued={self.queue_depth})"
+                )
+            waiter.future.set_result(None)
+
+    def _release(self, tenant: str) -> None:
+        self._in_flight -= 1
+        remaining = self._tenant_in_flight.get(tenant, 0) - 1
+        if remaining > 0:
+            self._tenant_in_flight[tenant] = remaining
+        else:
+            self._tenant_in_flight.pop(tenant, None)
+        self._dispatch()
+
+    def _discard(self, waiter: _Waiter) -> None:
+        waiter.future.cancel()
+        if self._lanes[waiter.lane].remove(waiter):
+            ADMISSION_QUEUE_DEPTH.dec()
@@ -0,0 +1,92 @@
+"""
+Exportação de análises em NDJSON
+
+Os documentos vêm do cursor Motor (ISimplePersistenceService.iter_analyses_for_export)
+e são serializados por lote, uma linha JSON por análise, opcionalmente em
+gzip. Serialização e compressão rodam em thread, fora do event loop, e a
+memória fica limitada a um lote independente do tamanho da exportação.
+"""
+import asyncio
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from pydantic.json import pydantic_encoder
+
+from app.config.settings import get_settings
+from app.services.persistence import ISimplePersistenceService
+
+
+def _encode_value(value: Any) -> Any:
+    try:
+        return pydantic_encoder(value)
+    except TypeError:
+        # ObjectId de registros legados e demais tipos BSON
+        return str(value)
+
+
+def encode_ndjson(docs: List[Dict[str, Any]]) -> bytes:
+    """Uma linha JSON compacta (UTF-8) por documento."""
+    return b"".join(
+        json.dumps(doc, separators=(",", ":"), ensure_ascii=False, default=_encode_value).encode("utf-8") + b"\n"
+        for doc in docs
+    )
+
+
+class AnalysisExportService:
+    """Gera a exportação NDJSON das análises em blocos de bytes."""
+
+    def __init__(self, persistence_service: ISimplePersistenceService):
+        self.persistence_service = persistence_service
+        self._batch_size = get_settings().analysis_export_batch_size
+
+    async def stream_ndjson(
+        self,
+        email: Optional[str] = None,
+        school: Optional[str] = None,
+        start_date=None,
+        end_date=None,
+        include_response: bool = False,
+        compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        """
+        Blocos NDJSON (ou gzip de NDJSON) prontos para StreamingResponse.
+
+        Args:
+            email: Restringe a um usuário (opcional)
+            school: Escola do cabeçalho (opcional)
+            start_date: Início do intervalo de created_at (opcional)
+            end_date: Fim do intervalo de created_at (opcional)
+            include_response: Exporta o response completo
+            compress: Comprime a saída em gzip
+
+        Yields:
+            Blocos de bytes, um por lote do cursor
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+        def encode(docs: List[Dict[str, Any]], final: bool = False) -> bytes:
+            chunk = encode_ndjson(docs)
+            if compressor is None:
+                return chunk
+            return compressor.compress(chunk) + (compressor.flush() if final else b"")
+
+        batch: List[Dict[str, Any]] = []
+        async for doc in self.persistence_service.iter_analyses_for_export(
+            email=email,
+            school=school,
+            start_date=start_date,
+            end_date=end_date,
+            include_response=include_response,
+            batch_size=self._batch_size
+        ):
+            batch.append(doc)
+            if len(batch) >= self._batch_size:
+                chunk = await asyncio.to_thread(encode, batch)
+                batch = []
+                if chunk:
+                    yield chunk
+
+        chunk = await asyncio.to_thread(encode, batch, True)
+        if chunk:
+            yield chunk
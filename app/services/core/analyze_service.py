@@ -6,12 +6,13 @@ Responsável por validar entrada, delegar processamento e retornar resposta estr
 """
 import logging
 from typing import Dict, Any
-from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 
 from app.core.interfaces import IDocumentAnalysisOrchestrator
 from app.core.di_container import container
 from app.models.internal import InternalDocumentResponse
 from app.core.exceptions import DocumentProcessingError
+from app.core.memory import MemoryCeilingExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +34,7 @@ class AnalyzeService:
         extracted_data: Dict[str, Any],
         email: str,
         filename: str,
-        file: UploadFile
+        file: DocumentBuffer
     ) -> InternalDocumentResponse:
         """
         Processa documento completo usando DI Container.
@@ -42,7 +43,7 @@ class AnalyzeService:
             extracted_data: Dados brutos extraídos
             email: Email do usuário
             filename: Nome do arquivo
-            file: UploadFile para fallback
+            file: DocumentBuffer para fallback
             
         Returns:
             InternalDocumentResponse: Resposta estruturada completa
@@ -75,6 +76,8 @@ class AnalyzeService:
             self._logger.info(f"Analysis completed successfully for {filename}")
             return response
             
+        except MemoryCeilingExceeded:
+            raise
         except Exception as e:
             self._logger.error(f"Analysis failed for {filename}: {str(e)}")
             raise DocumentProcessingError(f"Document analysis failed: {str(e)}") from e
@@ -83,7 +86,7 @@ class AnalyzeService:
                            extracted_data: Dict[str, Any],
                            email: str,
                            filename: str,
-                           file: UploadFile) -> None:
+                           file: DocumentBuffer) -> None:
         """Valida dados de entrada do processamento."""
         if not extracted_data:
             raise DocumentProcessingError("extracted_data is required and cannot be empty")
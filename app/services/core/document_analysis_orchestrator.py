@@ -5,9 +5,10 @@ Orquestrador especializado para análise completa de documentos usando
 Dependency Injection com interfaces abstratas.
 """
 import logging
-from typing import Dict, Any, List
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List
 from uuid import uuid4
-from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 
 from app.parsers.header_parser import HeaderParser
 from app.parsers.question_parser import QuestionParser
@@ -26,6 +27,9 @@ from app.models.internal import (
 )
 from app.models.internal.processing_context import ProcessingContext, ProcessingContextBuilder
 from app.core.exceptions import DocumentProcessingError
+from app.core.memory import MemoryCeilingExceeded, track_phase
+from app.core.document_metrics import time_stage
+from app.core.tracing import start_span
 from app.utils.processing_constants import (
     PROCESSING_CONSTANTS, 
     get_max_debug_blocks, 
@@ -36,6 +40,13 @@ from app.utils.processing_constants import (
 logger = logging.getLogger(__name__)
 
 
+@contextmanager
+def _phase(name: str) -> Iterator[None]:
+    """Span ``analysis.<fase>``, histograma de duração e memória da fase."""
+    with start_span(f"analysis.{name}"), time_stage(name), track_phase(name):
+        yield
+
+
 class DocumentAnalysisOrchestrator:
     """
     Orquestrador para análise completa de documentos com Dependency Injection.
@@ -86,7 +97,7 @@ class DocumentAnalysisOrchestrator:
                                    extracted_data: Dict[str, Any],
                                    email: str,
                                    filename: str,
-                                   file: UploadFile) -> InternalDocumentResponse:
+                                   file: DocumentBuffer) -> InternalDocumentResponse:
         """
         Orquestra todo o pipeline de análise de documento.
 
@@ -94,7 +105,7 @@ class DocumentAnalysisOrchestrator:
             extracted_data: Dados brutos extraídos pelo DocumentExtractionService
             email: Email do usuário
             filename: Nome do arquivo original
-            file: Objeto UploadFile para fallback de extração
+            file: DocumentBuffer do upload para fallback de extração
 
         Returns:
             InternalDocumentResponse: Resposta completa estruturada
@@ -107,57 +118,85 @@ class DocumentAnalysisOrchestrator:
 
         try:
             # Phase 1: Preparação de dados básicos
-            analysis_context = await self._prepare_analysis_context(
-                extracted_data, email, filename, document_id
-            )
+            with _phase("context_preparation"):
+                analysis_context = await self._prepare_analysis_context(
+                    extracted_data, email, filename, document_id
+                )
 
             # Phase 2: Extração e categorização de imagens
-            image_analysis = await self._execute_image_analysis_phase(
-                file, analysis_context, document_id
-            )
+            with _phase("image_analysis"):
+                image_analysis = await self._execute_image_analysis_phase(
+                    file, analysis_context, document_id
+                )
+
+            # Phases 3-7: Parsing e agregação (reutilizável sem Azure/PDF)
+            final_response = await self.run_parsing_phases(analysis_context, image_analysis)
+
+            self._logger.info(f"Document analysis orchestration completed successfully for {filename}")
+            return final_response
+
+        except MemoryCeilingExceeded:
+            raise
+        except Exception as e:
+            self._logger.error(f"Document analysis orchestration failed for {filename}: {str(e)}")
+            raise DocumentProcessingError(f"Analysis pipeline failed: {str(e)}") from e
+
+    async def run_parsing_phases(self,
+                                 analysis_context: ProcessingContext,
+                                 image_analysis: Dict[str, Any]) -> InternalDocumentResponse:
+        """
+        Executa as fases 3-7 do pipeline sobre um contexto já preparado.
 
-            # Phase 3: Parsing de header e metadados
+        Não acessa o PDF nem o Azure: depende apenas do ``azure_result`` do contexto
+        e das imagens já extraídas. Usado pelo fluxo normal e pelo reprocessamento
+        em lote de responses Azure armazenados.
+
+        Args:
+            analysis_context: Contexto da fase 1
+            image_analysis: Resultado da fase 2 (ou estrutura vazia)
+
+        Returns:
+            InternalDocumentResponse: Resposta completa estruturada
+        """
+        # Phase 3: Parsing de header e metadados
+        with _phase("header_parsing"):
             header_metadata = await self._execute_header_parsing_phase(
                 analysis_context, image_analysis
             )
 
-            # Phase 4: Extração de questões
+        # Phase 4: Extração de questões
+        with _phase("question_extraction"):
             questions_and_context = await self._execute_question_extraction_phase(
                 analysis_context, image_analysis
             )
 
-            # Phase 5: Construção de context blocks refatorados
+        # Phase 5: Construção de context blocks refatorados
+        with _phase("context_building"):
             enhanced_context_blocks = await self._execute_context_building_phase(
                 analysis_context, image_analysis
             )
 
-            # 🔍 DEBUG: Verificar context blocks após phase 5
+        # 🔍 DEBUG: Verificar context blocks após phase 5 (só monta as linhas com DEBUG ativo)
+        if self._logger.isEnabledFor(logging.DEBUG):
             if enhanced_context_blocks:
-                self._logger.debug(f"🔍 [ORCHESTRATOR] After phase 5: {len(enhanced_context_blocks)} blocks")
-                max_debug_blocks = get_max_debug_blocks()
-                for i, cb in enumerate(enhanced_context_blocks[:max_debug_blocks]):  # Use constant instead of magic number
-                    self._logger.debug(f"🔍   Block {i+1}: '{cb.title}' - Content: {cb.content is not None}")
-                    if cb.content:
-                        self._logger.debug(f"🔍     Description: {len(cb.content.description) if cb.content.description else 0} items")
+                self._log_debug_blocks("After phase 5", enhanced_context_blocks)
             else:
-                self._logger.debug(f"🔍 [ORCHESTRATOR] Phase 5 returned None")
+                self._logger.debug("🔍 [ORCHESTRATOR] Phase 5 returned None")
 
-            # Phase 6: Associação de figuras (se aplicável)
+        # Phase 6: Associação de figuras (se aplicável)
+        with _phase("figure_association"):
             enhanced_questions = await self._execute_figure_association_phase(
                 analysis_context, questions_and_context["questions"]
             )
 
-            # Phase 7: Agregação final
-            final_context_blocks = enhanced_context_blocks or questions_and_context["context_blocks"]
-            
-            # 🔍 DEBUG: Verificar context blocks antes da agregação final
-            self._logger.error(f"🔍 [ORCHESTRATOR] Before aggregation: {len(final_context_blocks)} blocks")
-            max_debug_blocks = get_max_debug_blocks()
-            for i, cb in enumerate(final_context_blocks[:max_debug_blocks]):  # Use constant instead of magic number
-                self._logger.error(f"🔍   Final Block {i+1}: '{cb.title}' - Content: {cb.content is not None}")
-                if cb.content:
-                    self._logger.error(f"🔍     Description: {len(cb.content.description) if cb.content.description else 0} items")
-            
+        # Phase 7: Agregação final
+        final_context_blocks = enhanced_context_blocks or questions_and_context["context_blocks"]
+        
+        # 🔍 DEBUG: Verificar context blocks antes da agregação final
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._log_debug_blocks("Before aggregation", final_context_blocks)
+        
+        with _phase("aggregation"):
             final_response = await self._aggregate_final_response(
                 analysis_context,
                 image_analysis,
@@ -165,13 +204,16 @@ class DocumentAnalysisOrchestrator:
                 enhanced_questions,
                 final_context_blocks
             )
+        return final_response
 
-            self._logger.info(f"Document analysis orchestration completed successfully for {filename}")
-            return final_response
-
-        except Exception as e:
-            self._logger.error(f"Document analysis orchestration failed for {filename}: {str(e)}")
-            raise DocumentProcessingError(f"Analysis pipeline failed: {str(e)}") from e
+    def _log_debug_blocks(self, stage: str, context_blocks: List[InternalContextBlock]) -> None:
+        """Resumo dos primeiros context blocks em DEBUG (chamado só com DEBUG ativo)."""
+        self._logger.debug("🔍 [ORCHESTRATOR] %s: %d blocks", stage, len(context_blocks))
+        for i, cb in enumerate(context_blocks[:get_max_debug_blocks()]):
+            self._logger.debug("🔍   Block %d: '%s' - Content: %s", i + 1, cb.title, cb.content is not None)
+            if cb.content:
+                description_count = len(cb.content.description) if cb.content.description else 0
+                self._logger.debug("🔍     Description: %d items", description_count)
 
     async def _prepare_analysis_context(self,
                                         extracted_data: Dict[str, Any],
@@ -192,7 +234,7 @@ class DocumentAnalysisOrchestrator:
         return context
 
     async def _execute_image_analysis_phase(self,
-                                            file: UploadFile,
+                                            file: DocumentBuffer,
                                             analysis_context: ProcessingContext,
                                             document_id: str) -> Dict[str, Any]:
         """Phase 2: Executa extração e categorização de imagens."""
@@ -287,7 +329,7 @@ class DocumentAnalysisOrchestrator:
 
                     pydantic_q = InternalQuestion.from_dict(q)
                     questions.append(pydantic_q)
-                    self._logger.debug(f"Question {i+1} converted: {len(pydantic_q.content.statement)} chars")
+                    self._logger.debug("Question %d converted: %d chars", i + 1, len(pydantic_q.content.statement))
                 except Exception as e:
                     self._logger.error(f"Error converting question {i+1}: {e}")
                     continue
@@ -0,0 +1,116 @@
+"""
+Cache das respostas de GET /analyze_document/{id}
+
+Análises concluídas não mudam (exceto por reprocessamento), então o JSON já
+serializado é mantido em um LRU em memória limitado por bytes, com ETag forte
+derivado do conteúdo. Requisições seguintes não consultam o MongoDB nem
+revalidam o DTO; ``If-None-Match`` com o mesmo ETag recebe 304.
+
+Quem reescreve um registro (ex.: AnalysisReprocessingService) chama
+``invalidate``. Outros workers/processos expiram a entrada pelo TTL.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from app.config.settings import get_settings
+from app.core.metrics import CACHE_REQUESTS
+
+_CACHE_HITS = CACHE_REQUESTS.labels(cache="document_response", result="hit")
+_CACHE_MISSES = CACHE_REQUESTS.labels(cache="document_response", result="miss")
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Corpo JSON serializado e seu ETag."""
+
+    body: bytes
+    etag: str
+    expires_at: float
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Avalia ``If-None-Match`` (lista de ETags ou ``*``; comparação fraca, RFC 9110)."""
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*":
+                return True
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == self.etag:
+                return True
+        return False
+
+
+def compute_etag(body: bytes) -> str:
+    """ETag forte a partir do conteúdo serializado."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class DocumentResponseCache:
+    """LRU de respostas serializadas por id do documento, limitado por bytes e entradas."""
+
+    def __init__(self):
+        settings = get_settings()
+        self._max_bytes = settings.document_response_cache_max_bytes
+        self._max_entries = settings.document_response_cache_max_entries
+        self._ttl = settings.document_response_cache_ttl_seconds
+        self.cache_control = f"private, max-age={settings.document_response_max_age_seconds}, must-revalidate"
+
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, document_id: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(document_id)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(document_id)
+            self.misses += 1
+            _CACHE_MISSES.inc()
+            return None
+        self._entries.move_to_end(document_id)
+        self.hits += 1
+        _CACHE_HITS.inc()
+        return entry
+
+    def put(self, document_id: str, body: bytes) -> CachedResponse:
+        """Armazena o corpo (se couber no limite) e devolve a entrada com ETag."""
+        entry = CachedResponse(body=body, etag=compute_etag(body), expires_at=time.monotonic() + self._ttl)
+        if self._max_entries <= 0 or len(body) > self._max_bytes:
+            return entry
+
+        self._remove(document_id)
+        self._entries[document_id] = entry
+        self._size += len(body)
+        while self._size > self._max_bytes or len(self._entries) > self._max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+        return entry
+
+    def invalidate(self, document_ids: Iterable[str]) -> None:
+        """Remove as entradas dos registros reescritos."""
+        for document_id in document_ids:
+            self._remove(str(document_id))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def _remove(self, document_id: str) -> None:
+        entry = self._entries.pop(document_id, None)
+        if entry is not None:
+            self._size -= len(entry.body)
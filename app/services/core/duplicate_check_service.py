@@ -3,17 +3,25 @@ Serviço de verificação de duplicatas de documentos.
 
 Responsabilidade única: Verificar se um documento já foi processado anteriormente
 e retornar os dados existentes quando aplicável.
+
+A identidade do documento é o SHA-256 do conteúdo (calculado na leitura única do
+upload), escopado pelo email. Requisições simultâneas do mesmo conteúdo são
+coalescidas: apenas uma análise roda, as demais aguardam o mesmo resultado.
 """
 
-from typing import Optional
+from typing import Awaitable, Callable, Optional, TypeVar
 from dataclasses import dataclass
-from fastapi import UploadFile
 from datetime import datetime
 
 from app.services.persistence import ISimplePersistenceService
 from app.models.persistence import DocumentStatus
 from app.dtos.responses.document_response_dto import DocumentResponseDTO
 from app.core.logging import structured_logger
+from app.core.document_buffer import DocumentBuffer
+from app.core.single_flight import SingleFlight
+from app.core.metrics import DUPLICATES
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -22,7 +30,9 @@ class DuplicateCheckResult:
     is_duplicate: bool
     should_process: bool
     file_size: int = 0
+    file_hash: Optional[str] = None
     existing_response: Optional[DocumentResponseDTO] = None
+    existing_response_json: Optional[bytes] = None
     existing_document_id: Optional[str] = None
     processed_at: Optional[datetime] = None
 
@@ -37,30 +47,64 @@ class DuplicateCheckService:
     
     def __init__(self, persistence_service: ISimplePersistenceService):
         self.persistence_service = persistence_service
+        self._in_flight = SingleFlight()
     
-    def _get_file_size(self, file: UploadFile) -> int:
+    def _get_file_size(self, file: DocumentBuffer) -> int:
         """
-        Extrai o tamanho do arquivo em bytes.
+        Retorna o tamanho do arquivo em bytes.
         
-        Nota: FastAPI's UploadFile.seek() é async e aceita apenas position.
-        Usamos o SpooledTemporaryFile subjacente (file.file) que possui
-        o método síncrono seek(offset, whence).
+        O tamanho já foi calculado durante a leitura única do upload
+        (DocumentBuffer), sem seek/tell no stream.
         
         Args:
-            file: Arquivo FastAPI UploadFile
+            file: Buffer do documento
             
         Returns:
             Tamanho do arquivo em bytes
         """
-        file.file.seek(0, 2)  # Seek to end
-        size = file.file.tell()
-        file.file.seek(0)  # Reset to start
-        return size
+        return file.size
+    
+    async def run_single_flight(
+        self,
+        email: str,
+        file: DocumentBuffer,
+        process: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Executa ``process`` uma única vez por (email, SHA-256) em andamento.
+        
+        Requisições concorrentes do mesmo conteúdo (ex.: duplo clique no upload)
+        aguardam a análise em andamento em vez de chamar o Azure novamente.
+        ``process`` deve incluir a verificação de duplicatas, para que uma
+        requisição que chegue logo após o término encontre o registro salvo.
+        
+        Args:
+            email: Email do usuário
+            file: Buffer do PDF
+            process: Fábrica da corrotina de análise completa
+            
+        Returns:
+            Resultado da análise (compartilhado entre requisições coalescidas)
+        """
+        result, shared = await self._in_flight.do((email, file.sha256), process)
+        
+        if shared:
+            DUPLICATES.labels(source="in_flight").inc()
+            structured_logger.info(
+                "Concurrent request coalesced into in-flight analysis",
+                context={
+                    "email": email,
+                    "filename": file.filename,
+                    "file_hash": file.sha256
+                }
+            )
+        
+        return result
     
     async def check_and_handle_duplicate(
         self,
         email: str,
-        file: UploadFile
+        file: DocumentBuffer
     ) -> DuplicateCheckResult:
         """
         Verifica se documento é duplicata e retorna resultado apropriado.
@@ -72,7 +116,7 @@ class DuplicateCheckService:
         
         Args:
             email: Email do usuário
-            file: Arquivo PDF a ser verificado
+            file: Buffer do PDF a ser verificado
             
         Returns:
             DuplicateCheckResult com informações sobre duplicata
@@ -84,15 +128,17 @@ class DuplicateCheckService:
             context={
                 "email": email,
                 "filename": file.filename,
-                "file_size": file_size
+                "file_size": file_size,
+                "file_hash": file.sha256
             }
         )
         
-        # Verificar no MongoDB
+        # Verificar no MongoDB (por conteúdo; nome só para registros legados)
         existing_doc = await self.persistence_service.check_duplicate_document(
             email=email,
             filename=file.filename,
-            file_size=file_size
+            file_size=file_size,
+            file_hash=file.sha256
         )
         
         # Caso 1: Documento não existe - processar normalmente
@@ -104,11 +150,13 @@ class DuplicateCheckService:
             return DuplicateCheckResult(
                 is_duplicate=False,
                 should_process=True,
-                file_size=file_size
+                file_size=file_size,
+                file_hash=file.sha256
             )
         
         # Caso 2: Documento existe e está COMPLETED - retornar existente
         if existing_doc.status == DocumentStatus.COMPLETED:
+            DUPLICATES.labels(source="database").inc()
             structured_logger.info(
                 "Duplicate document found - returning existing data",
                 context={
@@ -121,20 +169,27 @@ class DuplicateCheckService:
             )
             
             # Montar response com metadados de duplicata
-            response_data = existing_doc.response.copy()
-            response_data.update({
+            duplicate_fields = {
                 "status": "already_processed",
                 "message": f"Documento já foi processado anteriormente em {existing_doc.created_at.isoformat()}",
                 "from_database": True
-            })
+            }
             
-            existing_response = DocumentResponseDTO(**response_data)
+            # Registros com JSON pré-serializado não reconstroem o DTO
+            if existing_doc.response_json is not None:
+                existing_response = None
+                existing_response_json = existing_doc.response_json.render(**duplicate_fields)
+            else:
+                existing_response = DocumentResponseDTO(**{**existing_doc.response, **duplicate_fields})
+                existing_response_json = None
             
             return DuplicateCheckResult(
                 is_duplicate=True,
                 should_process=False,
                 existing_response=existing_response,
+                existing_response_json=existing_response_json,
                 file_size=file_size,
+                file_hash=file.sha256,
                 existing_document_id=str(existing_doc.id),
                 processed_at=existing_doc.created_at
             )
@@ -154,6 +209,7 @@ class DuplicateCheckService:
                 is_duplicate=True,
                 should_process=True,
                 file_size=file_size,
+                file_hash=file.sha256,
                 existing_document_id=str(existing_doc.id),
                 processed_at=existing_doc.created_at
             )
@@ -172,5 +228,6 @@ class DuplicateCheckService:
             is_duplicate=True,
             should_process=True,
             file_size=file_size,
+            file_hash=file.sha256,
             existing_document_id=str(existing_doc.id)
         )
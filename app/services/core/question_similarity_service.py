@@ -0,0 +1,102 @@
+"""
+Busca de questões quase-duplicadas (MinHash + LSH)
+
+Cada questão da coleção 'questions' guarda a assinatura MinHash do enunciado e
+as chaves LSH por faixa (app.core.minhash), gravadas junto com a análise. A
+busca consulta o índice multikey das chaves LSH: só as questões que colidem em
+alguma faixa são lidas e pontuadas pela similaridade estimada, então o custo
+depende do tamanho do grupo e não do tamanho da coleção.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import get_settings
+from app.core import minhash
+from app.services.persistence import ISimplePersistenceService
+
+
+@dataclass
+class QuestionCluster:
+    """Questão de referência e suas quase-duplicatas, da mais similar para a menos."""
+
+    question: Dict[str, Any]
+    matches: List[Tuple[Dict[str, Any], float]] = field(default_factory=list)
+    candidates_examined: int = 0
+
+
+class QuestionSimilarityService:
+    """Agrupa quase-duplicatas de uma questão pelo índice LSH."""
+
+    def __init__(self, persistence_service: ISimplePersistenceService):
+        self.persistence_service = persistence_service
+        settings = get_settings()
+        self._threshold = settings.question_similarity_threshold
+        self._max_candidates = settings.question_similarity_max_candidates
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    async def find_near_duplicates(
+        self,
+        question_id: str,
+        threshold: Optional[float] = None,
+        limit: int = 20
+    ) -> Optional[QuestionCluster]:
+        """
+        Quase-duplicatas de uma questão.
+
+        Questões gravadas antes da assinatura têm a assinatura calculada a partir
+        do enunciado (as demais só são encontradas após o backfill 'questions').
+
+        Args:
+            question_id: _id da questão
+            threshold: Similaridade mínima (padrão: question_similarity_threshold)
+            limit: Máximo de quase-duplicatas retornadas
+
+        Returns:
+            QuestionCluster ou None se a questão não existir
+        """
+        threshold = self._threshold if threshold is None else threshold
+        question = await self.persistence_service.get_question(question_id)
+        if question is None:
+            return None
+
+        signature = (
+            minhash.unpack(question["minhash"]) if question.get("minhash")
+            else minhash.signature(question.get("statement"))
+        )
+        question.pop("minhash", None)
+        bands = question.pop("lsh_bands", None)
+        if signature is None:
+            return QuestionCluster(question=question)
+
+        candidates = await self.persistence_service.find_questions_by_lsh_bands(
+            bands or minhash.band_keys(signature),
+            exclude_id=question_id,
+            limit=self._max_candidates
+        )
+
+        matches = []
+        for candidate in candidates:
+            candidate_signature = candidate.pop("minhash", None)
+            if not candidate_signature:
+                continue
+            score = minhash.similarity(signature, minhash.unpack(candidate_signature))
+            if score >= threshold:
+                matches.append((candidate, score))
+        matches.sort(key=lambda match: (-match[1], match[0]["_id"]))
+
+        if len(candidates) >= self._max_candidates:
+            self._logger.warning({
+                "event": "question_similarity_candidates_truncated",
+                "question_id": question_id,
+                "max_candidates": self._max_candidates
+            })
+        return QuestionCluster(
+            question=question,
+            matches=matches[:limit],
+            candidates_examined=len(candidates)
+        )
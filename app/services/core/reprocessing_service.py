@@ -0,0 +1,491 @@
+"""
+Analysis Reprocessing Service
+
+Reprocessa em lote os responses do Azure Document Intelligence já armazenados
+em 'azure_responses', re-executando apenas as fases 3-7 do pipeline (parsing de
+header, questões, context blocks, figuras e agregação) sem chamar o Azure nem
+reabrir o PDF. O resultado atualiza os documentos de 'analyze_documents'.
+
+Características:
+- Cursor em lotes ordenado por _id (keyset), com checkpoint em 'reprocessing_jobs'
+- Parsing CPU-bound executado em ProcessPoolExecutor (contexto spawn)
+- Escrita via bulk_write (UpdateOne por documento alterado), regravando as
+  questões do documento na coleção 'questions'
+- Relatório de throughput e resumo de diferenças
+"""
+import asyncio
+import logging
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from app.config.settings import get_settings
+from app.models.persistence.document_summary import DocumentSummary
+from app.models.persistence.question_record import QuestionRecord
+from app.models.persistence.stored_response import StoredResponseJSON, VOLATILE_RESPONSE_FIELDS
+from app.services.infrastructure import MongoDBConnectionService
+from app.services.persistence.azure_response_payload_store import AzureResponsePayloadStore
+from app.services.core.document_response_cache import DocumentResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Orquestrador reutilizado entre tarefas do mesmo processo worker
+_worker_orchestrator = None
+
+
+def _get_worker_orchestrator():
+    """Cria (uma vez por processo) um orquestrador sem extração de imagens nem upload."""
+    global _worker_orchestrator
+    if _worker_orchestrator is None:
+        from app.services.core.document_analysis_orchestrator import DocumentAnalysisOrchestrator
+        from app.services.image.image_categorization_service import ImageCategorizationService
+        from app.services.context.context_block_builder import ContextBlockBuilder
+        from app.services.azure.azure_figure_processor import AzureFigureProcessor
+
+        _worker_orchestrator = DocumentAnalysisOrchestrator(
+            image_categorizer=ImageCategorizationService(),
+            image_extractor=None,
+            context_builder=ContextBlockBuilder(),
+            figure_processor=AzureFigureProcessor()
+        )
+    return _worker_orchestrator
+
+
+async def _run_parsing_phases(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from app.models.internal.processing_context import ProcessingContext
+    from app.services.base.text_normalizer import TextNormalizer
+    from app.dtos.responses.document_response_dto import DocumentResponseDTO
+
+    azure_result = payload["azure_response"] or {}
+    context = ProcessingContext(
+        extracted_text=TextNormalizer.clean_extracted_text(azure_result.get("content", ""), "azure"),
+        azure_result=azure_result,
+        email=payload["user_email"],
+        filename=payload["file_name"],
+        document_id=payload["document_id"],
+        provider_metadata={"provider": "azure", "raw_response": azure_result, "reprocessed": True}
+    )
+    image_analysis = {"image_data": {}, "header_images": [], "content_images": [], "all_images": []}
+
+    internal_response = await _get_worker_orchestrator().run_parsing_phases(context, image_analysis)
+    return DocumentResponseDTO.from_internal_response(internal_response).dict()
+
+
+def reprocess_azure_response(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Re-executa as fases 3-7 para um response Azure armazenado.
+
+    Função de módulo (picklable) para execução em ProcessPoolExecutor.
+
+    Args:
+        payload: {"document_id", "user_email", "file_name", "azure_response"}
+
+    Returns:
+        Dicionário no formato de DocumentResponseDTO.dict()
+    """
+    return asyncio.run(_run_parsing_phases(payload))
+
+
+def carry_over_images(new_response: Dict[str, Any], old_response: Dict[str, Any]) -> int:
+    """
+    Copia as URLs de imagens do response anterior para o novo.
+
+    O reprocessamento não re-extrai nem re-envia imagens, então os context blocks
+    (e sub-contextos) com o mesmo id/sequência reaproveitam as imagens já publicadas.
+
+    Returns:
+        Número de context blocks que receberam imagens
+    """
+    old_blocks = {cb.get("id"): cb for cb in (old_response or {}).get("context_blocks") or []}
+    carried = 0
+
+    for block in new_response.get("context_blocks") or []:
+        old_block = old_blocks.get(block.get("id"))
+        if not old_block:
+            continue
+
+        if not block.get("images") and old_block.get("images"):
+            block["images"] = old_block["images"]
+            block["contentType"] = old_block.get("contentType")
+            block["hasImage"] = True
+            carried += 1
+
+        old_subs = {sub.get("sequence"): sub for sub in old_block.get("sub_contexts") or []}
+        for sub in block.get("sub_contexts") or []:
+            old_sub = old_subs.get(sub.get("sequence"))
+            if old_sub and not sub.get("images") and old_sub.get("images"):
+                sub["images"] = old_sub["images"]
+
+    return carried
+
+
+def summarize_diff(old_response: Dict[str, Any], new_response: Dict[str, Any]) -> Dict[str, Any]:
+    """Resumo das diferenças entre o response armazenado e o reprocessado."""
+    old = {k: v for k, v in (old_response or {}).items() if k not in VOLATILE_RESPONSE_FIELDS}
+    new = {k: v for k, v in new_response.items() if k not in VOLATILE_RESPONSE_FIELDS}
+
+    return {
+        "changed": old != new,
+        "header_changed": old.get("header") != new.get("header"),
+        "questions_delta": len(new.get("questions") or []) - len(old.get("questions") or []),
+        "context_blocks_delta": len(new.get("context_blocks") or []) - len(old.get("context_blocks") or []),
+    }
+
+
+@dataclass
+class ReprocessingReport:
+    """Estado/relatório de um job de reprocessamento (persistido como checkpoint)."""
+    job_id: str
+    status: str = "running"
+    dry_run: bool = False
+    user_email: Optional[str] = None
+    last_azure_response_id: Optional[str] = None
+    scanned: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    missing_analysis: int = 0
+    failed: int = 0
+    header_changed: int = 0
+    questions_delta: int = 0
+    context_blocks_delta: int = 0
+    images_carried_over: int = 0
+    elapsed_seconds: float = 0.0
+    throughput_docs_per_second: float = 0.0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+
+    MAX_ERRORS = 50
+
+    def add_error(self, azure_response_id: str, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({"azure_response_id": azure_response_id, "error": error})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_mongo(cls, data: Dict[str, Any]) -> "ReprocessingReport":
+        data = dict(data)
+        data["job_id"] = data.pop("_id")
+        known = cls.__dataclass_fields__.keys()
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+class AnalysisReprocessingService:
+    """
+    Reprocessa analyze_documents a partir dos responses Azure armazenados.
+
+    Recebe conexão pronta via DI Container (mesmo padrão do MongoDBPersistenceService).
+    """
+
+    JOBS_COLLECTION = "reprocessing_jobs"
+
+    def __init__(self, connection_service: MongoDBConnectionService, response_cache: DocumentResponseCache):
+        self._connection_service = connection_service
+        self._response_cache = response_cache
+        self._payload_store = AzureResponsePayloadStore(connection_service)
+        self._settings = get_settings()
+        self._logger = logging.getLogger(__name__)
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start_background(self, **kwargs) -> str:
+        """
+        Inicia (ou retoma) um job em background e retorna o job_id.
+
+        Aceita os mesmos argumentos de ``run``.
+        """
+        job_id = kwargs.pop("job_id", None) or str(uuid.uuid4())
+        running = self._tasks.get(job_id)
+        if running and not running.done():
+            return job_id
+
+        task = asyncio.create_task(self.run(job_id=job_id, **kwargs))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _t: self._tasks.pop(job_id, None))
+        return job_id
+
+    def is_running(self, job_id: str) -> bool:
+        task = self._tasks.get(job_id)
+        return bool(task and not task.done())
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna o checkpoint/relatório persistido de um job."""
+        database = await self._connection_service.get_database()
+        doc = await database[self.JOBS_COLLECTION].find_one({"_id": job_id})
+        if doc is None:
+            return None
+        return ReprocessingReport.from_mongo(doc).to_dict()
+
+    async def run(
+        self,
+        job_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        limit: Optional[int] = None,
+        user_email: Optional[str] = None,
+        dry_run: bool = False
+    ) -> ReprocessingReport:
+        """
+        Executa (ou retoma a partir do checkpoint) um job de reprocessamento.
+
+        Args:
+            job_id: ID do job; se já existir, retoma após o último _id processado
+            batch_size: Documentos por lote (cursor, process pool e bulk_write)
+            max_workers: Processos do pool; 0 executa no próprio processo
+            limit: Máximo de responses a processar nesta execução
+            user_email: Restringe a um usuário
+            dry_run: Calcula o diff sem gravar em analyze_documents
+
+        Returns:
+            ReprocessingReport com contadores, throughput e resumo do diff
+        """
+        batch_size = batch_size or self._settings.reprocessing_batch_size
+        max_workers = self._settings.reprocessing_max_workers if max_workers is None else max_workers
+
+        database = await self._connection_service.get_database()
+        jobs = database[self.JOBS_COLLECTION]
+
+        report = await self._load_or_create_report(jobs, job_id or str(uuid.uuid4()), user_email, dry_run)
+        report.status = "running"
+        await self._save_checkpoint(jobs, report)
+        elapsed_before = report.elapsed_seconds
+        started = time.perf_counter()
+
+        self._logger.info({
+            "event": "reprocessing_started",
+            "job_id": report.job_id,
+            "resume_after": report.last_azure_response_id,
+            "batch_size": batch_size,
+            "max_workers": max_workers,
+            "dry_run": report.dry_run
+        })
+
+        pool = None
+        if max_workers > 0:
+            import multiprocessing
+            pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+        processed_this_run = 0
+        try:
+            async for batch in self._iter_batches(database, report, batch_size, limit):
+                await self._process_batch(database, batch, report, pool)
+                processed_this_run += len(batch)
+
+                report.elapsed_seconds = round(elapsed_before + time.perf_counter() - started, 3)
+                report.throughput_docs_per_second = (
+                    round(report.scanned / report.elapsed_seconds, 2) if report.elapsed_seconds else 0.0
+                )
+                await self._save_checkpoint(jobs, report)
+
+                self._logger.info({
+                    "event": "reprocessing_batch_completed",
+                    "job_id": report.job_id,
+                    "scanned": report.scanned,
+                    "updated": report.updated,
+                    "failed": report.failed,
+                    "throughput_docs_per_second": report.throughput_docs_per_second
+                })
+
+            report.status = "completed"
+        except asyncio.CancelledError:
+            report.status = "interrupted"
+            raise
+        except Exception as e:
+            report.status = "failed"
+            report.add_error(report.last_azure_response_id or "", str(e))
+            self._logger.error({
+                "event": "reprocessing_failed",
+                "job_id": report.job_id,
+                "error": str(e)
+            })
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            report.elapsed_seconds = round(elapsed_before + time.perf_counter() - started, 3)
+            await self._save_checkpoint(jobs, report)
+
+        self._logger.info({
+            "event": "reprocessing_finished",
+            "job_id": report.job_id,
+            "status": report.status,
+            "processed_this_run": processed_this_run,
+            "scanned": report.scanned,
+            "updated": report.updated,
+            "unchanged": report.unchanged,
+            "failed": report.failed,
+            "throughput_docs_per_second": report.throughput_docs_per_second
+        })
+        return report
+
+    async def _load_or_create_report(self, jobs, job_id: str, user_email: Optional[str], dry_run: bool) -> ReprocessingReport:
+        existing = await jobs.find_one({"_id": job_id})
+        if existing:
+            return ReprocessingReport.from_mongo(existing)
+        return ReprocessingReport(job_id=job_id, user_email=user_email, dry_run=dry_run)
+
+    async def _save_checkpoint(self, jobs, report: ReprocessingReport) -> None:
+        report.updated_at = datetime.utcnow()
+        data = report.to_dict()
+        data.pop("job_id")
+        await jobs.update_one({"_id": report.job_id}, {"$set": data}, upsert=True)
+
+    async def _iter_batches(self, database, report: ReprocessingReport, batch_size: int, limit: Optional[int]):
+        query: Dict[str, Any] = {"status": "success"}
+        if report.user_email:
+            query["user_email"] = report.user_email
+        if report.last_azure_response_id is not None:
+            query["_id"] = {"$gt": report.last_azure_response_id}
+
+        cursor = database["azure_responses"].find(
+            query,
+            projection={
+                "_id": 1, "document_id": 1, "user_email": 1, "file_name": 1,
+                "azure_response_ref": 1, "azure_response": 1
+            }
+        ).sort("_id", 1).batch_size(batch_size)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        batch: List[Dict[str, Any]] = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _process_batch(self, database, batch: List[Dict[str, Any]], report: ReprocessingReport, pool) -> None:
+        analyses = database["analyze_documents"]
+        document_ids = [doc["document_id"] for doc in batch]
+
+        existing: Dict[str, Dict[str, Any]] = {}
+        async for analysis in analyses.find(
+            {"response.document_id": {"$in": document_ids}},
+            projection={"_id": 1, "response": 1, "summary": 1, "user_email": 1, "created_at": 1}
+        ):
+            existing[analysis["response"]["document_id"]] = analysis
+
+        # Payloads comprimidos no GridFS são carregados só para o lote atual;
+        # falhas de leitura entram no relatório como erro do registro
+        results: List[Any] = list(await asyncio.gather(
+            *(self._payload_store.resolve(doc) for doc in batch),
+            return_exceptions=True
+        ))
+        pending = [i for i, loaded in enumerate(results) if not isinstance(loaded, BaseException)]
+        payloads = [
+            {
+                "document_id": batch[i]["document_id"],
+                "user_email": batch[i]["user_email"],
+                "file_name": batch[i]["file_name"],
+                "azure_response": results[i]
+            }
+            for i in pending
+        ]
+        page_counts = {i: len(results[i].get("pages") or []) for i in pending}
+
+        if pool is not None:
+            loop = asyncio.get_running_loop()
+            parsed = await asyncio.gather(
+                *(loop.run_in_executor(pool, reprocess_azure_response, payload) for payload in payloads),
+                return_exceptions=True
+            )
+        else:
+            parsed = []
+            for payload in payloads:
+                try:
+                    parsed.append(await _run_parsing_phases(payload))
+                except Exception as e:
+                    parsed.append(e)
+        for i, result in zip(pending, parsed):
+            results[i] = result
+
+        now = datetime.utcnow()
+        operations = []
+        # GET /analyze_document/{id} aceita o _id ou o document_id do response
+        rewritten_document_ids: List[str] = []
+        # Argumentos de QuestionRecord.from_analysis (MinHash calculado em thread)
+        rewritten_questions: List[tuple] = []
+        for index, (doc, result) in enumerate(zip(batch, results)):
+            report.scanned += 1
+            report.last_azure_response_id = doc["_id"]
+
+            if isinstance(result, BaseException):
+                report.add_error(str(doc["_id"]), str(result))
+                continue
+
+            analysis = existing.get(doc["document_id"])
+            if analysis is None:
+                report.missing_analysis += 1
+                continue
+
+            old_response = analysis.get("response") or {}
+            for key in VOLATILE_RESPONSE_FIELDS:
+                if key in old_response:
+                    result[key] = old_response[key]
+            report.images_carried_over += carry_over_images(result, old_response)
+
+            diff = summarize_diff(old_response, result)
+            report.questions_delta += diff["questions_delta"]
+            report.context_blocks_delta += diff["context_blocks_delta"]
+            report.header_changed += int(diff["header_changed"])
+
+            if not diff["changed"]:
+                report.unchanged += 1
+                continue
+
+            report.updated += 1
+            summary = DocumentSummary.from_response(
+                result,
+                grade=(analysis.get("summary") or {}).get("grade"),
+                page_count=page_counts.get(index)
+            )
+            rewritten_document_ids.append(doc["document_id"])
+            rewritten_questions.append((
+                str(analysis["_id"]),
+                analysis.get("user_email") or doc["user_email"],
+                result,
+                summary.dict(exclude_none=True),
+                analysis.get("created_at")
+            ))
+            operations.append(UpdateOne(
+                {"_id": analysis["_id"]},
+                {"$set": {
+                    "response": result,
+                    "summary": summary.dict(exclude_none=True),
+                    "response_json": StoredResponseJSON.encode(result).dict(),
+                    "reprocessed_at": now
+                }}
+            ))
+
+        if operations and not report.dry_run:
+            await analyses.bulk_write(operations, ordered=False)
+            analysis_ids = await self._replace_questions(database, rewritten_questions)
+            self._response_cache.invalidate(analysis_ids + rewritten_document_ids)
+
+    @staticmethod
+    async def _replace_questions(database, rewritten: List[tuple]) -> List[str]:
+        """
+        Substitui as questões dos documentos reescritos (a contagem pode ter mudado).
+
+        Returns:
+            _id das análises reescritas
+        """
+        analysis_ids = [args[0] for args in rewritten]
+        questions = await asyncio.to_thread(lambda: [
+            question.dict_for_mongo()
+            for args in rewritten
+            for question in QuestionRecord.from_analysis(*args)
+        ])
+        collection = database["questions"]
+        await collection.delete_many({"document_id": {"$in": analysis_ids}})
+        if questions:
+            await collection.insert_many(questions, ordered=False)
+        return analysis_ids
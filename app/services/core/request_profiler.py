@@ -0,0 +1,258 @@
+"""
+Request Profiler
+
+Perfil de requisições individuais de POST /analyze/analyze_document sob
+demanda (header ``X-Profile`` ou ``?profile=true`` com a chave administrativa)
+ou por amostragem (PROFILING_SAMPLE_RATE). O artefato é gravado em
+PROFILING_DIR com o request id (header ``X-Request-ID``) no nome e listado por
+GET /admin/profiles.
+
+Modos (PROFILING_MODE):
+- ``sampling`` (padrão): uma thread amostra a pilha da thread do event loop a
+  cada PROFILING_INTERVAL_MS e grava as pilhas agregadas no formato "folded"
+  (``<request_id>.folded``), aberto pelo speedscope.app ou flamegraph.pl. O
+  custo não depende da quantidade de chamadas do código perfilado.
+- ``cprofile``: cProfile determinístico (``<request_id>.prof``, pstats/snakeviz);
+  contagem exata de chamadas, com overhead alto em código Python intenso.
+
+Os dois modos observam a thread do event loop: corrotinas de outras requisições
+simultâneas também aparecem no perfil. Apenas uma requisição é perfilada por
+vez; as demais seguem sem perfil.
+"""
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.config.settings import get_settings
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_MODES = ("sampling", "cprofile")
+_ARTIFACT_EXTENSIONS = {"sampling": "folded", "cprofile": "prof"}
+_SAFE_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+_TOP_FUNCTIONS = 20
+
+
+@dataclass
+class ProfileSummary:
+    """Metadados de um perfil gravado (``<request_id>.json``)."""
+
+    request_id: str
+    mode: str
+    trigger: str
+    artifact: str
+    started_at: str
+    duration_ms: float
+    samples: int = 0
+    context: Dict[str, Any] = field(default_factory=dict)
+    top_functions: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class _StackSampler(threading.Thread):
+    """Amostra periodicamente a pilha de uma thread e conta as pilhas iguais."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stopped = threading.Event()
+        self.stacks: Counter = Counter()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+class RequestProfiler:
+    """Perfila uma requisição por vez e mantém os artefatos em disco."""
+
+    def __init__(self):
+        settings = get_settings()
+        self._directory = settings.profiling_dir
+        self._mode = settings.profiling_mode if settings.profiling_mode in PROFILE_MODES else "sampling"
+        self._interval = settings.profiling_interval_ms / 1000
+        self._max_artifacts = settings.profiling_max_artifacts
+        self._active = False
+        self._logger = logging.getLogger(__name__)
+
+    @asynccontextmanager
+    async def profile(
+        self,
+        request_id: str,
+        trigger: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[bool]:
+        """
+        Executa o bloco sob o profiler e grava o artefato ao final.
+
+        Yields:
+            True se o bloco está sendo perfilado (False se outro perfil está ativo
+            ou o request id não serve como nome de arquivo)
+        """
+        if self._active or not _SAFE_ID.match(request_id):
+            self._logger.info({"event": "profile_skipped", "request_id": request_id, "busy": self._active})
+            yield False
+            return
+
+        self._active = True
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        sampler: Optional[_StackSampler] = None
+        profiler: Optional[cProfile.Profile] = None
+        if self._mode == "sampling":
+            sampler = _StackSampler(threading.get_ident(), self._interval)
+            sampler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            yield True
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if sampler is not None:
+                sampler.stop()
+            if profiler is not None:
+                profiler.disable()
+            self._active = False
+            summary = ProfileSummary(
+                request_id=request_id,
+                mode=self._mode,
+                trigger=trigger,
+                artifact=f"{request_id}.{_ARTIFACT_EXTENSIONS[self._mode]}",
+                started_at=started_at.isoformat(),
+                duration_ms=round(duration_ms, 1),
+                context=context or {}
+            )
+            try:
+                await asyncio.to_thread(self._save, summary, sampler, profiler)
+                self._logger.info({
+                    "event": "profile_saved",
+                    "request_id": request_id,
+                    "artifact": summary.artifact,
+                    "duration_ms": summary.duration_ms
+                })
+            except OSError as e:
+                self._logger.error({"event": "profile_save_failed", "request_id": request_id, "error": str(e)})
+
+    def list_profiles(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Resumos dos perfis gravados, do mais recente para o mais antigo."""
+        summaries = []
+        for path in self._summary_paths()[:limit]:
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    summaries.append(json.load(handle))
+            except (OSError, ValueError):
+                continue
+        return summaries
+
+    def get_artifact_path(self, request_id: str) -> Optional[Tuple[str, str]]:
+        """Caminho e modo do artefato de um request id (None se não existir)."""
+        if not _SAFE_ID.match(request_id):
+            return None
+        for mode, extension in _ARTIFACT_EXTENSIONS.items():
+            path = os.path.join(self._directory, f"{request_id}.{extension}")
+            if os.path.isfile(path):
+                return path, mode
+        return None
+
+    def _save(
+        self,
+        summary: ProfileSummary,
+        sampler: Optional[_StackSampler],
+        profiler: Optional[cProfile.Profile]
+    ) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        artifact_path = os.path.join(self._directory, summary.artifact)
+        if sampler is not None:
+            summary.samples = sum(sampler.stacks.values())
+            summary.top_functions = _top_sampled_functions(sampler.stacks)
+            with open(artifact_path, "w", encoding="utf-8") as handle:
+                for stack, count in sampler.stacks.most_common():
+                    handle.write(f"{stack} {count}\n")
+        else:
+            profiler.dump_stats(artifact_path)
+            summary.top_functions = _top_profiled_functions(profiler)
+
+        with open(os.path.join(self._directory, f"{summary.request_id}.json"), "w", encoding="utf-8") as handle:
+            json.dump(asdict(summary), handle, ensure_ascii=False, default=str)
+        self._prune()
+
+    def _summary_paths(self) -> List[str]:
+        if not os.path.isdir(self._directory):
+            return []
+        paths = [
+            os.path.join(self._directory, name)
+            for name in os.listdir(self._directory) if name.endswith(".json")
+        ]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def _prune(self) -> None:
+        """Mantém apenas os PROFILING_MAX_ARTIFACTS perfis mais recentes."""
+        for path in self._summary_paths()[self._max_artifacts:]:
+            base = path[:-len(".json")]
+            for extension in (".json", *(f".{ext}" for ext in _ARTIFACT_EXTENSIONS.values())):
+                try:
+                    os.remove(base + extension)
+                except FileNotFoundError:
+                    pass
+
+
+def should_sample(sample_rate: float) -> bool:
+    """Sorteio da amostragem (PROFILING_SAMPLE_RATE), sem resolver o profiler."""
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def _top_sampled_functions(stacks: Counter) -> List[Dict[str, Any]]:
+    """Funções com mais amostras: ``self`` no topo da pilha, ``total`` em qualquer posição."""
+    total = sum(stacks.values()) or 1
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+    return [
+        {"function": frame, "self_pct": round(count / total * 100, 1),
+         "total_pct": round(total_counts[frame] / total * 100, 1)}
+        for frame, count in self_counts.most_common(_TOP_FUNCTIONS)
+    ]
+
+
+def _top_profiled_functions(profiler: cProfile.Profile) -> List[Dict[str, Any]]:
+    """Funções com maior tempo próprio no cProfile."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (_, calls, self_time, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": f"{name} ({os.path.basename(filename)}:{line})",
+            "calls": calls,
+            "self_ms": round(self_time * 1000, 2),
+            "cumulative_ms": round(cumulative * 1000, 2)
+        })
+    rows.sort(key=lambda row: row["self_ms"], reverse=True)
+    return rows[:_TOP_FUNCTIONS]
@@ -6,7 +6,7 @@ usando Azure Document Intelligence.
 """
 import logging
 from typing import Dict, Any
-from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 from app.services.core.document_extraction_factory import DocumentExtractionFactory
 
 logger = logging.getLogger(__name__)
@@ -21,7 +21,7 @@ class DocumentExtractionService:
     """
     
     @staticmethod
-    async def get_extraction_data(file: UploadFile, email: str) -> Dict[str, Any]:
+    async def get_extraction_data(file: DocumentBuffer, email: str) -> Dict[str, Any]:
         """
         Extrai dados do documento usando Azure Document Intelligence.
         
@@ -29,7 +29,7 @@ class DocumentExtractionService:
         antes de chamar este método.
         
         Args:
-            file: Arquivo para extração
+            file: Buffer do documento (lido uma única vez no controller)
             email: Email do usuário (usado apenas para logging)
             
         Returns:
@@ -37,14 +37,8 @@ class DocumentExtractionService:
         """
         logger.info(f"⚡ Extracting document data for {email} - {file.filename}")
         
-        # Resetar ponteiro do arquivo
-        await file.seek(0)
-        
         # Extrair do provedor (Azure Document Intelligence)
         extractor = DocumentExtractionFactory.get_provider()
         extracted_data = await extractor.extract_document_data(file)
         
-        # Resetar ponteiro para próximo consumidor
-        await file.seek(0)
-        
         return extracted_data
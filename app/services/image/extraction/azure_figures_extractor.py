@@ -3,18 +3,21 @@ Azure-based image extraction strategy using official SDK method.
 Uses Azure Document Intelligence figures API following official documentation.
 """
 
+import asyncio
 import logging
-import io
 import time
 from typing import Dict, Any, Optional
-from fastapi import UploadFile
 from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.ai.documentintelligence.models import AnalyzeOutputOption
 from azure.core.credentials import AzureKeyCredential
 
+from app.core.document_buffer import DocumentBuffer
 from app.services.image.extraction.base_image_extractor import BaseImageExtractor
 from app.config import settings
 from app.core.exceptions import DocumentProcessingError
+from app.core.document_metrics import record_figure, time_azure_call
+from app.core.tracing import start_span
+from app.services.azure.azure_rate_limiter import get_azure_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -39,9 +42,11 @@ class AzureFiguresImageExtractor(BaseImageExtractor):
         if not self.endpoint or not self.key:
             raise ValueError("Azure Document Intelligence credentials not configured")
         
+        self.rate_limiter = get_azure_rate_limiter()
         self.client = DocumentIntelligenceClient(
             endpoint=self.endpoint,
-            credential=AzureKeyCredential(self.key)
+            credential=AzureKeyCredential(self.key),
+            raw_response_hook=self.rate_limiter.response_hook
         )
         
         self._extraction_metrics = {
@@ -54,7 +59,7 @@ class AzureFiguresImageExtractor(BaseImageExtractor):
     
     async def extract_images(
         self, 
-        file: UploadFile, 
+        file: DocumentBuffer, 
         document_analysis_result: Dict[str, Any],
         document_id: Optional[str] = None
     ) -> Dict[str, str]:
@@ -72,28 +77,30 @@ class AzureFiguresImageExtractor(BaseImageExtractor):
         try:
             logger.info("🔄 Starting Azure figures-based image extraction using official SDK...")
             
-            # Reposition file pointer and read content
-            await file.seek(0)
-            file_content = await file.read()
-            
-            if not file_content:
+            if not file.size:
                 logger.error("❌ Empty PDF file")
                 return {}
             
             # Step 1: Analyze document with FIGURES output using official method
             logger.info("📊 Analyzing document with AnalyzeOutputOption.FIGURES...")
             
-            poller = self.client.begin_analyze_document(
-                self.model_id,
-                io.BytesIO(file_content),
-                content_type="application/pdf",
-                output=[AnalyzeOutputOption.FIGURES]  # Official way to request figures
-            )
-            
-            self._extraction_metrics["api_calls"] += 1
-            
-            # Step 2: Get result and operation_id (official method)
-            result = poller.result()
+            # Shared rate limiter; the synchronous SDK calls run off the event loop
+            await self.rate_limiter.acquire("figures")
+            with file.open_stream() as document_stream, \
+                    start_span("azure.analyze_document", operation="figures", model_id=self.model_id), \
+                    time_azure_call("figures"):
+                poller = await asyncio.to_thread(
+                    self.client.begin_analyze_document,
+                    self.model_id,
+                    document_stream,
+                    content_type="application/pdf",
+                    output=[AnalyzeOutputOption.FIGURES]  # Official way to request figures
+                )
+                
+                self._extraction_metrics["api_calls"] += 1
+                
+                # Step 2: Get result and operation_id (official method)
+                result = await asyncio.to_thread(poller.result)
             operation_id = poller.details.get("operation_id")
             
             logger.info(f"✅ Analysis completed. Operation ID: {operation_id}")
@@ -118,14 +125,11 @@ class AzureFiguresImageExtractor(BaseImageExtractor):
                         logger.info(f"🔗 Fetching figure {figure_id} using official SDK...")
                         
                         # Use official SDK method - no manual HTTP requests needed!
-                        figure_response = self.client.get_analyze_result_figure(
-                            model_id=result.model_id,
-                            result_id=operation_id,
-                            figure_id=figure_id
-                        )
-                        
-                        # Convert response to bytes and then base64
-                        figure_bytes = b"".join(figure_response)  # figure_response is iterable
+                        await self.rate_limiter.acquire("figure_download")
+                        with start_span("azure.get_figure", figure_id=figure_id):
+                            figure_bytes = await asyncio.to_thread(
+                                self._download_figure, result.model_id, operation_id, figure_id
+                            )
                         
                         if figure_bytes:
                             import base64
@@ -134,16 +138,20 @@ class AzureFiguresImageExtractor(BaseImageExtractor):
                             
                             logger.info(f"✅ Figure {figure_id}: {len(figure_bytes)} bytes → {len(base64_image)} chars base64")
                             self._extraction_metrics["successful_extractions"] += 1
+                            record_figure("azure_figures", len(figure_bytes))
                         else:
                             logger.warning(f"⚠️  Figure {figure_id}: Empty response from Azure")
                             self._extraction_metrics["failed_extractions"] += 1
+                            record_figure("azure_figures", None)
                     else:
                         logger.warning(f"⚠️  Missing operation_id or model_id for figure {figure_id}")
                         self._extraction_metrics["failed_extractions"] += 1
+                        record_figure("azure_figures", None)
                         
                 except Exception as e:
                     logger.error(f"❌ Error extracting figure {figure_id}: {str(e)}")
                     self._extraction_metrics["failed_extractions"] += 1
+                    record_figure("azure_figures", None)
             
             processing_time = time.time() - start_time
             self._extraction_metrics["total_processing_time"] += processing_time
@@ -158,6 +166,16 @@ class AzureFiguresImageExtractor(BaseImageExtractor):
             logger.error(f"❌ Error in Azure figures extraction: {str(e)}", exc_info=True)
             raise DocumentProcessingError(f"Azure figures extraction failed: {str(e)}")
     
+    def _download_figure(self, model_id: str, result_id: str, figure_id: str) -> bytes:
+        """Download a figure image (blocking; runs in a worker thread)."""
+        figure_response = self.client.get_analyze_result_figure(
+            model_id=model_id,
+            result_id=result_id,
+            figure_id=figure_id
+        )
+        # Convert response to bytes (figure_response is iterable)
+        return b"".join(figure_response)
+    
     def get_extraction_method_name(self) -> str:
         """Get the name of this extraction method."""
         return "azure_figures"
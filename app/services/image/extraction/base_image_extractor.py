@@ -8,7 +8,7 @@ This base class focuses on extraction logic only.
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
-from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,7 +32,7 @@ class BaseImageExtractor(ABC):
     @abstractmethod
     async def extract_images(
         self, 
-        file: UploadFile, 
+        file: DocumentBuffer, 
         document_analysis_result: Dict[str, Any],
         document_id: Optional[str] = None
     ) -> Dict[str, str]:
@@ -40,7 +40,7 @@ class BaseImageExtractor(ABC):
         Extract images from a document.
         
         Args:
-            file: The uploaded PDF file
+            file: Request-scoped buffer of the uploaded PDF
             document_analysis_result: The result from document analysis
             document_id: Optional document identifier
             
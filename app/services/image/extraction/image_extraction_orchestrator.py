@@ -5,9 +5,9 @@ Manages different image extraction strategies.
 
 import logging
 from typing import Dict, Any, Optional
-from fastapi import UploadFile
 
 # Import enums from centralized location
+from app.core.document_buffer import DocumentBuffer
 from app.enums import ImageExtractionMethod
 
 from app.services.image.extraction.base_image_extractor import BaseImageExtractor
@@ -37,7 +37,7 @@ class ImageExtractionOrchestrator:
     async def extract_images_single_method(
         self,
         method: ImageExtractionMethod,
-        file: UploadFile,
+        file: DocumentBuffer,
         document_analysis_result: Dict[str, Any],
         document_id: Optional[str] = None
     ) -> Dict[str, str]:
@@ -46,7 +46,7 @@ class ImageExtractionOrchestrator:
 
         Args:
             method: The extraction method to use
-            file: The uploaded PDF file
+            file: Request-scoped buffer of the uploaded PDF
             document_analysis_result: The result from document analysis
             document_id: Optional document identifier
 
@@ -63,7 +63,7 @@ class ImageExtractionOrchestrator:
     
     async def extract_with_fallback(
         self,
-        file: UploadFile,
+        file: DocumentBuffer,
         document_analysis_result: Dict[str, Any],
         document_id: Optional[str] = None
     ) -> Dict[str, str]:
@@ -74,7 +74,7 @@ class ImageExtractionOrchestrator:
         This method centralizes the fallback logic previously in AnalyzeService.
         
         Args:
-            file: The uploaded PDF file
+            file: Request-scoped buffer of the uploaded PDF
             document_analysis_result: The result from document analysis  
             document_id: Optional document identifier
             
@@ -82,7 +82,6 @@ class ImageExtractionOrchestrator:
             Dictionary mapping figure IDs to base64 encoded images
         """
         logger.info("🔄 Starting image extraction with automatic fallback")
-        await file.seek(0)
         
         # Try primary method: MANUAL_PDF
         try:
@@ -95,14 +94,11 @@ class ImageExtractionOrchestrator:
             )
             if manual_images:
                 logger.info(f"✅ Manual PDF extraction successful: {len(manual_images)} images extracted.")
-                await file.seek(0)
                 return manual_images
             logger.warning("⚠️ Manual PDF extraction returned no images, attempting fallback")
         except Exception as e:
             logger.warning(f"⚠️ Manual PDF extraction failed: {str(e)}, attempting fallback")
         
-        await file.seek(0)
-        
         # Try fallback method: AZURE_FIGURES
         try:
             logger.info("STEP 2: Using Azure Figures fallback (secondary method)")
@@ -114,12 +110,10 @@ class ImageExtractionOrchestrator:
             )
             if azure_images:
                 logger.info(f"✅ Azure Figures fallback successful: {len(azure_images)} images extracted.")
-                await file.seek(0)
                 return azure_images
             logger.warning("⚠️ Azure Figures fallback also returned no images")
         except Exception as e:
             logger.error(f"❌ Azure Figures fallback failed: {str(e)}")
         
         logger.warning("❌ All image extraction methods failed, returning empty result")
-        await file.seek(0)
         return {}
\ No newline at end of file
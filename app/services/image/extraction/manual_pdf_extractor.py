@@ -4,15 +4,14 @@ Uses coordinate-based cropping from the existing PDF processing approach.
 """
 
 import logging
-import tempfile
-import os
 import time
 from typing import Dict, Any, Optional
-from fastapi import UploadFile
 
+from app.core.document_buffer import DocumentBuffer
 from app.services.image.extraction.base_image_extractor import BaseImageExtractor
 from app.services.utils.pdf_image_extractor import PDFImageExtractor
 from app.core.exceptions import DocumentProcessingError
+from app.core.document_metrics import record_figure
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +37,7 @@ class ManualPDFImageExtractor(BaseImageExtractor):
     
     async def extract_images(
         self, 
-        file: UploadFile, 
+        file: DocumentBuffer, 
         document_analysis_result: Dict[str, Any],
         document_id: Optional[str] = None
     ) -> Dict[str, str]:
@@ -46,39 +45,20 @@ class ManualPDFImageExtractor(BaseImageExtractor):
         Extract images using manual PDF coordinate-based cropping.
         
         This method:
-        1. Saves the PDF to a temporary file
+        1. Opens the request buffer once in PyMuPDF (no temporary copy)
         2. Uses the existing PDFImageExtractor with coordinate data
         3. Returns base64 encoded images
         """
         start_time = time.time()
-        temp_file = None
         
         try:
             logger.info("🔧 Starting manual PDF-based image extraction...")
             
-            # Reposition file pointer and read content
-            await file.seek(0)
-            file_content = await file.read()
-            
-            if not file_content:
+            if not file.size:
                 logger.error("❌ Empty PDF file")
                 return {}
             
-            logger.info(f"📄 PDF file loaded: {len(file_content)} bytes")
-            
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                temp_file = tmp.name
-                tmp.write(file_content)
-            
-            logger.info(f"📁 Temporary file created: {temp_file}")
-            
-            # Verify temporary file
-            if not os.path.exists(temp_file):
-                raise DocumentProcessingError(f"Temporary file not created: {temp_file}")
-            
-            temp_file_size = os.path.getsize(temp_file)
-            logger.info(f"📊 Temporary file size: {temp_file_size} bytes")
+            logger.info(f"📄 PDF buffer: {file.size} bytes (memory-mapped: {file.is_memory_mapped})")
             
             # Check for figures in the analysis result
             figures = document_analysis_result.get("figures", [])
@@ -92,8 +72,8 @@ class ManualPDFImageExtractor(BaseImageExtractor):
             logger.info("🔧 Using PDFImageExtractor for coordinate-based extraction...")
             
             image_bytes_dict = PDFImageExtractor.extract_figures_from_azure_result(
-                pdf_path=temp_file,
-                azure_result=document_analysis_result
+                azure_result=document_analysis_result,
+                document_buffer=file
             )
             
             logger.info(f"📸 PDFImageExtractor returned {len(image_bytes_dict)} images")
@@ -107,9 +87,11 @@ class ManualPDFImageExtractor(BaseImageExtractor):
                     
                     logger.info(f"✅ Figure {figure_id}: {len(img_bytes)} bytes → {len(base64_img)} chars base64")
                     self._extraction_metrics["successful_extractions"] += 1
+                    record_figure("manual_pdf_cropping", len(img_bytes))
                 else:
                     logger.warning(f"⚠️  Figure {figure_id}: empty or null bytes")
                     self._extraction_metrics["failed_extractions"] += 1
+                    record_figure("manual_pdf_cropping", None)
             
             processing_time = time.time() - start_time
             self._extraction_metrics["total_processing_time"] += processing_time
@@ -124,15 +106,6 @@ class ManualPDFImageExtractor(BaseImageExtractor):
             
             logger.error(f"❌ Error in manual PDF extraction: {str(e)}", exc_info=True)
             raise DocumentProcessingError(f"Manual PDF extraction failed: {str(e)}")
-            
-        finally:
-            # Clean up temporary file
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                    logger.debug(f"🗑️  Temporary file removed: {temp_file}")
-                except Exception as e:
-                    logger.error(f"❌ Error removing temporary file: {str(e)}")
     
     def get_extraction_method_name(self) -> str:
         """Get the name of this extraction method."""
@@ -4,8 +4,13 @@ Serviços de infraestrutura
 Contém serviços de infraestrutura como conexões e recursos externos.
 """
 
-from .mongodb_connection_service import MongoDBConnectionService
+from .mongodb_connection_service import MongoDBConnectionService, write_timeout
+from .mongodb_pool_monitor import MongoDBPoolMonitor
+from .mongodb_tracing_listener import MongoDBTracingListener
 
 __all__ = [
-    "MongoDBConnectionService"
+    "MongoDBConnectionService",
+    "MongoDBPoolMonitor",
+    "MongoDBTracingListener",
+    "write_timeout"
 ]
\ No newline at end of file
@@ -2,16 +2,71 @@
 Serviço de conexão MongoDB
 
 Gerencia conexão MongoDB através do DI Container.
+
+O pool (tamanho mínimo/máximo, tempo ocioso), a compressão de rede e os
+timeouts de leitura/escrita vêm das settings. Estatísticas do pool e dos
+comandos ficam disponíveis em ``pool_stats()``.
 """
+import asyncio
+import importlib
 import logging
-from typing import Optional
+from typing import Any, ContextManager, Dict, List, Optional
+
+import pymongo
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.config.settings import get_settings
+from .mongodb_pool_monitor import MongoDBPoolMonitor
+from .mongodb_tracing_listener import MongoDBTracingListener
 
 
 logger = logging.getLogger(__name__)
 
 
+def _importable(module: str) -> bool:
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        return False
+    return True
+
+
+# Pacotes usados pelo PyMongo para cada compressor (extras pymongo[zstd,snappy])
+_COMPRESSOR_AVAILABLE = {
+    "zstd": _importable("zstandard"),
+    "snappy": _importable("snappy"),
+    "zlib": _importable("zlib")
+}
+
+
+def configured_compressors(configured: str) -> List[str]:
+    """Nomes em MONGODB_COMPRESSORS, na ordem de preferência."""
+    return [name.strip().lower() for name in configured.split(",") if name.strip()]
+
+
+def available_compressors(configured: str) -> List[str]:
+    """
+    Compressores configurados (ordem de preferência) suportados neste ambiente.
+
+    zstd e snappy dependem dos pacotes zstandard e python-snappy (instalados
+    pelo requirements.txt); os ausentes são descartados em vez de gerar
+    warnings do driver.
+    """
+    return [name for name in configured_compressors(configured) if _COMPRESSOR_AVAILABLE.get(name)]
+
+
+def write_timeout() -> ContextManager[None]:
+    """
+    Timeout das operações de escrita (``MONGODB_WRITE_TIMEOUT_MS``).
+
+    Leituras usam o socketTimeoutMS do cliente; escritas de documentos grandes
+    usam este limite próprio via timeout por operação do PyMongo::
+
+        with write_timeout():
+            await collection.insert_one(doc)
+    """
+    return pymongo.timeout(get_settings().mongodb_write_timeout_ms / 1000)
+
+
 class MongoDBConnectionService:
     """
     Serviço responsável por gerenciar conexão MongoDB.
@@ -24,6 +79,7 @@ class MongoDBConnectionService:
         self._client: Optional[AsyncIOMotorClient] = None
         self._database: Optional[AsyncIOMotorDatabase] = None
         self._settings = get_settings()
+        self._pool_monitor = MongoDBPoolMonitor()
         logger.info("MongoDBConnectionService initialized")
 
     async def get_database(self) -> AsyncIOMotorDatabase:
@@ -49,12 +105,7 @@ class MongoDBConnectionService:
             ConnectionError: Se falhar na conexão
         """
         try:
-            self._client = AsyncIOMotorClient(
-                self._settings.mongodb_url,
-                serverSelectionTimeoutMS=self._settings.mongodb_connection_timeout,
-                connectTimeoutMS=self._settings.mongodb_connection_timeout,
-                socketTimeoutMS=self._settings.mongodb_connection_timeout
-            )
+            self._client = AsyncIOMotorClient(self._settings.mongodb_url, **self._client_options())
             
             # Testa conexão
             await self._client.admin.command('ping')
@@ -67,6 +118,60 @@ class MongoDBConnectionService:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise ConnectionError(f"MongoDB connection failed: {str(e)}")
 
+    def _client_options(self) -> Dict[str, Any]:
+        """Opções do cliente: timeouts, pool e compressão de rede."""
+        options: Dict[str, Any] = {
+            "serverSelectionTimeoutMS": self._settings.mongodb_connection_timeout,
+            "connectTimeoutMS": self._settings.mongodb_connection_timeout,
+            "socketTimeoutMS": self._settings.mongodb_read_timeout_ms,
+            "minPoolSize": self._settings.mongodb_min_pool_size,
+            "maxPoolSize": self._settings.mongodb_max_pool_size,
+            "maxIdleTimeMS": self._settings.mongodb_max_idle_time_ms,
+            "event_listeners": [self._pool_monitor]
+        }
+        if self._settings.tracing_enabled:
+            options["event_listeners"].append(MongoDBTracingListener())
+        compressors = available_compressors(self._settings.mongodb_compressors)
+        missing = [name for name in configured_compressors(self._settings.mongodb_compressors)
+                   if name not in compressors]
+        if missing:
+            logger.warning(f"⚠️ MongoDB compressors unavailable (package not installed): {', '.join(missing)}")
+        if compressors:
+            options["compressors"] = ",".join(compressors)
+            if "zlib" in compressors:
+                options["zlibCompressionLevel"] = self._settings.mongodb_zlib_compression_level
+        return options
+
+    async def warm_up(self, connections: Optional[int] = None) -> int:
+        """
+        Abre conexões do pool antes do primeiro request.
+
+        Executa pings concorrentes (cada um ocupa uma conexão), para que o pool
+        já tenha ``connections`` (padrão: MONGODB_MIN_POOL_SIZE) conexões
+        autenticadas quando o tráfego chegar.
+
+        Returns:
+            Conexões abertas no pool após o aquecimento
+        """
+        target = self._settings.mongodb_min_pool_size if connections is None else connections
+        await self.get_database()
+        if target > 0:
+            await asyncio.gather(*(self._client.admin.command('ping') for _ in range(target)))
+
+        open_connections = sum(pool["open"] for pool in self._pool_monitor.snapshot()["pools"].values())
+        logger.info(f"MongoDB pool warmed up: {open_connections} connections open (target {target})")
+        return open_connections
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Configuração do pool e estatísticas acumuladas do monitor de comandos."""
+        return {
+            "connected": self._client is not None,
+            "min_pool_size": self._settings.mongodb_min_pool_size,
+            "max_pool_size": self._settings.mongodb_max_pool_size,
+            "compressors": available_compressors(self._settings.mongodb_compressors),
+            **self._pool_monitor.snapshot()
+        }
+
     async def close(self):
         """Fecha conexão MongoDB."""
         if self._client:
@@ -0,0 +1,136 @@
+"""
+Monitor do pool de conexões MongoDB
+
+Listener do PyMongo (``event_listeners``) que acumula estatísticas do pool de
+conexões e dos comandos executados. Os eventos chegam nas threads do driver,
+por isso os contadores são protegidos por lock. A duração de cada comando
+também alimenta o histograma Prometheus exposto em GET /metrics.
+"""
+import threading
+from collections import defaultdict
+from typing import Any, Dict
+
+from pymongo import monitoring
+
+from app.core.metrics import MONGODB_OPERATION_LATENCY
+
+
+class MongoDBPoolMonitor(monitoring.ConnectionPoolListener, monitoring.CommandListener):
+    """Estatísticas do pool de conexões e dos comandos por nome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+            "open": 0,
+            "checked_out": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "created": 0,
+            "closed": 0,
+            "cleared": 0
+        })
+        self._commands: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+            "count": 0,
+            "failures": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0
+        })
+
+    # ------------------------------------------------------------------
+    # ConnectionPoolListener
+    # ------------------------------------------------------------------
+
+    def pool_created(self, event) -> None:
+        with self._lock:
+            self._pools[self._address(event)]
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        self._incr(event, "cleared")
+
+    def pool_closed(self, event) -> None:
+        with self._lock:
+            self._pools.pop(self._address(event), None)
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            pool = self._pools[self._address(event)]
+            pool["created"] += 1
+            pool["open"] += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            pool = self._pools[self._address(event)]
+            pool["closed"] += 1
+            pool["open"] = max(0, pool["open"] - 1)
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        self._incr(event, "checkout_failures")
+
+    def connection_checked_out(self, event) -> None:
+        with self._lock:
+            pool = self._pools[self._address(event)]
+            pool["checkouts"] += 1
+            pool["checked_out"] += 1
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            pool = self._pools[self._address(event)]
+            pool["checked_out"] = max(0, pool["checked_out"] - 1)
+
+    # ------------------------------------------------------------------
+    # CommandListener
+    # ------------------------------------------------------------------
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        self._record_command(event.command_name, event.duration_micros, failed=False)
+
+    def failed(self, event) -> None:
+        self._record_command(event.command_name, event.duration_micros, failed=True)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cópia das estatísticas atuais (pools por endereço e comandos por nome)."""
+        with self._lock:
+            return {
+                "pools": {address: dict(stats) for address, stats in self._pools.items()},
+                "commands": {
+                    name: {**stats, "total_ms": round(stats["total_ms"], 3), "max_ms": round(stats["max_ms"], 3)}
+                    for name, stats in self._commands.items()
+                }
+            }
+
+    def _record_command(self, name: str, duration_micros: int, failed: bool) -> None:
+        duration_ms = duration_micros / 1000
+        MONGODB_OPERATION_LATENCY.labels(
+            command=name, result="failure" if failed else "success"
+        ).observe(duration_micros / 1e6)
+        with self._lock:
+            stats = self._commands[name]
+            stats["count"] += 1
+            stats["failures"] += int(failed)
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
+    def _incr(self, event, key: str) -> None:
+        with self._lock:
+            self._pools[self._address(event)][key] += 1
+
+    @staticmethod
+    def _address(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
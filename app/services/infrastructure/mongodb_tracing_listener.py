@@ -0,0 +1,58 @@
+"""
+Spans dos comandos MongoDB
+
+CommandListener do PyMongo que abre um span CLIENT no ``started`` e o fecha no
+``succeeded``/``failed``. O Motor executa o driver em threads com uma cópia do
+contexto da corrotina, então o span do comando fica sob o span da fase (e da
+requisição) que o disparou. O conteúdo dos comandos não é gravado no span.
+"""
+import threading
+from typing import Dict, Tuple
+
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+from pymongo import monitoring
+
+from app.core.tracing import get_tracer
+
+
+class MongoDBTracingListener(monitoring.CommandListener):
+    """Um span por comando MongoDB (``mongodb.<comando>``)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[Tuple[int, object], Span] = {}
+
+    def started(self, event) -> None:
+        collection = event.command.get(event.command_name)
+        span = get_tracer().start_span(
+            f"mongodb.{event.command_name}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "mongodb",
+                "db.name": event.database_name,
+                "db.operation": event.command_name,
+                "db.mongodb.collection": collection if isinstance(collection, str) else "",
+            }
+        )
+        with self._lock:
+            self._spans[self._key(event)] = span
+
+    def succeeded(self, event) -> None:
+        span = self._pop(event)
+        if span is not None:
+            span.end()
+
+    def failed(self, event) -> None:
+        span = self._pop(event)
+        if span is not None:
+            failure = event.failure if isinstance(event.failure, dict) else {}
+            span.set_status(Status(StatusCode.ERROR, str(failure.get("errmsg", "command failed"))))
+            span.end()
+
+    def _pop(self, event):
+        with self._lock:
+            return self._spans.pop(self._key(event), None)
+
+    @staticmethod
+    def _key(event) -> Tuple[int, object]:
+        return event.request_id, event.connection_id
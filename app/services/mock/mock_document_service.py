@@ -506,21 +506,10 @@ class MockDocumentService:
         # Usar extrator isolado
         extractor = ManualPDFImageExtractor()
         
-        # Simular UploadFile-like object do Path
-        with open(pdf_path, 'rb') as file:
-            file_content = file.read()
-        
-        # Criar mock file object
-        import io
-        from fastapi import UploadFile
-        
-        mock_file_obj = io.BytesIO(file_content)
-        mock_file = UploadFile(
-            filename=pdf_path.name,
-            file=mock_file_obj,
-            size=len(file_content),
-            headers={"content-type": "application/pdf"}
-        )
+        # Buffer do documento a partir do Path
+        from app.core.document_buffer import DocumentBuffer
+        
+        mock_file = DocumentBuffer.from_bytes(pdf_path.read_bytes(), filename=pdf_path.name)
         
         # Extrair imagens usando classe isolada
         images = await extractor.extract_images(
@@ -6,6 +6,9 @@ Este módulo contém interfaces e implementações para operações de persistê
 
 from .i_simple_persistence_service import ISimplePersistenceService
 from .mongodb_persistence_service import MongoDBPersistenceService
+from .document_list_query import DocumentListCursor, DocumentSummaryPage
+from .document_search_query import DocumentSearchPage
+from .migration_manager import MongoDBMigrationManager
 from .exceptions import (
     PersistenceError,
     ConnectionError,
@@ -17,6 +20,10 @@ from .exceptions import (
 __all__ = [
     "ISimplePersistenceService",
     "MongoDBPersistenceService",
+    "DocumentListCursor",
+    "DocumentSummaryPage",
+    "DocumentSearchPage",
+    "MongoDBMigrationManager",
     "PersistenceError",
     "ConnectionError", 
     "DocumentNotFoundError",
@@ -0,0 +1,135 @@
+"""
+Armazenamento externo dos responses do Azure
+
+O JSON bruto do Azure Document Intelligence é gravado comprimido (gzip) em um
+bucket GridFS, fora da coleção 'azure_responses'. O registro de metadados guarda
+apenas a referência (AzureResponsePayloadRef), então consultas de metadados não
+trafegam o payload e provas grandes não esbarram no limite de 16 MB do BSON.
+
+A leitura é sob demanda: os chunks do GridFS são descomprimidos um a um.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import zlib
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+from app.config.settings import get_settings
+from app.models.persistence.azure_response_record import AzureResponsePayloadRef
+from app.services.infrastructure import MongoDBConnectionService
+
+
+logger = logging.getLogger(__name__)
+
+GZIP_CODEC = "gzip"
+
+
+class AzureResponsePayloadStore:
+    """Bucket GridFS com os payloads comprimidos de 'azure_responses'."""
+
+    BUCKET_NAME = "azure_response_payloads"
+
+    def __init__(self, connection_service: MongoDBConnectionService):
+        self._connection_service = connection_service
+        self._compression_level = get_settings().azure_response_compression_level
+        self._logger = logging.getLogger(__name__)
+
+    async def _bucket(self) -> AsyncIOMotorGridFSBucket:
+        database = await self._connection_service.get_database()
+        return AsyncIOMotorGridFSBucket(database, bucket_name=self.BUCKET_NAME)
+
+    def _encode(self, payload: Dict[str, Any]) -> Tuple[bytes, int]:
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return gzip.compress(raw, compresslevel=self._compression_level), len(raw)
+
+    async def put(
+        self,
+        file_id: str,
+        payload: Dict[str, Any],
+        filename: Optional[str] = None
+    ) -> AzureResponsePayloadRef:
+        """
+        Comprime e grava o payload com ``file_id`` (o _id do AzureResponseRecord).
+
+        Args:
+            file_id: Identificador do arquivo no bucket
+            payload: Response bruto do Azure
+            filename: Nome do PDF de origem (apenas informativo)
+
+        Returns:
+            Referência a ser gravada no registro de metadados
+        """
+        # Serialização + gzip de vários MB é CPU-bound: fora do event loop
+        compressed, raw_bytes = await asyncio.to_thread(self._encode, payload)
+        bucket = await self._bucket()
+        await bucket.upload_from_stream_with_id(
+            file_id,
+            filename or file_id,
+            compressed,
+            metadata={"codec": GZIP_CODEC, "raw_bytes": raw_bytes}
+        )
+
+        self._logger.debug({
+            "event": "azure_payload_stored",
+            "file_id": file_id,
+            "raw_bytes": raw_bytes,
+            "stored_bytes": len(compressed)
+        })
+        return AzureResponsePayloadRef(
+            file_id=file_id,
+            codec=GZIP_CODEC,
+            raw_bytes=raw_bytes,
+            stored_bytes=len(compressed)
+        )
+
+    async def iter_raw(self, ref: AzureResponsePayloadRef) -> AsyncIterator[bytes]:
+        """Produz o JSON descomprimido em pedaços, lendo um chunk do GridFS por vez."""
+        if ref.codec != GZIP_CODEC:
+            raise ValueError(f"Unsupported Azure payload codec: {ref.codec!r}")
+
+        bucket = await self._bucket()
+        grid_out = await bucket.open_download_stream(ref.file_id)
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        while True:
+            chunk = await grid_out.readchunk()
+            if not chunk:
+                break
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    async def load(self, ref: AzureResponsePayloadRef) -> Dict[str, Any]:
+        """Carrega e desserializa o payload completo."""
+        parts = [part async for part in self.iter_raw(ref)]
+        return await asyncio.to_thread(json.loads, b"".join(parts))
+
+    async def resolve(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Devolve o response do Azure de um documento de 'azure_responses'.
+
+        Aceita registros novos (``azure_response_ref``) e legados com o
+        response inline em ``azure_response``.
+        """
+        ref = doc.get("azure_response_ref")
+        if ref:
+            return await self.load(AzureResponsePayloadRef(**ref))
+        return doc.get("azure_response") or {}
+
+    async def delete(self, file_id: str) -> None:
+        """Remove o payload (usado quando o registro de metadados não é gravado)."""
+        bucket = await self._bucket()
+        await bucket.delete(file_id)
+
+    async def delete_if_exists(self, file_id: str) -> None:
+        """Como ``delete``, ignorando arquivo inexistente."""
+        try:
+            await self.delete(file_id)
+        except NoFile:
+            pass
@@ -0,0 +1,74 @@
+"""
+Backfills de dados executados pelo MongoDBMigrationManager
+
+Cada backfill seleciona apenas documentos ainda não migrados ou grava de forma
+idempotente, então pode ser executado novamente com segurança.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReplaceOne
+
+from app.models.persistence import DocumentStatus, QuestionRecord, StoredResponseJSON
+from app.services.infrastructure import write_timeout
+from .migration_manager import Backfill
+from .question_query import QUESTIONS_COLLECTION
+
+
+def _encode_response_json(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return {"response_json": StoredResponseJSON.encode(doc.get("response") or {}).dict()}
+
+
+RESPONSE_JSON_BACKFILL = Backfill(
+    name="response_json",
+    collection="analyze_documents",
+    query={"status": DocumentStatus.COMPLETED.value, "response_json": {"$exists": False}},
+    projection={"_id": 1, "response": 1},
+    transform=_encode_response_json,
+    batch_size=100
+)
+
+
+def _question_upserts(docs: List[Dict[str, Any]]) -> List[ReplaceOne]:
+    return [
+        ReplaceOne({"_id": question["_id"]}, question, upsert=True)
+        for doc in docs
+        for question in (
+            q.dict_for_mongo()
+            for q in QuestionRecord.from_analysis(
+                document_id=str(doc["_id"]),
+                user_email=doc.get("user_email", ""),
+                response=doc.get("response") or {},
+                summary=doc.get("summary"),
+                created_at=doc.get("created_at")
+            )
+        )
+    ]
+
+
+async def _write_questions(database, docs: List[Dict[str, Any]]) -> int:
+    # Assinaturas MinHash (~2 ms por questão) calculadas fora do event loop
+    operations = await asyncio.to_thread(_question_upserts, docs)
+    if not operations:
+        return 0
+    with write_timeout():
+        result = await database[QUESTIONS_COLLECTION].bulk_write(operations, ordered=False)
+    return result.upserted_count + result.modified_count
+
+
+# Questões das análises concluídas anteriores à coleção 'questions' (upsert por _id)
+QUESTIONS_BACKFILL = Backfill(
+    name="questions",
+    collection="analyze_documents",
+    query={"status": DocumentStatus.COMPLETED.value},
+    projection={"_id": 1, "user_email": 1, "created_at": 1, "summary": 1,
+                "response.header": 1, "response.questions": 1},
+    transform=lambda doc: None,
+    batch_size=200,
+    on_batch=_write_questions
+)
+
+BACKFILLS: Dict[str, Backfill] = {
+    backfill.name: backfill
+    for backfill in (RESPONSE_JSON_BACKFILL, QUESTIONS_BACKFILL)
+}
@@ -0,0 +1,118 @@
+"""
+Consulta leve da listagem de documentos
+
+Projeção de campos de resumo e paginação keyset por (campo de ordenação, _id),
+com cursor opaco para o cliente. Evita carregar o ``response`` completo de cada
+documento e o custo de ``skip()`` em páginas profundas.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+# Campos necessários para os itens da lista (nunca o response completo)
+SUMMARY_PROJECTION: Dict[str, Any] = {
+    "_id": 1,
+    "user_email": 1,
+    "file_name": 1,
+    "file_size": 1,
+    "status": 1,
+    "created_at": 1,
+    "response.document_id": 1,
+    "summary": 1,
+}
+
+# Ordenações aceitas na listagem -> campo no MongoDB (sempre desc, _id desempata)
+SORT_FIELDS: Dict[str, str] = {
+    "created_at": "created_at",
+    "question_count": "summary.question_count",
+}
+DEFAULT_SORT = "created_at"
+
+
+def list_sort(sort_by: str = DEFAULT_SORT) -> List[Tuple[str, int]]:
+    """Ordem da listagem para ``sort_by`` (mais recentes/maiores primeiro)."""
+    return [(SORT_FIELDS[sort_by], -1), ("_id", -1)]
+
+
+# Ordem padrão da listagem (mais recentes primeiro)
+LIST_SORT = list_sort(DEFAULT_SORT)
+
+
+def _get_path(doc: Dict[str, Any], path: str) -> Any:
+    for part in path.split("."):
+        doc = (doc or {}).get(part)
+    return doc
+
+
+@dataclass(frozen=True)
+class DocumentListCursor:
+    """Posição do último item entregue: (valor do campo de ordenação, _id)."""
+
+    value: Any
+    document_id: Any
+    sort_by: str = DEFAULT_SORT
+
+    def encode(self) -> str:
+        """Serializa para token opaco (base64 url-safe)."""
+        if isinstance(self.value, datetime):
+            payload = {"s": self.sort_by, "d": self.value.isoformat()}
+        else:
+            payload = {"s": self.sort_by, "v": self.value}
+        payload["i"] = str(self.document_id)
+        if isinstance(self.document_id, ObjectId):
+            payload["o"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "DocumentListCursor":
+        """
+        Reconstrói o cursor a partir do token.
+
+        Raises:
+            ValueError: Token malformado
+        """
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            document_id = ObjectId(payload["i"]) if payload.get("o") else payload["i"]
+            sort_by = payload.get("s", DEFAULT_SORT)
+            if sort_by not in SORT_FIELDS:
+                raise ValueError(f"unknown sort {sort_by!r}")
+            value = datetime.fromisoformat(payload["d"]) if "d" in payload else payload["v"]
+            return cls(value=value, document_id=document_id, sort_by=sort_by)
+        except (ValueError, KeyError, TypeError, InvalidId) as e:
+            raise ValueError(f"Invalid cursor: {token!r}") from e
+
+    @classmethod
+    def from_document(cls, doc: Dict[str, Any], sort_by: str = DEFAULT_SORT) -> "DocumentListCursor":
+        return cls(value=_get_path(doc, SORT_FIELDS[sort_by]), document_id=doc["_id"], sort_by=sort_by)
+
+    def to_query(self) -> Dict[str, Any]:
+        """Condição keyset para itens posteriores a este cursor na ordem list_sort(sort_by)."""
+        field_name = SORT_FIELDS[self.sort_by]
+        return {
+            "$or": [
+                {field_name: {"$lt": self.value}},
+                {field_name: self.value, "_id": {"$lt": self.document_id}},
+            ]
+        }
+
+
+@dataclass
+class DocumentSummaryPage:
+    """Página da listagem: itens projetados, próximo cursor e total (opcional)."""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    total_count: Optional[int] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
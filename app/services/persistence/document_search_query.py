@@ -0,0 +1,57 @@
+"""
+Busca textual nas análises do usuário (índice de texto do MongoDB)
+
+O índice idx_search_text cobre diretamente os campos de texto do ``response``
+(enunciados, alternativas, parágrafos e títulos dos context blocks), então
+cada gravação ou reprocessamento da análise atualiza o índice sem campo
+auxiliar. Idioma português: stemming e comparação sem acentos/maiúsculas.
+
+O prefixo ``user_email`` do índice composto restringe a busca às entradas do
+usuário: o custo depende do acervo do usuário, não da coleção.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from app.models.persistence.enums import DocumentStatus
+from .document_list_query import SUMMARY_PROJECTION
+
+SEARCH_INDEX_NAME = "idx_search_text"
+SEARCH_LANGUAGE = "portuguese"
+# Campo inexistente: impede que um campo "language" do response troque o idioma
+SEARCH_LANGUAGE_OVERRIDE = "search_language"
+
+# Campo -> peso na relevância (textScore)
+SEARCH_TEXT_WEIGHTS: Dict[str, int] = {
+    "response.questions.question": 10,
+    "response.context_blocks.title": 5,
+    "response.questions.alternatives.text": 4,
+    "response.context_blocks.statement": 3,
+    "response.context_blocks.paragraphs": 2,
+    "response.context_blocks.sub_contexts.content": 2,
+}
+
+SEARCH_PROJECTION: Dict[str, Any] = {**SUMMARY_PROJECTION, "score": {"$meta": "textScore"}}
+SEARCH_SORT = [("score", {"$meta": "textScore"}), ("created_at", -1)]
+
+
+def build_search_query(email: str, text: str) -> Dict[str, Any]:
+    """
+    Filtro da busca: análises concluídas do usuário que contêm os termos.
+
+    Sintaxe do ``$text``: termos separados por espaço (qualquer um), "frase
+    exata" entre aspas e -termo para excluir.
+    """
+    return {
+        "user_email": email,
+        "$text": {"$search": text, "$language": SEARCH_LANGUAGE},
+        "status": DocumentStatus.COMPLETED.value,
+    }
+
+
+@dataclass
+class DocumentSearchPage:
+    """Página da busca, ordenada por relevância."""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    page: int = 1
+    has_next: bool = False
@@ -4,10 +4,14 @@ Interface simplificada para serviços de persistência
 Define contrato conforme escopo original do prompt MongoDB.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List, Tuple
+from typing import Any, AsyncIterator, Dict, Optional, List, Sequence, Tuple, Union
 from datetime import datetime
 
-from app.models.persistence import AnalyzeDocumentRecord, AzureProcessingDataRecord, AzureResponseRecord
+from app.models.persistence import AnalyzeDocumentRecord, AzureProcessingDataRecord, AzureResponseRecord, DocumentSummary
+from .document_list_query import DEFAULT_SORT, DocumentSummaryPage
+from .document_search_query import DocumentSearchPage
+from .processing_metrics_query import LatencyPercentiles
+from .question_query import QuestionPage
 
 
 class ISimplePersistenceService(ABC):
@@ -56,6 +60,45 @@ class ISimplePersistenceService(ABC):
         """
         pass
 
+    @abstractmethod
+    async def enqueue_write(
+        self,
+        record: Union[AnalyzeDocumentRecord, AzureResponseRecord, AzureProcessingDataRecord]
+    ) -> str:
+        """
+        Agenda a gravação do registro sem aguardar o banco (write-behind).
+        
+        Args:
+            record: Registro com _id pré-alocado
+            
+        Returns:
+            _id do registro
+        """
+        pass
+
+    @abstractmethod
+    async def start_write_behind(self) -> None:
+        """Inicia a fila write-behind (startup da aplicação)."""
+        pass
+
+    @abstractmethod
+    async def stop_write_behind(self) -> None:
+        """Drena a fila write-behind (shutdown da aplicação)."""
+        pass
+
+    @abstractmethod
+    async def load_azure_response(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Carrega sob demanda o response bruto do Azure de um documento.
+        
+        Args:
+            document_id: ID do documento em analyze_documents
+            
+        Returns:
+            Response do Azure ou None se não houver registro
+        """
+        pass
+
     @abstractmethod
     async def get_by_document_id(self, document_id: str) -> Optional[AnalyzeDocumentRecord]:
         """
@@ -127,28 +170,200 @@ class ISimplePersistenceService(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_document_summaries_page(
+        self,
+        email: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        include_total: bool = False,
+        subject: Optional[str] = None,
+        sort_by: str = DEFAULT_SORT
+    ) -> DocumentSummaryPage:
+        """
+        Recupera uma página leve da listagem (apenas campos de resumo).
+        
+        Paginação keyset por (created_at, _id): ``cursor`` é o next_cursor da
+        página anterior. Sem cursor, ``page`` é aplicado via skip.
+        
+        Args:
+            email: Email do usuário (obrigatório)
+            start_date: Data início do intervalo (opcional)
+            end_date: Data fim do intervalo (opcional)
+            page_size: Itens por página (máximo 50)
+            cursor: Cursor opaco da página anterior (opcional)
+            page: Número da página quando não há cursor (1-indexed)
+            include_total: Se True, inclui o total de registros (cacheado)
+            subject: Filtro por matéria (summary.subject_key)
+            sort_by: Ordenação: "created_at" ou "question_count" (desc)
+            
+        Returns:
+            DocumentSummaryPage com itens, next_cursor e total opcional
+            
+        Raises:
+            ValueError: Cursor inválido
+        """
+        pass
+
+    @abstractmethod
+    async def get_questions_page(
+        self,
+        email: Optional[str] = None,
+        subject: Optional[str] = None,
+        grade: Optional[str] = None,
+        multiple_choice: Optional[bool] = None,
+        has_image: Optional[bool] = None,
+        document_id: Optional[str] = None,
+        page_size: int = 20,
+        cursor: Optional[str] = None
+    ) -> QuestionPage:
+        """
+        Recupera uma página do banco de questões (coleção 'questions').
+        
+        Args:
+            email: Restringe às questões de um usuário (opcional)
+            subject: Matéria (sem diferenciar acentos/maiúsculas)
+            grade: Série/ano (sem diferenciar acentos/maiúsculas)
+            multiple_choice: Filtra por questões com/sem alternativas
+            has_image: Filtra por questões com/sem imagem
+            document_id: Questões de uma análise
+            page_size: Itens por página
+            cursor: Cursor opaco da página anterior (opcional)
+            
+        Returns:
+            QuestionPage com itens e next_cursor
+            
+        Raises:
+            ValueError: Cursor inválido
+        """
+        pass
+
+    @abstractmethod
+    async def get_question(self, question_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Recupera uma questão do banco de questões pelo _id.
+        
+        Returns:
+            Documento da questão (com assinatura MinHash) ou None
+        """
+        pass
+
+    @abstractmethod
+    async def find_questions_by_lsh_bands(
+        self,
+        bands: List[str],
+        exclude_id: Optional[str] = None,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Candidatas a quase-duplicata: questões que compartilham alguma chave LSH.
+        
+        Args:
+            bands: Chaves LSH da questão de referência
+            exclude_id: _id a excluir (a própria questão)
+            limit: Máximo de candidatas
+            
+        Returns:
+            Documentos das questões (com assinatura MinHash, sem as chaves LSH)
+        """
+        pass
+
+    @abstractmethod
+    async def search_documents(
+        self,
+        email: str,
+        text: str,
+        page: int = 1,
+        page_size: int = 10
+    ) -> DocumentSearchPage:
+        """
+        Busca textual (enunciados, alternativas e context blocks) nas análises
+        concluídas do usuário, ordenada por relevância.
+        
+        Args:
+            email: Email do usuário (obrigatório)
+            text: Termos da busca
+            page: Página (1-indexed)
+            page_size: Itens por página
+            
+        Returns:
+            DocumentSearchPage com itens de resumo e ``score``
+        """
+        pass
+
+    @abstractmethod
+    async def get_processing_metrics_percentiles(
+        self,
+        since: datetime,
+        group_by: Sequence[str] = ("day",),
+        cache_outcome: str = "miss"
+    ) -> List[LatencyPercentiles]:
+        """
+        Percentis p50/p95/p99 das durações de processamento por documento.
+        
+        Args:
+            since: Considera análises a partir desta data (UTC)
+            group_by: Dimensões do agrupamento (day, page_bucket, stage)
+            cache_outcome: 'miss' (análises executadas) ou 'hit' (duplicatas)
+            
+        Returns:
+            Percentis por grupo, ordenados pela chave
+        """
+        pass
+
+    @abstractmethod
+    def iter_analyses_for_export(
+        self,
+        email: Optional[str] = None,
+        school: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_response: bool = False,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Percorre as análises concluídas para exportação, sem carregar tudo em memória.
+        
+        Args:
+            email: Restringe a um usuário (opcional)
+            school: Escola do cabeçalho (response.header.school, opcional)
+            start_date: Data início do intervalo (opcional)
+            end_date: Data fim do intervalo (opcional)
+            include_response: Inclui o response completo (senão apenas resumo)
+            batch_size: Documentos por lote do cursor MongoDB
+            
+        Returns:
+            Iterador assíncrono de documentos projetados
+        """
+        pass
+
     @abstractmethod
     async def check_duplicate_document(
         self,
         email: str,
         filename: str,
-        file_size: int
+        file_size: int,
+        file_hash: Optional[str] = None
     ) -> Optional[AnalyzeDocumentRecord]:
         """
         Verifica se documento já foi processado.
         
         Busca documento com:
         - Mesmo email
-        - Mesmo filename
-        - Mesmo file_size
+        - Mesmo file_hash (SHA-256 do conteúdo), independente do nome
+        - Registros legados sem file_hash: mesmo filename + file_size
         - Status COMPLETED (docs FAILED são ignorados para permitir retry)
         
-        Performance: O(1) devido ao índice composto idx_duplicate_check
+        Performance: O(1) devido aos índices idx_user_file_hash / idx_duplicate_check
         
         Args:
             email: Email do usuário
             filename: Nome do arquivo
             file_size: Tamanho do arquivo em bytes
+            file_hash: SHA-256 (hex) do conteúdo
             
         Returns:
             AnalyzeDocumentRecord se encontrado, None caso contrário
@@ -161,7 +376,9 @@ class ISimplePersistenceService(ABC):
         email: str,
         filename: str,
         file_size: int,
-        response_dict: dict
+        response_dict: dict,
+        file_hash: Optional[str] = None,
+        summary: Optional[DocumentSummary] = None
     ) -> str:
         """
         Método high-level para persistir resultado de análise completa.
@@ -176,6 +393,8 @@ class ISimplePersistenceService(ABC):
             filename: Nome do arquivo
             file_size: Tamanho do arquivo em bytes
             response_dict: Dicionário com response completo (DocumentResponseDTO.dict())
+            file_hash: SHA-256 (hex) do conteúdo
+            summary: Resumo desnormalizado (padrão: extraído de response_dict)
             
         Returns:
             ID do documento salvo
@@ -0,0 +1,186 @@
+"""
+Índices exigidos pelas consultas do MongoDBPersistenceService
+
+Declarados junto à camada de persistência para que a aplicação confirme na
+inicialização (MongoDBMigrationManager.ensure_indexes) que os índices dos quais
+as consultas dependem existem. ``HOT_QUERIES`` descreve as consultas críticas
+para verificação do plano via ``explain()`` (sem COLLSCAN).
+
+Os nomes coincidem com os criados pelas migrações em scripts/migrations/.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.persistence.enums import DocumentStatus
+from .document_search_query import (
+    SEARCH_INDEX_NAME,
+    SEARCH_LANGUAGE,
+    SEARCH_LANGUAGE_OVERRIDE,
+    SEARCH_TEXT_WEIGHTS,
+    build_search_query
+)
+
+IndexKeys = List[Tuple[str, int]]
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """Índice exigido em uma coleção."""
+
+    collection: str
+    name: str
+    keys: Tuple[Tuple[str, Any], ...]
+    options: Dict[str, Any] = field(default_factory=dict, hash=False, compare=False)
+
+    @property
+    def stored_keys(self) -> Tuple[Tuple[str, Any], ...]:
+        """
+        Chaves como listadas por list_indexes().
+
+        Índices de texto são listados com os campos de texto substituídos por
+        ``_fts``/``_ftsx`` (os campos ficam em ``weights``).
+        """
+        text_positions = [i for i, (_, kind) in enumerate(self.keys) if kind == "text"]
+        if not text_positions:
+            return self.keys
+        return (
+            self.keys[:text_positions[0]]
+            + (("_fts", "text"), ("_ftsx", 1))
+            + self.keys[text_positions[-1] + 1:]
+        )
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """Consulta crítica cujo plano não pode ser COLLSCAN."""
+
+    name: str
+    collection: str
+    filter: Dict[str, Any] = field(hash=False, compare=False)
+    sort: Optional[IndexKeys] = field(default=None, hash=False, compare=False)
+    expected_index: Optional[str] = None
+
+
+REQUIRED_INDEXES: List[IndexSpec] = [
+    # check_duplicate_document: por conteúdo e fallback legado (nome + tamanho)
+    IndexSpec(
+        "analyze_documents", "idx_user_file_hash",
+        (("user_email", 1), ("file_hash", 1), ("status", 1)),
+        {"partialFilterExpression": {"file_hash": {"$exists": True}}}
+    ),
+    IndexSpec(
+        "analyze_documents", "idx_duplicate_check",
+        (("user_email", 1), ("file_name", 1), ("file_size", 1))
+    ),
+    # get_by_document_id: registros anteriores ao _id pré-alocado
+    IndexSpec("analyze_documents", "idx_response_document_id", (("response.document_id", 1),)),
+    # GET /documents: listagem keyset por usuário em cada ordenação
+    IndexSpec("analyze_documents", "idx_user_created_at", (("user_email", 1), ("created_at", -1), ("_id", -1))),
+    IndexSpec(
+        "analyze_documents", "idx_user_question_count",
+        (("user_email", 1), ("summary.question_count", -1), ("_id", -1))
+    ),
+    IndexSpec(
+        "analyze_documents", "idx_user_subject_created_at",
+        (("user_email", 1), ("summary.subject_key", 1), ("created_at", -1), ("_id", -1))
+    ),
+    # load_azure_response e varredura do reprocessamento
+    IndexSpec("azure_responses", "idx_document_id", (("document_id", 1),)),
+    IndexSpec("azure_responses", "idx_status_id", (("status", 1), ("_id", 1))),
+    # get_questions_page: banco de questões por matéria/série/tipo, keyset por _id
+    IndexSpec(
+        "questions", "idx_q_subject_grade_type",
+        (("subject_key", 1), ("grade_key", 1), ("is_multiple_choice", 1), ("_id", 1))
+    ),
+    IndexSpec(
+        "questions", "idx_q_user_subject_grade",
+        (("user_email", 1), ("subject_key", 1), ("grade_key", 1), ("_id", 1))
+    ),
+    IndexSpec("questions", "idx_q_document", (("document_id", 1), ("_id", 1))),
+    # find_questions_by_lsh_bands: quase-duplicatas (multikey, uma chave por faixa LSH)
+    IndexSpec("questions", "idx_q_lsh_bands", (("lsh_bands", 1),)),
+    # get_processing_metrics_percentiles: janela de datas das métricas por documento
+    IndexSpec("azure_processing_data", "idx_pm_created_at", (("created_at", 1),)),
+    # search_documents: busca textual por usuário (único índice de texto da coleção)
+    IndexSpec(
+        "analyze_documents", SEARCH_INDEX_NAME,
+        (("user_email", 1),) + tuple((name, "text") for name in SEARCH_TEXT_WEIGHTS),
+        {
+            "weights": SEARCH_TEXT_WEIGHTS,
+            "default_language": SEARCH_LANGUAGE,
+            "language_override": SEARCH_LANGUAGE_OVERRIDE
+        }
+    ),
+]
+
+
+_SAMPLE_EMAIL = "explain@smartquest.invalid"
+
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery(
+        "duplicate_by_hash", "analyze_documents",
+        {"user_email": _SAMPLE_EMAIL, "file_hash": "0" * 64, "status": DocumentStatus.COMPLETED.value},
+        expected_index="idx_user_file_hash"
+    ),
+    HotQuery(
+        "duplicate_legacy", "analyze_documents",
+        {
+            "user_email": _SAMPLE_EMAIL,
+            "file_name": "explain.pdf",
+            "file_size": 1,
+            "file_hash": {"$exists": False},
+            "status": DocumentStatus.COMPLETED.value
+        },
+        expected_index="idx_duplicate_check"
+    ),
+    HotQuery(
+        "document_by_response_id", "analyze_documents",
+        {"response.document_id": "explain"},
+        expected_index="idx_response_document_id"
+    ),
+    HotQuery(
+        "list_by_created_at", "analyze_documents",
+        {"user_email": _SAMPLE_EMAIL},
+        sort=[("created_at", -1), ("_id", -1)],
+        expected_index="idx_user_created_at"
+    ),
+    HotQuery(
+        "list_by_question_count", "analyze_documents",
+        {"user_email": _SAMPLE_EMAIL},
+        sort=[("summary.question_count", -1), ("_id", -1)],
+        expected_index="idx_user_question_count"
+    ),
+    HotQuery(
+        "list_by_subject", "analyze_documents",
+        {"user_email": _SAMPLE_EMAIL, "summary.subject_key": "matematica"},
+        sort=[("created_at", -1), ("_id", -1)],
+        expected_index="idx_user_subject_created_at"
+    ),
+    HotQuery(
+        "search_documents", "analyze_documents",
+        build_search_query(_SAMPLE_EMAIL, "fotossintese"),
+        expected_index=SEARCH_INDEX_NAME
+    ),
+    HotQuery(
+        "questions_by_subject_grade_type", "questions",
+        {"subject_key": "lingua portuguesa", "grade_key": "9o ano", "is_multiple_choice": True},
+        sort=[("_id", 1)],
+        expected_index="idx_q_subject_grade_type"
+    ),
+    HotQuery(
+        "questions_by_user_subject", "questions",
+        {"user_email": _SAMPLE_EMAIL, "subject_key": "matematica"},
+        sort=[("_id", 1)],
+        expected_index="idx_q_user_subject_grade"
+    ),
+    HotQuery(
+        "questions_by_lsh_bands", "questions",
+        {"lsh_bands": {"$in": ["00" + "0" * 16, "01" + "0" * 16]}},
+        expected_index="idx_q_lsh_bands"
+    ),
+    HotQuery(
+        "azure_response_by_document", "azure_responses",
+        {"document_id": "explain"},
+        expected_index="idx_document_id"
+    ),
+]
@@ -0,0 +1,320 @@
+"""
+Gerenciador de índices e migrações de dados (MongoDB)
+
+- ``ensure_indexes``: confirma que os índices de ``REQUIRED_INDEXES`` existem
+  (por chave, independente do nome) e cria os ausentes
+- ``run_backfill``: atualiza documentos em lotes ordenados por _id com
+  ``bulk_write``, gravando checkpoint após cada lote; uma execução
+  interrompida continua do último _id processado
+- ``check_query_plans``: executa ``explain()`` das consultas críticas e aponta
+  planos com COLLSCAN
+
+As migrações em JavaScript (scripts/migrations/) continuam válidas; este
+serviço verifica o resultado delas a partir da própria aplicação.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from pymongo import IndexModel, UpdateOne
+
+from app.services.infrastructure import MongoDBConnectionService, write_timeout
+from .indexes import HOT_QUERIES, REQUIRED_INDEXES, HotQuery, IndexSpec
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexCheckResult:
+    """Resultado da verificação de índices."""
+
+    present: List[str] = field(default_factory=list)
+    created: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.failed
+
+
+@dataclass
+class QueryPlanCheck:
+    """Plano vencedor de uma consulta crítica."""
+
+    query: str
+    collection: str
+    stages: List[str]
+    indexes: List[str]
+    expected_index: Optional[str] = None
+
+    @property
+    def collscan(self) -> bool:
+        return "COLLSCAN" in self.stages
+
+    @property
+    def ok(self) -> bool:
+        if self.collscan:
+            return False
+        return self.expected_index is None or self.expected_index in self.indexes
+
+
+@dataclass
+class Backfill:
+    """
+    Atualização de dados em lotes.
+
+    ``transform`` recebe o documento (com ``projection``) e devolve os campos
+    do ``$set`` ou None para não alterar o documento. ``on_batch`` (opcional)
+    recebe a database e o lote para gravações em outras coleções e devolve a
+    quantidade de documentos gravados.
+    """
+
+    name: str
+    collection: str
+    query: Dict[str, Any]
+    transform: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    projection: Optional[Dict[str, Any]] = None
+    batch_size: int = 500
+    on_batch: Optional[Callable[[Any, List[Dict[str, Any]]], Awaitable[int]]] = None
+
+
+@dataclass
+class BackfillReport:
+    """Progresso de um backfill (também persistido como checkpoint)."""
+
+    name: str
+    scanned: int = 0
+    updated: int = 0
+    batches: int = 0
+    resumed: bool = False
+    completed: bool = False
+
+
+class MongoDBMigrationManager:
+    """Verificação/criação de índices, backfills retomáveis e checagem de planos."""
+
+    CHECKPOINTS_COLLECTION = "migration_checkpoints"
+
+    def __init__(self, connection_service: MongoDBConnectionService):
+        self._connection_service = connection_service
+        self._logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------
+    # Índices
+    # ------------------------------------------------------------------
+
+    async def ensure_indexes(
+        self,
+        specs: Iterable[IndexSpec] = REQUIRED_INDEXES,
+        create_missing: bool = True
+    ) -> IndexCheckResult:
+        """
+        Confirma que os índices exigidos existem, criando os ausentes.
+
+        Um índice existente com as mesmas chaves e outro nome é aceito.
+
+        Args:
+            specs: Índices exigidos
+            create_missing: Cria os índices ausentes (False apenas reporta)
+
+        Returns:
+            IndexCheckResult com presentes, criados, ausentes e falhas
+        """
+        database = await self._connection_service.get_database()
+        result = IndexCheckResult()
+        existing_by_collection: Dict[str, Dict[tuple, str]] = {}
+
+        for spec in specs:
+            if spec.collection not in existing_by_collection:
+                existing_by_collection[spec.collection] = {
+                    tuple(index["key"].items()): index["name"]
+                    async for index in database[spec.collection].list_indexes()
+                }
+            existing = existing_by_collection[spec.collection]
+
+            if spec.stored_keys in existing:
+                result.present.append(spec.name)
+                continue
+            if not create_missing:
+                result.missing.append(spec.name)
+                continue
+
+            try:
+                await database[spec.collection].create_indexes(
+                    [IndexModel(list(spec.keys), name=spec.name, **spec.options)]
+                )
+                existing[spec.stored_keys] = spec.name
+                result.created.append(spec.name)
+            except Exception as e:
+                result.failed[spec.name] = str(e)
+
+        log = self._logger.info if result.ok else self._logger.warning
+        log({
+            "event": "mongodb_indexes_checked",
+            "present": len(result.present),
+            "created": result.created,
+            "missing": result.missing,
+            "failed": result.failed
+        })
+        return result
+
+    # ------------------------------------------------------------------
+    # Backfills
+    # ------------------------------------------------------------------
+
+    async def run_backfill(
+        self,
+        backfill: Backfill,
+        dry_run: bool = False,
+        max_batches: Optional[int] = None
+    ) -> BackfillReport:
+        """
+        Executa o backfill em lotes ordenados por _id, com checkpoint por lote.
+
+        Uma execução interrompida (ou limitada por ``max_batches``) continua do
+        último _id gravado no checkpoint. Após concluir, a próxima execução
+        recomeça do início: a ``query`` deve excluir documentos já migrados ou
+        a gravação deve ser idempotente.
+
+        Args:
+            backfill: Definição do backfill
+            dry_run: Apenas percorre e conta, sem gravar nem salvar checkpoint
+            max_batches: Interrompe após N lotes (retomável)
+
+        Returns:
+            BackfillReport com documentos percorridos/atualizados
+        """
+        database = await self._connection_service.get_database()
+        collection = database[backfill.collection]
+        checkpoints = database[self.CHECKPOINTS_COLLECTION]
+
+        checkpoint = await checkpoints.find_one({"_id": backfill.name})
+        report = BackfillReport(name=backfill.name)
+        last_id = None
+        if checkpoint and not checkpoint.get("completed"):
+            last_id = checkpoint.get("last_id")
+            report.scanned = checkpoint.get("scanned", 0)
+            report.updated = checkpoint.get("updated", 0)
+            report.resumed = last_id is not None
+
+        while max_batches is None or report.batches < max_batches:
+            query = dict(backfill.query)
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            cursor = collection.find(query, projection=backfill.projection).sort("_id", 1)
+            batch = await cursor.to_list(length=backfill.batch_size)
+            if not batch:
+                report.completed = True
+                break
+
+            operations = []
+            for doc in batch:
+                changes = backfill.transform(doc)
+                if changes:
+                    operations.append(UpdateOne({**backfill.query, "_id": doc["_id"]}, {"$set": changes}))
+
+            if operations and not dry_run:
+                with write_timeout():
+                    result = await collection.bulk_write(operations, ordered=False)
+                report.updated += result.modified_count
+            elif dry_run:
+                report.updated += len(operations)
+            if backfill.on_batch is not None and not dry_run:
+                report.updated += await backfill.on_batch(database, batch)
+
+            report.scanned += len(batch)
+            report.batches += 1
+            last_id = batch[-1]["_id"]
+            if not dry_run:
+                await self._save_checkpoint(checkpoints, report, last_id)
+
+        if report.completed and not dry_run:
+            await self._save_checkpoint(checkpoints, report, last_id)
+
+        self._logger.info({
+            "event": "mongodb_backfill_finished" if report.completed else "mongodb_backfill_paused",
+            "backfill": backfill.name,
+            "scanned": report.scanned,
+            "updated": report.updated,
+            "batches": report.batches,
+            "resumed": report.resumed,
+            "dry_run": dry_run
+        })
+        return report
+
+    @staticmethod
+    async def _save_checkpoint(checkpoints, report: BackfillReport, last_id: Any) -> None:
+        await checkpoints.update_one(
+            {"_id": report.name},
+            {"$set": {
+                "last_id": last_id,
+                "scanned": report.scanned,
+                "updated": report.updated,
+                "completed": report.completed,
+                "updated_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+
+    # ------------------------------------------------------------------
+    # Planos de consulta
+    # ------------------------------------------------------------------
+
+    async def check_query_plans(self, queries: Iterable[HotQuery] = HOT_QUERIES) -> List[QueryPlanCheck]:
+        """
+        Executa ``explain()`` das consultas críticas.
+
+        Returns:
+            Um QueryPlanCheck por consulta (``ok`` False para COLLSCAN ou
+            índice diferente do esperado)
+        """
+        database = await self._connection_service.get_database()
+        checks: List[QueryPlanCheck] = []
+
+        for query in queries:
+            cursor = database[query.collection].find(query.filter)
+            if query.sort:
+                cursor = cursor.sort(query.sort)
+            explain = await cursor.limit(1).explain()
+
+            stages: List[str] = []
+            indexes: List[str] = []
+            _walk_plan(explain.get("queryPlanner", {}).get("winningPlan", {}), stages, indexes)
+            check = QueryPlanCheck(
+                query=query.name,
+                collection=query.collection,
+                stages=stages,
+                indexes=indexes,
+                expected_index=query.expected_index
+            )
+            checks.append(check)
+
+            if not check.ok:
+                self._logger.warning({
+                    "event": "mongodb_query_plan_unexpected",
+                    "query": query.name,
+                    "stages": stages,
+                    "indexes": indexes,
+                    "expected_index": query.expected_index
+                })
+        return checks
+
+
+def _walk_plan(plan: Dict[str, Any], stages: List[str], indexes: List[str]) -> None:
+    """Coleta estágios e índices do plano (formato clássico e SBE)."""
+    if not plan:
+        return
+    if "queryPlan" in plan:
+        _walk_plan(plan["queryPlan"], stages, indexes)
+        return
+    if "stage" in plan:
+        stages.append(plan["stage"])
+    if "indexName" in plan:
+        indexes.append(plan["indexName"])
+    if "inputStage" in plan:
+        _walk_plan(plan["inputStage"], stages, indexes)
+    for child in plan.get("inputStages", []):
+        _walk_plan(child, stages, indexes)
@@ -4,19 +4,66 @@ Implementação MongoDB do serviço de persistência
 Implementa ISimplePersistenceService conforme escopo original do prompt.
 Apenas operações essenciais sem complexidade desnecessária.
 """
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, AsyncIterator, Sequence, Tuple, Union
 from datetime import datetime
-from pymongo.errors import PyMongoError
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
 
-from app.models.persistence import AnalyzeDocumentRecord, AzureProcessingDataRecord, AzureResponseRecord
-from app.services.infrastructure import MongoDBConnectionService
+from app.config.settings import get_settings
+
+from app.models.persistence import (
+    AnalyzeDocumentRecord,
+    AzureProcessingDataRecord,
+    AzureResponseRecord,
+    DocumentStatus,
+    DocumentSummary,
+    QuestionRecord,
+    normalize_subject_key,
+)
+from app.services.infrastructure import MongoDBConnectionService, write_timeout
 from .i_simple_persistence_service import ISimplePersistenceService
 from .exceptions import PersistenceError
+from .azure_response_payload_store import AzureResponsePayloadStore
+from .write_behind_queue import PendingWrite, WriteBehindQueue
+from .document_list_query import (
+    DEFAULT_SORT,
+    DocumentListCursor,
+    DocumentSummaryPage,
+    SUMMARY_PROJECTION,
+    list_sort,
+)
+from .document_search_query import (
+    SEARCH_PROJECTION,
+    SEARCH_SORT,
+    DocumentSearchPage,
+    build_search_query,
+)
+from .processing_metrics_query import (
+    PROCESSING_METRICS_COLLECTION,
+    LatencyPercentiles,
+    build_percentile_pipeline,
+    summarize_groups,
+    validate_group_by,
+)
+from .question_query import (
+    QUESTION_LIST_PROJECTION,
+    QUESTIONS_COLLECTION,
+    QuestionPage,
+    build_question_query,
+    decode_question_cursor,
+    encode_question_cursor,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Código de erro do MongoDB para chave duplicada (regravação de um lote já aplicado)
+_DUPLICATE_KEY_ERROR = 11000
+# Operador de agregação desconhecido (ex.: $percentile antes do MongoDB 7)
+_UNKNOWN_OPERATOR_ERRORS = (15952, 168)
+
 
 class MongoDBPersistenceService(ISimplePersistenceService):
     """
@@ -34,7 +81,24 @@ class MongoDBPersistenceService(ISimplePersistenceService):
             connection_service: Serviço de conexão MongoDB via DI Container
         """
         self._connection_service = connection_service
+        self._payload_store = AzureResponsePayloadStore(connection_service)
         self._logger = logging.getLogger(__name__)
+        # Totais da listagem: (email, start, end) -> (expira_em, total)
+        self._count_cache: Dict[Tuple[Any, ...], Tuple[float, int]] = {}
+        # False após o servidor recusar $percentile (MongoDB < 7): usa $push
+        self._server_percentile = True
+        
+        settings = get_settings()
+        self._write_behind_enabled = settings.write_behind_enabled
+        self._write_behind_shutdown_timeout = settings.write_behind_shutdown_timeout_seconds
+        self._write_behind = WriteBehindQueue(
+            flush=self._flush_write_batch,
+            record_types=(AnalyzeDocumentRecord, AzureResponseRecord, AzureProcessingDataRecord),
+            journal_dir=settings.write_behind_journal_dir,
+            batch_size=settings.write_behind_batch_size,
+            flush_interval_seconds=settings.write_behind_flush_interval_ms / 1000,
+            max_pending_bytes=settings.write_behind_max_pending_bytes
+        )
         self._logger.info("MongoDBPersistenceService initialized with connection service")
 
     async def save_analysis_result(self, analysis_record: AnalyzeDocumentRecord) -> str:
@@ -59,7 +123,21 @@ class MongoDBPersistenceService(ISimplePersistenceService):
             doc_data = analysis_record.dict_for_mongo()
             
             # Insere documento
-            result = await collection.insert_one(doc_data)
+            with write_timeout():
+                result = await collection.insert_one(doc_data)
+            self._invalidate_count_cache(analysis_record.user_email)
+            
+            # Banco de questões: falha aqui não desfaz a análise (backfill 'questions' completa)
+            try:
+                questions = await asyncio.to_thread(self._question_documents, [analysis_record])
+                if questions:
+                    await self._insert_many_idempotent(database[QUESTIONS_COLLECTION], questions)
+            except Exception as e:
+                self._logger.warning({
+                    "event": "questions_fan_out_failed",
+                    "document_id": analysis_record.id,
+                    "error": str(e)
+                })
             
             self._logger.info({
                 "event": "analysis_result_saved",
@@ -88,6 +166,128 @@ class MongoDBPersistenceService(ISimplePersistenceService):
             })
             raise PersistenceError(error_msg)
 
+    async def start_write_behind(self) -> None:
+        """Inicia a fila write-behind (lifespan), regravando o journal pendente."""
+        if not self._write_behind_enabled:
+            self._logger.info({"event": "write_behind_disabled"})
+            return
+        await self._write_behind.start()
+
+    async def stop_write_behind(self) -> None:
+        """Drena a fila write-behind no shutdown (o restante fica no journal)."""
+        await self._write_behind.stop(timeout=self._write_behind_shutdown_timeout)
+
+    async def enqueue_write(
+        self,
+        record: Union[AnalyzeDocumentRecord, AzureResponseRecord, AzureProcessingDataRecord]
+    ) -> str:
+        """
+        Agenda a gravação do registro sem aguardar o MongoDB (write-behind).
+        
+        O registro vai para o journal local e é gravado em lote em background;
+        até lá continua visível em get_by_document_id/check_duplicate_document.
+        Sem a fila ativa (desabilitada ou em shutdown) grava diretamente.
+        
+        Args:
+            record: AnalyzeDocumentRecord, AzureResponseRecord ou
+                AzureProcessingDataRecord com _id pré-alocado
+            
+        Returns:
+            _id do registro
+            
+        Raises:
+            PersistenceError: Falha ao gravar (journal ou gravação direta)
+        """
+        if self._write_behind.running:
+            try:
+                return await self._write_behind.put(record)
+            except RuntimeError:
+                pass  # Fila encerrando: grava diretamente
+            except OSError as e:
+                raise PersistenceError(f"Failed to journal write-behind record: {str(e)}")
+        
+        if isinstance(record, AzureResponseRecord):
+            return await self.save_azure_response(record)
+        if isinstance(record, AzureProcessingDataRecord):
+            return await self.save_azure_processing_data(record)
+        return await self.save_analysis_result(record)
+
+    async def _flush_write_batch(self, batch: Sequence[PendingWrite]) -> None:
+        """Grava um lote da fila write-behind (insert_many por coleção)."""
+        database = await self._connection_service.get_database()
+        analyses = [p.record for p in batch if isinstance(p.record, AnalyzeDocumentRecord)]
+        azure_pending = [p for p in batch if isinstance(p.record, AzureResponseRecord)]
+        processing_metrics = [p.record for p in batch if isinstance(p.record, AzureProcessingDataRecord)]
+        
+        if azure_pending:
+            await asyncio.gather(*(self._store_azure_payload(p) for p in azure_pending))
+            await self._insert_many_idempotent(
+                database["azure_responses"],
+                [p.record.dict_for_mongo(exclude={"azure_response"}) for p in azure_pending]
+            )
+        if analyses:
+            await self._insert_many_idempotent(
+                database["analyze_documents"],
+                [record.dict_for_mongo() for record in analyses]
+            )
+            for email in {record.user_email for record in analyses}:
+                self._invalidate_count_cache(email)
+            # Regravação do lote é idempotente: _id da questão = documento + posição
+            questions = await asyncio.to_thread(self._question_documents, analyses)
+            if questions:
+                await self._insert_many_idempotent(database[QUESTIONS_COLLECTION], questions)
+        if processing_metrics:
+            await self._insert_many_idempotent(
+                database[PROCESSING_METRICS_COLLECTION],
+                [record.dict_for_mongo() for record in processing_metrics]
+            )
+        
+        self._logger.info({
+            "event": "write_behind_batch_saved",
+            "status": "success",
+            "analyze_documents": len(analyses),
+            "azure_responses": len(azure_pending),
+            "processing_metrics": len(processing_metrics)
+        })
+
+    async def _store_azure_payload(self, pending: PendingWrite) -> None:
+        record = pending.record
+        if record.azure_response is None or record.azure_response_ref is not None:
+            return
+        if pending.replayed:
+            # Execução anterior pode ter gravado o payload parcialmente
+            await self._payload_store.delete_if_exists(record.id)
+        record.azure_response_ref = await self._payload_store.put(
+            record.id, record.azure_response, filename=record.file_name
+        )
+
+    @staticmethod
+    def _question_documents(records: Sequence[AnalyzeDocumentRecord]) -> List[Dict[str, Any]]:
+        """Documentos da coleção 'questions' das análises concluídas."""
+        return [
+            question.dict_for_mongo()
+            for record in records
+            if record.status == DocumentStatus.COMPLETED
+            for question in QuestionRecord.from_analysis(
+                document_id=record.id,
+                user_email=record.user_email,
+                response=record.response,
+                summary=record.summary.dict() if record.summary else None,
+                created_at=record.created_at
+            )
+        ]
+
+    @staticmethod
+    async def _insert_many_idempotent(collection, documents: List[Dict[str, Any]]) -> None:
+        try:
+            with write_timeout():
+                await collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # _id pré-alocado: chave duplicada = registro já gravado em tentativa anterior
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != _DUPLICATE_KEY_ERROR for err in errors):
+                raise
+
     async def save_azure_processing_data(self, azure_data_record: AzureProcessingDataRecord) -> str:
         """
         Persiste dados de processamento do Azure.
@@ -104,13 +304,14 @@ class MongoDBPersistenceService(ISimplePersistenceService):
         try:
             # get_database() já valida a conexão e lança ConnectionError se falhar
             database = await self._connection_service.get_database()
-            collection = database["azure_processing_data"]
+            collection = database[PROCESSING_METRICS_COLLECTION]
             
             # Converte para formato MongoDB
             doc_data = azure_data_record.dict_for_mongo()
             
             # Insere documento
-            result = await collection.insert_one(doc_data)
+            with write_timeout():
+                result = await collection.insert_one(doc_data)
             
             self._logger.info({
                 "event": "azure_data_saved",
@@ -143,6 +344,9 @@ class MongoDBPersistenceService(ISimplePersistenceService):
         """
         Persiste response completo do Azure Document Intelligence.
         
+        O JSON bruto vai comprimido para o GridFS; 'azure_responses' recebe
+        apenas os metadados e a referência (azure_response_ref).
+        
         Args:
             azure_response_record: Response completo do Azure
             
@@ -156,19 +360,35 @@ class MongoDBPersistenceService(ISimplePersistenceService):
             database = await self._connection_service.get_database()
             collection = database["azure_responses"]
             
-            # Converte para formato MongoDB
-            doc_data = azure_response_record.dict_for_mongo()
+            if azure_response_record.azure_response is not None:
+                azure_response_record.azure_response_ref = await self._payload_store.put(
+                    azure_response_record.id,
+                    azure_response_record.azure_response,
+                    filename=azure_response_record.file_name
+                )
+            
+            # Converte para formato MongoDB (sem o payload inline)
+            doc_data = azure_response_record.dict_for_mongo(exclude={"azure_response"})
             
             # Insere documento
-            result = await collection.insert_one(doc_data)
+            try:
+                with write_timeout():
+                    result = await collection.insert_one(doc_data)
+            except Exception:
+                if azure_response_record.azure_response_ref is not None:
+                    await self._payload_store.delete(azure_response_record.azure_response_ref.file_id)
+                raise
             
+            ref = azure_response_record.azure_response_ref
             self._logger.info({
                 "event": "azure_response_saved",
                 "status": "success",
                 "document_id": str(result.inserted_id),
                 "operation": "save_azure_response",
                 "file_name": azure_response_record.file_name,
-                "page_count": azure_response_record.page_count
+                "page_count": azure_response_record.page_count,
+                "payload_raw_bytes": ref.raw_bytes if ref else None,
+                "payload_stored_bytes": ref.stored_bytes if ref else None
             })
             return str(result.inserted_id)
             
@@ -191,6 +411,39 @@ class MongoDBPersistenceService(ISimplePersistenceService):
             })
             raise PersistenceError(error_msg)
 
+    async def load_azure_response(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Carrega sob demanda o response bruto do Azure de um documento.
+        
+        Args:
+            document_id: ID do documento em analyze_documents
+            
+        Returns:
+            Response do Azure ou None se não houver registro
+            
+        Raises:
+            PersistenceError: Erro durante busca
+        """
+        try:
+            database = await self._connection_service.get_database()
+            doc = await database["azure_responses"].find_one(
+                {"document_id": document_id},
+                projection={"azure_response_ref": 1, "azure_response": 1},
+                sort=[("created_at", -1)]
+            )
+            if doc is None:
+                return None
+            return await self._payload_store.resolve(doc)
+        except Exception as e:
+            self._logger.error({
+                "event": "load_azure_response_error",
+                "status": "error",
+                "operation": "load_azure_response",
+                "document_id": document_id,
+                "error": str(e)
+            })
+            raise PersistenceError(f"Failed to load Azure response: {str(e)}")
+
     async def get_by_document_id(self, document_id: str) -> Optional[AnalyzeDocumentRecord]:
         """
         Recupera registro por ID do documento.
@@ -204,6 +457,10 @@ class MongoDBPersistenceService(ISimplePersistenceService):
         Raises:
             PersistenceError: Erro durante busca
         """
+        pending = self._write_behind.get(document_id)
+        if isinstance(pending, AnalyzeDocumentRecord):
+            return pending
+        
         try:
             database = await self._connection_service.get_database()
             collection = database["analyze_documents"]
@@ -219,6 +476,10 @@ class MongoDBPersistenceService(ISimplePersistenceService):
                 # Se não é ObjectId válido, busca como string
                 doc_data = await collection.find_one({"_id": document_id})
             
+            if doc_data is None:
+                # Registros anteriores ao _id pré-alocado: id do response (idx_response_document_id)
+                doc_data = await collection.find_one({"response.document_id": document_id})
+            
             if doc_data is None:
                 return None
                 
@@ -382,27 +643,393 @@ class MongoDBPersistenceService(ISimplePersistenceService):
             self._logger.error(f"Error getting documents with filters for email {email}: {e}")
             raise PersistenceError(f"Failed to get documents with filters: {str(e)}")
 
+    async def get_document_summaries_page(
+        self,
+        email: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        include_total: bool = False,
+        subject: Optional[str] = None,
+        sort_by: str = DEFAULT_SORT
+    ) -> DocumentSummaryPage:
+        """
+        Página leve da listagem: apenas campos de resumo, paginação keyset.
+        
+        Com ``cursor`` a busca continua a partir do último item entregue usando
+        os índices idx_user_created_at / idx_user_question_count /
+        idx_user_subject_created_at (sem skip). Sem cursor, ``page`` > 1 ainda
+        é aceito via skip para compatibilidade com clientes antigos.
+        
+        Args:
+            email: Email do usuário (obrigatório)
+            start_date: Data início do intervalo (opcional)
+            end_date: Data fim do intervalo (opcional)
+            page_size: Itens por página
+            cursor: Token next_cursor da página anterior (opcional)
+            page: Página (1-indexed) quando não há cursor
+            include_total: Calcula o total (cacheado por alguns segundos)
+            subject: Filtra pela matéria (sem diferenciar acentos/maiúsculas)
+            sort_by: Ordenação ("created_at" ou "question_count", desc)
+            
+        Returns:
+            DocumentSummaryPage com itens projetados e next_cursor
+            
+        Raises:
+            ValueError: Cursor inválido
+            PersistenceError: Erro durante busca
+        """
+        keyset = DocumentListCursor.decode(cursor) if cursor else None
+        if keyset is not None and keyset.sort_by != sort_by:
+            raise ValueError(f"Cursor was issued for sort_by={keyset.sort_by!r}")
+        
+        try:
+            database = await self._connection_service.get_database()
+            collection = database["analyze_documents"]
+            
+            base_query: Dict[str, Any] = {"user_email": email}
+            if start_date is not None and end_date is not None:
+                base_query["created_at"] = {"$gte": start_date, "$lte": end_date}
+            subject_key = normalize_subject_key(subject)
+            if subject_key:
+                base_query["summary.subject_key"] = subject_key
+            
+            query = {"$and": [base_query, keyset.to_query()]} if keyset else base_query
+            
+            # page_size + 1 para saber se há próxima página sem contar
+            find_cursor = collection.find(query, SUMMARY_PROJECTION).sort(list_sort(sort_by))
+            if keyset is None and page > 1:
+                find_cursor = find_cursor.skip((page - 1) * page_size)
+            find_cursor = find_cursor.limit(page_size + 1)
+            
+            items = [doc async for doc in find_cursor]
+            next_cursor = None
+            if len(items) > page_size:
+                items = items[:page_size]
+                next_cursor = DocumentListCursor.from_document(items[-1], sort_by).encode()
+            
+            total_count = None
+            if include_total:
+                total_count = await self._count_documents_cached(
+                    collection, base_query, (email, start_date, end_date, subject_key)
+                )
+            
+            self._logger.info({
+                "event": "document_summaries_page",
+                "email": email,
+                "returned": len(items),
+                "keyset": keyset is not None,
+                "has_next": next_cursor is not None,
+                "total": total_count
+            })
+            
+            return DocumentSummaryPage(items=items, next_cursor=next_cursor, total_count=total_count)
+            
+        except Exception as e:
+            self._logger.error(f"Error getting document summaries for email {email}: {e}")
+            raise PersistenceError(f"Failed to get document summaries: {str(e)}")
+
+    async def search_documents(
+        self,
+        email: str,
+        text: str,
+        page: int = 1,
+        page_size: int = 10
+    ) -> DocumentSearchPage:
+        """
+        Busca textual nas análises concluídas do usuário (índice idx_search_text).
+        
+        Resultados ordenados por relevância (textScore) e paginados por skip;
+        a busca só percorre as entradas do usuário no índice.
+        
+        Args:
+            email: Email do usuário (obrigatório)
+            text: Termos da busca (aceita "frase" e -exclusão)
+            page: Página (1-indexed)
+            page_size: Itens por página
+            
+        Returns:
+            DocumentSearchPage com itens projetados (com ``score``)
+            
+        Raises:
+            PersistenceError: Erro durante busca
+        """
+        try:
+            database = await self._connection_service.get_database()
+            find_cursor = database["analyze_documents"].find(
+                build_search_query(email, text), SEARCH_PROJECTION
+            ).sort(SEARCH_SORT).skip((page - 1) * page_size).limit(page_size + 1)
+            items = [doc async for doc in find_cursor]
+        except Exception as e:
+            self._logger.error(f"Error searching documents for email {email}: {e}")
+            raise PersistenceError(f"Failed to search documents: {str(e)}")
+        
+        self._logger.info({
+            "event": "document_search",
+            "email": email,
+            "page": page,
+            "returned": min(len(items), page_size)
+        })
+        return DocumentSearchPage(items=items[:page_size], page=page, has_next=len(items) > page_size)
+
+    async def get_processing_metrics_percentiles(
+        self,
+        since: datetime,
+        group_by: Sequence[str] = ("day",),
+        cache_outcome: str = "miss"
+    ) -> List[LatencyPercentiles]:
+        """
+        Percentis p50/p95/p99 das durações gravadas em 'azure_processing_data'.
+        
+        Args:
+            since: Considera análises a partir desta data (UTC)
+            group_by: Dimensões do agrupamento (day, page_bucket, stage)
+            cache_outcome: 'miss' (análises executadas) ou 'hit' (duplicatas)
+            
+        Returns:
+            Percentis por grupo, ordenados pela chave
+            
+        Raises:
+            ValueError: Dimensão desconhecida
+            PersistenceError: Erro durante a agregação
+        """
+        validate_group_by(group_by)
+        try:
+            database = await self._connection_service.get_database()
+            collection = database[PROCESSING_METRICS_COLLECTION]
+            try:
+                groups = await self._aggregate_percentiles(collection, since, group_by, cache_outcome)
+            except OperationFailure as e:
+                if not self._server_percentile or e.code not in _UNKNOWN_OPERATOR_ERRORS:
+                    raise
+                self._server_percentile = False
+                self._logger.warning(f"⚠️ $percentile unsupported by MongoDB server, using $push: {e}")
+                groups = await self._aggregate_percentiles(collection, since, group_by, cache_outcome)
+        except Exception as e:
+            self._logger.error(f"Error aggregating processing metrics: {e}")
+            raise PersistenceError(f"Failed to aggregate processing metrics: {str(e)}")
+        
+        return await asyncio.to_thread(summarize_groups, groups)
+
+    async def _aggregate_percentiles(
+        self,
+        collection,
+        since: datetime,
+        group_by: Sequence[str],
+        cache_outcome: str
+    ) -> List[Dict[str, Any]]:
+        pipeline = build_percentile_pipeline(since, group_by, cache_outcome, self._server_percentile)
+        return [group async for group in collection.aggregate(pipeline, allowDiskUse=True)]
+
+    async def iter_analyses_for_export(
+        self,
+        email: Optional[str] = None,
+        school: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_response: bool = False,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Percorre as análises concluídas direto do cursor Motor, em lotes.
+        
+        Sem ``include_response`` apenas os campos de resumo (mais o cabeçalho)
+        são transferidos; ``response_json`` nunca é exportado.
+        
+        Args:
+            email: Restringe a um usuário (opcional)
+            school: Escola do cabeçalho (response.header.school, opcional)
+            start_date: Data início do intervalo (opcional)
+            end_date: Data fim do intervalo (opcional)
+            include_response: Inclui o response completo
+            batch_size: Documentos por lote do cursor MongoDB
+            
+        Yields:
+            Documentos projetados na ordem natural da coleção
+        """
+        from app.models.persistence.enums import DocumentStatus
+        
+        query: Dict[str, Any] = {"status": DocumentStatus.COMPLETED.value}
+        if email:
+            query["user_email"] = email
+        if school:
+            query["response.header.school"] = school
+        if start_date is not None or end_date is not None:
+            query["created_at"] = {
+                key: value
+                for key, value in (("$gte", start_date), ("$lte", end_date))
+                if value is not None
+            }
+        
+        if include_response:
+            projection: Dict[str, Any] = {"response_json": 0}
+        else:
+            projection = {**SUMMARY_PROJECTION, "file_hash": 1, "response.header": 1}
+        
+        database = await self._connection_service.get_database()
+        cursor = database["analyze_documents"].find(query, projection, batch_size=batch_size)
+        
+        exported = 0
+        try:
+            async for doc in cursor:
+                exported += 1
+                yield doc
+        finally:
+            await cursor.close()
+            self._logger.info({
+                "event": "analyses_exported",
+                "email": email,
+                "school": school,
+                "include_response": include_response,
+                "exported": exported
+            })
+
+    async def get_questions_page(
+        self,
+        email: Optional[str] = None,
+        subject: Optional[str] = None,
+        grade: Optional[str] = None,
+        multiple_choice: Optional[bool] = None,
+        has_image: Optional[bool] = None,
+        document_id: Optional[str] = None,
+        page_size: int = 20,
+        cursor: Optional[str] = None
+    ) -> QuestionPage:
+        """
+        Página do banco de questões, paginação keyset por _id.
+        
+        Args:
+            email: Restringe às questões de um usuário (opcional)
+            subject: Matéria (sem diferenciar acentos/maiúsculas)
+            grade: Série/ano (sem diferenciar acentos/maiúsculas)
+            multiple_choice: Apenas questões com (True) ou sem (False) alternativas
+            has_image: Apenas questões com (True) ou sem (False) imagem
+            document_id: Questões de uma análise
+            page_size: Itens por página
+            cursor: Token next_cursor da página anterior (opcional)
+            
+        Returns:
+            QuestionPage com itens e next_cursor
+            
+        Raises:
+            ValueError: Cursor inválido
+            PersistenceError: Erro durante busca
+        """
+        query = build_question_query(email, subject, grade, multiple_choice, has_image, document_id)
+        if cursor:
+            query["_id"] = {"$gt": decode_question_cursor(cursor)}
+        
+        try:
+            database = await self._connection_service.get_database()
+            find_cursor = database[QUESTIONS_COLLECTION].find(
+                query, projection=QUESTION_LIST_PROJECTION
+            ).sort("_id", 1).limit(page_size + 1)
+            items = [doc async for doc in find_cursor]
+        except Exception as e:
+            self._logger.error(f"Error querying questions: {e}")
+            raise PersistenceError(f"Failed to query questions: {str(e)}")
+        
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            next_cursor = encode_question_cursor(items[-1]["_id"])
+        return QuestionPage(items=items, next_cursor=next_cursor)
+
+    async def get_question(self, question_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Recupera uma questão do banco de questões pelo _id.
+        
+        Raises:
+            PersistenceError: Erro durante busca
+        """
+        try:
+            database = await self._connection_service.get_database()
+            return await database[QUESTIONS_COLLECTION].find_one({"_id": question_id})
+        except Exception as e:
+            self._logger.error(f"Error retrieving question {question_id}: {e}")
+            raise PersistenceError(f"Failed to retrieve question: {str(e)}")
+
+    async def find_questions_by_lsh_bands(
+        self,
+        bands: List[str],
+        exclude_id: Optional[str] = None,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Candidatas a quase-duplicata pelo índice multikey idx_q_lsh_bands.
+        
+        Args:
+            bands: Chaves LSH da questão de referência
+            exclude_id: _id a excluir (a própria questão)
+            limit: Máximo de candidatas
+            
+        Returns:
+            Documentos das questões (com minhash, sem lsh_bands)
+            
+        Raises:
+            PersistenceError: Erro durante busca
+        """
+        if not bands:
+            return []
+        query: Dict[str, Any] = {"lsh_bands": {"$in": bands}}
+        if exclude_id is not None:
+            query["_id"] = {"$ne": exclude_id}
+        
+        try:
+            database = await self._connection_service.get_database()
+            find_cursor = database[QUESTIONS_COLLECTION].find(
+                query, projection={"lsh_bands": 0}
+            ).limit(limit)
+            return [doc async for doc in find_cursor]
+        except Exception as e:
+            self._logger.error(f"Error querying near-duplicate candidates: {e}")
+            raise PersistenceError(f"Failed to query near-duplicate candidates: {str(e)}")
+
+    async def _count_documents_cached(self, collection, query: Dict[str, Any], key: Tuple[Any, ...]) -> int:
+        """count_documents com cache TTL em memória (invalidado ao salvar; chave inicia pelo email)."""
+        ttl = get_settings().documents_count_cache_ttl_seconds
+        now = time.monotonic()
+        cached = self._count_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        total = await collection.count_documents(query)
+        if ttl > 0:
+            self._count_cache[key] = (now + ttl, total)
+        return total
+
+    def _invalidate_count_cache(self, email: str) -> None:
+        for key in [k for k in self._count_cache if k[0] == email]:
+            del self._count_cache[key]
+
     async def check_duplicate_document(
         self,
         email: str,
         filename: str,
-        file_size: int
+        file_size: int,
+        file_hash: Optional[str] = None
     ) -> Optional[AnalyzeDocumentRecord]:
         """
-        Verifica duplicata usando índice otimizado.
+        Verifica duplicata pelo conteúdo do arquivo usando índice otimizado.
         
         Busca documento com:
         - Mesmo email
-        - Mesmo filename
-        - Mesmo file_size
+        - Mesmo file_hash (SHA-256), independente do nome do arquivo
         - Status COMPLETED (docs FAILED são ignorados para permitir retry)
         
-        Performance: O(1) devido ao índice composto idx_duplicate_check
+        Registros anteriores ao file_hash (sem o campo) ainda são encontrados
+        por filename + file_size; ao serem encontrados recebem o file_hash
+        atual (backfill incremental), passando a responder pela busca por hash.
+        
+        Performance: O(1) devido aos índices idx_user_file_hash e idx_duplicate_check
         
         Args:
             email: Email do usuário
             filename: Nome do arquivo
             file_size: Tamanho do arquivo em bytes
+            file_hash: SHA-256 (hex) do conteúdo
             
         Returns:
             AnalyzeDocumentRecord se encontrado, None caso contrário
@@ -410,19 +1037,50 @@ class MongoDBPersistenceService(ISimplePersistenceService):
         try:
             from app.models.persistence.enums import DocumentStatus
             
+            if file_hash:
+                # Análise concluída ainda na fila write-behind
+                for record in self._write_behind.pending():
+                    if (
+                        isinstance(record, AnalyzeDocumentRecord)
+                        and record.user_email == email
+                        and record.file_hash == file_hash
+                        and record.status == DocumentStatus.COMPLETED
+                    ):
+                        return record
+            
             database = await self._connection_service.get_database()
             collection = database["analyze_documents"]
             
-            # Query otimizada com índice idx_duplicate_check
-            query = {
-                "user_email": email,
-                "file_name": filename,
-                "file_size": file_size,
-                "status": DocumentStatus.COMPLETED.value  # Apenas docs bem-sucedidos
-            }
+            doc = None
+            if file_hash:
+                # Query por conteúdo com índice idx_user_file_hash
+                doc = await collection.find_one({
+                    "user_email": email,
+                    "file_hash": file_hash,
+                    "status": DocumentStatus.COMPLETED.value  # Apenas docs bem-sucedidos
+                })
             
-            # Buscar documento (usa índice)
-            doc = await collection.find_one(query)
+            if doc is None:
+                # Fallback para registros legados (sem file_hash) com índice idx_duplicate_check
+                doc = await collection.find_one({
+                    "user_email": email,
+                    "file_name": filename,
+                    "file_size": file_size,
+                    "file_hash": {"$exists": False},
+                    "status": DocumentStatus.COMPLETED.value
+                })
+                
+                if doc is not None and file_hash:
+                    await collection.update_one(
+                        {"_id": doc["_id"], "file_hash": {"$exists": False}},
+                        {"$set": {"file_hash": file_hash}}
+                    )
+                    doc["file_hash"] = file_hash
+                    self._logger.info({
+                        "event": "file_hash_backfilled",
+                        "document_id": str(doc["_id"]),
+                        "filename": filename
+                    })
             
             if doc:
                 self._logger.info({
@@ -430,6 +1088,7 @@ class MongoDBPersistenceService(ISimplePersistenceService):
                     "email": email,
                     "filename": filename,
                     "file_size": file_size,
+                    "file_hash": file_hash,
                     "document_id": str(doc["_id"]),
                     "processed_at": doc.get("created_at")
                 })
@@ -453,13 +1112,15 @@ class MongoDBPersistenceService(ISimplePersistenceService):
         email: str,
         filename: str,
         file_size: int,
-        response_dict: dict
+        response_dict: dict,
+        file_hash: Optional[str] = None,
+        summary: Optional[DocumentSummary] = None
     ) -> str:
         """
         Método high-level para persistir resultado de análise completa.
         
         Encapsula toda a lógica de:
-        1. Criar AnalyzeDocumentRecord com status COMPLETED
+        1. Criar AnalyzeDocumentRecord com status COMPLETED e summary desnormalizado
         2. Salvar no MongoDB via save_analysis_result
         3. Tratar erros de persistência
         
@@ -468,6 +1129,8 @@ class MongoDBPersistenceService(ISimplePersistenceService):
             filename: Nome do arquivo
             file_size: Tamanho do arquivo em bytes
             response_dict: Dicionário com response completo (DocumentResponseDTO.dict())
+            file_hash: SHA-256 (hex) do conteúdo
+            summary: Resumo já calculado (padrão: extraído de response_dict)
             
         Returns:
             ID do documento salvo
@@ -491,7 +1154,9 @@ class MongoDBPersistenceService(ISimplePersistenceService):
                 file_name=filename,
                 file_size=file_size,
                 response=response_dict,
-                status=DocumentStatus.COMPLETED
+                status=DocumentStatus.COMPLETED,
+                file_hash=file_hash,
+                summary=summary or DocumentSummary.from_response(response_dict)
             )
             
             # Salvar no MongoDB
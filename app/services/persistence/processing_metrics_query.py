@@ -0,0 +1,142 @@
+"""
+Agregação das métricas de processamento por documento (coleção 'azure_processing_data')
+
+Percentis (p50/p95/p99) das durações gravadas a cada análise, agrupados por
+dia, faixa de páginas e/ou etapa. O MongoDB 7+ calcula os percentis no
+``$group`` com ``$percentile`` (método ``approximate``), sem materializar os
+valores de um grupo num único documento. Servidores mais antigos não têm o
+operador: os valores são agrupados com ``$push`` e os percentis calculados
+aqui (grupos limitados aos 16 MB de um documento). A etapa ``total`` é a
+duração da análise inteira e ``azure.<operação>`` o tempo nas chamadas ao
+Azure.
+"""
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+PROCESSING_METRICS_COLLECTION = "azure_processing_data"
+
+GROUP_DIMENSIONS = ("day", "page_bucket", "stage")
+TOTAL_STAGE = "total"
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class LatencyPercentiles:
+    """Percentis de duração (segundos) de um grupo."""
+
+    group: Dict[str, str]
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+def validate_group_by(group_by: Sequence[str]) -> None:
+    """
+    Raises:
+        ValueError: Dimensão desconhecida em ``group_by``
+    """
+    unknown = [dimension for dimension in group_by if dimension not in GROUP_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown group_by dimensions: {unknown}")
+
+
+def build_percentile_pipeline(
+    since: datetime,
+    group_by: Sequence[str],
+    cache_outcome: str = "miss",
+    server_percentile: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Pipeline de agregação com os percentis de duração de cada grupo.
+
+    Com ``server_percentile=False`` (MongoDB < 7) o grupo traz os valores
+    (``$push``) em vez dos percentis.
+
+    Raises:
+        ValueError: Dimensão desconhecida em ``group_by``
+    """
+    validate_group_by(group_by)
+
+    total = [{"k": TOTAL_STAGE, "v": "$metrics.processing_duration_seconds"}]
+    if "stage" in group_by:
+        stages: Any = {"$concatArrays": [
+            total,
+            {"$objectToArray": {"$ifNull": ["$metrics.stage_durations_seconds", {}]}},
+            {"$map": {
+                "input": {"$objectToArray": {"$ifNull": ["$metrics.azure_latency_seconds", {}]}},
+                "as": "call",
+                "in": {"k": {"$concat": ["azure.", "$$call.k"]}, "v": "$$call.v"}
+            }}
+        ]}
+    else:
+        stages = total
+
+    group_id: Dict[str, Any] = {}
+    if "day" in group_by:
+        group_id["day"] = "$day"
+    if "page_bucket" in group_by:
+        group_id["page_bucket"] = "$page_bucket"
+    if "stage" in group_by:
+        group_id["stage"] = "$stages.k"
+
+    return [
+        {"$match": {"created_at": {"$gte": since}, "metrics.cache_outcome": cache_outcome}},
+        {"$project": {
+            "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+            "page_bucket": {"$ifNull": ["$metrics.page_bucket", "unknown"]},
+            "stages": stages
+        }},
+        {"$unwind": "$stages"},
+        {"$match": {"stages.v": {"$type": "number"}}},
+        {"$group": _percentile_group(group_id) if server_percentile else {
+            "_id": group_id, "values": {"$push": "$stages.v"}
+        }}
+    ]
+
+
+def _percentile_group(group_id: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "_id": group_id,
+        "count": {"$sum": 1},
+        "percentiles": {"$percentile": {
+            "input": "$stages.v",
+            "p": [p / 100 for p in PERCENTILES],
+            "method": "approximate"
+        }},
+        "max": {"$max": "$stages.v"}
+    }
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Percentil por posto mais próximo (``sorted_values`` ordenado, não vazio)."""
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_groups(groups: Sequence[Dict[str, Any]]) -> List[LatencyPercentiles]:
+    """Percentis de cada grupo retornado pelo pipeline, ordenados pela chave."""
+    summaries = []
+    for group in groups:
+        if "percentiles" in group:
+            count, maximum = group["count"], group["max"]
+            p50, p95, p99 = (round(value, 3) for value in group["percentiles"])
+        else:
+            values = sorted(group["values"])
+            if not values:
+                continue
+            count, maximum = len(values), values[-1]
+            p50, p95, p99 = (round(percentile(values, p), 3) for p in PERCENTILES)
+        summaries.append(LatencyPercentiles(
+            group={key: str(value) for key, value in (group["_id"] or {}).items()},
+            count=count,
+            p50=p50,
+            p95=p95,
+            p99=p99,
+            max=round(maximum, 3)
+        ))
+    summaries.sort(key=lambda summary: [summary.group.get(d, "") for d in GROUP_DIMENSIONS])
+    return summaries
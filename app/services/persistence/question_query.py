@@ -0,0 +1,76 @@
+"""
+Consulta paginada do banco de questões (coleção 'questions')
+
+Filtros por igualdade nos campos normalizados (matéria, série, tipo) e
+paginação keyset por _id ascendente, que agrupa as questões por documento na
+ordem original. Os índices idx_q_subject_grade_type e idx_q_user_subject_grade
+cobrem filtros + ordenação.
+"""
+import base64
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.models.persistence.document_summary import normalize_subject_key
+
+QUESTIONS_COLLECTION = "questions"
+
+# Assinatura e chaves LSH ficam fora da listagem (usadas só na busca de similares)
+QUESTION_LIST_PROJECTION = {"minhash": 0, "lsh_bands": 0}
+
+
+def encode_question_cursor(last_id: str) -> str:
+    """Token opaco (base64 url-safe) do último _id entregue."""
+    return base64.urlsafe_b64encode(last_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_question_cursor(token: str) -> str:
+    """
+    _id a partir do token.
+
+    Raises:
+        ValueError: Token malformado
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def build_question_query(
+    email: Optional[str] = None,
+    subject: Optional[str] = None,
+    grade: Optional[str] = None,
+    multiple_choice: Optional[bool] = None,
+    has_image: Optional[bool] = None,
+    document_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Filtro MongoDB para os parâmetros informados (matéria/série sem acentos e maiúsculas)."""
+    query: Dict[str, Any] = {}
+    if email:
+        query["user_email"] = email
+    subject_key = normalize_subject_key(subject)
+    if subject_key:
+        query["subject_key"] = subject_key
+    grade_key = normalize_subject_key(grade)
+    if grade_key:
+        query["grade_key"] = grade_key
+    if multiple_choice is not None:
+        query["is_multiple_choice"] = multiple_choice
+    if has_image is not None:
+        query["has_image"] = has_image
+    if document_id:
+        query["document_id"] = document_id
+    return query
+
+
+@dataclass
+class QuestionPage:
+    """Página do banco de questões."""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
@@ -0,0 +1,474 @@
+"""
+Fila write-behind de persistência
+
+A requisição registra o documento no journal local (um arquivo por registro,
+com fsync) e retorna; uma task em background grava os pendentes no MongoDB em
+lotes. Se o MongoDB oscilar, os registros aguardam no journal e a gravação é
+repetida com backoff, sem que a latência chegue ao cliente.
+
+- Memória limitada por ``max_pending_bytes``: acima disso ``put`` aguarda
+  espaço (backpressure), em vez de acumular sem limite
+- Registros ainda não gravados continuam consultáveis via ``get``/``pending``
+- Só falhas transitórias (rede, timeout, failover) são repetidas; com outro
+  erro o lote é gravado registro a registro e o que falhar vai para
+  ``dead_letter/`` no journal, sem prender os demais
+- ``stop`` drena a fila no shutdown; o que não couber no timeout fica no
+  journal e é regravado no próximo ``start`` (ids pré-alocados tornam a
+  regravação idempotente)
+- Cada worker usa o próprio subdiretório ``worker-<host>-<pid>`` do journal,
+  travado com ``flock`` enquanto roda; no ``start`` só são adotados os
+  subdiretórios sem trava (workers encerrados), nunca os de workers vivos.
+  Sem fcntl (Windows) o subdiretório é por host e não há adoção
+"""
+import asyncio
+import itertools
+import logging
+import os
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Type
+
+from gridfs.errors import FileExists
+from pymongo.errors import (
+    BulkWriteError,
+    ConnectionFailure,
+    DuplicateKeyError,
+    ExecutionTimeout,
+    PyMongoError,
+    WTimeoutError,
+)
+
+from app.models.persistence.base_document import BaseDocument
+
+try:
+    import fcntl
+except ImportError:  # Windows: um subdiretório por host, sem adoção entre workers
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_JOURNAL_SUFFIX = ".json"
+DEAD_LETTER_DIR = "dead_letter"
+_WORKER_DIR_PREFIX = "worker-"
+_LOCK_FILE = ".lock"
+
+
+@dataclass
+class PendingWrite:
+    """
+    Registro aguardando gravação no MongoDB.
+
+    ``replayed`` indica que uma tentativa anterior (outra execução ou lote que
+    falhou) pode ter gravado o registro parcialmente.
+    """
+
+    record: BaseDocument
+    journal_path: Path
+    size: int
+    replayed: bool = False
+
+
+FlushFunction = Callable[[Sequence[PendingWrite]], Awaitable[None]]
+
+
+def is_retryable_write_error(error: BaseException) -> bool:
+    """
+    Falha transitória: rede, timeout, failover ou chave duplicada de regravação.
+
+    Os demais erros (documento acima de 16 MB, validação, falha do GridFS) não
+    se resolvem repetindo a gravação.
+    """
+    if isinstance(error, BulkWriteError):
+        details = error.details or {}
+        return not details.get("writeErrors") and bool(details.get("writeConcernErrors"))
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, (ConnectionFailure, ExecutionTimeout, WTimeoutError, DuplicateKeyError, FileExists)):
+        return True
+    if isinstance(error, PyMongoError):
+        return error.has_error_label("RetryableWriteError")
+    return False
+
+
+class WriteBehindQueue:
+    """Fila limitada com journal em disco e gravação em lote por task de background."""
+
+    def __init__(
+        self,
+        flush: FlushFunction,
+        record_types: Sequence[Type[BaseDocument]],
+        journal_dir: str,
+        batch_size: int = 20,
+        flush_interval_seconds: float = 0.2,
+        max_pending_bytes: int = 256 * 1024 * 1024,
+        max_retry_delay_seconds: float = 30.0,
+        is_retryable: Callable[[BaseException], bool] = is_retryable_write_error
+    ):
+        self._flush = flush
+        self._record_types: Dict[str, Type[BaseDocument]] = {t.__name__: t for t in record_types}
+        self._root_dir = Path(journal_dir)
+        self._journal_dir = self._root_dir
+        self._lock_file = None
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval_seconds
+        self._max_pending_bytes = max_pending_bytes
+        self._max_retry_delay = max_retry_delay_seconds
+        self._is_retryable = is_retryable
+
+        self._pending: "OrderedDict[str, PendingWrite]" = OrderedDict()
+        self._pending_bytes = 0
+        self._space = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._sequence = 0
+        self._logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> int:
+        """
+        Reenfileira o journal de execuções anteriores e inicia a task de gravação.
+
+        Returns:
+            Quantidade de registros recuperados do journal
+        """
+        if self.running:
+            return 0
+        self._stopping = False
+        adopted = await asyncio.to_thread(self._open_journal)
+        recovered = await asyncio.to_thread(self._read_journal)
+        for pending in recovered:
+            self._pending[pending.record.id] = pending
+            self._pending_bytes += pending.size
+        self._task = asyncio.create_task(self._run(), name="write-behind-flusher")
+
+        self._logger.info({
+            "event": "write_behind_started",
+            "journal_dir": str(self._journal_dir),
+            "recovered": len(recovered),
+            "adopted_from_other_workers": adopted
+        })
+        if recovered:
+            self._wakeup.set()
+        return len(recovered)
+
+    async def stop(self, timeout: float = 30.0) -> int:
+        """
+        Drena a fila e encerra a task de gravação.
+
+        Returns:
+            Registros que permaneceram no journal (não gravados no timeout)
+        """
+        if self._task is None:
+            return len(self._pending)
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+        remaining = len(self._pending)
+        await asyncio.to_thread(self._close_journal)
+        log = self._logger.warning if remaining else self._logger.info
+        log({"event": "write_behind_stopped", "remaining_in_journal": remaining})
+        return remaining
+
+    # ------------------------------------------------------------------
+    # Enfileiramento e leitura
+    # ------------------------------------------------------------------
+
+    async def put(self, record: BaseDocument) -> str:
+        """
+        Grava o registro no journal e agenda a persistência.
+
+        A serialização e o fsync rodam em thread; depois aguarda enquanto a
+        fila estiver acima de ``max_pending_bytes``.
+
+        Returns:
+            _id do registro (pré-alocado)
+
+        Raises:
+            RuntimeError: Fila não iniciada
+            TypeError: Tipo de registro não registrado na fila
+        """
+        if not self.running or self._stopping:
+            raise RuntimeError("Write-behind queue is not running")
+        kind = type(record).__name__
+        if kind not in self._record_types:
+            raise TypeError(f"Unsupported record type for write-behind: {kind}")
+
+        self._sequence += 1
+        path = self._journal_dir / f"{time.time_ns():020d}_{self._sequence:06d}_{kind}_{record.id}{_JOURNAL_SUFFIX}"
+        # Serializar um AzureResponseRecord de vários MB é CPU-bound: fora do event loop
+        size = await asyncio.to_thread(self._write_journal_file, path, record)
+
+        try:
+            async with self._space:
+                await self._space.wait_for(
+                    lambda: not self._pending or self._pending_bytes + size <= self._max_pending_bytes
+                )
+                self._pending_bytes += size
+        except BaseException:
+            await asyncio.to_thread(self._remove_journal_files, [path])
+            raise
+
+        self._pending[record.id] = PendingWrite(record=record, journal_path=path, size=size)
+        if len(self._pending) >= self._batch_size:
+            self._wakeup.set()
+        return record.id
+
+    def get(self, record_id: str) -> Optional[BaseDocument]:
+        """Registro ainda não gravado no MongoDB, se houver."""
+        pending = self._pending.get(record_id)
+        return pending.record if pending else None
+
+    def pending(self) -> List[BaseDocument]:
+        """Registros aguardando gravação (ordem de chegada)."""
+        return [pending.record for pending in self._pending.values()]
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Gravação em background
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        retry_delay = self._flush_interval
+        while True:
+            if not self._pending:
+                if self._stopping:
+                    return
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batch = list(self._pending.values())[:self._batch_size]
+            error = await self._try_flush(batch)
+            if error is not None and not self._is_retryable(error):
+                error = await self._isolate_failures(batch, error)
+            if error is None:
+                retry_delay = self._flush_interval
+                continue
+
+            self._logger.error({
+                "event": "write_behind_flush_failed",
+                "batch_size": len(batch),
+                "pending": len(self._pending),
+                "retry_in_seconds": retry_delay,
+                "error": str(error)
+            })
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, self._max_retry_delay)
+
+    async def _try_flush(self, batch: Sequence[PendingWrite]) -> Optional[Exception]:
+        """Grava o lote; devolve o erro em vez de lançar."""
+        try:
+            await self._flush(batch)
+        except Exception as e:
+            for pending in batch:
+                pending.replayed = True
+            return e
+        await self._complete(batch)
+        return None
+
+    async def _isolate_failures(self, batch: Sequence[PendingWrite], error: Exception) -> Optional[Exception]:
+        """
+        Grava o lote registro a registro após um erro não transitório.
+
+        Returns:
+            Erro transitório que interrompeu a gravação (lote volta ao retry)
+        """
+        if len(batch) == 1:
+            await self._dead_letter(batch[0], error)
+            return None
+        self._logger.warning({
+            "event": "write_behind_batch_split",
+            "batch_size": len(batch),
+            "error": str(error)
+        })
+        for pending in batch:
+            error = await self._try_flush([pending])
+            if error is None:
+                continue
+            if self._is_retryable(error):
+                return error
+            await self._dead_letter(pending, error)
+        return None
+
+    async def _dead_letter(self, pending: PendingWrite, error: Exception) -> None:
+        """Tira da fila um registro que não grava, movendo o journal para ``dead_letter/``."""
+        dead_letter_path = self._root_dir / DEAD_LETTER_DIR / pending.journal_path.name
+        try:
+            await asyncio.to_thread(self._move_journal_file, pending.journal_path, dead_letter_path)
+        except OSError as e:
+            # Fica no journal: volta a ser tentado (e descartado) no próximo start
+            dead_letter_path = pending.journal_path
+            self._logger.warning({"event": "write_behind_dead_letter_move_failed", "error": str(e)})
+        self._pending.pop(pending.record.id, None)
+        await self._release(pending.size)
+        self._logger.error({
+            "event": "write_behind_dead_lettered",
+            "record_id": pending.record.id,
+            "record_type": type(pending.record).__name__,
+            "file": str(dead_letter_path),
+            "error": str(error)
+        })
+
+    async def _complete(self, batch: Sequence[PendingWrite]) -> None:
+        for pending in batch:
+            self._pending.pop(pending.record.id, None)
+        await asyncio.to_thread(self._remove_journal_files, [p.journal_path for p in batch])
+        await self._release(sum(p.size for p in batch))
+
+    async def _release(self, size: int) -> None:
+        async with self._space:
+            self._pending_bytes -= size
+            self._space.notify_all()
+
+    # ------------------------------------------------------------------
+    # Journal (executado em thread)
+    # ------------------------------------------------------------------
+
+    def _open_journal(self) -> int:
+        """
+        Trava o subdiretório deste worker e adota o journal de workers encerrados.
+
+        Returns:
+            Arquivos adotados de outros subdiretórios (ou do layout antigo)
+        """
+        self._root_dir.mkdir(parents=True, exist_ok=True)
+        worker = f"{_WORKER_DIR_PREFIX}{socket.gethostname()}"
+        if fcntl is not None:
+            worker = f"{worker}-{os.getpid()}"
+        for attempt in itertools.count():
+            directory = self._root_dir / (worker if attempt == 0 else f"{worker}-{attempt}")
+            directory.mkdir(exist_ok=True)
+            self._lock_file = self._try_lock(directory)
+            if self._lock_file is not None:
+                self._journal_dir = directory
+                break
+
+        # Layout anterior: arquivos direto na raiz (rename atômico, um worker adota cada um)
+        adopted = sum(self._adopt_file(path) for path in self._root_dir.glob(f"*{_JOURNAL_SUFFIX}"))
+        if fcntl is None:
+            return adopted
+        for directory in self._root_dir.glob(f"{_WORKER_DIR_PREFIX}*"):
+            if directory == self._journal_dir or not directory.is_dir():
+                continue
+            lock_file = self._try_lock(directory)
+            if lock_file is None:
+                continue  # Worker vivo: o journal é dele
+            try:
+                adopted += sum(self._adopt_file(path) for path in directory.glob(f"*{_JOURNAL_SUFFIX}"))
+                self._remove_worker_dir(directory)
+            finally:
+                lock_file.close()
+        return adopted
+
+    def _close_journal(self) -> None:
+        """Libera a trava; remove o subdiretório se não sobrou nada a gravar."""
+        if self._lock_file is None:
+            return
+        if not any(self._journal_dir.glob(f"*{_JOURNAL_SUFFIX}")):
+            self._remove_worker_dir(self._journal_dir)
+        self._lock_file.close()
+        self._lock_file = None
+
+    @staticmethod
+    def _try_lock(directory: Path):
+        try:
+            lock_file = open(directory / _LOCK_FILE, "a+")
+        except FileNotFoundError:
+            return None  # Removido por outro worker
+        if fcntl is None:
+            return lock_file
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    def _adopt_file(self, path: Path) -> int:
+        try:
+            os.replace(path, self._journal_dir / path.name)
+        except FileNotFoundError:
+            return 0  # Adotado por outro worker
+        return 1
+
+    @staticmethod
+    def _remove_worker_dir(directory: Path) -> None:
+        for path in directory.iterdir():
+            try:
+                path.unlink()  # .lock e .tmp de gravações interrompidas
+            except OSError:
+                pass
+        try:
+            directory.rmdir()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _write_journal_file(path: Path, record: BaseDocument) -> int:
+        body = record.json(by_alias=True).encode("utf-8")
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return len(body)
+
+    @staticmethod
+    def _move_journal_file(path: Path, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+
+    @staticmethod
+    def _remove_journal_files(paths: Sequence[Path]) -> None:
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _read_journal(self) -> List[PendingWrite]:
+        recovered: List[PendingWrite] = []
+        for path in sorted(self._journal_dir.glob(f"*{_JOURNAL_SUFFIX}")):
+            kind = path.stem.split("_")[2] if path.stem.count("_") >= 3 else None
+            record_type = self._record_types.get(kind)
+            if record_type is None:
+                self._logger.warning({"event": "write_behind_journal_skipped", "file": path.name})
+                continue
+            body = path.read_bytes()
+            try:
+                record = record_type.parse_raw(body)
+            except ValueError as e:
+                self._logger.error({
+                    "event": "write_behind_journal_corrupted",
+                    "file": path.name,
+                    "error": str(e)
+                })
+                continue
+            recovered.append(PendingWrite(record=record, journal_path=path, size=len(body), replayed=True))
+        return recovered
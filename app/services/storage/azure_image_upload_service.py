@@ -6,11 +6,14 @@ e retornar URLs públicas acessíveis.
 """
 import base64
 import logging
+import time
 import uuid
 from datetime import datetime
 from typing import Any, Dict, Optional
 import httpx
 from app.config.settings import get_settings
+from app.core.metrics import BLOB_UPLOAD_LATENCY
+from app.core.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
@@ -177,12 +180,21 @@ class AzureImageUploadService:
             }
             
             # Fazer upload via PUT request
-            response = await client.put(
-                url=upload_url,
-                content=image_bytes,
-                headers=headers,
-                timeout=30.0
-            )
+            started = time.perf_counter()
+            result = "error"
+            try:
+                with start_span("blob.put", blob_name=blob_name, size_bytes=len(image_bytes)) as span:
+                    response = await client.put(
+                        url=upload_url,
+                        content=image_bytes,
+                        headers=headers,
+                        timeout=30.0
+                    )
+                    span.set_attribute("http.status_code", response.status_code)
+                if response.status_code in [200, 201]:
+                    result = "success"
+            finally:
+                BLOB_UPLOAD_LATENCY.labels(result=result).observe(time.perf_counter() - started)
             
             # Verificar se upload foi bem-sucedido
             if response.status_code in [200, 201]:
@@ -2,10 +2,16 @@ import fitz  # PyMuPDF
 import os
 import logging
 import base64
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, TYPE_CHECKING
 from io import BytesIO
 from PIL import Image
 
+from app.core.metrics import PAGE_RENDER_LATENCY
+from app.core.tracing import start_span
+
+if TYPE_CHECKING:
+    from app.core.document_buffer import DocumentBuffer
+
 logger = logging.getLogger(__name__)
 
 class PDFImageExtractor:
@@ -16,28 +22,32 @@ class PDFImageExtractor:
 
     @staticmethod
     def extract_figure_from_pdf(
-        pdf_path: str, 
+        pdf_path: Optional[str], 
         page_number: int, 
-        coordinates: List[float]
+        coordinates: List[float],
+        pdf_document: Optional["fitz.Document"] = None
     ) -> Optional[bytes]:
         """
         Extrai uma figura específica de um documento PDF usando coordenadas
         
         Args:
-            pdf_path: Caminho para o arquivo PDF
+            pdf_path: Caminho para o arquivo PDF (ignorado se pdf_document for informado)
             page_number: Número da página (1-indexed, como retornado pelo Azure)
             coordinates: Lista de coordenadas do polígono [x1, y1, x2, y2, x3, y3, x4, y4]
                        Formato Azure Document Intelligence: 
                        [Superior-esquerdo X, Y, Superior-direito X, Y, 
                         Inferior-direito X, Y, Inferior-esquerdo X, Y]
                        As coordenadas são em pontos PDF (72 pontos = 1 polegada)
+            pdf_document: Documento já aberto (reutilizado entre figuras; não é fechado aqui)
             
         Returns:
             Bytes da imagem extraída ou None se falhar
         """
+        owns_document = pdf_document is None
+        doc = None
         try:
-            # Abrir o documento
-            doc = fitz.open(pdf_path)
+            # Abrir o documento (apenas se não foi fornecido já aberto)
+            doc = fitz.open(pdf_path) if owns_document else pdf_document
             
             # Ajustar page_number para 0-indexed (PyMuPDF usa 0-indexed)
             page_idx = page_number - 1
@@ -98,17 +108,16 @@ class PDFImageExtractor:
             
             # Renderizar a parte da página como uma imagem com alta resolução
             matrix = fitz.Matrix(3, 3)  # Fator de zoom para melhor resolução (3x)
-            pix = page.get_pixmap(matrix=matrix, clip=rect, alpha=False)
+            with start_span("pdf.render_figure", page=page_number), PAGE_RENDER_LATENCY.time():
+                pix = page.get_pixmap(matrix=matrix, clip=rect, alpha=False)
+                
+                # Converter para bytes
+                img_bytes = BytesIO()
+                pix.pil_save(img_bytes, format="JPEG", quality=95)  # Alta qualidade
             
             logger.info(f"Imagem extraída com dimensões: {pix.width}x{pix.height}")
-            
-            # Converter para bytes
-            img_bytes = BytesIO()
-            pix.pil_save(img_bytes, format="JPEG", quality=95)  # Alta qualidade
             img_bytes.seek(0)
             
-            doc.close()
-            
             return img_bytes.getvalue()
             
         except Exception as e:
@@ -116,31 +125,59 @@ class PDFImageExtractor:
             # Registrar informações adicionais para depuração
             logger.error(f"PDF: {pdf_path}, Página: {page_number}, Coordenadas: {coordinates}")
             return None
+        
+        finally:
+            if owns_document and doc is not None:
+                doc.close()
             
     @staticmethod
     def extract_figures_from_azure_result(
-        pdf_path: str, 
-        azure_result: Dict[str, Any]
+        pdf_path: Optional[str] = None, 
+        azure_result: Optional[Dict[str, Any]] = None,
+        document_buffer: Optional["DocumentBuffer"] = None
     ) -> Dict[str, bytes]:
         """
         Extrai todas as figuras identificadas na resposta do Azure Document Intelligence
         
+        O PDF é aberto uma única vez e reutilizado para todas as figuras.
+        
         Args:
-            pdf_path: Caminho para o arquivo PDF original
+            pdf_path: Caminho para o arquivo PDF original (quando não há buffer)
             azure_result: Resultado JSON do Azure Document Intelligence
+            document_buffer: Buffer do documento da requisição (preferencial)
             
         Returns:
             Dicionário com ID da figura como chave e bytes da imagem como valor
         """
         extracted_figures = {}
+        azure_result = azure_result or {}
         
         if "figures" not in azure_result:
             logger.warning("Nenhuma figura encontrada no resultado do Azure")
             return extracted_figures
         
         logger.info(f"Processando {len(azure_result['figures'])} figuras do resultado do Azure")
-            
-        for figure in azure_result["figures"]:
+        
+        pdf_document = document_buffer.open_pdf() if document_buffer is not None else fitz.open(pdf_path)
+        try:
+            PDFImageExtractor._extract_figures_from_document(
+                pdf_document, azure_result["figures"], extracted_figures, pdf_path
+            )
+        finally:
+            pdf_document.close()
+                    
+        logger.info(f"Total de figuras extraídas: {len(extracted_figures)} de {len(azure_result['figures'])}")
+        return extracted_figures
+    
+    @staticmethod
+    def _extract_figures_from_document(
+        pdf_document: "fitz.Document",
+        figures: List[Dict[str, Any]],
+        extracted_figures: Dict[str, bytes],
+        pdf_path: Optional[str] = None
+    ) -> None:
+        """Recorta cada figura a partir de um documento PyMuPDF já aberto."""
+        for figure in figures:
             figure_id = figure.get("id")
             
             if not figure_id:
@@ -167,7 +204,8 @@ class PDFImageExtractor:
                 image_bytes = PDFImageExtractor.extract_figure_from_pdf(
                     pdf_path=pdf_path,
                     page_number=page_number,
-                    coordinates=polygon
+                    coordinates=polygon,
+                    pdf_document=pdf_document
                 )
                 
                 if image_bytes:
@@ -176,9 +214,6 @@ class PDFImageExtractor:
                     logger.info(f"Figura {figure_id} extraída com sucesso. Tamanho: {size_kb:.2f} KB")
                 else:
                     logger.warning(f"Falha ao extrair figura {figure_id}")
-                    
-        logger.info(f"Total de figuras extraídas: {len(extracted_figures)} de {len(azure_result['figures'])}")
-        return extracted_figures
         
     @staticmethod
     def get_base64_image(image_bytes: bytes) -> str:
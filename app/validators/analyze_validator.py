@@ -1,5 +1,6 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 from fastapi import UploadFile
+from app.core.document_buffer import DocumentBuffer
 from pydantic import BaseModel, EmailStr, ValidationError
 from app.core.utils import is_pdf
 from app.core.exceptions import (
@@ -24,7 +25,7 @@ class AnalyzeValidator:
             raise InvalidEmailException(email)
 
     @staticmethod
-    def validate_all(file: UploadFile, email: str) -> None:
+    def validate_all(file: Union[DocumentBuffer, UploadFile], email: str) -> None:
         """Valida arquivo e email, coletando erros e lançando exceção múltipla se necessário"""
         errors = []
 
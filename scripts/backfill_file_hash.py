@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Backfill de file_hash - SmartQuest
+
+Preenche 'file_hash' (SHA-256 do conteúdo) nos registros de 'analyze_documents'
+anteriores à verificação de duplicatas por conteúdo. Como o PDF original não é
+armazenado, o hash é calculado a partir de um diretório com os PDFs enviados,
+associando cada arquivo aos registros sem hash com mesmo file_name e file_size.
+
+Registros sem PDF correspondente continuam sendo preenchidos de forma
+incremental pela própria verificação de duplicatas.
+
+Uso:
+    python scripts/backfill_file_hash.py --pdf-dir ./uploads
+    python scripts/backfill_file_hash.py --pdf-dir ./uploads --email prof@escola.com --dry-run
+"""
+import argparse
+import asyncio
+import hashlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+async def _run(args) -> int:
+    from pymongo import UpdateMany
+    from app.services.infrastructure import MongoDBConnectionService
+
+    pdf_files = sorted(p for p in Path(args.pdf_dir).rglob("*") if p.suffix.lower() == ".pdf")
+    print(f"[INFO] {len(pdf_files)} PDFs encontrados em {args.pdf_dir}")
+
+    connection_service = MongoDBConnectionService()
+    try:
+        database = await connection_service.get_database()
+        collection = database["analyze_documents"]
+
+        operations = []
+        for path in pdf_files:
+            query = {
+                "file_name": path.name,
+                "file_size": path.stat().st_size,
+                "file_hash": {"$exists": False}
+            }
+            if args.email:
+                query["user_email"] = args.email
+            operations.append(UpdateMany(query, {"$set": {"file_hash": _sha256(path)}}))
+
+        if args.dry_run or not operations:
+            print(f"[INFO] {len(operations)} atualizações calculadas (nada gravado)")
+            return 0
+
+        result = await collection.bulk_write(operations, ordered=False)
+        remaining = await collection.count_documents({"file_hash": {"$exists": False}})
+        print(f"[SUCCESS] {result.modified_count} registros atualizados; {remaining} ainda sem file_hash")
+        return 0
+    finally:
+        await connection_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preenche file_hash em analyze_documents a partir dos PDFs originais")
+    parser.add_argument("--pdf-dir", required=True, help="Diretório com os PDFs enviados (busca recursiva)")
+    parser.add_argument("--email", help="Restringe a um usuário")
+    parser.add_argument("--dry-run", action="store_true", help="Calcula os hashes sem gravar")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
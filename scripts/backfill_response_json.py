@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Backfill de response_json - SmartQuest
+
+Preenche 'response_json' (response já serializado) nas análises concluídas de
+'analyze_documents' gravadas antes da pré-serialização. Sem ele, a verificação
+de duplicatas e GET /analyze_document/{id} continuam funcionando, mas
+reconstroem o DTO a cada leitura.
+
+Executado pelo MongoDBMigrationManager em lotes ordenados por _id, com
+checkpoint em 'migration_checkpoints': pode ser interrompido e executado de
+novo. Equivale a ``scripts/manage_indexes.py --backfill response_json``.
+
+Uso:
+    python scripts/backfill_response_json.py
+    python scripts/backfill_response_json.py --batch-size 200 --dry-run
+"""
+import argparse
+import asyncio
+import dataclasses
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def _run(args) -> int:
+    from app.services.infrastructure import MongoDBConnectionService
+    from app.services.persistence import MongoDBMigrationManager
+    from app.services.persistence.backfills import RESPONSE_JSON_BACKFILL
+
+    connection_service = MongoDBConnectionService()
+    try:
+        backfill = dataclasses.replace(RESPONSE_JSON_BACKFILL, batch_size=args.batch_size)
+        report = await MongoDBMigrationManager(connection_service).run_backfill(backfill, dry_run=args.dry_run)
+        print(f"[SUCCESS] {report.updated} registros com response_json ({report.scanned} percorridos)")
+        return 0
+    finally:
+        await connection_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preenche response_json nas análises concluídas")
+    parser.add_argument("--batch-size", type=int, default=100, help="Registros por lote")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas percorre os registros pendentes")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de quase-duplicatas (MinHash + LSH) - SmartQuest
+
+Gera um banco sintético de questões em grupos (uma questão-base e variantes
+com pequenas edições), calcula as assinaturas com app.core.minhash e monta em
+memória o mesmo índice que a coleção 'questions' mantém no MongoDB (chave LSH
+-> questões). Para uma amostra de consultas mede:
+- custo da assinatura por questão (o que é pago na gravação da análise)
+- latência da consulta e quantidade de candidatas lidas pelo índice
+- recall/precisão em relação aos grupos gerados
+- latência da comparação exaustiva (todas as assinaturas) para referência
+
+Com 1M de questões o cálculo das assinaturas leva ~30 min por núcleo;
+use --workers para paralelizar.
+
+Uso:
+    python scripts/benchmark_question_similarity.py
+    python scripts/benchmark_question_similarity.py --questions 100000 --queries 500
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import minhash  # noqa: E402
+
+_SYLLABLES = ["ma", "te", "ri", "ca", "lo", "pa", "ne", "so", "vi", "da", "cor", "men", "tra", "lis", "pro", "ba"]
+
+
+def _vocabulary(size: int, rng: random.Random) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _variant(words: List[str], vocabulary: List[str], rng: random.Random) -> List[str]:
+    """Pequena edição: troca, remove ou insere 1-2 palavras."""
+    words = list(words)
+    for _ in range(rng.randint(1, 2)):
+        position = rng.randrange(len(words))
+        operation = rng.random()
+        if operation < 0.5:
+            words[position] = rng.choice(vocabulary)
+        elif operation < 0.75 and len(words) > 10:
+            del words[position]
+        else:
+            words.insert(position, rng.choice(vocabulary))
+    return words
+
+
+def _generate(count: int, group_size: int, seed: int) -> Tuple[List[str], List[int]]:
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(20000, rng)
+    texts: List[str] = []
+    groups: List[int] = []
+    group = 0
+    while len(texts) < count:
+        base = [rng.choice(vocabulary) for _ in range(rng.randint(20, 45))]
+        size = rng.randint(1, group_size)
+        for index in range(min(size, count - len(texts))):
+            texts.append(" ".join(base if index == 0 else _variant(base, vocabulary, rng)))
+            groups.append(group)
+        group += 1
+    return texts, groups
+
+
+def _signatures(texts: List[str]) -> List[Tuple[List[int], List[str]]]:
+    result = []
+    for text in texts:
+        signature = minhash.signature(text)
+        result.append((signature, minhash.band_keys(signature)))
+    return result
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de quase-duplicatas (MinHash + LSH)")
+    parser.add_argument("--questions", type=int, default=1_000_000, help="Quantidade de questões sintéticas")
+    parser.add_argument("--group-size", type=int, default=5, help="Máximo de variantes por grupo")
+    parser.add_argument("--queries", type=int, default=1000, help="Consultas da amostra")
+    parser.add_argument("--exhaustive-queries", type=int, default=5,
+                        help="Consultas comparadas contra todas as assinaturas (referência)")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Similaridade mínima")
+    parser.add_argument("--workers", type=int, default=None, help="Processos para calcular as assinaturas")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"[INFO] Gerando {args.questions:,} questões (grupos de até {args.group_size})...")
+    texts, groups = _generate(args.questions, args.group_size, args.seed)
+
+    started = time.perf_counter()
+    chunk = 10_000
+    chunks = [texts[i:i + chunk] for i in range(0, len(texts), chunk)]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        computed = [item for part in pool.map(_signatures, chunks) for item in part]
+    signing = time.perf_counter() - started
+    print(f"[INFO] Assinaturas: {signing:.1f}s ({signing / len(texts) * 1e6:.0f} µs/questão com os workers)")
+
+    started = time.perf_counter()
+    index: Dict[str, List[int]] = defaultdict(list)
+    for question, (_, bands) in enumerate(computed):
+        for band in bands:
+            index[band].append(question)
+    print(f"[INFO] Índice LSH: {len(index):,} chaves em {time.perf_counter() - started:.1f}s")
+
+    members: Dict[int, List[int]] = defaultdict(list)
+    for question, group in enumerate(groups):
+        members[group].append(question)
+
+    rng = random.Random(args.seed)
+    sample = rng.sample(range(len(texts)), min(args.queries, len(texts)))
+    latencies: List[float] = []
+    candidates_read: List[int] = []
+    expected = found = true_positives = 0
+    for question in sample:
+        signature, bands = computed[question]
+        started = time.perf_counter()
+        candidates = {other for band in bands for other in index[band] if other != question}
+        matches = [
+            other for other in candidates
+            if minhash.similarity(signature, computed[other][0]) >= args.threshold
+        ]
+        latencies.append((time.perf_counter() - started) * 1000)
+        candidates_read.append(len(candidates))
+
+        # Verdade: variantes do mesmo grupo cuja similaridade estimada atinge o limiar
+        relevant = {
+            other for other in members[groups[question]]
+            if other != question and minhash.similarity(signature, computed[other][0]) >= args.threshold
+        }
+        expected += len(relevant)
+        found += len(matches)
+        true_positives += len(relevant.intersection(matches))
+
+    print(f"[INFO] Consultas: {len(sample)}")
+    print(f"[INFO] Latência LSH: p50={_percentile(latencies, 0.5):.2f}ms "
+          f"p95={_percentile(latencies, 0.95):.2f}ms p99={_percentile(latencies, 0.99):.2f}ms")
+    print(f"[INFO] Candidatas por consulta: média={statistics.mean(candidates_read):.1f} "
+          f"máx={max(candidates_read)} (de {len(texts):,})")
+    print(f"[INFO] Recall={true_positives / expected if expected else 1:.3f} "
+          f"Precisão={true_positives / found if found else 1:.3f}")
+
+    exhaustive: List[float] = []
+    for question in sample[:args.exhaustive_queries]:
+        signature = computed[question][0]
+        started = time.perf_counter()
+        for other, (other_signature, _) in enumerate(computed):
+            if other != question:
+                minhash.similarity(signature, other_signature)
+        exhaustive.append((time.perf_counter() - started) * 1000)
+    if exhaustive:
+        print(f"[INFO] Comparação exaustiva: {statistics.mean(exhaustive):.0f}ms por consulta")
+
+    print("[SUCCESS] Benchmark concluído")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
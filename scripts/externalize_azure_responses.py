@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Externalização dos responses do Azure - SmartQuest
+
+Move o 'azure_response' inline dos registros antigos de 'azure_responses' para
+o bucket GridFS comprimido (azure_response_payloads), deixando no registro
+apenas os metadados e 'azure_response_ref'.
+
+O processamento é idempotente e pode ser interrompido: cada execução continua
+pelos registros que ainda têm 'azure_response' inline.
+
+Uso:
+    python scripts/externalize_azure_responses.py
+    python scripts/externalize_azure_responses.py --batch-size 20 --limit 100 --dry-run
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def _run(args) -> int:
+    from app.services.infrastructure import MongoDBConnectionService
+    from app.services.persistence.azure_response_payload_store import AzureResponsePayloadStore
+
+    connection_service = MongoDBConnectionService()
+    store = AzureResponsePayloadStore(connection_service)
+    try:
+        database = await connection_service.get_database()
+        collection = database["azure_responses"]
+        query = {"azure_response": {"$exists": True}}
+
+        pending = await collection.count_documents(query)
+        print(f"[INFO] {pending} registros com azure_response inline")
+        if args.dry_run or not pending:
+            return 0
+
+        moved = raw_total = stored_total = 0
+        while not args.limit or moved < args.limit:
+            batch_size = args.batch_size if not args.limit else min(args.batch_size, args.limit - moved)
+            batch = await collection.find(
+                query, projection={"_id": 1, "file_name": 1, "azure_response": 1}
+            ).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                break
+
+            for doc in batch:
+                file_id = str(doc["_id"])
+                # Reexecução após falha entre upload e update: substitui o payload
+                await store.delete_if_exists(file_id)
+                ref = await store.put(file_id, doc["azure_response"], filename=doc.get("file_name"))
+                await collection.update_one(
+                    {"_id": doc["_id"]},
+                    {"$set": {"azure_response_ref": ref.dict()}, "$unset": {"azure_response": ""}}
+                )
+                moved += 1
+                raw_total += ref.raw_bytes
+                stored_total += ref.stored_bytes
+
+            print(f"[INFO] {moved}/{pending} registros externalizados")
+
+        ratio = (stored_total / raw_total) if raw_total else 0
+        print(f"[SUCCESS] {moved} registros; {raw_total} -> {stored_total} bytes ({ratio:.1%})")
+        return 0
+    finally:
+        await connection_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move azure_response inline para GridFS comprimido")
+    parser.add_argument("--batch-size", type=int, default=50, help="Registros por lote")
+    parser.add_argument("--limit", type=int, default=0, help="Máximo de registros nesta execução (0 = todos)")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas conta os registros pendentes")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Índices, planos de consulta e backfills - SmartQuest
+
+Usa o MongoDBMigrationManager da aplicação para:
+- verificar (e com --create, criar) os índices de REQUIRED_INDEXES
+- com --explain, executar explain() das consultas críticas e falhar se algum
+  plano usar COLLSCAN ou outro índice que não o esperado (uso em CI/deploy)
+- com --backfill NOME, executar um backfill retomável em lotes
+
+Uso:
+    python scripts/manage_indexes.py
+    python scripts/manage_indexes.py --create --explain
+    python scripts/manage_indexes.py --backfill response_json --max-batches 10
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def _run(args) -> int:
+    from app.services.infrastructure import MongoDBConnectionService
+    from app.services.persistence import MongoDBMigrationManager
+    from app.services.persistence.backfills import BACKFILLS
+
+    connection_service = MongoDBConnectionService()
+    manager = MongoDBMigrationManager(connection_service)
+    exit_code = 0
+    try:
+        index_check = await manager.ensure_indexes(create_missing=args.create)
+        print(f"[INFO] Índices presentes: {len(index_check.present)}")
+        for name in index_check.created:
+            print(f"[SUCCESS] Índice criado: {name}")
+        for name in index_check.missing:
+            print(f"[ERROR] Índice ausente: {name} (use --create)")
+        for name, error in index_check.failed.items():
+            print(f"[ERROR] Falha ao criar {name}: {error}")
+        if not index_check.ok:
+            exit_code = 1
+
+        if args.explain:
+            for plan in await manager.check_query_plans():
+                status = "SUCCESS" if plan.ok else "ERROR"
+                print(f"[{status}] {plan.query}: {' > '.join(plan.stages)} (índices: {plan.indexes or '-'})")
+                if not plan.ok:
+                    exit_code = 1
+
+        if args.backfill:
+            report = await manager.run_backfill(
+                BACKFILLS[args.backfill],
+                dry_run=args.dry_run,
+                max_batches=args.max_batches
+            )
+            state = "concluído" if report.completed else "pausado (execute novamente para continuar)"
+            print(f"[INFO] Backfill {report.name} {state}: {report.updated}/{report.scanned} documentos atualizados")
+        return exit_code
+    finally:
+        await connection_service.close()
+
+
+def main():
+    from app.services.persistence.backfills import BACKFILLS
+
+    parser = argparse.ArgumentParser(description="Verifica índices, planos de consulta e executa backfills")
+    parser.add_argument("--create", action="store_true", help="Cria os índices ausentes")
+    parser.add_argument("--explain", action="store_true", help="Verifica os planos das consultas críticas")
+    parser.add_argument("--backfill", choices=sorted(BACKFILLS), help="Executa um backfill")
+    parser.add_argument("--max-batches", type=int, help="Limita o backfill a N lotes (retomável)")
+    parser.add_argument("--dry-run", action="store_true", help="Backfill sem gravar")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+// =============================================================================
+// 🔄 MIGRATION: Índice para reprocessamento em lote
+// =============================================================================
+// Versão: 2026-10-18_001000
+// Descrição: Cria índices usados pelo reprocessamento em lote dos responses Azure
+// Data: 2026-10-18
+
+print("🚀 [MIGRATION] Iniciando: add_response_document_id_index");
+
+db = db.getSiblingDB("smartquest");
+
+// =============================================================================
+// ✅ VERIFICAR SE MIGRAÇÃO JÁ FOI APLICADA
+// =============================================================================
+const migrationVersion = "2026-10-18_001000";
+const existingMigration = db.migrations.findOne({ version: migrationVersion });
+
+if (existingMigration) {
+  print(
+    `⚠️ [SKIP] Migração ${migrationVersion} já foi aplicada em ${existingMigration.applied_at}`
+  );
+  quit();
+}
+
+// =============================================================================
+// 🎯 CRIAÇÃO DE ÍNDICES
+// =============================================================================
+
+// Junção azure_responses.document_id -> analyze_documents.response.document_id
+print("📊 [INDEX] Criando índice 'idx_response_document_id' em analyze_documents...");
+db.analyze_documents.createIndex(
+  { "response.document_id": 1 },
+  { name: "idx_response_document_id" }
+);
+print("✅ [INDEX] Índice 'idx_response_document_id' criado");
+
+// Varredura por status em ordem de _id (cursor keyset do reprocessamento)
+print("📊 [INDEX] Criando índice 'idx_status_id' em azure_responses...");
+db.azure_responses.createIndex({ status: 1, _id: 1 }, { name: "idx_status_id" });
+print("✅ [INDEX] Índice 'idx_status_id' criado");
+
+// =============================================================================
+// 📝 REGISTRAR MIGRAÇÃO
+// =============================================================================
+
+db.migrations.insertOne({
+  version: migrationVersion,
+  description: "Índices para reprocessamento em lote de azure_responses",
+  applied_at: new Date(),
+});
+
+print(`\n✅ [SUCCESS] Migração ${migrationVersion} aplicada com sucesso!`);
@@ -0,0 +1,62 @@
+// =============================================================================
+// 🔄 MIGRATION: Índice de duplicatas por conteúdo (file_hash)
+// =============================================================================
+// Versão: 2026-10-18_002000
+// Descrição: Cria índice composto para verificação de duplicatas por SHA-256
+// Data: 2026-10-18
+//
+// Documentos existentes não têm file_hash (o PDF original não é armazenado).
+// Eles continuam sendo encontrados por idx_duplicate_check (nome + tamanho) e
+// recebem o file_hash na primeira verificação que os encontrar. Para preencher
+// em lote a partir dos PDFs originais: scripts/backfill_file_hash.py
+
+print("🚀 [MIGRATION] Iniciando: add_file_hash_index");
+
+db = db.getSiblingDB("smartquest");
+
+// =============================================================================
+// ✅ VERIFICAR SE MIGRAÇÃO JÁ FOI APLICADA
+// =============================================================================
+const migrationVersion = "2026-10-18_002000";
+const existingMigration = db.migrations.findOne({ version: migrationVersion });
+
+if (existingMigration) {
+  print(
+    `⚠️ [SKIP] Migração ${migrationVersion} já foi aplicada em ${existingMigration.applied_at}`
+  );
+  quit();
+}
+
+// =============================================================================
+// 🎯 CRIAÇÃO DE ÍNDICES
+// =============================================================================
+
+// Busca por conteúdo: { user_email, file_hash, status: "completed" }
+// Parcial: registros legados sem file_hash não ocupam o índice
+print("📊 [INDEX] Criando índice 'idx_user_file_hash' em analyze_documents...");
+db.analyze_documents.createIndex(
+  { user_email: 1, file_hash: 1, status: 1 },
+  {
+    name: "idx_user_file_hash",
+    partialFilterExpression: { file_hash: { $exists: true } },
+  }
+);
+print("✅ [INDEX] Índice 'idx_user_file_hash' criado");
+
+const legacyCount = db.analyze_documents.countDocuments({
+  file_hash: { $exists: false },
+});
+print(`ℹ️ [INFO] ${legacyCount} documentos sem file_hash (backfill incremental)`);
+
+// =============================================================================
+// 📝 REGISTRAR MIGRAÇÃO
+// =============================================================================
+
+db.migrations.insertOne({
+  version: migrationVersion,
+  description: "Índice de duplicatas por conteúdo (file_hash)",
+  applied_at: new Date(),
+  legacy_documents_without_hash: legacyCount,
+});
+
+print(`\n✅ [SUCCESS] Migração ${migrationVersion} aplicada com sucesso!`);
@@ -0,0 +1,47 @@
+// =============================================================================
+// 🔄 MIGRATION: Índice para listagem keyset de documentos
+// =============================================================================
+// Versão: 2026-10-18_003000
+// Descrição: Índice composto para GET /analyze/documents (paginação por cursor)
+// Data: 2026-10-18
+
+print("🚀 [MIGRATION] Iniciando: add_user_created_at_index");
+
+db = db.getSiblingDB("smartquest");
+
+// =============================================================================
+// ✅ VERIFICAR SE MIGRAÇÃO JÁ FOI APLICADA
+// =============================================================================
+const migrationVersion = "2026-10-18_003000";
+const existingMigration = db.migrations.findOne({ version: migrationVersion });
+
+if (existingMigration) {
+  print(
+    `⚠️ [SKIP] Migração ${migrationVersion} já foi aplicada em ${existingMigration.applied_at}`
+  );
+  quit();
+}
+
+// =============================================================================
+// 🎯 CRIAÇÃO DE ÍNDICES
+// =============================================================================
+
+// Filtro por usuário + ordenação (created_at desc, _id desc) + condição keyset
+print("📊 [INDEX] Criando índice 'idx_user_created_at' em analyze_documents...");
+db.analyze_documents.createIndex(
+  { user_email: 1, created_at: -1, _id: -1 },
+  { name: "idx_user_created_at" }
+);
+print("✅ [INDEX] Índice 'idx_user_created_at' criado");
+
+// =============================================================================
+// 📝 REGISTRAR MIGRAÇÃO
+// =============================================================================
+
+db.migrations.insertOne({
+  version: migrationVersion,
+  description: "Índice para listagem keyset de analyze_documents",
+  applied_at: new Date(),
+});
+
+print(`\n✅ [SUCCESS] Migração ${migrationVersion} aplicada com sucesso!`);
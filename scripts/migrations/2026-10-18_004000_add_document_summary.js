@@ -0,0 +1,127 @@
+// =============================================================================
+// 🔄 MIGRATION: Resumo desnormalizado (summary) em analyze_documents
+// =============================================================================
+// Versão: 2026-10-18_004000
+// Descrição: Preenche 'summary' nos documentos existentes e cria índices de
+//            filtro por matéria e ordenação por quantidade de questões
+// Data: 2026-10-18
+//
+// O backfill deriva question_count, context_block_count e subject do 'response'
+// já gravado. 'grade' não faz parte do response da API e fica vazio nos
+// documentos antigos; 'page_count' é preenchido pelo reprocessamento
+// (AnalysisReprocessingService) a partir do response do Azure.
+
+print("🚀 [MIGRATION] Iniciando: add_document_summary");
+
+db = db.getSiblingDB("smartquest");
+
+// =============================================================================
+// ✅ VERIFICAR SE MIGRAÇÃO JÁ FOI APLICADA
+// =============================================================================
+const migrationVersion = "2026-10-18_004000";
+const existingMigration = db.migrations.findOne({ version: migrationVersion });
+
+if (existingMigration) {
+  print(
+    `⚠️ [SKIP] Migração ${migrationVersion} já foi aplicada em ${existingMigration.applied_at}`
+  );
+  quit();
+}
+
+// Mesma regra de normalize_subject_key (app/models/persistence/document_summary.py)
+function normalizeSubjectKey(subject) {
+  if (!subject || !subject.trim()) {
+    return null;
+  }
+  return subject
+    .normalize("NFKD")
+    .replace(/[\u0300-\u036f]/g, "")
+    .toLowerCase()
+    .split(/\s+/)
+    .filter((part) => part.length > 0)
+    .join(" ");
+}
+
+// =============================================================================
+// 📦 BACKFILL DO SUMMARY (em lotes, retomável)
+// =============================================================================
+const BATCH_SIZE = 500;
+let operations = [];
+let backfilled = 0;
+
+print("📦 [BACKFILL] Preenchendo 'summary' nos documentos sem resumo...");
+db.analyze_documents
+  .find(
+    { summary: { $exists: false } },
+    {
+      "response.questions": 1,
+      "response.context_blocks": 1,
+      "response.header.subject": 1,
+      "response.header.series": 1,
+    }
+  )
+  .forEach((doc) => {
+    const response = doc.response || {};
+    const header = response.header || {};
+    const summary = {
+      question_count: (response.questions || []).length,
+      context_block_count: (response.context_blocks || []).length,
+    };
+    if (header.subject) {
+      summary.subject = header.subject;
+      summary.subject_key = normalizeSubjectKey(header.subject);
+    }
+    if (header.series) {
+      summary.grade = header.series;
+    }
+
+    operations.push({
+      updateOne: {
+        filter: { _id: doc._id, summary: { $exists: false } },
+        update: { $set: { summary: summary } },
+      },
+    });
+
+    if (operations.length >= BATCH_SIZE) {
+      backfilled += db.analyze_documents.bulkWrite(operations, { ordered: false }).modifiedCount;
+      operations = [];
+    }
+  });
+
+if (operations.length > 0) {
+  backfilled += db.analyze_documents.bulkWrite(operations, { ordered: false }).modifiedCount;
+}
+print(`✅ [BACKFILL] ${backfilled} documentos atualizados`);
+
+// =============================================================================
+// 🎯 CRIAÇÃO DE ÍNDICES
+// =============================================================================
+
+// Listagem ordenada por quantidade de questões: sort(summary.question_count, _id) desc
+print("📊 [INDEX] Criando índice 'idx_user_question_count' em analyze_documents...");
+db.analyze_documents.createIndex(
+  { user_email: 1, "summary.question_count": -1, _id: -1 },
+  { name: "idx_user_question_count" }
+);
+print("✅ [INDEX] Índice 'idx_user_question_count' criado");
+
+// Filtro por matéria com a ordenação padrão: { user_email, summary.subject_key } + created_at desc
+print("📊 [INDEX] Criando índice 'idx_user_subject_created_at' em analyze_documents...");
+db.analyze_documents.createIndex(
+  { user_email: 1, "summary.subject_key": 1, created_at: -1, _id: -1 },
+  { name: "idx_user_subject_created_at" }
+);
+print("✅ [INDEX] Índice 'idx_user_subject_created_at' criado");
+
+// =============================================================================
+// 📝 REGISTRAR MIGRAÇÃO
+// =============================================================================
+
+db.migrations.insertOne({
+  version: migrationVersion,
+  description: "Resumo desnormalizado (summary) e índices de filtro/ordenação",
+  applied_at: new Date(),
+  backfilled_documents: backfilled,
+});
+
+print(`\n✅ [SUCCESS] Migração ${migrationVersion} aplicada com sucesso!`);
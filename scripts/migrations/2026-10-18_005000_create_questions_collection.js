@@ -0,0 +1,62 @@
+// =============================================================================
+// 🔄 MIGRATION: Coleção 'questions' (banco de questões)
+// =============================================================================
+// Versão: 2026-10-18_005000
+// Descrição: Índices do banco de questões. As questões das análises existentes
+//            são gravadas pelo backfill Python (retomável):
+//            python scripts/manage_indexes.py --backfill questions
+// Data: 2026-10-18
+
+print("🚀 [MIGRATION] Iniciando: create_questions_collection");
+
+db = db.getSiblingDB("smartquest");
+
+// =============================================================================
+// ✅ VERIFICAR SE MIGRAÇÃO JÁ FOI APLICADA
+// =============================================================================
+const migrationVersion = "2026-10-18_005000";
+const existingMigration = db.migrations.findOne({ version: migrationVersion });
+
+if (existingMigration) {
+  print(
+    `⚠️ [SKIP] Migração ${migrationVersion} já foi aplicada em ${existingMigration.applied_at}`
+  );
+  quit();
+}
+
+// =============================================================================
+// 🎯 CRIAÇÃO DE ÍNDICES
+// =============================================================================
+
+// Banco de questões: matéria + série + tipo, paginação por _id
+print("📊 [INDEX] Criando índice 'idx_q_subject_grade_type' em questions...");
+db.questions.createIndex(
+  { subject_key: 1, grade_key: 1, is_multiple_choice: 1, _id: 1 },
+  { name: "idx_q_subject_grade_type" }
+);
+print("✅ [INDEX] Índice 'idx_q_subject_grade_type' criado");
+
+// Questões de um usuário por matéria + série
+print("📊 [INDEX] Criando índice 'idx_q_user_subject_grade' em questions...");
+db.questions.createIndex(
+  { user_email: 1, subject_key: 1, grade_key: 1, _id: 1 },
+  { name: "idx_q_user_subject_grade" }
+);
+print("✅ [INDEX] Índice 'idx_q_user_subject_grade' criado");
+
+// Questões de uma análise (consulta e substituição no reprocessamento)
+print("📊 [INDEX] Criando índice 'idx_q_document' em questions...");
+db.questions.createIndex({ document_id: 1, _id: 1 }, { name: "idx_q_document" });
+print("✅ [INDEX] Índice 'idx_q_document' criado");
+
+// =============================================================================
+// 📝 REGISTRAR MIGRAÇÃO
+// =============================================================================
+
+db.migrations.insertOne({
+  version: migrationVersion,
+  description: "Coleção questions (banco de questões) e índices",
+  applied_at: new Date(),
+});
+
+print(`\n✅ [SUCCESS] Migração ${migrationVersion} aplicada com sucesso!`);
@@ -0,0 +1,47 @@
+// =============================================================================
+// 🔄 MIGRATION: Índice LSH do banco de questões (quase-duplicatas)
+// =============================================================================
+// Versão: 2026-10-18_006000
+// Descrição: Índice multikey das chaves LSH (MinHash) das questões. As
+//            assinaturas das questões existentes são calculadas pelo backfill
+//            Python (retomável):
+//            python scripts/manage_indexes.py --backfill questions
+// Data: 2026-10-18
+
+print("🚀 [MIGRATION] Iniciando: add_question_lsh_index");
+
+db = db.getSiblingDB("smartquest");
+
+// =============================================================================
+// ✅ VERIFICAR SE MIGRAÇÃO JÁ FOI APLICADA
+// =============================================================================
+const migrationVersion = "2026-10-18_006000";
+const existingMigration = db.migrations.findOne({ version: migrationVersion });
+
+if (existingMigration) {
+  print(
+    `⚠️ [SKIP] Migração ${migrationVersion} já foi aplicada em ${existingMigration.applied_at}`
+  );
+  quit();
+}
+
+// =============================================================================
+// 🎯 CRIAÇÃO DE ÍNDICES
+// =============================================================================
+
+// Candidatas a quase-duplicata: questões que compartilham alguma faixa LSH
+print("📊 [INDEX] Criando índice 'idx_q_lsh_bands' em questions...");
+db.questions.createIndex({ lsh_bands: 1 }, { name: "idx_q_lsh_bands" });
+print("✅ [INDEX] Índice 'idx_q_lsh_bands' criado");
+
+// =============================================================================
+// 📝 REGISTRAR MIGRAÇÃO
+// =============================================================================
+
+db.migrations.insertOne({
+  version: migrationVersion,
+  description: "Índice LSH (MinHash) para quase-duplicatas no banco de questões",
+  applied_at: new Date(),
+});
+
+print(`\n✅ [SUCCESS] Migração ${migrationVersion} aplicada com sucesso!`);
@@ -0,0 +1,69 @@
+// =============================================================================
+// 🔄 MIGRATION: Índice de texto para busca nas provas do usuário
+// =============================================================================
+// Versão: 2026-10-18_007000
+// Descrição: Índice de texto composto (user_email + campos de texto do
+//            response) em analyze_documents. Idioma português (stemming,
+//            sem diferenciar acentos). Declarado também em REQUIRED_INDEXES.
+// Data: 2026-10-18
+
+print("🚀 [MIGRATION] Iniciando: add_search_text_index");
+
+db = db.getSiblingDB("smartquest");
+
+// =============================================================================
+// ✅ VERIFICAR SE MIGRAÇÃO JÁ FOI APLICADA
+// =============================================================================
+const migrationVersion = "2026-10-18_007000";
+const existingMigration = db.migrations.findOne({ version: migrationVersion });
+
+if (existingMigration) {
+  print(
+    `⚠️ [SKIP] Migração ${migrationVersion} já foi aplicada em ${existingMigration.applied_at}`
+  );
+  quit();
+}
+
+// =============================================================================
+// 🎯 CRIAÇÃO DE ÍNDICES
+// =============================================================================
+
+// Busca textual: prefixo user_email restringe a busca ao acervo do usuário
+print("📊 [INDEX] Criando índice 'idx_search_text' em analyze_documents...");
+db.analyze_documents.createIndex(
+  {
+    user_email: 1,
+    "response.questions.question": "text",
+    "response.context_blocks.title": "text",
+    "response.questions.alternatives.text": "text",
+    "response.context_blocks.statement": "text",
+    "response.context_blocks.paragraphs": "text",
+    "response.context_blocks.sub_contexts.content": "text",
+  },
+  {
+    name: "idx_search_text",
+    weights: {
+      "response.questions.question": 10,
+      "response.context_blocks.title": 5,
+      "response.questions.alternatives.text": 4,
+      "response.context_blocks.statement": 3,
+      "response.context_blocks.paragraphs": 2,
+      "response.context_blocks.sub_contexts.content": 2,
+    },
+    default_language: "portuguese",
+    language_override: "search_language",
+  }
+);
+print("✅ [INDEX] Índice 'idx_search_text' criado");
+
+// =============================================================================
+// 📝 REGISTRAR MIGRAÇÃO
+// =============================================================================
+
+db.migrations.insertOne({
+  version: migrationVersion,
+  description: "Índice de texto (português) para busca nas provas do usuário",
+  applied_at: new Date(),
+});
+
+print(`\n✅ [SUCCESS] Migração ${migrationVersion} aplicada com sucesso!`);
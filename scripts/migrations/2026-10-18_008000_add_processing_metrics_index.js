@@ -0,0 +1,47 @@
+// =============================================================================
+// 🔄 MIGRATION: Índice das métricas de processamento por documento
+// =============================================================================
+// Versão: 2026-10-18_008000
+// Descrição: Janela de datas de GET /admin/processing-metrics (azure_processing_data)
+// Data: 2026-10-18
+
+print("🚀 [MIGRATION] Iniciando: add_processing_metrics_index");
+
+db = db.getSiblingDB("smartquest");
+
+// =============================================================================
+// ✅ VERIFICAR SE MIGRAÇÃO JÁ FOI APLICADA
+// =============================================================================
+const migrationVersion = "2026-10-18_008000";
+const existingMigration = db.migrations.findOne({ version: migrationVersion });
+
+if (existingMigration) {
+  print(
+    `⚠️ [SKIP] Migração ${migrationVersion} já foi aplicada em ${existingMigration.applied_at}`
+  );
+  quit();
+}
+
+// =============================================================================
+// 🎯 CRIAÇÃO DE ÍNDICES
+// =============================================================================
+
+// Agregação dos percentis filtra por created_at (janela de dias)
+print("📊 [INDEX] Criando índice 'idx_pm_created_at' em azure_processing_data...");
+db.azure_processing_data.createIndex(
+  { created_at: 1 },
+  { name: "idx_pm_created_at" }
+);
+print("✅ [INDEX] Índice 'idx_pm_created_at' criado");
+
+// =============================================================================
+// 📝 REGISTRAR MIGRAÇÃO
+// =============================================================================
+
+db.migrations.insertOne({
+  version: migrationVersion,
+  description: "Índice de created_at em azure_processing_data",
+  applied_at: new Date(),
+});
+
+print(`\n✅ [SUCCESS] Migração ${migrationVersion} aplicada com sucesso!`);
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Reprocessamento em lote - SmartQuest
+
+Re-executa as fases 3-7 do pipeline sobre os responses do Azure armazenados em
+'azure_responses' e atualiza 'analyze_documents', sem chamar o Azure.
+
+Uso:
+    python scripts/reprocess_analyses.py                      # novo job
+    python scripts/reprocess_analyses.py --job-id <id>        # retoma do checkpoint
+    python scripts/reprocess_analyses.py --dry-run --limit 100
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def _run(args) -> int:
+    from app.services.infrastructure import MongoDBConnectionService
+    from app.services.core.reprocessing_service import AnalysisReprocessingService
+    from app.services.core.document_response_cache import DocumentResponseCache
+
+    connection_service = MongoDBConnectionService()
+    # Fora da API: o cache dos workers expira pelo TTL (DOCUMENT_RESPONSE_CACHE_TTL_SECONDS)
+    service = AnalysisReprocessingService(connection_service, DocumentResponseCache())
+    try:
+        report = await service.run(
+            job_id=args.job_id,
+            batch_size=args.batch_size,
+            max_workers=args.workers,
+            limit=args.limit,
+            user_email=args.email,
+            dry_run=args.dry_run
+        )
+    finally:
+        await connection_service.close()
+
+    print(json.dumps(report.to_dict(), indent=2, default=str, ensure_ascii=False))
+    print(f"[INFO] Job {report.job_id}: {report.status} - "
+          f"{report.scanned} analisados, {report.updated} atualizados, {report.failed} falhas "
+          f"({report.throughput_docs_per_second} docs/s)")
+    return 0 if report.status == "completed" else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprocessa analyze_documents a partir dos responses Azure armazenados")
+    parser.add_argument("--job-id", help="ID do job (retoma do checkpoint se existir)")
+    parser.add_argument("--email", help="Restringe a um usuário")
+    parser.add_argument("--batch-size", type=int, help="Documentos por lote")
+    parser.add_argument("--workers", type=int, help="Processos do pool (0 = in-process)")
+    parser.add_argument("--limit", type=int, help="Máximo de documentos nesta execução")
+    parser.add_argument("--dry-run", action="store_true", help="Calcula o diff sem gravar")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Linha do tempo de uma requisição a partir dos spans exportados - SmartQuest
+
+Lê o arquivo JSON Lines do exportador local (TRACING_FILE_PATH) e mostra a
+árvore de spans de um trace com início relativo, duração e barra proporcional,
+para identificar qual etapa (Azure, renderização, upload, MongoDB, fases do
+orquestrador) dominou a latência. ``--chrome`` grava o mesmo trace no formato
+Trace Event, que o Perfetto (ui.perfetto.dev) e o chrome://tracing exibem como
+flame chart.
+
+Sem --request-id/--trace-id lista os traces mais lentos.
+
+Uso:
+    python scripts/trace_timeline.py
+    python scripts/trace_timeline.py --request-id 5f1c...  --chrome trace.json
+    python scripts/trace_timeline.py --trace-id 4bf92f3577b34da6a3ce929d0e0e4736
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BAR_WIDTH = 40
+
+
+def _load(path: Path) -> List[dict]:
+    spans = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+
+def _trace_id_for_request(spans: List[dict], request_id: str) -> Optional[str]:
+    for span in spans:
+        if span["attributes"].get("request.id") == request_id:
+            return span["trace_id"]
+    return None
+
+
+def _print_slowest(spans: List[dict], limit: int) -> None:
+    ids = {span["span_id"] for span in spans}
+    roots = [span for span in spans if span["parent_span_id"] not in ids and span["duration_ms"] is not None]
+    roots.sort(key=lambda span: span["duration_ms"], reverse=True)
+    print(f"{'duração (ms)':>12}  {'trace_id':32}  {'request.id':36}  span")
+    for span in roots[:limit]:
+        print(f"{span['duration_ms']:>12.1f}  {span['trace_id']}  "
+              f"{span['attributes'].get('request.id', '-'):36}  {span['name']}")
+
+
+def _print_timeline(spans: List[dict]) -> None:
+    ids = {span["span_id"] for span in spans}
+    children: Dict[Optional[str], List[dict]] = defaultdict(list)
+    for span in spans:
+        parent = span["parent_span_id"] if span["parent_span_id"] in ids else None
+        children[parent].append(span)
+    for siblings in children.values():
+        siblings.sort(key=lambda span: span["start_time_unix_nano"])
+
+    start = min(span["start_time_unix_nano"] for span in spans)
+    end = max(span["end_time_unix_nano"] or span["start_time_unix_nano"] for span in spans)
+    total = max(end - start, 1)
+
+    def walk(span: dict, depth: int) -> None:
+        offset = span["start_time_unix_nano"] - start
+        duration = (span["end_time_unix_nano"] or span["start_time_unix_nano"]) - span["start_time_unix_nano"]
+        left = int(offset / total * BAR_WIDTH)
+        width = max(1, int(duration / total * BAR_WIDTH))
+        bar = " " * left + "█" * min(width, BAR_WIDTH - left)
+        status = " ❌" if span["status"] == "ERROR" else ""
+        print(f"{offset / 1e6:>9.1f} {duration / 1e6:>9.1f}  |{bar:<{BAR_WIDTH}}|  {'  ' * depth}{span['name']}{status}")
+        for child in children.get(span["span_id"], []):
+            walk(child, depth + 1)
+
+    print(f"{'início(ms)':>9} {'dur.(ms)':>9}  {'':{BAR_WIDTH + 2}}  span")
+    for root in children[None]:
+        walk(root, 0)
+
+
+def _write_chrome_trace(spans: List[dict], output: Path) -> None:
+    events = [
+        {
+            "name": span["name"],
+            "cat": span["kind"].lower(),
+            "ph": "X",
+            "ts": span["start_time_unix_nano"] / 1000,
+            "dur": ((span["end_time_unix_nano"] or span["start_time_unix_nano"]) - span["start_time_unix_nano"]) / 1000,
+            "pid": 1,
+            "tid": 1,
+            "args": span["attributes"],
+        }
+        for span in spans
+    ]
+    output.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Linha do tempo dos spans de uma requisição")
+    parser.add_argument("--file", default="logs/traces.jsonl", help="Arquivo do exportador (TRACING_FILE_PATH)")
+    parser.add_argument("--request-id", help="request id (header X-Request-ID da resposta)")
+    parser.add_argument("--trace-id", help="trace id (32 hex)")
+    parser.add_argument("--chrome", help="Grava o trace no formato Trace Event (Perfetto/chrome://tracing)")
+    parser.add_argument("--limit", type=int, default=20, help="Traces listados quando nenhum id é informado")
+    args = parser.parse_args()
+
+    path = Path(args.file)
+    if not path.exists():
+        print(f"[ERROR] Arquivo não encontrado: {path}")
+        return 1
+    spans = _load(path)
+
+    trace_id = args.trace_id
+    if args.request_id:
+        trace_id = _trace_id_for_request(spans, args.request_id)
+        if trace_id is None:
+            print(f"[ERROR] Nenhum span com request.id={args.request_id}")
+            return 1
+    if trace_id is None:
+        _print_slowest(spans, args.limit)
+        return 0
+
+    selected = [span for span in spans if span["trace_id"] == trace_id]
+    if not selected:
+        print(f"[ERROR] Trace não encontrado: {trace_id}")
+        return 1
+    _print_timeline(selected)
+    if args.chrome:
+        _write_chrome_trace(selected, Path(args.chrome))
+        print(f"[SUCCESS] Trace Event gravado em {args.chrome}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
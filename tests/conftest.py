@@ -127,6 +127,97 @@ def mock_settings():
     return settings
 
 
+class _AsyncDocIterator:
+    """Iteração assíncrona sobre uma lista de documentos (``async for``)."""
+
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def make_async_cursor(docs):
+    """
+    Fake de cursor do Motor (find/aggregate/list_indexes) sobre ``docs``.
+
+    ``sort``/``batch_size`` encadeiam sem reordenar (os documentos já vêm na
+    ordem da consulta); ``skip``/``limit`` recortam a lista; ``to_list`` e
+    ``async for`` devolvem o resultado. É um MagicMock: as chamadas podem ser
+    verificadas (ex.: ``cursor.limit.assert_called_once_with(3)``).
+    """
+    from unittest.mock import AsyncMock, MagicMock
+
+    cursor = MagicMock(name="AsyncCursor")
+    cursor.docs = list(docs)
+
+    def _skip(n):
+        cursor.docs = cursor.docs[n:]
+        return cursor
+
+    def _limit(n):
+        # Como no MongoDB, limit(0) não limita
+        if n:
+            cursor.docs = cursor.docs[:n]
+        return cursor
+
+    cursor.sort.side_effect = lambda *args, **kwargs: cursor
+    cursor.batch_size.side_effect = lambda *args, **kwargs: cursor
+    cursor.skip.side_effect = _skip
+    cursor.limit.side_effect = _limit
+    cursor.to_list = AsyncMock(side_effect=lambda length=None: cursor.docs[:length] if length else list(cursor.docs))
+    cursor.close = AsyncMock()
+    cursor.__aiter__ = lambda self: _AsyncDocIterator(cursor.docs)
+    return cursor
+
+
+@pytest.fixture
+def async_cursor():
+    """Fábrica de cursores assíncronos do Motor: ``async_cursor(docs)``."""
+    return make_async_cursor
+
+
+def make_mongo_connection(collections):
+    """
+    Fake do MongoDBConnectionService: ``get_database()`` devolve um banco em que
+    ``database[name]`` é ``collections[name]`` (dict) ou a mesma coleção para
+    qualquer nome.
+    """
+    from unittest.mock import AsyncMock, MagicMock
+
+    database = MagicMock(name="Database")
+    if isinstance(collections, dict):
+        database.__getitem__ = MagicMock(side_effect=lambda name: collections[name])
+    else:
+        database.__getitem__ = MagicMock(return_value=collections)
+    connection = AsyncMock(name="MongoDBConnectionService")
+    connection.get_database = AsyncMock(return_value=database)
+    return connection
+
+
+@pytest.fixture
+def mongo_connection():
+    """Fábrica de conexões MongoDB fake: ``mongo_connection(collections)``."""
+    return make_mongo_connection
+
+
+@pytest.fixture
+def persistence_service_for():
+    """MongoDBPersistenceService sobre coleções fake: ``persistence_service_for(collections)``."""
+    from app.services.persistence import MongoDBPersistenceService
+
+    def build(collections):
+        return MongoDBPersistenceService(make_mongo_connection(collections))
+
+    return build
+
+
 # Test data for different scenarios
 @pytest.fixture
 def sample_text_with_questions():
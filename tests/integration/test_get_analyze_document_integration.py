@@ -10,6 +10,15 @@ from unittest.mock import AsyncMock, patch
 from app.main import app
 from app.models.persistence.analyze_document_record import AnalyzeDocumentRecord
 from app.models.persistence.enums import DocumentStatus
+from app.services.core.document_response_cache import DocumentResponseCache
+
+
+def _resolve_with(mock_container, persistence_service):
+    """Container mockado: cache real (vazio) e o serviço de persistência informado."""
+    response_cache = DocumentResponseCache()
+    mock_container.resolve.side_effect = lambda interface: (
+        response_cache if interface is DocumentResponseCache else persistence_service
+    )
 
 
 class TestGetAnalyzeDocumentIntegration:
@@ -74,7 +83,7 @@ class TestGetAnalyzeDocumentIntegration:
         # Arrange
         mock_persistence_service = AsyncMock()
         mock_persistence_service.get_by_document_id.return_value = sample_document_record
-        mock_container.resolve.return_value = mock_persistence_service
+        _resolve_with(mock_container, mock_persistence_service)
 
         document_id = "507f1f77bcf86cd799439011"
 
@@ -112,7 +121,7 @@ class TestGetAnalyzeDocumentIntegration:
         # Arrange
         mock_persistence_service = AsyncMock()
         mock_persistence_service.get_by_document_id.return_value = None
-        mock_container.resolve.return_value = mock_persistence_service
+        _resolve_with(mock_container, mock_persistence_service)
 
         document_id = "507f1f77bcf86cd799439012"
 
@@ -148,7 +157,7 @@ class TestGetAnalyzeDocumentIntegration:
         # Arrange
         mock_persistence_service = AsyncMock()
         mock_persistence_service.get_by_document_id.side_effect = Exception("Database error")
-        mock_container.resolve.return_value = mock_persistence_service
+        _resolve_with(mock_container, mock_persistence_service)
 
         document_id = "507f1f77bcf86cd799439011"
 
@@ -168,7 +177,7 @@ class TestGetAnalyzeDocumentIntegration:
     ):
         """Teste de integração com diferentes status de documento"""
         mock_persistence_service = AsyncMock()
-        mock_container.resolve.return_value = mock_persistence_service
+        _resolve_with(mock_container, mock_persistence_service)
 
         # Test PENDING status
         pending_record = AnalyzeDocumentRecord(
@@ -260,7 +269,7 @@ class TestGetAnalyzeDocumentIntegration:
 
         mock_persistence_service = AsyncMock()
         mock_persistence_service.get_by_document_id.return_value = complex_record
-        mock_container.resolve.return_value = mock_persistence_service
+        _resolve_with(mock_container, mock_persistence_service)
 
         # Act
         response = client.get("/analyze/analyze_document/507f1f77bcf86cd799439011")
@@ -10,10 +10,24 @@ from fastapi import UploadFile
 from io import BytesIO
 
 from app.api.controllers.analyze import analyze_document
-from app.models.persistence import AnalyzeDocumentRecord
+from app.core.document_buffer import DocumentBuffer
+from app.models.persistence import AnalyzeDocumentRecord, AzureProcessingDataRecord
 from app.models.persistence.enums import DocumentStatus
 
 
+async def _run_process(email, document, process):
+    """Single-flight sem concorrência: apenas executa a análise."""
+    return await process()
+
+
+def _enqueued(mock_persistence, record_type):
+    """Registros de um tipo agendados via enqueue_write."""
+    return [
+        call.args[0] for call in mock_persistence.enqueue_write.call_args_list
+        if isinstance(call.args[0], record_type)
+    ]
+
+
 class TestAnalyzeDuplicateCheck:
     """Testes para verificação de duplicatas no endpoint."""
 
@@ -35,6 +49,12 @@ class TestAnalyzeDuplicateCheck:
         
         mock_file.seek = AsyncMock(side_effect=async_seek)
         
+        # Mock async read (controller lê o upload uma única vez em chunks)
+        async def async_read(size=-1):
+            return file_obj.read(size)
+        
+        mock_file.read = AsyncMock(side_effect=async_read)
+        
         return mock_file
 
     @pytest.fixture
@@ -99,6 +119,7 @@ class TestAnalyzeDuplicateCheck:
             from app.dtos.responses.document_response_dto import DocumentResponseDTO
             
             mock_duplicate_service = AsyncMock()
+            mock_duplicate_service.run_single_flight = AsyncMock(side_effect=_run_process)
             
             # Create expected response from existing document (same way DuplicateCheckService does)
             response_data = mock_existing_doc.response.copy()
@@ -160,6 +181,7 @@ class TestAnalyzeDuplicateCheck:
             from app.services.core.duplicate_check_service import DuplicateCheckResult
             
             mock_duplicate_service = AsyncMock()
+            mock_duplicate_service.run_single_flight = AsyncMock(side_effect=_run_process)
             mock_result = DuplicateCheckResult(
                 is_duplicate=True,
                 should_process=True,  # FAILED status allows reprocessing
@@ -172,7 +194,7 @@ class TestAnalyzeDuplicateCheck:
             
             # Mock persistence service
             mock_persistence = AsyncMock()
-            mock_persistence.save_completed_analysis = AsyncMock(return_value="new_doc_id")
+            mock_persistence.enqueue_write = AsyncMock(return_value="new_doc_id")
             
             # Mock analyze service
             mock_analyze = AsyncMock()
@@ -181,6 +203,7 @@ class TestAnalyzeDuplicateCheck:
             mock_internal_response.questions = []
             mock_internal_response.context_blocks = []
             mock_internal_response.document_metadata.header_images = []
+            mock_internal_response.document_metadata.grade = None
             mock_analyze.process_document_with_models = AsyncMock(return_value=mock_internal_response)
             
             def resolve_service(interface):
@@ -216,7 +239,7 @@ class TestAnalyzeDuplicateCheck:
             # Verificar que documento foi reprocessado
             mock_extraction.get_extraction_data.assert_called_once()
             mock_analyze.process_document_with_models.assert_called_once()
-            mock_persistence.save_completed_analysis.assert_called_once()
+            assert len(_enqueued(mock_persistence, AnalyzeDocumentRecord)) == 1
 
     @pytest.mark.asyncio
     async def test_no_duplicate_processes_normally(
@@ -232,6 +255,7 @@ class TestAnalyzeDuplicateCheck:
             from app.services.core.duplicate_check_service import DuplicateCheckResult
             
             mock_duplicate_service = AsyncMock()
+            mock_duplicate_service.run_single_flight = AsyncMock(side_effect=_run_process)
             mock_result = DuplicateCheckResult(
                 is_duplicate=False,
                 should_process=True,
@@ -244,7 +268,7 @@ class TestAnalyzeDuplicateCheck:
             
             # Mock persistence service (sem duplicata)
             mock_persistence = AsyncMock()
-            mock_persistence.save_completed_analysis = AsyncMock(return_value="new_doc_id")
+            mock_persistence.enqueue_write = AsyncMock(return_value="new_doc_id")
             
             # Mock analyze service
             mock_analyze = AsyncMock()
@@ -253,6 +277,7 @@ class TestAnalyzeDuplicateCheck:
             mock_internal_response.questions = []
             mock_internal_response.context_blocks = []
             mock_internal_response.document_metadata.header_images = []
+            mock_internal_response.document_metadata.grade = None
             mock_analyze.process_document_with_models = AsyncMock(return_value=mock_internal_response)
             
             def resolve_service(interface):
@@ -286,13 +311,27 @@ class TestAnalyzeDuplicateCheck:
             )
             
             # Verificar processamento completo
-            mock_duplicate_service.check_and_handle_duplicate.assert_called_once_with(
-                "test@example.com",
-                mock_file
-            )
+            mock_duplicate_service.check_and_handle_duplicate.assert_called_once()
+            email_arg, document_arg = mock_duplicate_service.check_and_handle_duplicate.call_args[0]
+            assert email_arg == "test@example.com"
+            assert isinstance(document_arg, DocumentBuffer)
+            assert document_arg.filename == "test.pdf"
+            
+            # Extração recebe o mesmo buffer (upload lido uma única vez)
+            assert mock_extraction.get_extraction_data.call_args[0][0] is document_arg
             mock_extraction.get_extraction_data.assert_called_once()
             mock_analyze.process_document_with_models.assert_called_once()
-            mock_persistence.save_completed_analysis.assert_called_once()
+            
+            # Persistência agendada (write-behind) com _id pré-alocado = document_id do response
+            [saved_record] = _enqueued(mock_persistence, AnalyzeDocumentRecord)
+            assert saved_record.id == "new_doc_id"
+            assert saved_record.status == DocumentStatus.COMPLETED
+            
+            # Métricas de processamento do documento (GET /admin/processing-metrics)
+            [metrics_record] = _enqueued(mock_persistence, AzureProcessingDataRecord)
+            assert metrics_record.document_id == "new_doc_id"
+            assert metrics_record.metrics.cache_outcome == "miss"
+            assert "extraction" in metrics_record.metrics.stage_durations_seconds
 
     @pytest.mark.asyncio
     async def test_duplicate_check_uses_file_size(
@@ -307,6 +346,7 @@ class TestAnalyzeDuplicateCheck:
             from app.dtos.responses.document_response_dto import DocumentResponseDTO
             
             mock_duplicate_service = AsyncMock()
+            mock_duplicate_service.run_single_flight = AsyncMock(side_effect=_run_process)
             
             # Create expected response from existing document (same way DuplicateCheckService does)
             response_data = mock_existing_doc.response.copy()
@@ -337,10 +377,11 @@ class TestAnalyzeDuplicateCheck:
             )
             
             # Verificar que file foi passado corretamente (service extrai file_size internamente)
-            mock_duplicate_service.check_and_handle_duplicate.assert_called_once_with(
-                "test@example.com",
-                mock_file
-            )
+            mock_duplicate_service.check_and_handle_duplicate.assert_called_once()
+            email_arg, document_arg = mock_duplicate_service.check_and_handle_duplicate.call_args[0]
+            assert email_arg == "test@example.com"
+            assert isinstance(document_arg, DocumentBuffer)
+            assert document_arg.size == 1100
             
             # Verificar que result contém file_size
             assert mock_result.file_size == 1100
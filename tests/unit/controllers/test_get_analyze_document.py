@@ -2,15 +2,18 @@
 Testes unitários para o endpoint GET /analyze/analyze_document/{id}
 """
 
+import json
+
 import pytest
 from unittest.mock import Mock, AsyncMock
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from datetime import datetime
 
 from app.api.controllers.analyze import get_analyze_document
 from app.dtos.responses.analyze_document_response_dto import AnalyzeDocumentResponseDTO
 from app.models.persistence.analyze_document_record import AnalyzeDocumentRecord
 from app.models.persistence.enums import DocumentStatus
+from app.services.core.document_response_cache import DocumentResponseCache
 
 
 class TestGetAnalyzeDocument:
@@ -20,6 +23,7 @@ class TestGetAnalyzeDocument:
     def mock_request(self):
         """Mock do request FastAPI"""
         request = Mock()
+        request.headers = {}
         return request
 
     @pytest.fixture
@@ -48,10 +52,17 @@ class TestGetAnalyzeDocument:
         return service
 
     @pytest.fixture
-    def mock_container(self, mock_persistence_service, monkeypatch):
+    def response_cache(self):
+        """Cache real (vazio) de respostas"""
+        return DocumentResponseCache()
+
+    @pytest.fixture
+    def mock_container(self, mock_persistence_service, response_cache, monkeypatch):
         """Mock do DI Container"""
         container = Mock()
-        container.resolve.return_value = mock_persistence_service
+        container.resolve.side_effect = lambda interface: (
+            response_cache if interface is DocumentResponseCache else mock_persistence_service
+        )
         
         # Patch do import do container no ponto correto
         monkeypatch.setattr("app.core.di_container.container", container)
@@ -71,19 +82,97 @@ class TestGetAnalyzeDocument:
         mock_persistence_service.get_by_document_id.return_value = sample_document_record
 
         # Act
-        result = await get_analyze_document(document_id, mock_request)
+        response = await get_analyze_document(document_id, mock_request)
 
         # Assert
-        assert isinstance(result, AnalyzeDocumentResponseDTO)
+        assert isinstance(response, Response)
+        assert response.status_code == 200
+        result = AnalyzeDocumentResponseDTO.parse_raw(response.body)
         assert result.id == str(sample_document_record.id)
         assert result.document_name == sample_document_record.file_name
         assert result.user_email == sample_document_record.user_email
         assert result.status == sample_document_record.status.value
         assert result.analysis_results == sample_document_record.response
+        assert json.loads(response.body)["file_name"] == sample_document_record.file_name
+        assert response.headers["etag"].startswith('"')
+        assert "must-revalidate" in response.headers["cache-control"]
         
         # Verificar chamadas
         mock_persistence_service.get_by_document_id.assert_called_once_with(document_id)
-        mock_container.resolve.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_completed_document_is_served_from_cache(
+        self,
+        mock_request,
+        sample_document_record,
+        mock_persistence_service,
+        mock_container
+    ):
+        """✅ Segunda leitura de análise concluída não consulta o MongoDB."""
+        mock_persistence_service.get_by_document_id.return_value = sample_document_record
+
+        first = await get_analyze_document("doc-1", mock_request)
+        second = await get_analyze_document("doc-1", mock_request)
+
+        assert second.body == first.body
+        assert second.headers["etag"] == first.headers["etag"]
+        mock_persistence_service.get_by_document_id.assert_called_once_with("doc-1")
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_returns_304(
+        self,
+        mock_request,
+        sample_document_record,
+        mock_persistence_service,
+        mock_container
+    ):
+        """✅ If-None-Match com o ETag atual responde 304 sem corpo."""
+        mock_persistence_service.get_by_document_id.return_value = sample_document_record
+        etag = (await get_analyze_document("doc-1", mock_request)).headers["etag"]
+
+        mock_request.headers = {"if-none-match": f'W/"outro", {etag}'}
+        response = await get_analyze_document("doc-1", mock_request)
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_invalidated_document_is_reloaded(
+        self,
+        mock_request,
+        sample_document_record,
+        mock_persistence_service,
+        mock_container,
+        response_cache
+    ):
+        """✅ Registro reescrito (invalidate) é relido com novo ETag."""
+        mock_persistence_service.get_by_document_id.return_value = sample_document_record
+        first = await get_analyze_document("doc-1", mock_request)
+
+        sample_document_record.response = {"document_id": "doc_123", "questions": [{"number": 1}]}
+        response_cache.invalidate(["doc-1"])
+        second = await get_analyze_document("doc-1", mock_request)
+
+        assert second.headers["etag"] != first.headers["etag"]
+        assert mock_persistence_service.get_by_document_id.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_pending_document_is_not_cached(
+        self,
+        mock_request,
+        sample_document_record,
+        mock_persistence_service,
+        mock_container
+    ):
+        """✅ Documento não concluído sempre é relido do MongoDB."""
+        sample_document_record.status = DocumentStatus.PENDING
+        mock_persistence_service.get_by_document_id.return_value = sample_document_record
+
+        await get_analyze_document("doc-1", mock_request)
+        await get_analyze_document("doc-1", mock_request)
+
+        assert mock_persistence_service.get_by_document_id.call_count == 2
 
     @pytest.mark.asyncio
     async def test_get_analyze_document_not_found(
@@ -161,12 +250,12 @@ class TestGetAnalyzeDocument:
         # Test MongoDB ObjectId format
         object_id = "507f1f77bcf86cd799439011"
         result = await get_analyze_document(object_id, mock_request)
-        assert isinstance(result, AnalyzeDocumentResponseDTO)
+        assert isinstance(AnalyzeDocumentResponseDTO.parse_raw(result.body), AnalyzeDocumentResponseDTO)
 
         # Test UUID format (caso seja usado)
         uuid_id = "550e8400-e29b-41d4-a716-446655440000"
         result = await get_analyze_document(uuid_id, mock_request)
-        assert isinstance(result, AnalyzeDocumentResponseDTO)
+        assert isinstance(AnalyzeDocumentResponseDTO.parse_raw(result.body), AnalyzeDocumentResponseDTO)
 
         # Verificar que o serviço foi chamado com os IDs corretos
         calls = mock_persistence_service.get_by_document_id.call_args_list
@@ -10,10 +10,15 @@ from fastapi import HTTPException
 from datetime import datetime, date, time
 
 from app.api.controllers.analyze import list_documents
-from app.dtos.responses.document_list_response_dto import DocumentListResponseDTO
-from app.dtos.responses.analyze_document_response_dto import AnalyzeDocumentResponseDTO
-from app.models.persistence.analyze_document_record import AnalyzeDocumentRecord
+from app.dtos.responses.document_list_response_dto import DocumentListResponseDTO, DocumentListItemDTO
 from app.models.persistence.enums import DocumentStatus
+from app.services.persistence import DocumentListCursor, DocumentSummaryPage
+
+
+def _page(items, total=None, has_next=False):
+    """DocumentSummaryPage com next_cursor derivado do último item."""
+    next_cursor = DocumentListCursor.from_document(items[-1]).encode() if has_next and items else None
+    return DocumentSummaryPage(items=items, next_cursor=next_cursor, total_count=total)
 
 
 class TestListDocuments:
@@ -35,22 +40,17 @@ class TestListDocuments:
 
     @pytest.fixture
     def sample_documents(self):
-        """Lista de documentos de exemplo"""
+        """Lista de documentos de exemplo (projeção de resumo do MongoDB)"""
         return [
-            AnalyzeDocumentRecord(
-                id=f"doc_{i}",
-                user_email="test@example.com",
-                file_name=f"test_{i}.pdf",
-                response={
-                    "document_id": f"doc_{i}",
-                    "email": "test@example.com",
-                    "filename": f"test_{i}.pdf",
-                    "questions": [],
-                    "context_blocks": []
-                },
-                status=DocumentStatus.COMPLETED,
-                created_at=datetime(2025, 1, i+1, 10, 30, 0)
-            )
+            {
+                "_id": f"doc_{i}",
+                "user_email": "test@example.com",
+                "file_name": f"test_{i}.pdf",
+                "file_size": 1024,
+                "response": {"document_id": f"doc_{i}"},
+                "status": DocumentStatus.COMPLETED.value,
+                "created_at": datetime(2025, 1, 15 - i, 10, 30, 0)
+            }
             for i in range(15)  # 15 documentos para testar paginação
         ]
 
@@ -58,7 +58,7 @@ class TestListDocuments:
     def mock_persistence_service(self):
         """Mock do serviço de persistência"""
         service = Mock()
-        service.get_by_user_email_with_filters = AsyncMock()
+        service.get_document_summaries_page = AsyncMock()
         return service
 
     @pytest.fixture
@@ -85,9 +85,10 @@ class TestListDocuments:
         Deve retornar primeira página com 10 documentos e metadados corretos
         """
         # Arrange
-        mock_persistence_service.get_by_user_email_with_filters.return_value = (
+        mock_persistence_service.get_document_summaries_page.return_value = _page(
             sample_documents[:10],  # Primeira página (10 itens)
-            15  # Total de documentos
+            15,  # Total de documentos
+            has_next=True
         )
         
         # Act
@@ -97,7 +98,11 @@ class TestListDocuments:
             start_date=None,
             end_date=None,
             page=1,
-            page_size=10
+            page_size=10,
+            cursor=None,
+            include_total=True,
+            subject=None,
+            sort_by="created_at"
         )
         
         # Assert
@@ -111,13 +116,18 @@ class TestListDocuments:
         assert result.pagination.has_previous is False
         
         # Verificar chamada ao service
-        mock_persistence_service.get_by_user_email_with_filters.assert_called_once_with(
+        mock_persistence_service.get_document_summaries_page.assert_called_once_with(
             email="test@example.com",
             start_date=None,
             end_date=None,
+            page_size=10,
+            cursor=None,
             page=1,
-            page_size=10
+            include_total=True,
+            subject=None,
+            sort_by="created_at"
         )
+        assert result.pagination.next_cursor is not None
 
     @pytest.mark.asyncio
     async def test_list_with_date_filter_returns_filtered_results(
@@ -135,7 +145,7 @@ class TestListDocuments:
         start_date = date(2025, 1, 1)
         end_date = date(2025, 1, 31)
         
-        mock_persistence_service.get_by_user_email_with_filters.return_value = (
+        mock_persistence_service.get_document_summaries_page.return_value = _page(
             sample_documents[:5],  # 5 documentos no período
             5
         )
@@ -147,7 +157,11 @@ class TestListDocuments:
             start_date=start_date,
             end_date=end_date,
             page=1,
-            page_size=10
+            page_size=10,
+            cursor=None,
+            include_total=True,
+            subject=None,
+            sort_by="created_at"
         )
         
         # Assert
@@ -157,7 +171,7 @@ class TestListDocuments:
         
         # Verificar que datas foram convertidas para datetime e passadas ao service
         # start_date = 00:00:00, end_date = 23:59:59.999999
-        call_args = mock_persistence_service.get_by_user_email_with_filters.call_args
+        call_args = mock_persistence_service.get_document_summaries_page.call_args
         assert call_args.kwargs["email"] == "test@example.com"
         assert call_args.kwargs["start_date"] == datetime.combine(start_date, time.min)
         assert call_args.kwargs["end_date"] == datetime.combine(end_date, time.max)
@@ -177,7 +191,7 @@ class TestListDocuments:
         Deve retornar itens restantes e metadados corretos
         """
         # Arrange
-        mock_persistence_service.get_by_user_email_with_filters.return_value = (
+        mock_persistence_service.get_document_summaries_page.return_value = _page(
             sample_documents[10:15],  # Segunda página (5 itens restantes)
             15
         )
@@ -189,7 +203,11 @@ class TestListDocuments:
             start_date=None,
             end_date=None,
             page=2,
-            page_size=10
+            page_size=10,
+            cursor=None,
+            include_total=True,
+            subject=None,
+            sort_by="created_at"
         )
         
         # Assert
@@ -210,7 +228,7 @@ class TestListDocuments:
         Deve retornar lista vazia com metadados zerados
         """
         # Arrange
-        mock_persistence_service.get_by_user_email_with_filters.return_value = (
+        mock_persistence_service.get_document_summaries_page.return_value = _page(
             [],  # Nenhum documento
             0
         )
@@ -222,7 +240,11 @@ class TestListDocuments:
             start_date=None,
             end_date=None,
             page=1,
-            page_size=10
+            page_size=10,
+            cursor=None,
+            include_total=True,
+            subject=None,
+            sort_by="created_at"
         )
         
         # Assert
@@ -245,9 +267,10 @@ class TestListDocuments:
         Deve retornar quantidade solicitada
         """
         # Arrange
-        mock_persistence_service.get_by_user_email_with_filters.return_value = (
+        mock_persistence_service.get_document_summaries_page.return_value = _page(
             sample_documents[:5],
-            15
+            15,
+            has_next=True
         )
         
         # Act
@@ -257,7 +280,11 @@ class TestListDocuments:
             start_date=None,
             end_date=None,
             page=1,
-            page_size=5
+            page_size=5,
+            cursor=None,
+            include_total=True,
+            subject=None,
+            sort_by="created_at"
         )
         
         # Assert
@@ -288,7 +315,11 @@ class TestListDocuments:
                 start_date=None,
                 end_date=None,
                 page=1,
-                page_size=10
+                page_size=10,
+                cursor=None,
+                include_total=True,
+                subject=None,
+                sort_by="created_at"
             )
         
         assert exc_info.value.status_code == 400
@@ -313,7 +344,11 @@ class TestListDocuments:
                 start_date=date(2025, 1, 1),
                 end_date=None,
                 page=1,
-                page_size=10
+                page_size=10,
+                cursor=None,
+                include_total=True,
+                subject=None,
+                sort_by="created_at"
             )
         
         assert exc_info.value.status_code == 400
@@ -338,7 +373,11 @@ class TestListDocuments:
                 start_date=None,
                 end_date=date(2025, 1, 31),
                 page=1,
-                page_size=10
+                page_size=10,
+                cursor=None,
+                include_total=True,
+                subject=None,
+                sort_by="created_at"
             )
         
         assert exc_info.value.status_code == 400
@@ -363,7 +402,11 @@ class TestListDocuments:
                 start_date=date(2025, 1, 31),
                 end_date=date(2025, 1, 1),
                 page=1,
-                page_size=10
+                page_size=10,
+                cursor=None,
+                include_total=True,
+                subject=None,
+                sort_by="created_at"
             )
         
         assert exc_info.value.status_code == 400
@@ -381,7 +424,7 @@ class TestListDocuments:
         Deve retornar 500 Internal Server Error
         """
         # Arrange
-        mock_persistence_service.get_by_user_email_with_filters.side_effect = Exception(
+        mock_persistence_service.get_document_summaries_page.side_effect = Exception(
             "MongoDB connection failed"
         )
         
@@ -393,7 +436,11 @@ class TestListDocuments:
                 start_date=None,
                 end_date=None,
                 page=1,
-                page_size=10
+                page_size=10,
+                cursor=None,
+                include_total=True,
+                subject=None,
+                sort_by="created_at"
             )
         
         assert exc_info.value.status_code == 500
@@ -416,7 +463,7 @@ class TestListDocuments:
         Deve manter todos os campos corretamente
         """
         # Arrange
-        mock_persistence_service.get_by_user_email_with_filters.return_value = (
+        mock_persistence_service.get_document_summaries_page.return_value = _page(
             [sample_documents[0]],
             1
         )
@@ -428,16 +475,22 @@ class TestListDocuments:
             start_date=None,
             end_date=None,
             page=1,
-            page_size=10
+            page_size=10,
+            cursor=None,
+            include_total=True,
+            subject=None,
+            sort_by="created_at"
         )
         
         # Assert
         assert len(result.items) == 1
         item = result.items[0]
-        assert isinstance(item, AnalyzeDocumentResponseDTO)
+        assert isinstance(item, DocumentListItemDTO)
         assert item.user_email == "test@example.com"
         assert item.document_name == "test_0.pdf"
         assert item.status == "completed"
+        assert item.document_id == "doc_0"
+        assert not hasattr(item, "analysis_results")
 
     @pytest.mark.asyncio
     async def test_pagination_metadata_calculated_correctly(
@@ -452,9 +505,10 @@ class TestListDocuments:
         Deve calcular total_pages, has_next, has_previous corretamente
         """
         # Arrange: 25 documentos, page_size=10 -> 3 páginas
-        mock_persistence_service.get_by_user_email_with_filters.return_value = (
+        mock_persistence_service.get_document_summaries_page.return_value = _page(
             sample_documents[:10],
-            25
+            25,
+            has_next=True
         )
         
         # Act
@@ -464,10 +518,90 @@ class TestListDocuments:
             start_date=None,
             end_date=None,
             page=1,
-            page_size=10
+            page_size=10,
+            cursor=None,
+            include_total=True,
+            subject=None,
+            sort_by="created_at"
         )
         
         # Assert
         assert result.pagination.total_pages == 3  # ceil(25/10) = 3
         assert result.pagination.has_next is True  # Página 1 de 3
         assert result.pagination.has_previous is False  # Primeira página
+
+    # ========================================================================
+    # TESTES DE PAGINAÇÃO KEYSET
+    # ========================================================================
+
+    @pytest.mark.asyncio
+    async def test_cursor_is_forwarded_and_total_skipped(
+        self,
+        mock_request,
+        mock_persistence_service,
+        mock_container,
+        sample_documents
+    ):
+        """
+        ✅ Cenário: Próxima página via cursor sem total
+        Deve repassar o cursor e omitir total_items/total_pages
+        """
+        # Arrange
+        cursor = DocumentListCursor.from_document(sample_documents[9]).encode()
+        mock_persistence_service.get_document_summaries_page.return_value = _page(
+            sample_documents[10:15]
+        )
+        
+        # Act
+        result = await list_documents(
+            request=mock_request,
+            email="test@example.com",
+            start_date=None,
+            end_date=None,
+            page=2,
+            page_size=10,
+            cursor=cursor,
+            include_total=False,
+            subject=None,
+            sort_by="created_at"
+        )
+        
+        # Assert
+        call_args = mock_persistence_service.get_document_summaries_page.call_args
+        assert call_args.kwargs["cursor"] == cursor
+        assert call_args.kwargs["include_total"] is False
+        assert result.pagination.total_items is None
+        assert result.pagination.total_pages is None
+        assert result.pagination.has_next is False
+        assert result.pagination.has_previous is True
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_raises_400(
+        self,
+        mock_request,
+        mock_persistence_service,
+        mock_container
+    ):
+        """
+        ❌ Cenário: Cursor malformado
+        Deve retornar 400 Bad Request
+        """
+        # Arrange
+        mock_persistence_service.get_document_summaries_page.side_effect = ValueError("Invalid cursor")
+        
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await list_documents(
+                request=mock_request,
+                email="test@example.com",
+                start_date=None,
+                end_date=None,
+                page=1,
+                page_size=10,
+                cursor="nao-e-um-cursor",
+                include_total=True,
+                subject=None,
+                sort_by="created_at"
+            )
+        
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,119 @@
+"""
+Testes unitários para os endpoints GET /analyze/questions e
+GET /analyze/questions/{question_id}/similar
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import HTTPException
+
+from app.api.controllers.analyze import list_questions, list_similar_questions
+from app.dtos.responses.question_list_response_dto import QuestionListResponseDTO
+from app.services.core.question_similarity_service import QuestionCluster
+from app.services.persistence.question_query import QuestionPage
+
+
+def _params(**overrides):
+    params = dict(
+        email=None, subject=None, grade=None, multiple_choice=None,
+        has_image=None, document_id=None, page_size=20, cursor=None
+    )
+    params.update(overrides)
+    return params
+
+
+class TestListQuestions:
+    """Testes para o endpoint GET /analyze/questions"""
+
+    @pytest.fixture
+    def mock_persistence_service(self):
+        service = Mock()
+        service.get_questions_page = AsyncMock()
+        return service
+
+    @pytest.fixture
+    def mock_container(self, mock_persistence_service):
+        with patch("app.core.di_container.container") as mock_cont:
+            mock_cont.resolve = Mock(return_value=mock_persistence_service)
+            yield mock_cont
+
+    @pytest.mark.asyncio
+    async def test_returns_questions_page(self, mock_persistence_service, mock_container):
+        """✅ Filtros repassados ao serviço e itens convertidos com next_cursor."""
+        mock_persistence_service.get_questions_page.return_value = QuestionPage(
+            items=[{
+                "_id": "analysis-1:0000", "document_id": "analysis-1", "user_email": "t@e.com",
+                "position": 0, "number": 1, "statement": "Quanto é 2 + 2?",
+                "alternatives": [{"letter": "A", "text": "4"}], "is_multiple_choice": True,
+                "subject": "Matemática", "subject_key": "matematica", "has_image": False,
+                "created_at": datetime(2026, 10, 18)
+            }],
+            next_cursor="YW5hbHlzaXMtMTowMDAw"
+        )
+
+        result = await list_questions(Mock(), **_params(subject="Matemática", multiple_choice=True, page_size=1))
+
+        assert isinstance(result, QuestionListResponseDTO)
+        assert result.items[0].id == "analysis-1:0000"
+        assert result.items[0].alternatives[0].text == "4"
+        assert result.has_next is True
+        assert result.next_cursor == "YW5hbHlzaXMtMTowMDAw"
+        mock_persistence_service.get_questions_page.assert_called_once_with(
+            **_params(subject="Matemática", multiple_choice=True, page_size=1)
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_returns_400(self, mock_persistence_service, mock_container):
+        """❌ Cursor inválido retorna 400."""
+        mock_persistence_service.get_questions_page.side_effect = ValueError("Invalid cursor")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await list_questions(Mock(), **_params(cursor="???"))
+
+        assert exc_info.value.status_code == 400
+
+
+class TestListSimilarQuestions:
+    """Testes para o endpoint GET /analyze/questions/{question_id}/similar"""
+
+    @pytest.fixture
+    def similarity_service(self):
+        service = Mock()
+        service.threshold = 0.8
+        service.find_near_duplicates = AsyncMock()
+        return service
+
+    @pytest.fixture
+    def mock_container(self, similarity_service):
+        with patch("app.core.di_container.container") as mock_cont:
+            mock_cont.resolve = Mock(return_value=similarity_service)
+            yield mock_cont
+
+    @pytest.mark.asyncio
+    async def test_returns_cluster_with_scores(self, similarity_service, mock_container):
+        """✅ Questão de referência e quase-duplicatas com a similaridade."""
+        question = {"_id": "a:0000", "document_id": "a", "user_email": "t@e.com", "number": 1}
+        similarity_service.find_near_duplicates.return_value = QuestionCluster(
+            question=question,
+            matches=[({**question, "_id": "b:0002", "document_id": "b"}, 0.9)],
+            candidates_examined=4
+        )
+
+        result = await list_similar_questions(Mock(), question_id="a:0000", threshold=None, limit=20)
+
+        assert result.question.id == "a:0000"
+        assert result.threshold == 0.8
+        assert result.candidates_examined == 4
+        assert [(item.id, item.similarity) for item in result.items] == [("b:0002", 0.9)]
+        similarity_service.find_near_duplicates.assert_awaited_once_with("a:0000", threshold=None, limit=20)
+
+    @pytest.mark.asyncio
+    async def test_unknown_question_returns_404(self, similarity_service, mock_container):
+        """❌ Questão inexistente retorna 404."""
+        similarity_service.find_near_duplicates.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await list_similar_questions(Mock(), question_id="x:0000", threshold=0.9, limit=20)
+
+        assert exc_info.value.status_code == 404
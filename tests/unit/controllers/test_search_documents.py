@@ -0,0 +1,60 @@
+"""
+Testes unitários para o endpoint GET /analyze/documents/search
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import HTTPException
+
+from app.api.controllers.analyze import search_documents
+from app.dtos.responses.document_list_response_dto import DocumentSearchResponseDTO
+from app.services.persistence import DocumentSearchPage
+
+
+class TestSearchDocuments:
+    """Testes para o endpoint GET /analyze/documents/search"""
+
+    @pytest.fixture
+    def mock_persistence_service(self):
+        service = Mock()
+        service.search_documents = AsyncMock()
+        return service
+
+    @pytest.fixture
+    def mock_container(self, mock_persistence_service):
+        with patch("app.core.di_container.container") as mock_cont:
+            mock_cont.resolve = Mock(return_value=mock_persistence_service)
+            yield mock_cont
+
+    @pytest.mark.asyncio
+    async def test_returns_ranked_documents(self, mock_persistence_service, mock_container):
+        """✅ Itens de resumo com relevância e indicação de próxima página."""
+        mock_persistence_service.search_documents.return_value = DocumentSearchPage(
+            items=[{
+                "_id": "doc_1", "file_name": "prova.pdf", "status": "completed",
+                "created_at": datetime(2026, 10, 18), "user_email": "t@e.com",
+                "summary": {"question_count": 10, "subject": "Ciências"}, "score": 4.5
+            }],
+            page=1,
+            has_next=True
+        )
+
+        result = await search_documents(Mock(), email="t@e.com", q=" fotossíntese ", page=1, page_size=1)
+
+        assert isinstance(result, DocumentSearchResponseDTO)
+        assert result.items[0].id == "doc_1"
+        assert result.items[0].score == 4.5
+        assert result.has_next is True
+        mock_persistence_service.search_documents.assert_awaited_once_with(
+            email="t@e.com", text="fotossíntese", page=1, page_size=1
+        )
+
+    @pytest.mark.asyncio
+    async def test_blank_terms_return_400(self, mock_persistence_service, mock_container):
+        """❌ Termos em branco retornam 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            await search_documents(Mock(), email="t@e.com", q="   ", page=1, page_size=10)
+
+        assert exc_info.value.status_code == 400
+        mock_persistence_service.search_documents.assert_not_called()
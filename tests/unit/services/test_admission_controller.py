@@ -0,0 +1,259 @@
+"""
+Testes unitários para o controle de admissão das análises
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.core.metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_WAIT
+from app.services.core.admission_controller import (
+    AdmissionController,
+    AdmissionRejected,
+    parse_tenant_weights,
+    tenant_of,
+)
+
+
+def _controller(max_in_flight=1, max_queue=2, timeout=1.0, tenant_key="email",
+                tenant_max_in_flight=0, weights="", quantum=10, priority_max_pages=2):
+    settings = SimpleNamespace(
+        admission_max_in_flight=max_in_flight,
+        admission_max_queue=max_queue,
+        admission_queue_timeout_seconds=timeout,
+        admission_tenant_key=tenant_key,
+        admission_tenant_max_in_flight=tenant_max_in_flight,
+        admission_tenant_weights=weights,
+        admission_drr_quantum_pages=quantum,
+        admission_priority_max_pages=priority_max_pages
+    )
+    with patch("app.services.core.admission_controller.get_settings", return_value=settings):
+        return AdmissionController()
+
+
+async def _hold(controller, started: asyncio.Event, release: asyncio.Event, order=None, name=None,
+                email=None, pages=None):
+    async with controller.slot(email, pages):
+        if order is not None:
+            order.append(name)
+        started.set()
+        await release.wait()
+
+
+class TestAdmissionController:
+    """Testes para limite de análises simultâneas, fila e rejeições."""
+
+    @pytest.mark.asyncio
+    async def test_limits_in_flight_and_hands_slot_in_order(self):
+        """✅ Excedentes aguardam na fila e recebem a vaga na ordem de chegada."""
+        controller = _controller(max_in_flight=1, max_queue=5)
+        release = asyncio.Event()
+        order = []
+        events = [asyncio.Event() for _ in range(3)]
+        tasks = []
+        for i, event in enumerate(events):
+            tasks.append(asyncio.create_task(_hold(controller, event, release, order, i)))
+            await asyncio.sleep(0)
+
+        await events[0].wait()
+        assert controller.in_flight == 1
+        assert controller.queue_depth == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2]
+        assert controller.in_flight == 0
+        assert controller.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_with_429_and_retry_after(self):
+        """❌ Fila cheia recusa na hora com 429 e Retry-After."""
+        controller = _controller(max_in_flight=1, max_queue=1)
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, started, release))
+        await started.wait()
+        waiter = asyncio.create_task(_hold(controller, asyncio.Event(), release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.slot():
+                pass
+
+        http_exception = exc_info.value.to_http_exception()
+        assert http_exception.status_code == 429
+        assert int(http_exception.headers["Retry-After"]) >= 1
+        release.set()
+        await asyncio.gather(holder, waiter)
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_rejects_with_503(self):
+        """❌ Espera além do timeout recusa com 503 e sai da fila."""
+        controller = _controller(max_in_flight=1, max_queue=1, timeout=0.05)
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, started, release))
+        await started.wait()
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.slot():
+                pass
+
+        assert exc_info.value.status_code == 503
+        assert "Retry-After" in exc_info.value.headers
+        assert controller.queue_depth == 0
+        release.set()
+        await holder
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """✅ Cliente desconectado sai da fila sem consumir vaga."""
+        controller = _controller(max_in_flight=1, max_queue=2)
+        depth_before = ADMISSION_QUEUE_DEPTH._value.get()
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, started, release))
+        await started.wait()
+        waiter = asyncio.create_task(_hold(controller, asyncio.Event(), release))
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert controller.queue_depth == 0
+        assert ADMISSION_QUEUE_DEPTH._value.get() == depth_before
+        release.set()
+        await holder
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_released_when_analysis_fails(self):
+        """✅ Erro na análise devolve a vaga."""
+        controller = _controller(max_in_flight=1)
+
+        with pytest.raises(RuntimeError):
+            async with controller.slot():
+                raise RuntimeError("azure failed")
+
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_when_max_in_flight_is_zero(self):
+        """✅ ADMISSION_MAX_IN_FLIGHT=0 desativa o limite."""
+        controller = _controller(max_in_flight=0, max_queue=0)
+
+        async with controller.slot():
+            async with controller.slot():
+                assert controller.in_flight == 0
+
+
+class TestFairScheduling:
+    """Testes para a fila justa entre tenants (deficit round-robin)."""
+
+    async def _run(self, controller, requests):
+        """Ocupa a vaga, enfileira ``requests`` (email, páginas) e devolve a ordem de atendimento."""
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, started, release, email="holder@x.org"))
+        await started.wait()
+        order = []
+        tasks = []
+        for i, (email, pages) in enumerate(requests):
+            tasks.append(asyncio.create_task(
+                _hold(controller, asyncio.Event(), release, order, f"{email}#{i}", email, pages)
+            ))
+            await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        return order
+
+    @pytest.mark.asyncio
+    async def test_bulk_uploader_does_not_starve_others(self):
+        """✅ Envio em massa de uma escola não atrasa o professor que chega depois."""
+        controller = _controller(max_in_flight=1, max_queue=20, priority_max_pages=0)
+        bulk = [("lote@escola.br", 10)] * 6
+        order = await self._run(controller, bulk + [("prof@gmail.com", 10)])
+
+        assert order.index("prof@gmail.com#6") <= 1
+
+    @pytest.mark.asyncio
+    async def test_cost_is_proportional_to_pages(self):
+        """✅ DRR: documento grande consome mais da vez do tenant que vários pequenos."""
+        controller = _controller(max_in_flight=1, max_queue=20, quantum=10, priority_max_pages=0)
+        order = await self._run(controller, [
+            ("a@x.org", 20), ("a@x.org", 20),
+            ("b@y.org", 5), ("b@y.org", 5), ("b@y.org", 5), ("b@y.org", 5)
+        ])
+
+        assert order.index("b@y.org#3") < order.index("a@x.org#0")
+        assert order.index("b@y.org#5") < order.index("a@x.org#1")
+
+    @pytest.mark.asyncio
+    async def test_weights_favor_configured_tenant(self):
+        """✅ ADMISSION_TENANT_WEIGHTS: tenant com peso 2 é atendido o dobro por rodada."""
+        controller = _controller(max_in_flight=1, max_queue=20, quantum=1,
+                                 weights="vip@x.org=2", priority_max_pages=0)
+        order = await self._run(controller, [("vip@x.org", 1)] * 4 + [("std@y.org", 1)] * 4)
+
+        first_six = order[:6]
+        assert sum(name.startswith("vip") for name in first_six) == 4
+
+    @pytest.mark.asyncio
+    async def test_small_documents_use_priority_lane(self):
+        """✅ Documento de poucas páginas passa à frente da faixa normal."""
+        controller = _controller(max_in_flight=1, max_queue=20, priority_max_pages=2)
+        order = await self._run(controller, [
+            ("lote@escola.br", 30), ("lote@escola.br", 30), ("prof@gmail.com", 1)
+        ])
+
+        assert order[0] == "prof@gmail.com#2"
+
+    @pytest.mark.asyncio
+    async def test_tenant_cap_leaves_slots_for_others(self):
+        """✅ ADMISSION_TENANT_MAX_IN_FLIGHT limita as vagas de um mesmo tenant."""
+        controller = _controller(max_in_flight=3, max_queue=20, tenant_max_in_flight=2)
+        release = asyncio.Event()
+        bulk = [asyncio.create_task(_hold(controller, asyncio.Event(), release, email="lote@escola.br"))
+                for _ in range(4)]
+        await asyncio.sleep(0)
+
+        assert controller.tenant_in_flight("lote@escola.br") == 2
+        assert controller.in_flight == 2
+        started = asyncio.Event()
+        other = asyncio.create_task(_hold(controller, started, release, email="prof@gmail.com"))
+        await asyncio.wait_for(started.wait(), timeout=1)
+
+        release.set()
+        await asyncio.gather(other, *bulk)
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_tenant_labels_stay_bounded(self):
+        """✅ Rótulo ``tenant`` só tem tenants configurados e ``other``, sem emails de usuários."""
+        controller = _controller(max_in_flight=1, max_queue=200, weights="vip@x.org=2", priority_max_pages=0)
+        emails = [f"prof{i}@escola{i}.br" for i in range(100)] + ["vip@x.org"]
+
+        await self._run(controller, [(email, 1) for email in emails])
+
+        tenants = {
+            sample.labels["tenant"]
+            for metric in ADMISSION_WAIT.collect()
+            for sample in metric.samples
+            if "tenant" in sample.labels
+        }
+        assert tenants <= {"vip@x.org", "other"}
+        assert not any(email in tenants for email in emails[:-1])
+        assert controller.metrics_label("prof1@escola1.br") == "other"
+
+    def test_tenant_key_and_weights_parsing(self):
+        """✅ Tenant por email ou domínio; pesos lidos de ADMISSION_TENANT_WEIGHTS."""
+        assert tenant_of("Prof@Escola.br") == "prof@escola.br"
+        assert tenant_of("prof@escola.br", "domain") == "escola.br"
+        assert tenant_of(None) == "anonymous"
+        assert parse_tenant_weights("escola.br=2, vip@x.org=0.5,invalid") == {
+            "escola.br": 2.0, "vip@x.org": 0.5
+        }
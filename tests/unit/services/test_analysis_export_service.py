@@ -0,0 +1,125 @@
+"""
+Testes unitários para a exportação NDJSON de análises
+
+Valida a serialização em blocos (com e sem gzip) e a consulta/projeção usada
+por MongoDBPersistenceService.iter_analyses_for_export.
+"""
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from unittest.mock import MagicMock, patch
+
+from app.services.core.analysis_export_service import AnalysisExportService
+
+
+def _docs(count):
+    return [
+        {"_id": f"id-{i}", "user_email": "t@e.com", "created_at": datetime(2026, 10, 18, 12, 0, i % 60),
+         "summary": {"subject": "Matemática"}}
+        for i in range(count)
+    ]
+
+
+def _service(docs, batch_size=2):
+    persistence = MagicMock()
+    calls = {}
+
+    async def iter_docs(**kwargs):
+        calls.update(kwargs)
+        for doc in docs:
+            yield doc
+
+    persistence.iter_analyses_for_export = iter_docs
+    with patch("app.services.core.analysis_export_service.get_settings",
+               return_value=MagicMock(analysis_export_batch_size=batch_size)):
+        return AnalysisExportService(persistence), calls
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+class TestAnalysisExportService:
+    """Testes para a geração dos blocos NDJSON."""
+
+    @pytest.mark.asyncio
+    async def test_one_json_line_per_analysis_in_batches(self):
+        """✅ Uma linha por análise, um bloco por lote."""
+        service, calls = _service(_docs(5))
+
+        chunks = await _collect(service.stream_ndjson(email="t@e.com"))
+
+        lines = b"".join(chunks).decode("utf-8").splitlines()
+        assert len(chunks) == 3
+        assert [json.loads(line)["_id"] for line in lines] == [f"id-{i}" for i in range(5)]
+        assert json.loads(lines[0])["summary"]["subject"] == "Matemática"
+        assert json.loads(lines[0])["created_at"] == "2026-10-18T12:00:00"
+        assert calls["email"] == "t@e.com"
+        assert calls["batch_size"] == 2
+
+    @pytest.mark.asyncio
+    async def test_gzip_output_is_a_valid_stream(self):
+        """✅ Saída gzip descomprime para o mesmo NDJSON."""
+        service, _ = _service(_docs(5))
+
+        compressed = b"".join(await _collect(service.stream_ndjson(compress=True)))
+
+        lines = gzip.decompress(compressed).splitlines()
+        assert len(lines) == 5
+
+    @pytest.mark.asyncio
+    async def test_object_id_is_exported_as_string(self):
+        """✅ _id ObjectId (registros legados) é exportado como string."""
+        oid = ObjectId()
+        service, _ = _service([{"_id": oid}])
+
+        [chunk] = await _collect(service.stream_ndjson())
+
+        assert json.loads(chunk)["_id"] == str(oid)
+
+    @pytest.mark.asyncio
+    async def test_empty_export(self):
+        """✅ Sem resultados: nenhum bloco (ou apenas o rodapé gzip)."""
+        service, _ = _service([])
+
+        assert await _collect(service.stream_ndjson()) == []
+        assert gzip.decompress(b"".join(await _collect(service.stream_ndjson(compress=True)))) == b""
+
+
+class TestIterAnalysesForExport:
+    """Testes para a consulta do cursor de exportação."""
+
+    @pytest.fixture
+    def collection(self, async_cursor):
+        collection = MagicMock()
+        collection.find = MagicMock(return_value=async_cursor([{"_id": "a"}]))
+        return collection
+
+    @pytest.fixture
+    def service(self, collection, persistence_service_for):
+        return persistence_service_for(collection)
+
+    @pytest.mark.asyncio
+    async def test_summary_projection_and_filters(self, service, collection):
+        """✅ Filtros de escola/período e projeção de resumo com batch_size."""
+        start = datetime(2026, 1, 1)
+
+        docs = [d async for d in service.iter_analyses_for_export(school="Escola X", start_date=start, batch_size=300)]
+
+        query, projection = collection.find.call_args[0]
+        assert docs == [{"_id": "a"}]
+        assert query == {"status": "completed", "response.header.school": "Escola X", "created_at": {"$gte": start}}
+        assert projection["summary"] == 1 and "response" not in projection
+        assert collection.find.call_args.kwargs["batch_size"] == 300
+
+    @pytest.mark.asyncio
+    async def test_full_export_excludes_stored_bytes(self, service, collection):
+        """✅ Exportação completa traz o response, nunca response_json."""
+        [_ async for _ in service.iter_analyses_for_export(email="t@e.com", include_response=True)]
+
+        query, projection = collection.find.call_args[0]
+        assert query["user_email"] == "t@e.com"
+        assert projection == {"response_json": 0}
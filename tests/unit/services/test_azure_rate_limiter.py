@@ -0,0 +1,157 @@
+"""
+Testes unitários para o rate limiter das chamadas ao Azure Document Intelligence
+"""
+import asyncio
+import email.utils
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.metrics import AZURE_THROTTLED
+from app.services.azure.azure_rate_limiter import (
+    AzureRateLimiter,
+    _FileLockBucket,
+    _LocalBucket,
+    fcntl,
+    gcra_reserve,
+    retry_after_seconds,
+)
+
+
+class TestTokenBucket:
+    """Testes para a reserva de horários (GCRA)."""
+
+    def test_spaces_calls_at_configured_rate(self):
+        """✅ Sem rajada, chamadas simultâneas são espaçadas por 1/TPS."""
+        state = {}
+        delays = [gcra_reserve(state, 100.0, 0.1, 0.0, 0.0) for _ in range(3)]
+
+        assert delays == pytest.approx([0.0, 0.1, 0.2])
+
+    def test_burst_allows_immediate_calls(self):
+        """✅ AZURE_RATE_LIMIT_BURST chamadas passam de imediato; a seguinte aguarda."""
+        state = {}
+        delays = [gcra_reserve(state, 100.0, 0.1, 0.2, 0.0) for _ in range(4)]
+
+        assert delays[:3] == [0.0, 0.0, 0.0]
+        assert delays[3] == pytest.approx(0.1)
+
+    def test_idle_time_refills_bucket(self):
+        """✅ Após um período ocioso a próxima chamada não espera."""
+        state = {}
+        gcra_reserve(state, 100.0, 0.1, 0.0, 0.0)
+        gcra_reserve(state, 100.0, 0.1, 0.0, 0.0)
+
+        assert gcra_reserve(state, 105.0, 0.1, 0.0, 0.0) == 0.0
+
+    def test_blocked_until_delays_next_call(self):
+        """✅ Bloqueio por Retry-After adia a próxima reserva."""
+        state = {}
+
+        assert gcra_reserve(state, 100.0, 0.1, 0.0, 102.0) == pytest.approx(2.0)
+
+    @pytest.mark.asyncio
+    async def test_local_bucket_is_shared_by_concurrent_callers(self):
+        """✅ Chamadas concorrentes no mesmo processo recebem horários distintos."""
+        bucket = _LocalBucket()
+
+        delays = await asyncio.gather(*(bucket.reserve(100.0, 0.1, 0.0, 0.0) for _ in range(3)))
+
+        assert sorted(delays) == pytest.approx([0.0, 0.1, 0.2])
+
+    @pytest.mark.skipif(fcntl is None, reason="fcntl indisponível")
+    @pytest.mark.asyncio
+    async def test_file_bucket_is_shared_between_workers(self, tmp_path):
+        """✅ Coordenação por arquivo: dois workers dividem o mesmo bucket."""
+        path = str(tmp_path / "rate.json")
+        worker_a, worker_b = _FileLockBucket(path), _FileLockBucket(path)
+
+        first = await worker_a.reserve(100.0, 0.1, 0.0, 0.0)
+        second = await worker_b.reserve(100.0, 0.1, 0.0, 0.0)
+
+        assert first == 0.0
+        assert second == pytest.approx(0.1)
+
+
+class TestAzureRateLimiter:
+    """Testes para o limiter adaptativo."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_next_slot(self):
+        """✅ Segunda chamada imediata aguarda o intervalo da TPS."""
+        limiter = AzureRateLimiter(tps=20)
+
+        assert await limiter.acquire("layout") == 0.0
+        started = time.monotonic()
+        waited = await limiter.acquire("layout")
+
+        assert waited == pytest.approx(0.05, abs=0.02)
+        assert time.monotonic() - started >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_disabled_when_tps_is_zero(self):
+        """✅ AZURE_RATE_LIMIT_TPS=0 desativa o limite."""
+        limiter = AzureRateLimiter(tps=0)
+
+        assert [await limiter.acquire("layout") for _ in range(5)] == [0.0] * 5
+
+    def test_throttle_halves_rate_and_recovers(self):
+        """✅ 429 reduz a taxa à metade, que volta linearmente à configurada."""
+        limiter = AzureRateLimiter(tps=10, recovery_seconds=60)
+
+        limiter.throttled(retry_after=2, now=1000.0)
+
+        assert limiter.current_rate(1000.0) == pytest.approx(5.0)
+        assert limiter.current_rate(1030.0) == pytest.approx(7.5)
+        assert limiter.current_rate(1060.0) == pytest.approx(10.0)
+
+    def test_repeated_throttles_respect_minimum_rate(self):
+        """✅ 429 seguidos não derrubam a taxa abaixo de 10% da configurada."""
+        limiter = AzureRateLimiter(tps=10)
+
+        for _ in range(10):
+            limiter.throttled(retry_after=0, now=1000.0)
+
+        assert limiter.current_rate(1000.0) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_response_hook_blocks_calls_after_429(self):
+        """✅ Um 429 visto pelo hook do SDK pausa as próximas chamadas pelo Retry-After."""
+        limiter = AzureRateLimiter(tps=1000)
+        throttled_before = AZURE_THROTTLED._value.get()
+        response = SimpleNamespace(http_response=SimpleNamespace(
+            status_code=429, headers={"Retry-After-Ms": "150"}
+        ))
+
+        limiter.response_hook(response)
+        waited = await limiter.acquire("figures")
+
+        assert waited == pytest.approx(0.15, abs=0.03)
+        assert AZURE_THROTTLED._value.get() == throttled_before + 1
+
+    def test_response_hook_ignores_success(self):
+        """✅ Respostas 2xx não alteram a taxa."""
+        limiter = AzureRateLimiter(tps=10)
+
+        limiter.response_hook(SimpleNamespace(http_response=SimpleNamespace(status_code=202, headers={})))
+
+        assert limiter.current_rate() == 10
+
+
+class TestRetryAfterParsing:
+    """Testes para a leitura do Retry-After das respostas 429."""
+
+    def test_parses_supported_headers(self):
+        """✅ Milissegundos, segundos e data HTTP; padrão de 1s sem header."""
+        future = email.utils.formatdate(time.time() + 5, usegmt=True)
+
+        assert retry_after_seconds({"x-ms-retry-after-ms": "250"}) == pytest.approx(0.25)
+        assert retry_after_seconds({"Retry-After": "3"}) == 3.0
+        assert 3.0 <= retry_after_seconds({"Retry-After": future}) <= 5.0
+        assert retry_after_seconds({}) == 1.0
+
+    def test_caps_long_waits(self):
+        """❌ Retry-After exagerado é limitado a 60s."""
+        assert retry_after_seconds({"Retry-After": "3600"}) == 60.0
+
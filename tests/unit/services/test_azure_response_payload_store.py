@@ -0,0 +1,163 @@
+"""
+Testes unitários para o armazenamento externo dos responses do Azure
+
+Valida compressão/leitura em chunks via GridFS e a gravação de metadados em
+MongoDBPersistenceService.save_azure_response.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.persistence import AzureResponseRecord, AzureResponsePayloadRef
+from app.services.persistence import MongoDBPersistenceService, PersistenceError
+from app.services.persistence.azure_response_payload_store import AzureResponsePayloadStore
+
+
+class _FakeGridOut:
+    def __init__(self, data: bytes, chunk_size: int):
+        self._chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+    async def readchunk(self):
+        return self._chunks.pop(0) if self._chunks else b""
+
+
+class _FakeBucket:
+    """Bucket GridFS em memória com chunks pequenos para exercitar a leitura em partes."""
+
+    files = {}
+
+    def __init__(self, database, bucket_name="fs"):
+        self.bucket_name = bucket_name
+
+    async def upload_from_stream_with_id(self, file_id, filename, source, metadata=None):
+        self.files[file_id] = source
+
+    async def open_download_stream(self, file_id):
+        return _FakeGridOut(self.files[file_id], chunk_size=64)
+
+    async def delete(self, file_id):
+        del self.files[file_id]
+
+
+@pytest.fixture
+def fake_bucket():
+    _FakeBucket.files = {}
+    with patch(
+        "app.services.persistence.azure_response_payload_store.AsyncIOMotorGridFSBucket", _FakeBucket
+    ):
+        yield _FakeBucket
+
+
+@pytest.fixture
+def azure_response():
+    return {
+        "content": "Questão 1 " * 200,
+        "pages": [{"pageNumber": 1}, {"pageNumber": 2}],
+        "paragraphs": [{"content": f"parágrafo {i}"} for i in range(50)],
+    }
+
+
+@pytest.fixture
+def mock_collection():
+    collection = MagicMock()
+    collection.insert_one = AsyncMock(return_value=MagicMock(inserted_id="resp-1"))
+    return collection
+
+
+@pytest.fixture
+def connection_service(mock_collection, mongo_connection):
+    return mongo_connection(mock_collection)
+
+
+def _record(azure_response):
+    return AzureResponseRecord.create_from_azure_processing(
+        document_id="doc-1",
+        user_email="t@e.com",
+        file_name="prova.pdf",
+        file_size=1000,
+        azure_response=azure_response,
+        azure_model_id="prebuilt-layout",
+        azure_api_version="2023-07-31",
+        processing_duration=1.5
+    )
+
+
+class TestAzureResponsePayloadStore:
+    """Testes para o bucket de payloads comprimidos."""
+
+    @pytest.mark.asyncio
+    async def test_put_and_load_round_trip(self, fake_bucket, connection_service, azure_response):
+        """✅ Payload é gravado comprimido e lido de volta chunk a chunk."""
+        store = AzureResponsePayloadStore(connection_service)
+
+        ref = await store.put("resp-1", azure_response, filename="prova.pdf")
+
+        assert ref.codec == "gzip"
+        assert ref.stored_bytes < ref.raw_bytes
+        assert len(fake_bucket.files["resp-1"]) == ref.stored_bytes
+        assert await store.load(ref) == azure_response
+
+    @pytest.mark.asyncio
+    async def test_resolve_supports_legacy_inline_records(self, fake_bucket, connection_service, azure_response):
+        """✅ Registros antigos com azure_response inline continuam legíveis."""
+        store = AzureResponsePayloadStore(connection_service)
+
+        assert await store.resolve({"azure_response": azure_response}) == azure_response
+        assert await store.resolve({}) == {}
+
+    @pytest.mark.asyncio
+    async def test_unknown_codec_raises_value_error(self, fake_bucket, connection_service):
+        """❌ Codec desconhecido não é descomprimido silenciosamente."""
+        store = AzureResponsePayloadStore(connection_service)
+        ref = AzureResponsePayloadRef(file_id="x", codec="zstd", raw_bytes=1, stored_bytes=1)
+
+        with pytest.raises(ValueError):
+            await store.load(ref)
+
+
+class TestSaveAzureResponse:
+    """Testes para a gravação de metadados + referência."""
+
+    @pytest.mark.asyncio
+    async def test_metadata_document_has_reference_not_payload(
+        self, fake_bucket, connection_service, mock_collection, azure_response
+    ):
+        """✅ azure_responses recebe apenas metadados e azure_response_ref."""
+        service = MongoDBPersistenceService(connection_service)
+        record = _record(azure_response)
+
+        await service.save_azure_response(record)
+
+        saved = mock_collection.insert_one.call_args[0][0]
+        assert "azure_response" not in saved
+        assert saved["azure_response_ref"]["file_id"] == record.id
+        assert saved["page_count"] == 2
+        assert record.id in fake_bucket.files
+
+    @pytest.mark.asyncio
+    async def test_payload_removed_when_metadata_insert_fails(
+        self, fake_bucket, connection_service, mock_collection, azure_response
+    ):
+        """❌ Falha ao gravar metadados remove o payload órfão e gera PersistenceError."""
+        mock_collection.insert_one = AsyncMock(side_effect=Exception("boom"))
+        service = MongoDBPersistenceService(connection_service)
+
+        with pytest.raises(PersistenceError):
+            await service.save_azure_response(_record(azure_response))
+
+        assert fake_bucket.files == {}
+
+    @pytest.mark.asyncio
+    async def test_load_azure_response_by_document_id(
+        self, fake_bucket, connection_service, mock_collection, azure_response
+    ):
+        """✅ load_azure_response busca a referência e carrega o payload sob demanda."""
+        service = MongoDBPersistenceService(connection_service)
+        record = _record(azure_response)
+        await service.save_azure_response(record)
+        mock_collection.find_one = AsyncMock(
+            return_value={"_id": record.id, "azure_response_ref": record.azure_response_ref.dict()}
+        )
+
+        assert await service.load_azure_response("doc-1") == azure_response
+        projection = mock_collection.find_one.call_args.kwargs["projection"]
+        assert "azure_response_ref" in projection
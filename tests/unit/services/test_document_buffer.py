@@ -0,0 +1,99 @@
+"""
+Testes unitários para DocumentBuffer
+
+Valida leitura única do upload, SHA-256 em streaming e mmap acima do limiar.
+"""
+import hashlib
+import os
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import UploadFile
+
+from app.core.document_buffer import DocumentBuffer
+
+
+PDF_FIXTURE = Path(__file__).parents[2] / "fixtures" / "pdfs" / "modelo-prova.pdf"
+
+
+def _make_upload(content: bytes, filename: str = "prova.pdf"):
+    """UploadFile mockado com read/seek assíncronos sobre um BytesIO."""
+    file_obj = BytesIO(content)
+    upload = MagicMock(spec=UploadFile)
+    upload.filename = filename
+    upload.content_type = "application/pdf"
+
+    async def async_read(size=-1):
+        return file_obj.read(size)
+
+    async def async_seek(offset, whence=0):
+        file_obj.seek(offset, whence)
+
+    upload.read = AsyncMock(side_effect=async_read)
+    upload.seek = AsyncMock(side_effect=async_seek)
+    return upload
+
+
+class TestDocumentBuffer:
+    """Testes para DocumentBuffer."""
+
+    @pytest.mark.asyncio
+    async def test_from_upload_in_memory_computes_hash_in_single_pass(self):
+        """✅ Abaixo do limiar mantém bytes em memória e calcula SHA-256/tamanho."""
+        content = b"%PDF-1.4 conteudo" * 100
+        upload = _make_upload(content)
+
+        buffer = await DocumentBuffer.from_upload(upload, mmap_threshold=1024 * 1024, chunk_size=256)
+
+        assert buffer.size == len(content)
+        assert buffer.sha256 == hashlib.sha256(content).hexdigest()
+        assert buffer.filename == "prova.pdf"
+        assert not buffer.is_memory_mapped
+        assert buffer.head(5) == b"%PDF-"
+        upload.seek.assert_awaited_once_with(0)
+
+    @pytest.mark.asyncio
+    async def test_from_upload_above_threshold_is_memory_mapped(self):
+        """✅ Acima do limiar grava em arquivo temporário e usa mmap; close remove o arquivo."""
+        content = b"%PDF-1.4 " + os.urandom(4096)
+        upload = _make_upload(content)
+
+        buffer = await DocumentBuffer.from_upload(upload, mmap_threshold=1000, chunk_size=512)
+        path = buffer.path
+
+        assert buffer.is_memory_mapped
+        assert os.path.exists(path)
+        assert buffer.sha256 == hashlib.sha256(content).hexdigest()
+        assert bytes(buffer.getbuffer()) == content
+        with buffer.open_stream() as stream:
+            assert stream.read() == content
+
+        buffer.close()
+
+        assert not os.path.exists(path)
+
+    def test_open_stream_returns_fresh_stream_each_time(self):
+        """✅ Cada consumidor recebe um stream novo, posicionado no início."""
+        buffer = DocumentBuffer.from_bytes(b"%PDF-abc")
+
+        with buffer.open_stream() as first:
+            first.read()
+        with buffer.open_stream() as second:
+            assert second.read() == b"%PDF-abc"
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not PDF_FIXTURE.exists(), reason="PDF de fixture ausente")
+    @pytest.mark.parametrize("mmap_threshold", [0, 512 * 1024 * 1024])
+    async def test_open_pdf_from_memory_and_mmap(self, mmap_threshold):
+        """✅ PyMuPDF abre o mesmo documento em memória ou memory-mapped."""
+        content = PDF_FIXTURE.read_bytes()
+        upload = _make_upload(content, filename=PDF_FIXTURE.name)
+
+        with await DocumentBuffer.from_upload(upload, mmap_threshold=mmap_threshold) as buffer:
+            pdf_document = buffer.open_pdf()
+            try:
+                assert len(pdf_document) > 0
+            finally:
+                pdf_document.close()
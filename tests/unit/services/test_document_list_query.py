@@ -0,0 +1,210 @@
+"""
+Testes unitários para a listagem leve de documentos
+
+Valida cursor keyset opaco, resumo desnormalizado (DocumentSummary) e
+MongoDBPersistenceService.get_document_summaries_page.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models.persistence import DocumentSummary, normalize_subject_key
+from app.services.persistence import DocumentListCursor, PersistenceError
+from app.services.persistence.document_list_query import SUMMARY_PROJECTION, list_sort
+
+
+def _docs(n):
+    base = datetime(2025, 6, 1, 12, 0, 0)
+    return [
+        {"_id": f"doc-{i:03d}", "user_email": "t@e.com", "file_name": f"p{i}.pdf",
+         "status": "completed", "created_at": base - timedelta(minutes=i)}
+        for i in range(n)
+    ]
+
+
+class TestDocumentListCursor:
+    """Testes para o cursor opaco."""
+
+    def test_round_trip_with_string_id(self):
+        """✅ encode/decode preserva created_at e _id."""
+        cursor = DocumentListCursor(datetime(2025, 6, 1, 12, 0, 0, 123000), "doc-1")
+
+        assert DocumentListCursor.decode(cursor.encode()) == cursor
+
+    def test_round_trip_with_object_id(self):
+        """✅ _id ObjectId (registros antigos) volta como ObjectId."""
+        oid = ObjectId()
+        decoded = DocumentListCursor.decode(DocumentListCursor(datetime(2025, 6, 1), oid).encode())
+
+        assert decoded.document_id == oid
+
+    def test_invalid_token_raises_value_error(self):
+        """❌ Token malformado gera ValueError."""
+        with pytest.raises(ValueError):
+            DocumentListCursor.decode("nao-e-um-cursor")
+
+    def test_question_count_cursor_uses_summary_field(self):
+        """✅ Cursor de sort_by=question_count filtra por summary.question_count."""
+        doc = {"_id": "doc-7", "summary": {"question_count": 12}}
+        cursor = DocumentListCursor.decode(
+            DocumentListCursor.from_document(doc, "question_count").encode()
+        )
+
+        assert cursor.value == 12
+        assert cursor.sort_by == "question_count"
+        assert cursor.to_query()["$or"][0] == {"summary.question_count": {"$lt": 12}}
+
+
+class TestDocumentSummary:
+    """Testes para o resumo desnormalizado."""
+
+    def test_normalize_subject_key_strips_accents_and_case(self):
+        """✅ Chave de matéria ignora acentos, maiúsculas e espaços extras."""
+        assert normalize_subject_key("  Língua   Portuguesa ") == "lingua portuguesa"
+        assert normalize_subject_key("   ") is None
+        assert normalize_subject_key(None) is None
+
+    def test_from_response_counts_and_subject(self):
+        """✅ Conta questões/context blocks e normaliza a matéria do header."""
+        response = {
+            "header": {"subject": "Matemática", "series": "8º Ano"},
+            "questions": [{}, {}, {}],
+            "context_blocks": [{}],
+        }
+
+        summary = DocumentSummary.from_response(response, page_count=2)
+
+        assert summary.question_count == 3
+        assert summary.context_block_count == 1
+        assert summary.subject_key == "matematica"
+        assert summary.grade == "8º Ano"
+        assert summary.page_count == 2
+
+    def test_from_response_prefers_explicit_grade(self):
+        """✅ Série dos metadados internos tem prioridade sobre o header."""
+        summary = DocumentSummary.from_response({"header": {"series": "8º"}}, grade="9º Ano")
+
+        assert summary.grade == "9º Ano"
+        assert summary.question_count == 0
+
+
+class TestGetDocumentSummariesPage:
+    """Testes para a consulta paginada com projeção."""
+
+    @pytest.fixture
+    def mock_collection(self):
+        collection = MagicMock()
+        collection.count_documents = AsyncMock(return_value=25)
+        return collection
+
+    @pytest.fixture
+    def persistence_service(self, mock_collection, persistence_service_for):
+        return persistence_service_for(mock_collection)
+
+    @pytest.mark.asyncio
+    async def test_first_page_uses_projection_and_returns_next_cursor(self, persistence_service, mock_collection,
+                                                                      async_cursor):
+        """✅ Projeta campos de resumo, busca page_size+1 e gera next_cursor."""
+        docs = _docs(12)
+        mock_collection.find = MagicMock(return_value=async_cursor(docs))
+
+        page = await persistence_service.get_document_summaries_page(email="t@e.com", page_size=10)
+
+        query, projection = mock_collection.find.call_args[0]
+        assert query == {"user_email": "t@e.com"}
+        assert projection == SUMMARY_PROJECTION
+        assert "response" not in projection
+        assert len(page.items) == 10
+        assert page.total_count is None
+        mock_collection.count_documents.assert_not_called()
+        assert DocumentListCursor.decode(page.next_cursor).document_id == "doc-009"
+
+    @pytest.mark.asyncio
+    async def test_cursor_builds_keyset_query_without_skip(self, persistence_service, mock_collection, async_cursor):
+        """✅ Com cursor, filtra por (created_at, _id) < cursor sem skip."""
+        cursor_docs = async_cursor(_docs(3))
+        mock_collection.find = MagicMock(return_value=cursor_docs)
+        cursor = DocumentListCursor(datetime(2025, 6, 1, 11, 0, 0), "doc-050")
+
+        page = await persistence_service.get_document_summaries_page(
+            email="t@e.com", page_size=10, cursor=cursor.encode(), page=6
+        )
+
+        query = mock_collection.find.call_args[0][0]
+        assert query["$and"][0] == {"user_email": "t@e.com"}
+        assert query["$and"][1] == cursor.to_query()
+        cursor_docs.skip.assert_not_called()
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_total_is_cached_and_invalidated_on_save(self, persistence_service, mock_collection, async_cursor):
+        """✅ include_total conta uma vez; novo documento do usuário invalida o cache."""
+        mock_collection.find = MagicMock(side_effect=lambda *a, **k: async_cursor(_docs(2)))
+        mock_collection.insert_one = AsyncMock(return_value=MagicMock(inserted_id="new"))
+
+        first = await persistence_service.get_document_summaries_page(email="t@e.com", include_total=True)
+        await persistence_service.get_document_summaries_page(email="t@e.com", include_total=True)
+        assert first.total_count == 25
+        assert mock_collection.count_documents.await_count == 1
+
+        record = MagicMock(user_email="t@e.com")
+        record.dict_for_mongo = MagicMock(return_value={})
+        await persistence_service.save_analysis_result(record)
+        await persistence_service.get_document_summaries_page(email="t@e.com", include_total=True)
+
+        assert mock_collection.count_documents.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_subject_filter_and_question_count_sort(self, persistence_service, mock_collection, async_cursor):
+        """✅ subject filtra por summary.subject_key e sort_by muda a ordenação."""
+        docs = [dict(d, summary={"question_count": 20 - i}) for i, d in enumerate(_docs(3))]
+        find_cursor = async_cursor(docs)
+        mock_collection.find = MagicMock(return_value=find_cursor)
+
+        page = await persistence_service.get_document_summaries_page(
+            email="t@e.com", page_size=2, subject="Língua Portuguesa", sort_by="question_count"
+        )
+
+        query = mock_collection.find.call_args[0][0]
+        assert query == {"user_email": "t@e.com", "summary.subject_key": "lingua portuguesa"}
+        find_cursor.sort.assert_called_once_with(list_sort("question_count"))
+        next_cursor = DocumentListCursor.decode(page.next_cursor)
+        assert (next_cursor.sort_by, next_cursor.value) == ("question_count", 19)
+
+    @pytest.mark.asyncio
+    async def test_cursor_from_other_sort_raises_value_error(self, persistence_service):
+        """❌ Cursor emitido para outra ordenação é rejeitado."""
+        cursor = DocumentListCursor(datetime(2025, 6, 1), "doc-1").encode()
+
+        with pytest.raises(ValueError):
+            await persistence_service.get_document_summaries_page(
+                email="t@e.com", cursor=cursor, sort_by="question_count"
+            )
+
+    @pytest.mark.asyncio
+    async def test_save_completed_analysis_stores_summary(self, persistence_service, mock_collection):
+        """✅ save_completed_analysis grava o summary derivado do response."""
+        mock_collection.insert_one = AsyncMock(return_value=MagicMock(inserted_id="new"))
+        response = {"document_id": "d1", "header": {"subject": "História"}, "questions": [{}, {}]}
+
+        await persistence_service.save_completed_analysis("t@e.com", "p.pdf", 10, response)
+
+        saved = mock_collection.insert_one.call_args[0][0]
+        assert saved["summary"]["question_count"] == 2
+        assert saved["summary"]["subject_key"] == "historia"
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_raises_value_error(self, persistence_service):
+        """❌ Cursor inválido propaga ValueError (controller responde 400)."""
+        with pytest.raises(ValueError):
+            await persistence_service.get_document_summaries_page(email="t@e.com", cursor="x")
+
+    @pytest.mark.asyncio
+    async def test_database_error_raises_persistence_error(self, persistence_service, mock_collection):
+        """❌ Erro no MongoDB vira PersistenceError."""
+        mock_collection.find = MagicMock(side_effect=Exception("boom"))
+
+        with pytest.raises(PersistenceError):
+            await persistence_service.get_document_summaries_page(email="t@e.com")
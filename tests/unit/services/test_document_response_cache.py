@@ -0,0 +1,87 @@
+"""
+Testes unitários para o DocumentResponseCache (LRU de respostas serializadas)
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.core.document_response_cache import DocumentResponseCache, compute_etag
+
+
+@pytest.fixture
+def make_cache():
+    def _make(max_bytes=100, max_entries=10, ttl=300):
+        settings = MagicMock(
+            document_response_cache_max_bytes=max_bytes,
+            document_response_cache_max_entries=max_entries,
+            document_response_cache_ttl_seconds=ttl,
+            document_response_max_age_seconds=0
+        )
+        with patch("app.services.core.document_response_cache.get_settings", return_value=settings):
+            return DocumentResponseCache()
+    return _make
+
+
+class TestDocumentResponseCache:
+    """Testes para limite, LRU, TTL e ETag."""
+
+    def test_etag_is_strong_and_content_based(self):
+        """✅ ETag forte (sem W/) muda com o conteúdo."""
+        assert compute_etag(b"a") == compute_etag(b"a")
+        assert compute_etag(b"a") != compute_etag(b"b")
+        assert compute_etag(b"a").startswith('"')
+
+    def test_evicts_least_recently_used_when_over_byte_limit(self, make_cache):
+        """✅ Acima de max_bytes remove a entrada menos usada."""
+        cache = make_cache(max_bytes=100)
+        cache.put("a", b"x" * 40)
+        cache.put("b", b"x" * 40)
+        cache.get("a")
+        cache.put("c", b"x" * 40)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["bytes"] == 80
+
+    def test_body_larger_than_limit_is_not_stored(self, make_cache):
+        """✅ Corpo maior que o limite é servido mas não ocupa o cache."""
+        cache = make_cache(max_bytes=10)
+        entry = cache.put("a", b"x" * 20)
+
+        assert entry.etag == compute_etag(b"x" * 20)
+        assert cache.get("a") is None
+
+    def test_expired_entry_is_dropped(self, make_cache):
+        """✅ Entrada expirada (TTL) não é servida."""
+        cache = make_cache(ttl=0)
+        cache.put("a", b"{}")
+
+        assert cache.get("a") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_if_none_match_parsing(self, make_cache):
+        """✅ If-None-Match aceita lista, W/ e *; ETag diferente não confere."""
+        entry = make_cache().put("a", b"{}")
+
+        assert entry.matches(entry.etag)
+        assert entry.matches(f'"x", W/{entry.etag}')
+        assert entry.matches("*")
+        assert not entry.matches('"outro"')
+        assert not entry.matches(None)
+
+    def test_hits_and_misses_are_exported_as_metrics(self, make_cache):
+        """✅ Acertos e falhas incrementam o contador Prometheus do cache."""
+        from prometheus_client import REGISTRY
+
+        def sample(result):
+            return REGISTRY.get_sample_value(
+                "smartquest_cache_requests_total", {"cache": "document_response", "result": result}
+            ) or 0.0
+
+        hits, misses = sample("hit"), sample("miss")
+        cache = make_cache()
+        cache.put("a", b"{}")
+        cache.get("a")
+        cache.get("b")
+
+        assert sample("hit") == hits + 1
+        assert sample("miss") == misses + 1
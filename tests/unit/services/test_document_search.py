@@ -0,0 +1,65 @@
+"""
+Testes unitários para a busca textual nas análises do usuário
+
+Valida o filtro $text restrito ao usuário, a ordenação por relevância e a
+paginação de MongoDBPersistenceService.search_documents.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.persistence.document_search_query import SEARCH_INDEX_NAME, SEARCH_TEXT_WEIGHTS
+from app.services.persistence.indexes import REQUIRED_INDEXES
+
+
+class TestSearchDocuments:
+    """Testes para a consulta de busca textual."""
+
+    @pytest.fixture
+    def cursor(self, async_cursor):
+        return async_cursor([{"_id": f"d{i}", "score": 5.0 - i} for i in range(5)])
+
+    @pytest.fixture
+    def collection(self, cursor):
+        collection = MagicMock()
+        collection.find = MagicMock(return_value=cursor)
+        return collection
+
+    @pytest.fixture
+    def service(self, collection, persistence_service_for):
+        return persistence_service_for(collection)
+
+    @pytest.mark.asyncio
+    async def test_text_query_scoped_by_user_and_ranked(self, service, collection, cursor):
+        """✅ $text em português, restrito ao usuário e às análises concluídas, por relevância."""
+        page = await service.search_documents("t@e.com", "fotossíntese", page=2, page_size=2)
+
+        query, projection = collection.find.call_args[0]
+        assert query == {
+            "user_email": "t@e.com",
+            "$text": {"$search": "fotossíntese", "$language": "portuguese"},
+            "status": "completed"
+        }
+        assert projection["score"] == {"$meta": "textScore"}
+        assert "response" not in projection
+        assert cursor.sort.call_args[0][0][0] == ("score", {"$meta": "textScore"})
+        cursor.skip.assert_called_once_with(2)
+        cursor.limit.assert_called_once_with(3)
+        assert [doc["_id"] for doc in page.items] == ["d2", "d3"]
+        assert page.has_next
+
+    @pytest.mark.asyncio
+    async def test_last_page(self, service, cursor):
+        """✅ Menos itens que page_size + 1: sem próxima página."""
+        page = await service.search_documents("t@e.com", "ciclo da água", page_size=10)
+
+        assert len(page.items) == 5
+        assert not page.has_next
+
+    def test_text_index_declared_with_user_prefix(self):
+        """✅ Índice de texto exigido: prefixo user_email e pesos por campo."""
+        [spec] = [spec for spec in REQUIRED_INDEXES if spec.name == SEARCH_INDEX_NAME]
+
+        assert spec.keys[0] == ("user_email", 1)
+        assert spec.stored_keys == (("user_email", 1), ("_fts", "text"), ("_ftsx", 1))
+        assert spec.options["weights"] == SEARCH_TEXT_WEIGHTS
+        assert spec.options["default_language"] == "portuguese"
@@ -310,3 +310,95 @@ class TestDuplicateCheckEdgeCases:
         
         # Fail-safe: retorna None para permitir processamento
         assert result is None
+
+
+class TestContentHashDuplicateCheck:
+    """🔐 Verificação de duplicatas por SHA-256 do conteúdo."""
+
+    FILE_HASH = "a" * 64
+
+    @pytest.fixture
+    def mock_collection(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def persistence_service(self, mock_collection, persistence_service_for):
+        return persistence_service_for(mock_collection)
+
+    @pytest.mark.asyncio
+    async def test_hash_match_ignores_filename(self, persistence_service, mock_collection):
+        """✅ Cópia renomeada é encontrada pelo file_hash."""
+        mock_doc = {
+            "_id": "doc-1",
+            "user_email": "test@example.com",
+            "file_name": "original.pdf",
+            "file_size": 1024,
+            "file_hash": self.FILE_HASH,
+            "status": DocumentStatus.COMPLETED.value,
+            "created_at": datetime.now(),
+            "response": {"document_id": "123", "questions": []}
+        }
+        mock_collection.find_one = AsyncMock(return_value=mock_doc)
+
+        result = await persistence_service.check_duplicate_document(
+            email="test@example.com",
+            filename="copia renomeada.pdf",
+            file_size=1024,
+            file_hash=self.FILE_HASH
+        )
+
+        assert result.file_name == "original.pdf"
+        assert result.file_hash == self.FILE_HASH
+        query = mock_collection.find_one.call_args[0][0]
+        assert query == {
+            "user_email": "test@example.com",
+            "file_hash": self.FILE_HASH,
+            "status": DocumentStatus.COMPLETED.value
+        }
+
+    @pytest.mark.asyncio
+    async def test_legacy_match_backfills_hash(self, persistence_service, mock_collection):
+        """✅ Registro legado (sem file_hash) encontrado por nome+tamanho recebe o hash."""
+        legacy_doc = {
+            "_id": "legacy-1",
+            "user_email": "test@example.com",
+            "file_name": "prova.pdf",
+            "file_size": 2048,
+            "status": DocumentStatus.COMPLETED.value,
+            "created_at": datetime.now(),
+            "response": {"document_id": "456", "questions": []}
+        }
+        mock_collection.find_one = AsyncMock(side_effect=[None, legacy_doc])
+        mock_collection.update_one = AsyncMock()
+
+        result = await persistence_service.check_duplicate_document(
+            email="test@example.com",
+            filename="prova.pdf",
+            file_size=2048,
+            file_hash=self.FILE_HASH
+        )
+
+        assert result.id == "legacy-1"
+        legacy_query = mock_collection.find_one.call_args_list[1][0][0]
+        assert legacy_query["file_hash"] == {"$exists": False}
+        mock_collection.update_one.assert_awaited_once_with(
+            {"_id": "legacy-1", "file_hash": {"$exists": False}},
+            {"$set": {"file_hash": self.FILE_HASH}}
+        )
+
+    @pytest.mark.asyncio
+    async def test_same_size_different_content_is_not_duplicate(self, persistence_service, mock_collection):
+        """✅ Mesmo nome/tamanho com hash diferente só casa com registros legados."""
+        mock_collection.find_one = AsyncMock(return_value=None)
+        mock_collection.update_one = AsyncMock()
+
+        result = await persistence_service.check_duplicate_document(
+            email="test@example.com",
+            filename="prova.pdf",
+            file_size=2048,
+            file_hash=self.FILE_HASH
+        )
+
+        assert result is None
+        assert mock_collection.find_one.await_count == 2
+        mock_collection.update_one.assert_not_called()
@@ -0,0 +1,59 @@
+"""
+Testes unitários para o watchdog de atraso do event loop
+"""
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.loop_watchdog import LoopLagWatchdog, start_loop_watchdog
+from app.core.metrics import LOOP_STALLS
+
+
+def _blocking_render(seconds):
+    time.sleep(seconds)
+
+
+class TestLoopLagWatchdog:
+    """Testes para detecção de bloqueios e captura da pilha."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_reports_stack(self, caplog):
+        """✅ Bloqueio acima do limite gera aviso com a pilha do código bloqueante."""
+        watchdog = LoopLagWatchdog(threshold_ms=50, interval_ms=10)
+        stalls_before = LOOP_STALLS._value.get()
+
+        with caplog.at_level(logging.WARNING, logger="app.core.loop_watchdog"):
+            watchdog.start()
+            await asyncio.sleep(0.05)
+            _blocking_render(0.4)
+            await asyncio.sleep(0.1)
+            await watchdog.stop()
+
+        warnings = [r.getMessage() for r in caplog.records if "Event loop blocked" in r.getMessage()]
+        assert len(warnings) == 1
+        assert "_blocking_render" in warnings[0]
+        blocked_ms = int(warnings[0].split("blocked for ")[1].split(" ms")[0])
+        assert 250 <= blocked_ms <= 600
+        assert LOOP_STALLS._value.get() == stalls_before + 1
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_reports_nothing(self, caplog):
+        """✅ Loop livre não gera avisos."""
+        watchdog = LoopLagWatchdog(threshold_ms=200, interval_ms=10)
+
+        with caplog.at_level(logging.WARNING, logger="app.core.loop_watchdog"):
+            watchdog.start()
+            await asyncio.sleep(0.15)
+            await watchdog.stop()
+
+        assert not [r for r in caplog.records if "Event loop blocked" in r.getMessage()]
+
+    @pytest.mark.asyncio
+    async def test_disabled_watchdog_not_started(self):
+        """✅ Com LOOP_WATCHDOG_ENABLED=false não há watchdog."""
+        settings = SimpleNamespace(loop_watchdog_enabled=False, loop_lag_threshold_ms=200, loop_watchdog_interval_ms=50)
+
+        assert start_loop_watchdog(settings) is None
@@ -0,0 +1,171 @@
+"""
+Testes unitários para a contabilidade de memória por etapa da análise
+"""
+import importlib.util
+import sys
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import app.core.memory
+from app.core.memory import MemoryCeilingExceeded, track_document, track_phase
+from app.core.metrics import DOCUMENT_RSS_GROWTH
+from app.models.persistence import AzureResponseRecord
+
+_MB = 1024 * 1024
+
+
+def _settings(enabled=True, ceiling_mb=0):
+    return SimpleNamespace(
+        memory_tracking_enabled=enabled,
+        memory_tracemalloc=False,
+        document_memory_ceiling_mb=ceiling_mb
+    )
+
+
+def _import_memory_without(*modules):
+    """Cópia isolada de app.core.memory importada como se ``modules`` não existissem (ex.: Windows)."""
+    spec = importlib.util.spec_from_file_location("memory_without_posix", app.core.memory.__file__)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {name: None for name in modules}):
+        spec.loader.exec_module(module)
+    return module
+
+
+class TestDocumentMemoryTracking:
+    """Testes para medição por etapa, relatório e teto por documento."""
+
+    def test_phase_records_rss_and_traced_peak(self):
+        """✅ Cada etapa registra a variação de RSS e o pico do tracemalloc."""
+        tracemalloc.start(1)
+        try:
+            with track_document(_settings()) as tracker:
+                with track_phase("figures"):
+                    buffer = bytearray(8 * _MB)
+                    del buffer
+                with track_phase("context_blocks"):
+                    pass
+        finally:
+            tracemalloc.stop()
+
+        report = tracker.report()
+        assert [phase.phase for phase in report.phases] == ["figures", "context_blocks"]
+        figures = report.phases[0]
+        assert figures.rss_delta_bytes == figures.rss_end_bytes - figures.rss_start_bytes
+        assert figures.traced_peak_bytes >= 8 * _MB
+        assert figures.traced_delta_bytes < _MB
+        assert report.traced_peak_bytes == figures.traced_peak_bytes
+        assert report.rss_peak_bytes >= report.rss_start_bytes
+        assert report.process_peak_rss_bytes > 0
+        assert report.ceiling_bytes is None
+
+    def test_ceiling_aborts_after_phase(self):
+        """❌ Crescimento de RSS acima do teto interrompe a análise com 413."""
+        rss = iter([100 * _MB, 100 * _MB, 180 * _MB])
+        with patch("app.core.memory.current_rss", side_effect=lambda: next(rss)):
+            with pytest.raises(MemoryCeilingExceeded) as exc_info:
+                with track_document(_settings(ceiling_mb=64)):
+                    with track_phase("extraction"):
+                        pass
+
+        assert exc_info.value.status_code == 413
+        assert exc_info.value.error_type == "memory_ceiling_exceeded"
+        assert exc_info.value.context["phase"] == "extraction"
+
+    def test_growth_under_ceiling_passes(self):
+        """✅ Crescimento abaixo do teto segue normalmente."""
+        rss = iter([100 * _MB, 100 * _MB, 130 * _MB])
+        with patch("app.core.memory.current_rss", side_effect=lambda: next(rss)):
+            with track_document(_settings(ceiling_mb=64)) as tracker:
+                with track_phase("extraction"):
+                    pass
+
+        report = tracker.report()
+        assert report.rss_growth_bytes == 30 * _MB
+        assert report.ceiling_bytes == 64 * _MB
+
+    def test_disabled_tracking_is_noop(self):
+        """✅ Desabilitado, não há tracker e track_phase não mede nada."""
+        with track_document(_settings(enabled=False)) as tracker:
+            with track_phase("extraction"):
+                pass
+        assert tracker is None
+
+        with track_phase("outside_document"):
+            pass
+
+    def test_record_persists_memory_report(self):
+        """✅ O relatório de memória é gravado com as métricas da análise."""
+        with track_document(_settings()) as tracker:
+            with track_phase("extraction"):
+                pass
+
+        record = AzureResponseRecord.create_from_azure_processing(
+            document_id="doc-1",
+            user_email="user@test.com",
+            file_name="prova.pdf",
+            file_size=1024,
+            azure_response={},
+            azure_model_id="prebuilt-layout",
+            azure_api_version="2023-07-31",
+            processing_duration=1.0,
+            memory=tracker.report()
+        )
+
+        assert record.memory.phases[0].phase == "extraction"
+        assert record.dict()["memory"]["rss_start_bytes"] > 0
+
+
+class TestMemoryTrackingWithoutResource:
+    """Testes para plataformas sem o módulo ``resource`` (Windows)."""
+
+    def test_import_without_resource_uses_psutil(self):
+        """✅ Sem ``resource`` o módulo importa e o RSS vem do psutil."""
+        memory = _import_memory_without("resource")
+        fake_psutil = SimpleNamespace(Process=lambda: SimpleNamespace(
+            memory_info=lambda: SimpleNamespace(rss=50 * _MB, peak_wset=70 * _MB)
+        ))
+
+        with patch.object(memory, "psutil", fake_psutil), \
+                patch.object(memory, "_proc_rss", return_value=None):
+            assert memory.resource is None
+            assert memory.current_rss() == 50 * _MB
+            assert memory.peak_rss() == 70 * _MB
+
+    def test_without_any_rss_source_skips_rss_and_ceiling(self):
+        """✅ Sem fonte de RSS: campos None, sem histograma de crescimento e sem teto."""
+        memory = _import_memory_without("resource", "psutil")
+        growth_sum_before = DOCUMENT_RSS_GROWTH._sum.get()
+
+        with patch.object(memory, "_proc_rss", return_value=None):
+            assert memory.current_rss() is None
+            assert memory.rss_available() is False
+            with memory.track_document(_settings(ceiling_mb=1)) as tracker:
+                with memory.track_phase("extraction"):
+                    buffer = bytearray(4 * _MB)
+                    del buffer
+
+        report = tracker.report()
+        assert report.rss_growth_bytes is None
+        assert report.process_peak_rss_bytes is None
+        assert report.phases[0].rss_delta_bytes is None
+        assert DOCUMENT_RSS_GROWTH._sum.get() == growth_sum_before
+
+    def test_peak_rss_is_not_used_as_current_rss(self):
+        """✅ Só ``resource`` (macOS sem psutil): RSS atual None, pico apenas no relatório."""
+        memory = _import_memory_without("psutil")
+
+        with patch.object(memory, "_proc_rss", return_value=None):
+            assert memory.current_rss() is None
+            assert memory.rss_available() is False
+            with memory.track_document(_settings(ceiling_mb=1)) as tracker:
+                with memory.track_phase("extraction"):
+                    pass
+
+        report = tracker.report()
+        assert report.phases[0].rss_end_bytes is None
+        assert report.phases[0].rss_delta_bytes is None
+        assert report.rss_growth_bytes is None
+        assert report.process_peak_rss_bytes > 0
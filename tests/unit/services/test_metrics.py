@@ -0,0 +1,85 @@
+"""
+Testes unitários das métricas Prometheus (app.core.metrics e middleware)
+"""
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.api.controllers.metrics import router as metrics_router
+from app.core.metrics import render_metrics
+from app.core.middleware import MetricsMiddleware
+from app.services.infrastructure.mongodb_pool_monitor import MongoDBPoolMonitor
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(f"smartquest_{name}", labels) or 0.0
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: str):
+        return {"id": item_id}
+
+    return app
+
+
+class TestMetrics:
+    """Testes para a exposição e o registro das métricas."""
+
+    def test_render_exposes_registered_metrics(self):
+        """✅ Exposição em formato texto com histogramas, contadores e gauge."""
+        body, content_type = render_metrics()
+
+        text = body.decode()
+        assert content_type.startswith("text/plain")
+        for name in (
+            "smartquest_http_request_duration_seconds",
+            "smartquest_pipeline_phase_duration_seconds",
+            "smartquest_azure_analyze_duration_seconds",
+            "smartquest_mongodb_operation_duration_seconds",
+            "smartquest_cache_requests_total",
+            "smartquest_analyses_in_flight",
+        ):
+            assert name in text
+
+    def test_middleware_labels_request_by_route_template(self):
+        """✅ Latência registrada pelo template da rota, não pelo caminho concreto."""
+        labels = dict(method="GET", route="/items/{item_id}", status="200")
+        before = _sample("http_request_duration_seconds_count", **labels)
+
+        client = TestClient(_app())
+        client.get("/items/1")
+        client.get("/items/2")
+
+        assert _sample("http_request_duration_seconds_count", **labels) == before + 2
+
+    def test_unmatched_paths_share_one_label(self):
+        """✅ Caminhos sem rota usam o rótulo 'unmatched' (cardinalidade limitada)."""
+        labels = dict(method="GET", route="unmatched", status="404")
+        before = _sample("http_request_duration_seconds_count", **labels)
+
+        TestClient(_app()).get("/nao-existe/123")
+
+        assert _sample("http_request_duration_seconds_count", **labels) == before + 1
+
+    def test_metrics_endpoint_serves_prometheus_text(self):
+        """✅ GET /metrics responde no formato do Prometheus."""
+        response = TestClient(_app()).get("/metrics")
+
+        assert response.status_code == 200
+        assert "smartquest_pages_analyzed_total" in response.text
+
+    def test_pool_monitor_observes_command_latency(self):
+        """✅ Comandos MongoDB alimentam o histograma com o resultado."""
+        before = _sample("mongodb_operation_duration_seconds_sum", command="find", result="failure")
+
+        MongoDBPoolMonitor().failed(SimpleNamespace(command_name="find", duration_micros=250_000))
+
+        after = _sample("mongodb_operation_duration_seconds_sum", command="find", result="failure")
+        assert after - before == 0.25
@@ -0,0 +1,222 @@
+"""
+Testes unitários para o gerenciador de índices e migrações
+
+Valida a verificação/criação de índices, o backfill em lotes com checkpoint
+retomável e a detecção de COLLSCAN via explain().
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.persistence import MongoDBMigrationManager
+from app.services.persistence.indexes import HotQuery, IndexSpec
+from app.services.persistence.migration_manager import Backfill
+
+
+class _FakeCollection:
+    """Coleção em memória com find/bulk_write suficientes para o backfill."""
+
+    def __init__(self, docs, async_cursor):
+        self.docs = {d["_id"]: d for d in docs}
+        self.bulk_calls = 0
+        self._async_cursor = async_cursor
+
+    def find(self, query, projection=None):
+        last_id = (query.get("_id") or {}).get("$gt")
+        pending = sorted(
+            (d for d in self.docs.values()
+             if "migrated" not in d and (last_id is None or d["_id"] > last_id)),
+            key=lambda d: d["_id"]
+        )
+        return self._async_cursor(pending)
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_calls += 1
+        for op in operations:
+            self.docs[op._filter["_id"]].update(op._doc["$set"])
+        return MagicMock(modified_count=len(operations))
+
+
+class _FakeCheckpoints:
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        self.docs.setdefault(query["_id"], {}).update(update["$set"])
+
+
+@pytest.fixture
+def manager_for(mongo_connection):
+    """MongoDBMigrationManager sobre coleções fake: ``manager_for(collections)``."""
+    return lambda collections: MongoDBMigrationManager(mongo_connection(collections))
+
+
+def _backfill(batch_size=2):
+    return Backfill(
+        name="mark",
+        collection="analyze_documents",
+        query={"migrated": {"$exists": False}},
+        transform=lambda doc: {"migrated": True},
+        batch_size=batch_size
+    )
+
+
+class TestEnsureIndexes:
+    """Testes para verificação e criação de índices."""
+
+    @pytest.fixture
+    def collection(self, async_cursor):
+        collection = MagicMock()
+        collection.list_indexes = MagicMock(side_effect=lambda: async_cursor([
+            {"name": "_id_", "key": {"_id": 1}},
+            {"name": "user_email_1_created_at_-1", "key": {"user_email": 1, "created_at": -1}}
+        ]))
+        collection.create_indexes = AsyncMock()
+        return collection
+
+    @pytest.fixture
+    def specs(self):
+        return [
+            IndexSpec("analyze_documents", "idx_user_created", (("user_email", 1), ("created_at", -1))),
+            IndexSpec("analyze_documents", "idx_hash", (("file_hash", 1),), {"sparse": True})
+        ]
+
+    @pytest.mark.asyncio
+    async def test_existing_keys_accepted_and_missing_created(self, manager_for, collection, specs):
+        """✅ Índice com as mesmas chaves (outro nome) é aceito; ausente é criado."""
+        manager = manager_for({"analyze_documents": collection})
+
+        result = await manager.ensure_indexes(specs)
+
+        assert result.present == ["idx_user_created"]
+        assert result.created == ["idx_hash"]
+        assert result.ok
+        model = collection.create_indexes.call_args[0][0][0]
+        assert model.document["name"] == "idx_hash"
+        assert model.document["sparse"] is True
+
+    @pytest.mark.asyncio
+    async def test_existing_text_index_is_recognized(self, manager_for, collection, async_cursor):
+        """✅ Índice de texto listado como _fts/_ftsx é reconhecido pelos campos declarados."""
+        collection.list_indexes = MagicMock(side_effect=lambda: async_cursor([
+            {"name": "search", "key": {"user_email": 1, "_fts": "text", "_ftsx": 1}}
+        ]))
+        spec = IndexSpec("analyze_documents", "idx_search_text",
+                         (("user_email", 1), ("response.questions.question", "text")))
+
+        result = await manager_for({"analyze_documents": collection}).ensure_indexes([spec])
+
+        assert result.present == ["idx_search_text"]
+        collection.create_indexes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_verify_only_reports_missing(self, manager_for, collection, specs):
+        """❌ Sem create_missing o índice ausente é reportado, não criado."""
+        manager = manager_for({"analyze_documents": collection})
+
+        result = await manager.ensure_indexes(specs, create_missing=False)
+
+        assert result.missing == ["idx_hash"]
+        assert not result.ok
+        collection.create_indexes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_failure_is_reported(self, manager_for, collection, specs):
+        """❌ Falha ao criar (ex.: conflito de opções) é reportada por índice."""
+        collection.create_indexes = AsyncMock(side_effect=Exception("IndexOptionsConflict"))
+        manager = manager_for({"analyze_documents": collection})
+
+        result = await manager.ensure_indexes(specs)
+
+        assert result.failed == {"idx_hash": "IndexOptionsConflict"}
+
+
+class TestRunBackfill:
+    """Testes para backfill em lotes com checkpoint."""
+
+    @pytest.mark.asyncio
+    async def test_backfill_updates_all_in_batches(self, manager_for, async_cursor):
+        """✅ Todos os documentos atualizados em lotes de batch_size."""
+        collection = _FakeCollection([{"_id": f"id-{i}"} for i in range(5)], async_cursor)
+        checkpoints = _FakeCheckpoints()
+        manager = manager_for({"analyze_documents": collection, "migration_checkpoints": checkpoints})
+
+        report = await manager.run_backfill(_backfill())
+
+        assert report.completed
+        assert report.updated == 5
+        assert collection.bulk_calls == 3
+        assert all(d.get("migrated") for d in collection.docs.values())
+        assert checkpoints.docs["mark"]["completed"] is True
+
+    @pytest.mark.asyncio
+    async def test_interrupted_backfill_resumes_from_checkpoint(self, manager_for, async_cursor):
+        """✅ Execução limitada grava checkpoint; a próxima continua do último _id."""
+        collection = _FakeCollection([{"_id": f"id-{i}"} for i in range(5)], async_cursor)
+        checkpoints = _FakeCheckpoints()
+        manager = manager_for({"analyze_documents": collection, "migration_checkpoints": checkpoints})
+
+        first = await manager.run_backfill(_backfill(), max_batches=1)
+        assert not first.completed
+        assert checkpoints.docs["mark"]["last_id"] == "id-1"
+
+        second = await manager.run_backfill(_backfill())
+
+        assert second.resumed
+        assert second.completed
+        assert second.updated == 5
+        assert second.scanned == 5
+
+    @pytest.mark.asyncio
+    async def test_dry_run_writes_nothing(self, manager_for, async_cursor):
+        """✅ dry_run percorre e conta sem gravar documentos ou checkpoint."""
+        collection = _FakeCollection([{"_id": "a"}, {"_id": "b"}], async_cursor)
+        checkpoints = _FakeCheckpoints()
+        manager = manager_for({"analyze_documents": collection, "migration_checkpoints": checkpoints})
+
+        report = await manager.run_backfill(_backfill(), dry_run=True)
+
+        assert report.updated == 2
+        assert collection.bulk_calls == 0
+        assert checkpoints.docs == {}
+
+
+class TestCheckQueryPlans:
+    """Testes para verificação de planos via explain()."""
+
+    def _collection(self, winning_plan):
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.limit.return_value = cursor
+        cursor.explain = AsyncMock(return_value={"queryPlanner": {"winningPlan": winning_plan}})
+        collection = MagicMock()
+        collection.find.return_value = cursor
+        return collection
+
+    @pytest.mark.asyncio
+    async def test_index_scan_is_ok(self, manager_for):
+        """✅ IXSCAN com o índice esperado passa (formato SBE com queryPlan)."""
+        plan = {"queryPlan": {"stage": "LIMIT", "inputStage": {
+            "stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "idx_user_created_at"}
+        }}}
+        manager = manager_for({"analyze_documents": self._collection(plan)})
+        query = HotQuery("list", "analyze_documents", {"user_email": "x"},
+                         sort=[("created_at", -1)], expected_index="idx_user_created_at")
+
+        [check] = await manager.check_query_plans([query])
+
+        assert check.ok
+        assert check.stages == ["LIMIT", "FETCH", "IXSCAN"]
+
+    @pytest.mark.asyncio
+    async def test_collscan_is_flagged(self, manager_for):
+        """❌ COLLSCAN é apontado mesmo sem índice esperado."""
+        plan = {"stage": "LIMIT", "inputStage": {"stage": "COLLSCAN"}}
+        manager = manager_for({"analyze_documents": self._collection(plan)})
+
+        [check] = await manager.check_query_plans([HotQuery("scan", "analyze_documents", {"x": 1})])
+
+        assert check.collscan
+        assert not check.ok
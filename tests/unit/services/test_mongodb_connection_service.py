@@ -0,0 +1,166 @@
+"""
+Testes unitários para a configuração do pool MongoDB
+
+Valida as opções do cliente (pool, compressão, timeouts), o aquecimento do
+pool e as estatísticas do monitor de comandos.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.infrastructure import MongoDBConnectionService, MongoDBPoolMonitor, MongoDBTracingListener
+from app.services.infrastructure.mongodb_connection_service import available_compressors
+
+
+def _settings(**overrides):
+    values = dict(
+        mongodb_url="mongodb://localhost:27017",
+        mongodb_database="smartquest",
+        mongodb_connection_timeout=5000,
+        mongodb_read_timeout_ms=30000,
+        mongodb_write_timeout_ms=60000,
+        mongodb_min_pool_size=3,
+        mongodb_max_pool_size=50,
+        mongodb_max_idle_time_ms=120000,
+        mongodb_compressors="zstd,snappy,zlib",
+        mongodb_zlib_compression_level=4,
+        tracing_enabled=False
+    )
+    values.update(overrides)
+    return MagicMock(**values)
+
+
+def _event(address=("db", 27017), **kwargs):
+    return MagicMock(address=address, **kwargs)
+
+
+class TestClientOptions:
+    """Testes para as opções do AsyncIOMotorClient."""
+
+    def test_options_come_from_settings(self):
+        """✅ Pool, timeouts separados e listener vêm das settings."""
+        with patch("app.services.infrastructure.mongodb_connection_service.get_settings", return_value=_settings()):
+            service = MongoDBConnectionService()
+
+        options = service._client_options()
+
+        assert options["minPoolSize"] == 3
+        assert options["maxPoolSize"] == 50
+        assert options["maxIdleTimeMS"] == 120000
+        assert options["connectTimeoutMS"] == 5000
+        assert options["socketTimeoutMS"] == 30000
+        assert options["event_listeners"] == [service._pool_monitor]
+        assert "zlib" in options["compressors"]
+        assert options["zlibCompressionLevel"] == 4
+
+    def test_unavailable_compressors_are_dropped(self):
+        """✅ Compressores sem pacote instalado são descartados, ordem preservada."""
+        with patch.dict(
+            "app.services.infrastructure.mongodb_connection_service._COMPRESSOR_AVAILABLE",
+            {"zstd": False, "snappy": True, "zlib": True}
+        ):
+            assert available_compressors(" zstd, snappy ,zlib,lz4") == ["snappy", "zlib"]
+
+    def test_availability_follows_importable_packages(self):
+        """✅ Disponibilidade de zstd/snappy vem da importação de zstandard/snappy."""
+        from app.services.infrastructure import mongodb_connection_service as module
+
+        assert module._COMPRESSOR_AVAILABLE["zstd"] == module._importable("zstandard")
+        assert module._COMPRESSOR_AVAILABLE["snappy"] == module._importable("snappy")
+        assert module._COMPRESSOR_AVAILABLE["zlib"] is True
+        assert module._importable("pacote_inexistente_smartquest") is False
+
+    def test_missing_compressor_is_logged(self, caplog):
+        """⚠️ Compressor configurado sem pacote instalado gera warning."""
+        with patch.dict(
+            "app.services.infrastructure.mongodb_connection_service._COMPRESSOR_AVAILABLE",
+            {"zstd": False, "snappy": False, "zlib": True}
+        ), patch("app.services.infrastructure.mongodb_connection_service.get_settings",
+                 return_value=_settings(mongodb_compressors="zstd,zlib")):
+            options = MongoDBConnectionService()._client_options()
+
+        assert options["compressors"] == "zlib"
+        assert "zstd" in caplog.text
+
+    def test_no_compressors_configured(self):
+        """✅ MONGODB_COMPRESSORS vazio desabilita a compressão."""
+        with patch("app.services.infrastructure.mongodb_connection_service.get_settings",
+                   return_value=_settings(mongodb_compressors="")):
+            options = MongoDBConnectionService()._client_options()
+
+        assert "compressors" not in options
+
+    def test_tracing_listener_registered_when_enabled(self):
+        """✅ TRACING_ENABLED adiciona o listener de spans dos comandos."""
+        with patch("app.services.infrastructure.mongodb_connection_service.get_settings",
+                   return_value=_settings(tracing_enabled=True)):
+            service = MongoDBConnectionService()
+
+        listeners = service._client_options()["event_listeners"]
+
+        assert listeners[0] is service._pool_monitor
+        assert isinstance(listeners[1], MongoDBTracingListener)
+
+
+class TestWarmUp:
+    """Testes para o aquecimento do pool."""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_issues_concurrent_pings(self):
+        """✅ Um ping concorrente por conexão do pool mínimo."""
+        with patch("app.services.infrastructure.mongodb_connection_service.get_settings", return_value=_settings()):
+            service = MongoDBConnectionService()
+        service._client = MagicMock()
+        service._client.admin.command = AsyncMock(return_value={"ok": 1})
+        service._database = MagicMock()
+
+        await service.warm_up()
+
+        assert service._client.admin.command.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_warm_up_zero_skips_pings(self):
+        """✅ Pool mínimo zero não abre conexões extras."""
+        with patch("app.services.infrastructure.mongodb_connection_service.get_settings",
+                   return_value=_settings(mongodb_min_pool_size=0)):
+            service = MongoDBConnectionService()
+        service._client = MagicMock()
+        service._client.admin.command = AsyncMock()
+        service._database = MagicMock()
+
+        assert await service.warm_up() == 0
+        service._client.admin.command.assert_not_awaited()
+
+
+class TestPoolMonitor:
+    """Testes para o listener de pool e comandos."""
+
+    def test_tracks_connections_and_checkouts(self):
+        """✅ Conexões abertas e em uso por endereço do servidor."""
+        monitor = MongoDBPoolMonitor()
+
+        monitor.connection_created(_event())
+        monitor.connection_created(_event())
+        monitor.connection_checked_out(_event())
+        monitor.connection_checked_out(_event())
+        monitor.connection_checked_in(_event())
+        monitor.connection_closed(_event())
+        monitor.connection_check_out_failed(_event())
+
+        pool = monitor.snapshot()["pools"]["db:27017"]
+        assert pool["open"] == 1
+        assert pool["checked_out"] == 1
+        assert pool["checkouts"] == 2
+        assert pool["checkout_failures"] == 1
+
+    def test_tracks_commands_by_name(self):
+        """✅ Contagem, falhas e duração por comando."""
+        monitor = MongoDBPoolMonitor()
+
+        monitor.succeeded(_event(command_name="insert", duration_micros=2000))
+        monitor.failed(_event(command_name="insert", duration_micros=5000))
+
+        insert = monitor.snapshot()["commands"]["insert"]
+        assert insert["count"] == 2
+        assert insert["failures"] == 1
+        assert insert["total_ms"] == 7.0
+        assert insert["max_ms"] == 5.0
@@ -0,0 +1,147 @@
+"""
+Testes unitários para as métricas de processamento por documento
+
+Valida o coletor da análise, o registro AzureProcessingDataRecord e a
+agregação de percentis de GET /admin/processing-metrics.
+"""
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from app.core.document_metrics import collect_document_metrics, record_figure, time_azure_call, time_stage
+from app.models.persistence import AzureProcessingDataRecord, ProcessingMetrics, page_count_bucket
+from app.services.persistence.processing_metrics_query import build_percentile_pipeline, summarize_groups
+
+
+class TestDocumentMetricsCollector:
+    """Testes para o coletor de medidas da análise."""
+
+    def test_collects_stages_azure_calls_and_figures(self):
+        """✅ Etapas, chamadas ao Azure e figuras acumulam no coletor da análise."""
+        with collect_document_metrics() as collector:
+            with time_stage("extraction"):
+                pass
+            with time_stage("figures"):
+                pass
+            with time_stage("figures"):
+                pass
+            with time_azure_call("layout"):
+                pass
+            record_figure("manual_pdf_cropping", 2048)
+            record_figure("manual_pdf_cropping", 1024)
+            record_figure("manual_pdf_cropping", None)
+
+        assert set(collector.stage_durations) == {"extraction", "figures"}
+        assert set(collector.azure_latency) == {"layout"}
+        assert collector.figures_count == 2
+        assert collector.figures_failed_count == 1
+        assert collector.image_bytes == 3072
+
+    def test_without_collector_only_prometheus(self):
+        """✅ Fora de uma análise as medidas não falham (apenas Prometheus)."""
+        with time_stage("extraction"), time_azure_call("layout"):
+            record_figure("azure_figures", 10)
+
+    def test_metrics_record_with_page_bucket(self):
+        """✅ Registro de métricas sem response do Azure, com faixa de páginas."""
+        record = AzureProcessingDataRecord.create_from_document_metrics(
+            document_id="doc-1",
+            user_email="user@test.com",
+            file_name="prova.pdf",
+            processing_metrics=ProcessingMetrics(processing_duration_seconds=12.5, pages_count=7, cache_outcome="miss")
+        )
+
+        data = record.dict_for_mongo()
+        assert data["document_id"] == "doc-1"
+        assert data["metrics"]["page_bucket"] == "6-10"
+        assert "response" not in data
+
+    @pytest.mark.parametrize("pages, bucket", [(None, "unknown"), (1, "1"), (5, "2-5"), (20, "11-20"), (120, "51+")])
+    def test_page_count_bucket(self, pages, bucket):
+        """✅ Faixas de quantidade de páginas."""
+        assert page_count_bucket(pages) == bucket
+
+
+class TestProcessingMetricsPercentiles:
+    """Testes para a agregação de percentis."""
+
+    def test_pipeline_by_stage_includes_total_and_azure(self):
+        """✅ Agrupamento por etapa inclui total, etapas e chamadas ao Azure."""
+        since = datetime(2026, 10, 1)
+        pipeline = build_percentile_pipeline(since, ["day", "stage"])
+
+        assert pipeline[0]["$match"] == {"created_at": {"$gte": since}, "metrics.cache_outcome": "miss"}
+        stages = pipeline[1]["$project"]["stages"]["$concatArrays"]
+        assert stages[0] == [{"k": "total", "v": "$metrics.processing_duration_seconds"}]
+        assert pipeline[-1]["$group"]["_id"] == {"day": "$day", "stage": "$stages.k"}
+
+    def test_pipeline_computes_percentiles_on_server(self):
+        """✅ MongoDB 7+: $percentile aproximado no $group, sem $push dos valores."""
+        group = build_percentile_pipeline(datetime(2026, 10, 1), ["day"])[-1]["$group"]
+
+        assert group["percentiles"]["$percentile"] == {
+            "input": "$stages.v", "p": [0.5, 0.95, 0.99], "method": "approximate"
+        }
+        assert "values" not in group
+        fallback = build_percentile_pipeline(datetime(2026, 10, 1), ["day"], server_percentile=False)[-1]["$group"]
+        assert fallback["values"] == {"$push": "$stages.v"}
+
+    def test_unknown_dimension_rejected(self):
+        """❌ Dimensão desconhecida."""
+        with pytest.raises(ValueError):
+            build_percentile_pipeline(datetime(2026, 10, 1), ["tenant"])
+
+    def test_percentiles_nearest_rank(self):
+        """✅ p50/p95/p99 por posto mais próximo, ordenados pela chave."""
+        summaries = summarize_groups([
+            {"_id": {"day": "2026-10-02"}, "values": [3.0]},
+            {"_id": {"day": "2026-10-01"}, "values": [float(v) for v in range(100, 0, -1)]},
+        ])
+
+        first, second = summaries
+        assert first.group == {"day": "2026-10-01"}
+        assert (first.count, first.p50, first.p95, first.p99, first.max) == (100, 50.0, 95.0, 99.0, 100.0)
+        assert (second.p50, second.p99) == (3.0, 3.0)
+
+    def test_server_percentiles_are_used_as_is(self):
+        """✅ Grupo com percentis calculados pelo servidor."""
+        [summary] = summarize_groups([
+            {"_id": {"stage": "total"}, "count": 40, "percentiles": [1.23456, 2.5, 3.0], "max": 4.0}
+        ])
+
+        assert (summary.count, summary.p50, summary.p95, summary.p99, summary.max) == (40, 1.235, 2.5, 3.0, 4.0)
+
+    @pytest.mark.asyncio
+    async def test_service_aggregates_collection(self, async_cursor, persistence_service_for):
+        """✅ MongoDBPersistenceService agrega 'azure_processing_data'."""
+        collection = MagicMock()
+        collection.aggregate = MagicMock(return_value=async_cursor([
+            {"_id": {"page_bucket": "2-5"}, "count": 3, "percentiles": [2.0, 4.0, 4.0], "max": 4.0}
+        ]))
+        service = persistence_service_for({"azure_processing_data": collection})
+
+        [group] = await service.get_processing_metrics_percentiles(datetime(2026, 10, 1), group_by=["page_bucket"])
+
+        assert collection.aggregate.call_args.kwargs["allowDiskUse"] is True
+        assert (group.group, group.count, group.p50, group.max) == ({"page_bucket": "2-5"}, 3, 2.0, 4.0)
+
+    @pytest.mark.asyncio
+    async def test_service_falls_back_to_push_on_older_servers(self, async_cursor, persistence_service_for):
+        """✅ Servidor sem $percentile (MongoDB < 7): repete com $push e lembra a escolha."""
+        collection = MagicMock()
+        collection.aggregate = MagicMock(side_effect=[
+            OperationFailure("unknown group operator '$percentile'", code=15952),
+            async_cursor([{"_id": {"day": "2026-10-01"}, "values": [1.0, 2.0, 4.0]}]),
+            async_cursor([]),
+        ])
+        service = persistence_service_for({"azure_processing_data": collection})
+
+        [group] = await service.get_processing_metrics_percentiles(datetime(2026, 10, 1))
+        await service.get_processing_metrics_percentiles(datetime(2026, 10, 1))
+
+        assert (group.count, group.p50, group.max) == (3, 2.0, 4.0)
+        pipelines = [call[0][0] for call in collection.aggregate.call_args_list]
+        assert "percentiles" in pipelines[0][-1]["$group"]
+        assert all("values" in pipeline[-1]["$group"] for pipeline in pipelines[1:])
@@ -0,0 +1,170 @@
+"""
+Testes unitários para o banco de questões (coleção 'questions')
+
+Valida a extração das questões de uma análise, o filtro/cursor da consulta
+paginada, a gravação junto com a análise e o backfill das análises antigas.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models.persistence import AnalyzeDocumentRecord, DocumentStatus, QuestionRecord
+from app.services.persistence.backfills import QUESTIONS_BACKFILL
+from app.services.persistence.question_query import (
+    build_question_query,
+    decode_question_cursor,
+    encode_question_cursor
+)
+
+
+def _response(questions=3):
+    return {
+        "document_id": "doc-1",
+        "header": {"subject": "Língua Portuguesa", "series": "9º Ano"},
+        "questions": [
+            {
+                "number": i + 1,
+                "question": f"Questão {i + 1}",
+                "alternatives": [{"letter": "A", "text": "sim"}] if i % 2 == 0 else [],
+                "hasImage": i == 1,
+                "context_id": 7 if i == 0 else None
+            }
+            for i in range(questions)
+        ],
+        "context_blocks": []
+    }
+
+
+class TestQuestionRecord:
+    """Testes para a extração das questões de uma análise."""
+
+    def test_one_record_per_question_with_normalized_keys(self):
+        """✅ Uma questão por documento, matéria/série normalizadas e _id determinístico."""
+        records = QuestionRecord.from_analysis("analysis-1", "t@e.com", _response())
+
+        assert [r.id for r in records] == ["analysis-1:0000", "analysis-1:0001", "analysis-1:0002"]
+        assert records[0].subject_key == "lingua portuguesa"
+        assert records[0].grade == "9º Ano"
+        assert records[0].is_multiple_choice and not records[1].is_multiple_choice
+        assert records[1].has_image
+        assert records[0].context_id == 7
+        assert records[0].alternatives[0].text == "sim"
+
+    def test_summary_takes_precedence_over_header(self):
+        """✅ Matéria/série do resumo do documento prevalecem sobre o cabeçalho."""
+        [record] = QuestionRecord.from_analysis(
+            "analysis-1", "t@e.com", _response(1), summary={"subject": "Matemática", "grade": "8º Ano"}
+        )
+
+        assert record.subject_key == "matematica"
+        assert record.grade == "8º Ano"
+
+    def test_response_without_questions(self):
+        """✅ Response sem questões (ex.: falha) não gera registros."""
+        assert QuestionRecord.from_analysis("analysis-1", "t@e.com", {"error": "boom"}) == []
+
+
+class TestQuestionQuery:
+    """Testes para filtro e cursor da consulta paginada."""
+
+    def test_filters_use_normalized_keys(self):
+        """✅ Matéria e série sem acentos/maiúsculas; booleanos False são mantidos."""
+        query = build_question_query(subject="LÍNGUA Portuguesa", grade="9º ano", multiple_choice=False)
+
+        assert query == {"subject_key": "lingua portuguesa", "grade_key": "9o ano", "is_multiple_choice": False}
+
+    def test_cursor_roundtrip(self):
+        """✅ Cursor codifica o último _id."""
+        assert decode_question_cursor(encode_question_cursor("analysis-1:0002")) == "analysis-1:0002"
+
+    def test_invalid_cursor(self):
+        """❌ Cursor malformado gera ValueError."""
+        with pytest.raises(ValueError):
+            decode_question_cursor("\xff")
+
+
+class TestQuestionPersistence:
+    """Testes para gravação e consulta da coleção 'questions'."""
+
+    @pytest.fixture
+    def collections(self):
+        analyze_documents = MagicMock()
+        analyze_documents.insert_one = AsyncMock(return_value=MagicMock(inserted_id="analysis-1"))
+        questions = MagicMock()
+        questions.insert_many = AsyncMock()
+        return {"analyze_documents": analyze_documents, "questions": questions}
+
+    @pytest.fixture
+    def service(self, collections, persistence_service_for):
+        return persistence_service_for(collections)
+
+    def _record(self, status=DocumentStatus.COMPLETED):
+        return AnalyzeDocumentRecord.create_from_request(
+            user_email="t@e.com",
+            file_name="prova.pdf",
+            file_size=100,
+            response=_response(),
+            status=status,
+            document_id="doc-1"
+        )
+
+    @pytest.mark.asyncio
+    async def test_save_fans_out_questions(self, service, collections):
+        """✅ Análise concluída grava suas questões na coleção 'questions'."""
+        record = self._record()
+
+        await service.save_analysis_result(record)
+
+        docs = collections["questions"].insert_many.call_args[0][0]
+        assert [d["_id"] for d in docs] == [f"{record.id}:000{i}" for i in range(3)]
+        assert all(d["document_id"] == record.id for d in docs)
+
+    @pytest.mark.asyncio
+    async def test_fan_out_failure_does_not_fail_save(self, service, collections):
+        """❌ Falha no banco de questões não desfaz a análise salva."""
+        collections["questions"].insert_many = AsyncMock(side_effect=Exception("boom"))
+
+        assert await service.save_analysis_result(self._record()) == "analysis-1"
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_has_no_questions(self, service, collections):
+        """✅ Análises não concluídas não entram no banco de questões."""
+        await service.save_analysis_result(self._record(status=DocumentStatus.FAILED))
+
+        collections["questions"].insert_many.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_questions_page_keyset(self, service, collections, async_cursor):
+        """✅ page_size + 1 itens indicam próxima página; cursor filtra por _id."""
+        cursor = async_cursor([{"_id": f"a:000{i}"} for i in range(3)])
+        collections["questions"].find = MagicMock(return_value=cursor)
+
+        page = await service.get_questions_page(
+            subject="Matemática", page_size=2, cursor=encode_question_cursor("a:0000")
+        )
+
+        query = collections["questions"].find.call_args[0][0]
+        assert query == {"subject_key": "matematica", "_id": {"$gt": "a:0000"}}
+        cursor.limit.assert_called_once_with(3)
+        assert [d["_id"] for d in page.items] == ["a:0000", "a:0001"]
+        assert page.has_next
+        assert decode_question_cursor(page.next_cursor) == "a:0001"
+
+
+class TestQuestionsBackfill:
+    """Testes para o backfill das análises anteriores à coleção."""
+
+    @pytest.mark.asyncio
+    async def test_backfill_upserts_questions(self):
+        """✅ Upsert por _id das questões de cada análise do lote."""
+        questions = MagicMock()
+        questions.bulk_write = AsyncMock(return_value=MagicMock(upserted_count=3, modified_count=0))
+        database = MagicMock()
+        database.__getitem__ = MagicMock(return_value=questions)
+        docs = [{"_id": "analysis-1", "user_email": "t@e.com", "response": _response()}]
+
+        written = await QUESTIONS_BACKFILL.on_batch(database, docs)
+
+        operations = questions.bulk_write.call_args[0][0]
+        assert written == 3
+        assert [op._filter for op in operations] == [{"_id": f"analysis-1:000{i}"} for i in range(3)]
+        assert all(op._upsert for op in operations)
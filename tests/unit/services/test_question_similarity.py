@@ -0,0 +1,138 @@
+"""
+Testes unitários para a busca de quase-duplicatas (MinHash + LSH)
+
+Valida assinatura/chaves LSH de app.core.minhash e a pontuação das candidatas
+lidas pelo índice em QuestionSimilarityService.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config.settings import get_settings
+from app.core import minhash
+from app.models.persistence import QuestionRecord
+from app.services.core.question_similarity_service import QuestionSimilarityService
+
+STATEMENT = (
+    "Leia o texto abaixo e responda: qual é a ideia principal defendida pelo autor "
+    "no segundo parágrafo sobre a preservação da floresta amazônica e dos rios?"
+)
+EDITED = STATEMENT.replace("segundo", "terceiro")
+UNRELATED = "Calcule a área de um triângulo retângulo cujos catetos medem 3 cm e 4 cm."
+
+
+def _question(question_id, statement):
+    signature = minhash.signature(statement)
+    return {
+        "_id": question_id,
+        "document_id": question_id.split(":")[0],
+        "user_email": "t@e.com",
+        "number": 1,
+        "statement": statement,
+        "minhash": minhash.pack(signature),
+        "lsh_bands": minhash.band_keys(signature)
+    }
+
+
+class TestMinHash:
+    """Testes para assinatura, chaves LSH e similaridade."""
+
+    def test_identical_text_ignoring_accents_and_punctuation(self):
+        """✅ Acentos, pontuação e maiúsculas não alteram a assinatura."""
+        assert minhash.signature("Qual é a ÁREA do círculo?") == minhash.signature("qual e a area do circulo")
+
+    def test_near_duplicate_shares_a_band(self):
+        """✅ Pequena edição mantém similaridade alta e colide em alguma faixa LSH."""
+        first, second = minhash.signature(STATEMENT), minhash.signature(EDITED)
+
+        assert minhash.similarity(first, second) >= 0.6
+        assert set(minhash.band_keys(first)) & set(minhash.band_keys(second))
+
+    def test_unrelated_text_does_not_collide(self):
+        """✅ Textos diferentes têm similaridade baixa e nenhuma faixa em comum."""
+        first, second = minhash.signature(STATEMENT), minhash.signature(UNRELATED)
+
+        assert minhash.similarity(first, second) < 0.2
+        assert not set(minhash.band_keys(first)) & set(minhash.band_keys(second))
+
+    def test_default_threshold_is_within_lsh_recall(self):
+        """✅ Pares no limiar padrão colidem no LSH com probabilidade > 0,99."""
+        threshold = get_settings().question_similarity_threshold
+
+        assert minhash.collision_probability(threshold) > 0.99
+        assert minhash.collision_probability(0.8) == pytest.approx(0.947, abs=0.001)
+
+    def test_empty_text_has_no_signature(self):
+        """✅ Questão sem enunciado (só imagem) não tem assinatura."""
+        assert minhash.signature("  ?! ") is None
+
+    def test_pack_roundtrip(self):
+        """✅ Assinatura persistida em bytes (4 bytes por permutação)."""
+        signature = minhash.signature(STATEMENT)
+
+        assert len(minhash.pack(signature)) == 4 * minhash.NUM_PERM
+        assert minhash.unpack(minhash.pack(signature)) == signature
+
+    def test_question_record_carries_signature(self):
+        """✅ QuestionRecord grava assinatura e uma chave por faixa."""
+        [record] = QuestionRecord.from_analysis("a", "t@e.com", {"questions": [{"number": 1, "question": STATEMENT}]})
+
+        assert minhash.unpack(record.minhash) == minhash.signature(STATEMENT)
+        assert len(record.lsh_bands) == minhash.BANDS
+
+
+class TestQuestionSimilarityService:
+    """Testes para a pontuação das candidatas do índice LSH."""
+
+    @pytest.fixture
+    def persistence(self):
+        persistence = MagicMock()
+        persistence.get_question = AsyncMock(return_value=_question("a:0000", STATEMENT))
+        persistence.find_questions_by_lsh_bands = AsyncMock(return_value=[
+            {k: v for k, v in _question("c:0000", UNRELATED).items() if k != "lsh_bands"},
+            {k: v for k, v in _question("b:0003", EDITED).items() if k != "lsh_bands"},
+            {"_id": "d:0000", "statement": STATEMENT}
+        ])
+        return persistence
+
+    @pytest.fixture
+    def service(self, persistence):
+        settings = MagicMock(question_similarity_threshold=0.6, question_similarity_max_candidates=100)
+        with patch("app.services.core.question_similarity_service.get_settings", return_value=settings):
+            return QuestionSimilarityService(persistence)
+
+    @pytest.mark.asyncio
+    async def test_cluster_keeps_candidates_above_threshold(self, service, persistence):
+        """✅ Apenas candidatas acima do limiar, sem assinatura no resultado."""
+        cluster = await service.find_near_duplicates("a:0000")
+
+        assert [doc["_id"] for doc, _ in cluster.matches] == ["b:0003"]
+        assert cluster.matches[0][1] >= 0.6
+        assert cluster.candidates_examined == 3
+        assert "minhash" not in cluster.question and "minhash" not in cluster.matches[0][0]
+        bands, = persistence.find_questions_by_lsh_bands.call_args[0]
+        assert bands == minhash.band_keys(minhash.signature(STATEMENT))
+        assert persistence.find_questions_by_lsh_bands.call_args.kwargs == {"exclude_id": "a:0000", "limit": 100}
+
+    @pytest.mark.asyncio
+    async def test_threshold_override(self, service):
+        """✅ Limiar informado na consulta prevalece sobre a configuração."""
+        cluster = await service.find_near_duplicates("a:0000", threshold=1.0)
+
+        assert cluster.matches == []
+
+    @pytest.mark.asyncio
+    async def test_legacy_question_signature_from_statement(self, service, persistence):
+        """✅ Questão gravada sem assinatura: calculada a partir do enunciado."""
+        persistence.get_question = AsyncMock(return_value={"_id": "a:0000", "statement": STATEMENT})
+
+        cluster = await service.find_near_duplicates("a:0000")
+
+        assert [doc["_id"] for doc, _ in cluster.matches] == ["b:0003"]
+
+    @pytest.mark.asyncio
+    async def test_missing_question(self, service, persistence):
+        """❌ Questão inexistente retorna None."""
+        persistence.get_question = AsyncMock(return_value=None)
+
+        assert await service.find_near_duplicates("x:0000") is None
+        persistence.find_questions_by_lsh_bands.assert_not_called()
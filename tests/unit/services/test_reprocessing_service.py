@@ -0,0 +1,185 @@
+"""
+Testes unitários para o reprocessamento em lote de responses Azure
+
+Valida AnalysisReprocessingService com MongoDB mockado (execução in-process).
+"""
+import json
+from pathlib import Path
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.core.reprocessing_service import (
+    AnalysisReprocessingService,
+    carry_over_images,
+    summarize_diff,
+)
+
+
+FIXTURE = Path(__file__).parents[2] / "fixtures" / "responses" / "azure_response_3Tri_20250716_215103.json"
+
+
+class TestReprocessingHelpers:
+    """Testes para funções auxiliares de diff e imagens."""
+
+    def test_carry_over_images_by_block_id(self):
+        """✅ Reaproveita URLs de imagens de blocks com mesmo id."""
+        old = {"context_blocks": [
+            {"id": 1, "images": ["https://blob/1.jpg"], "contentType": "image/url", "hasImage": True},
+            {"id": 2, "sub_contexts": [{"sequence": "I", "images": ["https://blob/2.jpg"]}]},
+        ]}
+        new = {"context_blocks": [
+            {"id": 1, "images": [], "contentType": None, "hasImage": False},
+            {"id": 2, "images": [], "sub_contexts": [{"sequence": "I", "images": []}]},
+            {"id": 3, "images": []},
+        ]}
+
+        carried = carry_over_images(new, old)
+
+        assert carried == 1
+        assert new["context_blocks"][0]["images"] == ["https://blob/1.jpg"]
+        assert new["context_blocks"][0]["contentType"] == "image/url"
+        assert new["context_blocks"][1]["sub_contexts"][0]["images"] == ["https://blob/2.jpg"]
+        assert new["context_blocks"][2]["images"] == []
+
+    def test_summarize_diff_ignores_volatile_fields(self):
+        """✅ status/message/from_database não contam como alteração."""
+        old = {"questions": [1], "context_blocks": [], "header": {"a": 1}, "status": "success"}
+        new = {"questions": [1], "context_blocks": [], "header": {"a": 1}, "status": "already_processed"}
+
+        assert summarize_diff(old, new)["changed"] is False
+
+    def test_summarize_diff_counts_deltas(self):
+        """✅ Calcula deltas de questões e context blocks."""
+        old = {"questions": [1], "context_blocks": [1, 2], "header": {}}
+        new = {"questions": [1, 2, 3], "context_blocks": [1], "header": {"subject": "X"}}
+
+        diff = summarize_diff(old, new)
+
+        assert diff["changed"] is True
+        assert diff["header_changed"] is True
+        assert diff["questions_delta"] == 2
+        assert diff["context_blocks_delta"] == -1
+
+
+class TestAnalysisReprocessingService:
+    """Testes do fluxo de reprocessamento com checkpoint e bulk_write."""
+
+    @pytest.fixture
+    def azure_response(self):
+        return json.loads(FIXTURE.read_text(encoding="utf-8"))
+
+    @pytest.fixture
+    def collections(self, azure_response, async_cursor):
+        azure_responses = MagicMock()
+        azure_responses.find = MagicMock(return_value=async_cursor([
+            {"_id": "a1", "document_id": "doc-1", "user_email": "t@e.com",
+             "file_name": "prova.pdf", "azure_response": azure_response},
+            {"_id": "a2", "document_id": "doc-2", "user_email": "t@e.com",
+             "file_name": "orfao.pdf", "azure_response": azure_response},
+        ]))
+
+        analyze_documents = MagicMock()
+        analyze_documents.find = MagicMock(return_value=async_cursor([
+            {"_id": "analysis-1", "response": {"document_id": "doc-1", "questions": [], "context_blocks": []}},
+        ]))
+        analyze_documents.bulk_write = AsyncMock()
+
+        jobs = MagicMock()
+        jobs.find_one = AsyncMock(return_value=None)
+        jobs.update_one = AsyncMock()
+
+        questions = MagicMock()
+        questions.delete_many = AsyncMock()
+        questions.insert_many = AsyncMock()
+
+        return {
+            "azure_responses": azure_responses,
+            "analyze_documents": analyze_documents,
+            "reprocessing_jobs": jobs,
+            "questions": questions,
+        }
+
+    @pytest.fixture
+    def service(self, collections, mongo_connection):
+        return AnalysisReprocessingService(mongo_connection(collections), MagicMock())
+
+    @pytest.mark.asyncio
+    async def test_run_updates_changed_documents_and_checkpoints(self, service, collections):
+        """✅ Reprocessa, grava via bulk_write e salva checkpoint com o último _id."""
+        report = await service.run(job_id="job-1", batch_size=10, max_workers=0)
+
+        assert report.status == "completed"
+        assert report.scanned == 2
+        assert report.updated == 1
+        assert report.missing_analysis == 1
+        assert report.failed == 0
+        assert report.questions_delta > 0
+        assert report.last_azure_response_id == "a2"
+
+        operations = collections["analyze_documents"].bulk_write.call_args[0][0]
+        assert len(operations) == 1
+        assert operations[0]._filter == {"_id": "analysis-1"}
+        service._response_cache.invalidate.assert_called_once_with(["analysis-1", "doc-1"])
+        collections["questions"].delete_many.assert_awaited_once_with({"document_id": {"$in": ["analysis-1"]}})
+        question_docs = collections["questions"].insert_many.call_args[0][0]
+        assert len(question_docs) == report.questions_delta
+        assert question_docs[0]["_id"] == "analysis-1:0000"
+
+        last_checkpoint = collections["reprocessing_jobs"].update_one.call_args[0]
+        assert last_checkpoint[0] == {"_id": "job-1"}
+        assert last_checkpoint[1]["$set"]["last_azure_response_id"] == "a2"
+        assert last_checkpoint[1]["$set"]["status"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_run_resumes_after_checkpoint(self, service, collections, async_cursor):
+        """✅ Job existente retoma a partir do último _id processado."""
+        collections["reprocessing_jobs"].find_one = AsyncMock(return_value={
+            "_id": "job-1", "status": "interrupted", "last_azure_response_id": "a1", "scanned": 1
+        })
+        collections["azure_responses"].find = MagicMock(return_value=async_cursor([]))
+
+        report = await service.run(job_id="job-1", max_workers=0)
+
+        query = collections["azure_responses"].find.call_args[0][0]
+        assert query["_id"] == {"$gt": "a1"}
+        assert report.scanned == 1
+        assert report.status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_rewritten_ids_for_questions_and_cache(self, service, collections, async_cursor):
+        """✅ Questões trocadas pelos _id das análises; cache invalidado por _id e document_id."""
+        collections["analyze_documents"].find = MagicMock(return_value=async_cursor([
+            {"_id": f"analysis-{i}", "response": {"document_id": f"doc-{i}", "questions": [], "context_blocks": []}}
+            for i in (1, 2)
+        ]))
+
+        report = await service.run(job_id="job-4", batch_size=10, max_workers=0)
+
+        assert report.updated == 2
+        collections["questions"].delete_many.assert_awaited_once_with(
+            {"document_id": {"$in": ["analysis-1", "analysis-2"]}}
+        )
+        invalidated = service._response_cache.invalidate.call_args[0][0]
+        assert sorted(invalidated) == ["analysis-1", "analysis-2", "doc-1", "doc-2"]
+
+    @pytest.mark.asyncio
+    async def test_dry_run_does_not_write(self, service, collections):
+        """✅ dry_run calcula o diff sem bulk_write."""
+        report = await service.run(job_id="job-2", max_workers=0, dry_run=True)
+
+        assert report.updated == 1
+        collections["analyze_documents"].bulk_write.assert_not_called()
+        collections["questions"].delete_many.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_payload_load_failure_is_reported_per_record(self, service, azure_response):
+        """❌ Payload do GridFS ilegível vira erro do registro sem interromper o lote."""
+        service._payload_store.resolve = AsyncMock(side_effect=[Exception("NoFile"), azure_response])
+
+        report = await service.run(job_id="job-3", max_workers=0)
+
+        assert report.status == "completed"
+        assert report.failed == 1
+        assert report.missing_analysis == 1
+        assert report.errors[0]["azure_response_id"] == "a1"
@@ -0,0 +1,143 @@
+"""
+Testes unitários para o RequestProfiler (perfil sob demanda de requisições)
+"""
+import asyncio
+import os
+import pstats
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.controllers.analyze import _profile_trigger
+from app.services.core.request_profiler import RequestProfiler, should_sample
+
+
+@pytest.fixture
+def make_profiler(tmp_path):
+    def _make(mode="sampling", max_artifacts=10):
+        settings = MagicMock(
+            profiling_dir=str(tmp_path / "profiles"),
+            profiling_mode=mode,
+            profiling_interval_ms=1,
+            profiling_max_artifacts=max_artifacts
+        )
+        with patch("app.services.core.request_profiler.get_settings", return_value=settings):
+            return RequestProfiler()
+    return _make
+
+
+def _busy_parser(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+class TestRequestProfiler:
+    """Testes para captura, gravação, listagem e retenção dos perfis."""
+
+    @pytest.mark.asyncio
+    async def test_sampling_profile_captures_hot_function(self, make_profiler):
+        """✅ Pilhas "folded" gravadas pelo request id, com a função quente no resumo."""
+        profiler = make_profiler()
+
+        async with profiler.profile("req-1", "header", context={"filename": "prova.pdf"}) as active:
+            _busy_parser(0.1)
+
+        assert active is True
+        path, mode = profiler.get_artifact_path("req-1")
+        assert mode == "sampling"
+        with open(path) as handle:
+            lines = handle.read().splitlines()
+        assert any("_busy_parser" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+        summary = profiler.list_profiles()[0]
+        assert summary["request_id"] == "req-1"
+        assert summary["trigger"] == "header"
+        assert summary["context"] == {"filename": "prova.pdf"}
+        assert summary["samples"] > 0
+        assert any("_busy_parser" in row["function"] for row in summary["top_functions"])
+
+    @pytest.mark.asyncio
+    async def test_cprofile_mode_writes_pstats(self, make_profiler):
+        """✅ Modo cprofile grava arquivo legível pelo pstats."""
+        profiler = make_profiler(mode="cprofile")
+
+        async with profiler.profile("req-2", "sampled"):
+            _busy_parser(0.01)
+
+        path, mode = profiler.get_artifact_path("req-2")
+        assert mode == "cprofile"
+        functions = {name for _, _, name in pstats.Stats(path).stats}
+        assert "_busy_parser" in functions
+
+    @pytest.mark.asyncio
+    async def test_only_one_request_profiled_at_a_time(self, make_profiler):
+        """✅ Requisição simultânea segue sem perfil."""
+        profiler = make_profiler()
+
+        async with profiler.profile("req-a", "header") as first:
+            async with profiler.profile("req-b", "header") as second:
+                await asyncio.sleep(0)
+
+        assert (first, second) == (True, False)
+        assert profiler.get_artifact_path("req-b") is None
+
+    @pytest.mark.asyncio
+    async def test_keeps_only_most_recent_artifacts(self, make_profiler):
+        """✅ Acima de PROFILING_MAX_ARTIFACTS os perfis mais antigos são removidos."""
+        profiler = make_profiler(max_artifacts=2)
+
+        for index in range(3):
+            async with profiler.profile(f"req-{index}", "sampled"):
+                pass
+            os.utime(os.path.join(profiler._directory, f"req-{index}.json"), (index, index))
+
+        assert [item["request_id"] for item in profiler.list_profiles()] == ["req-2", "req-1"]
+        assert profiler.get_artifact_path("req-0") is None
+
+    def test_rejects_unsafe_request_ids(self, make_profiler):
+        """❌ Request id com caminho não é resolvido para arquivo."""
+        assert make_profiler().get_artifact_path("../../etc/passwd") is None
+
+    def test_sample_rate_bounds(self):
+        """✅ Taxa 0 nunca sorteia, taxa 1 sempre sorteia."""
+        assert should_sample(0) is False
+        assert should_sample(1.0) is True
+
+
+class TestProfileTrigger:
+    """Testes para a decisão de perfilar POST /analyze/analyze_document."""
+
+    def _request(self, headers=None, query=None, admin_key=None):
+        request = MagicMock()
+        headers = dict(headers or {})
+        if admin_key:
+            headers["X-Admin-Key"] = admin_key
+        request.headers = headers
+        request.query_params = query or {}
+        return request
+
+    def test_header_with_admin_key(self):
+        """✅ X-Profile com a chave administrativa válida."""
+        with patch("app.api.controllers.admin.get_settings", return_value=MagicMock(admin_api_key="segredo")):
+            assert _profile_trigger(self._request({"X-Profile": "true"}, admin_key="segredo")) == "header"
+
+    def test_query_flag_without_admin_key_is_forbidden(self):
+        """❌ ?profile=true sem a chave administrativa retorna 403."""
+        with patch("app.api.controllers.admin.get_settings", return_value=MagicMock(admin_api_key="segredo")):
+            with pytest.raises(HTTPException) as exc_info:
+                _profile_trigger(self._request(query={"profile": "1"}))
+
+        assert exc_info.value.status_code == 403
+
+    def test_sampled_by_rate(self):
+        """✅ Sem pedido explícito, decide pela PROFILING_SAMPLE_RATE."""
+        with patch("app.api.controllers.analyze.get_settings", return_value=MagicMock(profiling_sample_rate=1.0)):
+            assert _profile_trigger(self._request()) == "sampled"
+        with patch("app.api.controllers.analyze.get_settings", return_value=MagicMock(profiling_sample_rate=0)):
+            assert _profile_trigger(self._request()) is None
@@ -0,0 +1,135 @@
+"""
+Testes unitários para coalescência de requisições concorrentes
+
+Valida SingleFlight e DuplicateCheckService.run_single_flight.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.document_buffer import DocumentBuffer
+from app.core.single_flight import SingleFlight
+from app.services.core.duplicate_check_service import DuplicateCheckService
+
+
+class TestSingleFlight:
+    """Testes para SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_single_execution(self):
+        """✅ Chamadas simultâneas com a mesma chave executam uma única vez."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "resultado"
+
+        tasks = [asyncio.create_task(flight.do("k", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert flight.in_flight("k")
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert [r[0] for r in results] == ["resultado"] * 3
+        assert sorted(r[1] for r in results) == [False, True, True]
+        assert not flight.in_flight("k")
+
+    @pytest.mark.asyncio
+    async def test_exception_is_propagated_to_followers(self):
+        """✅ Falha do líder é repassada a quem aguardava; próxima chamada executa de novo."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise ValueError("falhou")
+
+        tasks = [asyncio.create_task(flight.do("k", failing)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+        async def ok():
+            return 1
+
+        assert await flight.do("k", ok) == (1, False)
+
+    @pytest.mark.asyncio
+    async def test_follower_takes_over_when_leader_is_cancelled(self):
+        """✅ Cancelamento do líder não cancela o seguidor, que assume a execução."""
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def fast():
+            return "seguidor"
+
+        leader = asyncio.create_task(flight.do("k", slow))
+        await started.wait()
+        follower = asyncio.create_task(flight.do("k", fast))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == ("seguidor", False)
+
+
+class TestDuplicateCheckSingleFlight:
+    """Coalescência por (email, SHA-256) no DuplicateCheckService."""
+
+    @pytest.mark.asyncio
+    async def test_same_content_from_same_user_is_coalesced(self):
+        """✅ Duplo clique: mesmo conteúdo, mesma análise."""
+        service = DuplicateCheckService(AsyncMock())
+        release = asyncio.Event()
+        calls = 0
+
+        async def analyze():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"document_id": "doc-1"}
+
+        first = DocumentBuffer.from_bytes(b"%PDF-conteudo", filename="prova.pdf")
+        renamed = DocumentBuffer.from_bytes(b"%PDF-conteudo", filename="prova (1).pdf")
+
+        tasks = [
+            asyncio.create_task(service.run_single_flight("t@e.com", first, analyze)),
+            asyncio.create_task(service.run_single_flight("t@e.com", renamed, analyze)),
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert results[0] is results[1]
+
+    @pytest.mark.asyncio
+    async def test_different_users_are_not_coalesced(self):
+        """✅ Chave inclui o email (análises de usuários distintos são independentes)."""
+        service = DuplicateCheckService(AsyncMock())
+        document = DocumentBuffer.from_bytes(b"%PDF-conteudo", filename="prova.pdf")
+        calls = 0
+
+        async def analyze():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            return calls
+
+        await asyncio.gather(
+            service.run_single_flight("a@e.com", document, analyze),
+            service.run_single_flight("b@e.com", document, analyze),
+        )
+
+        assert calls == 2
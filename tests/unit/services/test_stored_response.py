@@ -0,0 +1,141 @@
+"""
+Testes unitários para o response pré-serializado das análises concluídas
+
+Valida a codificação canônica (com e sem gzip), a equivalência dos bytes com a
+serialização via DTO e o caminho de duplicata sem reconstrução do DTO.
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.dtos.responses.analyze_document_response_dto import AnalyzeDocumentResponseDTO
+from app.dtos.responses.document_response_dto import DocumentResponseDTO
+from app.models.persistence import AnalyzeDocumentRecord, DocumentStatus, StoredResponseJSON
+from app.services.core.duplicate_check_service import DuplicateCheckService
+
+
+def _response(questions=2):
+    return DocumentResponseDTO(
+        email="t@e.com",
+        document_id="doc-1",
+        filename="prova.pdf",
+        header={"subject": "Matemática", "school": "Escola Ação"},
+        questions=[
+            {"number": i, "question": f"Questão {i} – ç", "alternatives": [{"letter": "A", "text": "sim"}]}
+            for i in range(1, questions + 1)
+        ],
+        context_blocks=[]
+    ).dict()
+
+
+def _record(response):
+    return AnalyzeDocumentRecord.create_from_request(
+        user_email="t@e.com",
+        file_name="prova.pdf",
+        file_size=100,
+        response=response,
+        status=DocumentStatus.COMPLETED,
+        file_hash="abc",
+        document_id="doc-1"
+    )
+
+
+class TestStoredResponseJSON:
+    """Testes para codificação e renderização."""
+
+    def test_completed_record_stores_canonical_bytes(self):
+        """✅ Registro concluído guarda o JSON compacto sem os campos voláteis."""
+        record = _record(_response())
+
+        canonical = json.loads(record.response_json.canonical())
+
+        assert record.response_json.encoding == "identity"
+        assert "status" not in canonical and "from_database" not in canonical
+        assert canonical["header"]["school"] == "Escola Ação"
+
+    def test_large_response_is_gzipped(self):
+        """✅ Acima do limite o JSON é comprimido e descomprimido na leitura."""
+        with patch("app.models.persistence.stored_response.get_settings",
+                   return_value=MagicMock(response_json_compress_threshold_bytes=100)):
+            stored = StoredResponseJSON.encode(_response(questions=50))
+
+        assert stored.encoding == "gzip"
+        assert len(stored.data) < stored.raw_bytes
+        assert len(stored.canonical()) == stored.raw_bytes
+
+    def test_render_matches_dto_serialization(self):
+        """✅ Bytes renderizados equivalem ao DTO com os campos da requisição."""
+        response = _response()
+        stored = StoredResponseJSON.encode(response)
+
+        rendered = stored.render(status="already_processed", message="msg", from_database=True)
+
+        expected = DocumentResponseDTO(**{
+            **response, "status": "already_processed", "message": "msg", "from_database": True
+        })
+        assert json.loads(rendered) == json.loads(expected.json())
+        assert list(json.loads(rendered)) == list(json.loads(expected.json()))
+
+    def test_round_trips_through_json_journal(self):
+        """✅ Registro serializado em JSON (journal write-behind) mantém os bytes."""
+        record = _record(_response())
+
+        restored = AnalyzeDocumentRecord.parse_raw(record.json(by_alias=True))
+
+        assert restored.response_json == record.response_json
+
+    def test_failed_record_has_no_stored_bytes(self):
+        """❌ Registros não concluídos não guardam response serializado."""
+        record = AnalyzeDocumentRecord.create_from_request(
+            user_email="t@e.com", file_name="prova.pdf", file_size=1,
+            response={"error": "boom"}, status=DocumentStatus.FAILED
+        )
+
+        assert record.response_json is None
+
+
+class TestAnalyzeDocumentJsonBytes:
+    """Testes para a montagem do JSON de GET /analyze_document/{id}."""
+
+    def test_stored_bytes_equal_dto_path(self):
+        """✅ Montagem a partir dos bytes equivale à serialização via DTO."""
+        record = _record(_response())
+
+        fast = AnalyzeDocumentResponseDTO.json_bytes_from_record(record)
+        slow = AnalyzeDocumentResponseDTO.from_analyze_document_record(record).json(by_alias=True)
+
+        assert json.loads(fast) == json.loads(slow)
+        assert list(json.loads(fast)) == list(json.loads(slow))
+
+    def test_legacy_record_uses_dto(self):
+        """✅ Registros sem response_json continuam serializados via DTO."""
+        record = _record(_response())
+        record.response_json = None
+
+        body = AnalyzeDocumentResponseDTO.json_bytes_from_record(record)
+
+        assert json.loads(body)["response"]["document_id"] == "doc-1"
+
+
+class TestDuplicateFastPath:
+    """Testes para o retorno de duplicatas a partir dos bytes armazenados."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_returns_stored_bytes_without_dto(self):
+        """✅ Duplicata concluída devolve os bytes com os metadados de duplicata."""
+        persistence = MagicMock()
+        persistence.check_duplicate_document = AsyncMock(return_value=_record(_response()))
+        service = DuplicateCheckService(persistence)
+
+        document = MagicMock(filename="prova.pdf", size=4, sha256="abc")
+
+        with patch("app.services.core.duplicate_check_service.DocumentResponseDTO") as dto:
+            result = await service.check_and_handle_duplicate("t@e.com", document)
+
+        dto.assert_not_called()
+        assert result.existing_response is None
+        body = json.loads(result.existing_response_json)
+        assert body["status"] == "already_processed"
+        assert body["from_database"] is True
+        assert body["document_id"] == "doc-1"
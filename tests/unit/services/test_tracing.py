@@ -0,0 +1,147 @@
+"""
+Testes unitários do tracing (app.core.tracing, listener MongoDB e middleware)
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.core import tracing
+from app.core.context import clear_context, set_current_request_id
+from app.core.middleware import RequestContextMiddleware
+from app.services.infrastructure.mongodb_tracing_listener import MongoDBTracingListener
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Tracer do módulo ligado a um provider em memória (sem alterar o provider global)."""
+    memory = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(tracing.RequestIdSpanProcessor())
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    monkeypatch.setattr(tracing, "_tracer", provider.get_tracer("test"))
+    yield memory
+    clear_context()
+
+
+def _command_event(name="find", **extra):
+    return SimpleNamespace(
+        command_name=name, database_name="smartquest", command={name: "questions"},
+        request_id=1, connection_id=("localhost", 27017), **extra
+    )
+
+
+class TestTracing:
+    """Testes para spans, request id e exportador JSON."""
+
+    def test_spans_nest_and_carry_request_id(self, exporter):
+        """✅ Span filho no mesmo trace, com request.id e sem atributos nulos."""
+        set_current_request_id("req-1")
+
+        with tracing.start_span("analysis.header_parsing"):
+            with tracing.start_span("azure.analyze_document", operation="layout", model_id=None):
+                pass
+
+        child, parent = exporter.get_finished_spans()
+        assert child.parent.span_id == parent.context.span_id
+        assert child.context.trace_id == parent.context.trace_id
+        assert child.attributes["request.id"] == "req-1"
+        assert child.attributes["operation"] == "layout"
+        assert "model_id" not in child.attributes
+
+    def test_exceptions_mark_span_as_error(self, exporter):
+        """❌ Exceção propagada e registrada no span."""
+        with pytest.raises(ValueError):
+            with tracing.start_span("blob.put"):
+                raise ValueError("falhou")
+
+        span = exporter.get_finished_spans()[0]
+        assert span.status.status_code.name == "ERROR"
+
+    def test_json_file_exporter_writes_one_span_per_line(self, exporter, tmp_path):
+        """✅ JSON Lines com ids em hex e referência ao span pai."""
+        with tracing.start_span("parent"):
+            with tracing.start_span("child"):
+                pass
+        path = tmp_path / "traces" / "spans.jsonl"
+
+        tracing.JsonFileSpanExporter(str(path)).export(exporter.get_finished_spans())
+
+        child, parent = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(parent["trace_id"]) == 32 and len(parent["span_id"]) == 16
+        assert child["parent_span_id"] == parent["span_id"]
+        assert parent["parent_span_id"] is None
+        assert child["duration_ms"] >= 0
+
+    def test_configure_tracing_disabled_is_noop(self):
+        """✅ Com TRACING_ENABLED=false nenhum provider é instalado."""
+        assert tracing.configure_tracing(SimpleNamespace(tracing_enabled=False)) is False
+
+
+class TestMongoDBTracingListener:
+    """Testes para os spans dos comandos MongoDB."""
+
+    def test_command_span_with_db_attributes(self, exporter):
+        """✅ started/succeeded geram um span CLIENT com coleção e operação."""
+        listener = MongoDBTracingListener()
+
+        listener.started(_command_event())
+        listener.succeeded(_command_event())
+
+        span = exporter.get_finished_spans()[0]
+        assert span.name == "mongodb.find"
+        assert span.attributes["db.mongodb.collection"] == "questions"
+        assert span.attributes["db.operation"] == "find"
+
+    def test_failed_command_sets_error_status(self, exporter):
+        """❌ Comando com falha encerra o span com status de erro."""
+        listener = MongoDBTracingListener()
+
+        listener.started(_command_event("insert"))
+        listener.failed(_command_event("insert", failure={"errmsg": "duplicate key"}))
+
+        span = exporter.get_finished_spans()[0]
+        assert span.status.status_code.name == "ERROR"
+        assert span.status.description == "duplicate key"
+
+
+class TestRequestContextTracing:
+    """Testes para o span raiz da requisição."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.add_middleware(RequestContextMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def read_item(item_id: str):
+            with tracing.start_span("work"):
+                return {"id": item_id}
+
+        return TestClient(app)
+
+    def test_root_span_named_by_route_with_request_id(self, exporter, client):
+        """✅ Span raiz pelo template da rota; X-Request-ID do chamador é reaproveitado."""
+        response = client.get("/items/7", headers={"X-Request-ID": "abc-123"})
+
+        assert response.headers["X-Request-ID"] == "abc-123"
+        work, root = exporter.get_finished_spans()
+        assert root.name == "GET /items/{item_id}"
+        assert root.attributes["http.status_code"] == 200
+        assert work.parent.span_id == root.context.span_id
+        assert work.attributes["request.id"] == "abc-123"
+
+    def test_continues_incoming_traceparent(self, exporter, client):
+        """✅ traceparent W3C recebido vira o pai do span raiz."""
+        traceparent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+        response = client.get("/items/1", headers={"traceparent": traceparent})
+
+        root = exporter.get_finished_spans()[-1]
+        assert format(root.context.trace_id, "032x") == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert response.headers["X-Request-ID"]
@@ -0,0 +1,268 @@
+"""
+Testes unitários para a fila write-behind de persistência
+
+Valida journal em disco, gravação em lote com retry, backpressure, drenagem no
+shutdown e a integração com MongoDBPersistenceService.
+"""
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo.errors import AutoReconnect, BulkWriteError, DocumentTooLarge
+
+from app.models.persistence import AnalyzeDocumentRecord, AzureResponseRecord, DocumentStatus
+from app.services.persistence.write_behind_queue import (
+    DEAD_LETTER_DIR,
+    WriteBehindQueue,
+    fcntl,
+    is_retryable_write_error,
+)
+
+
+def _analysis(document_id="doc-1", email="t@e.com", file_hash="abc"):
+    return AnalyzeDocumentRecord.create_from_request(
+        user_email=email,
+        file_name="prova.pdf",
+        file_size=100,
+        response={"document_id": document_id, "questions": []},
+        status=DocumentStatus.COMPLETED,
+        file_hash=file_hash,
+        document_id=document_id
+    )
+
+
+def _queue(tmp_path, flush, **kwargs):
+    kwargs.setdefault("flush_interval_seconds", 0.01)
+    return WriteBehindQueue(
+        flush=flush,
+        record_types=(AnalyzeDocumentRecord, AzureResponseRecord),
+        journal_dir=str(tmp_path),
+        **kwargs
+    )
+
+
+async def _wait_until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class TestWriteBehindQueue:
+    """Testes para journal, lote e ciclo de vida."""
+
+    @pytest.mark.asyncio
+    async def test_put_journals_then_flushes_in_background(self, tmp_path):
+        """✅ put retorna o _id, o registro fica no journal até a gravação em lote."""
+        flushed = []
+        queue = _queue(tmp_path, AsyncMock(side_effect=lambda batch: flushed.extend(batch)))
+        await queue.start()
+
+        record_id = await queue.put(_analysis())
+
+        assert record_id == "doc-1"
+        await _wait_until(lambda: len(queue) == 0)
+        assert [p.record.id for p in flushed] == ["doc-1"]
+        assert list(tmp_path.rglob("*.json")) == []
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried_and_record_stays_readable(self, tmp_path):
+        """✅ Falha do MongoDB não perde o registro: continua legível e é regravado."""
+        flush = AsyncMock(side_effect=[AutoReconnect("mongo down"), None])
+        queue = _queue(tmp_path, flush)
+        await queue.start()
+
+        await queue.put(_analysis())
+        await _wait_until(lambda: flush.await_count >= 1)
+        assert queue.get("doc-1") is not None
+
+        await _wait_until(lambda: len(queue) == 0)
+        assert flush.await_count == 2
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_timeout_keeps_journal_for_next_start(self, tmp_path):
+        """✅ O que não for gravado no shutdown é recuperado do journal no próximo start."""
+        blocked = _queue(tmp_path, AsyncMock(side_effect=AutoReconnect("mongo down")))
+        await blocked.start()
+        await blocked.put(_analysis("doc-1"))
+        await blocked.put(_analysis("doc-2"))
+
+        assert await blocked.stop(timeout=0.05) == 2
+        assert len(list(tmp_path.glob("worker-*/*.json"))) == 2
+
+        flushed = []
+        recovered = _queue(tmp_path, AsyncMock(side_effect=lambda batch: flushed.extend(batch)))
+        assert await recovered.start() == 2
+        await _wait_until(lambda: len(recovered) == 0)
+
+        assert [p.record.id for p in flushed] == ["doc-1", "doc-2"]
+        assert all(p.replayed for p in flushed)
+        assert flushed[0].record.status == DocumentStatus.COMPLETED
+        await recovered.stop()
+
+    @pytest.mark.skipif(fcntl is None, reason="fcntl indisponível")
+    @pytest.mark.asyncio
+    async def test_live_worker_journal_is_not_replayed_by_siblings(self, tmp_path):
+        """✅ Vários workers: journal de worker vivo não é regravado; o de worker encerrado é adotado."""
+        owner = _queue(tmp_path, AsyncMock(side_effect=AutoReconnect("mongo down")))
+        await owner.start()
+        await owner.put(_analysis("doc-1"))
+
+        sibling = _queue(tmp_path, AsyncMock())
+        assert await sibling.start() == 0
+        assert owner.get("doc-1") is not None
+        await sibling.stop()
+
+        assert await owner.stop(timeout=0.05) == 1
+        [owner_dir] = {path.parent for path in tmp_path.glob("worker-*/*.json")}
+        owner_dir.rename(tmp_path / "worker-encerrado-1")  # Worker de outro host/pid
+        flushed = []
+        successor = _queue(tmp_path, AsyncMock(side_effect=lambda batch: flushed.extend(batch)))
+        assert await successor.start() == 1
+        await _wait_until(lambda: len(successor) == 0)
+
+        assert [p.record.id for p in flushed] == ["doc-1"]
+        await successor.stop()
+        assert list(tmp_path.rglob("*.json")) == []
+
+    @pytest.mark.asyncio
+    async def test_put_waits_when_pending_bytes_exceed_limit(self, tmp_path):
+        """✅ Backpressure: acima de max_pending_bytes o put aguarda a gravação."""
+        release = asyncio.Event()
+
+        async def slow_flush(batch):
+            await release.wait()
+
+        queue = _queue(tmp_path, slow_flush, max_pending_bytes=1)
+        await queue.start()
+        await queue.put(_analysis("doc-1"))
+
+        second = asyncio.create_task(queue.put(_analysis("doc-2")))
+        await asyncio.sleep(0.05)
+        assert not second.done()
+
+        release.set()
+        assert await asyncio.wait_for(second, timeout=1) == "doc-2"
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_put_serializes_off_event_loop(self, tmp_path):
+        """✅ Serialização do registro roda na thread do fsync, fora do event loop."""
+        threads = []
+        original_json = AnalyzeDocumentRecord.json
+
+        def tracking_json(record, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return original_json(record, *args, **kwargs)
+
+        queue = _queue(tmp_path, AsyncMock())
+        await queue.start()
+        with patch.object(AnalyzeDocumentRecord, "json", tracking_json):
+            await queue.put(_analysis())
+
+        assert threads and threading.get_ident() not in threads
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_unwritable_record_is_dead_lettered_without_blocking_batch(self, tmp_path):
+        """✅ Erro não transitório: lote gravado um a um, o registro que falha vai ao dead letter."""
+        flushed = []
+
+        async def flush(batch):
+            if any(p.record.id == "doc-2" for p in batch):
+                raise DocumentTooLarge("BSON document too large")
+            flushed.extend(p.record.id for p in batch)
+
+        queue = _queue(tmp_path, flush, batch_size=3)
+        await queue.start()
+        for document_id in ("doc-1", "doc-2", "doc-3"):
+            await queue.put(_analysis(document_id))
+
+        await _wait_until(lambda: len(queue) == 0)
+
+        assert flushed == ["doc-1", "doc-3"]
+        assert queue.get("doc-2") is None
+        [dead] = (tmp_path / DEAD_LETTER_DIR).glob("*.json")
+        assert "doc-2" in dead.name
+        assert await queue.put(_analysis("doc-4")) == "doc-4"
+        await queue.stop()
+
+    def test_retryable_error_classification(self):
+        """✅ Rede, timeout e chave duplicada são repetidos; documento grande e erros de escrita não."""
+        assert is_retryable_write_error(AutoReconnect("primary stepped down"))
+        assert is_retryable_write_error(ConnectionError("MongoDB is unavailable"))
+        assert is_retryable_write_error(BulkWriteError({"writeErrors": [], "writeConcernErrors": [{"code": 64}]}))
+        assert not is_retryable_write_error(DocumentTooLarge("BSON document too large"))
+        assert not is_retryable_write_error(BulkWriteError({"writeErrors": [{"code": 10334, "index": 0}]}))
+        assert not is_retryable_write_error(ValueError("invalid document"))
+
+    @pytest.mark.asyncio
+    async def test_put_requires_running_queue(self, tmp_path):
+        """❌ Fila não iniciada rejeita put."""
+        with pytest.raises(RuntimeError):
+            await _queue(tmp_path, AsyncMock()).put(_analysis())
+
+
+class TestPersistenceWriteBehind:
+    """Integração com MongoDBPersistenceService."""
+
+    @pytest.fixture
+    def collections(self):
+        return {"analyze_documents": MagicMock(), "azure_responses": MagicMock()}
+
+    @pytest.fixture
+    def persistence_service(self, collections, tmp_path, persistence_service_for):
+        settings = MagicMock(
+            write_behind_enabled=True,
+            write_behind_journal_dir=str(tmp_path),
+            write_behind_batch_size=10,
+            write_behind_flush_interval_ms=10,
+            write_behind_max_pending_bytes=1024 * 1024,
+            write_behind_shutdown_timeout_seconds=1,
+            azure_response_compression_level=6
+        )
+        with patch("app.services.persistence.mongodb_persistence_service.get_settings", return_value=settings):
+            return persistence_service_for(collections)
+
+    @pytest.mark.asyncio
+    async def test_enqueue_without_running_queue_saves_directly(self, persistence_service, collections):
+        """✅ Fila desabilitada/parada: grava diretamente no MongoDB."""
+        collections["analyze_documents"].insert_one = AsyncMock(return_value=MagicMock(inserted_id="doc-1"))
+
+        assert await persistence_service.enqueue_write(_analysis()) == "doc-1"
+        collections["analyze_documents"].insert_one.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_pending_record_is_visible_to_reads(self, persistence_service, collections):
+        """✅ Registro pendente é encontrado por id e pela verificação de duplicatas."""
+        collections["analyze_documents"].insert_many = AsyncMock(side_effect=AutoReconnect("mongo down"))
+        await persistence_service.start_write_behind()
+
+        await persistence_service.enqueue_write(_analysis())
+
+        found = await persistence_service.get_by_document_id("doc-1")
+        duplicate = await persistence_service.check_duplicate_document("t@e.com", "outro.pdf", 1, file_hash="abc")
+        assert found.id == "doc-1"
+        assert duplicate.id == "doc-1"
+        await persistence_service.stop_write_behind()
+
+    @pytest.mark.asyncio
+    async def test_flush_uses_insert_many_and_ignores_duplicate_keys(self, persistence_service, collections):
+        """✅ Lote gravado via insert_many; chave duplicada (regravação) não é erro."""
+        collections["analyze_documents"].insert_many = AsyncMock(side_effect=BulkWriteError({
+            "writeErrors": [{"code": 11000, "index": 0}]
+        }))
+        await persistence_service.start_write_behind()
+
+        await persistence_service.enqueue_write(_analysis("doc-1"))
+        await persistence_service.enqueue_write(_analysis("doc-2"))
+        await persistence_service.stop_write_behind()
+
+        calls = collections["analyze_documents"].insert_many.call_args_list
+        assert [d["_id"] for call in calls for d in call[0][0]] == ["doc-1", "doc-2"]
+        assert collections["analyze_documents"].insert_many.call_args.kwargs["ordered"] is False
+        assert persistence_service._write_behind.pending() == []
@@ -55,7 +55,7 @@ class TestStructuredLogger:
         
         mock_info.assert_called_once()
         call_args = mock_info.call_args[0][0]
-        log_data = json.loads(call_args)
+        log_data = json.loads(str(call_args))
         
         assert log_data["level"] == "INFO"
         assert log_data["message"] == "Test info"
@@ -71,7 +71,7 @@ class TestStructuredLogger:
         
         mock_error.assert_called_once()
         call_args = mock_error.call_args[0][0]
-        log_data = json.loads(call_args)
+        log_data = json.loads(str(call_args))
         
         assert log_data["level"] == "ERROR"
         assert log_data["message"] == "Processing failed"
@@ -86,7 +86,7 @@ class TestStructuredLogger:
         
         mock_warning.assert_called_once()
         call_args = mock_warning.call_args[0][0]
-        log_data = json.loads(call_args)
+        log_data = json.loads(str(call_args))
         
         assert log_data["level"] == "WARNING"
         assert log_data["context"]["user_id"] == "123"
@@ -105,7 +105,7 @@ class TestStructuredLogger:
         
         mock_info.assert_called_once()
         call_args = mock_info.call_args[0][0]
-        log_data = json.loads(call_args)
+        log_data = json.loads(str(call_args))
         
         assert log_data["message"] == "Request started"
         assert log_data["context"]["method"] == "POST"
@@ -123,7 +123,7 @@ class TestStructuredLogger:
         
         mock_info.assert_called_once()
         call_args = mock_info.call_args[0][0]
-        log_data = json.loads(call_args)
+        log_data = json.loads(str(call_args))
         
         assert log_data["message"] == "Request completed successfully"
         assert log_data["context"]["status_code"] == 200
@@ -140,11 +140,118 @@ class TestStructuredLogger:
         
         mock_error.assert_called_once()
         call_args = mock_error.call_args[0][0]
-        log_data = json.loads(call_args)
+        log_data = json.loads(str(call_args))
         
         assert log_data["message"] == "Request completed with error"
         assert log_data["context"]["status_code"] == 500
 
+    def test_disabled_level_skips_rendering(self, logger):
+        """Nível desabilitado: a entrada nem é montada"""
+        with patch('app.core.logging.StructuredLogEntry') as mock_entry:
+            logger.debug("Debug message", {"blocks": list(range(1000))})
+        
+        mock_entry.assert_not_called()
+    
+    def test_non_serializable_context_single_pass(self, logger):
+        """Valores não serializáveis viram str na mesma passada do JSON"""
+        with patch('logging.Logger.info') as mock_info:
+            logger.info("Custom value", {"value": {1, 2}, "nested": {"when": object}})
+        
+        log_data = json.loads(str(mock_info.call_args[0][0]))
+        assert log_data["context"]["value"] == "{1, 2}"
+        assert log_data["context"]["nested"]["when"] == str(object)
+
+
+class TestAsyncLoggingPipeline:
+    """Testes para a fila de logging e a amostragem por tipo de evento"""
+    
+    @staticmethod
+    def _settings(async_enabled=True, queue_size=100, sample_rates=""):
+        return Mock(log_async_enabled=async_enabled, log_queue_size=queue_size, log_sample_rates=sample_rates)
+    
+    @pytest.fixture
+    def captured(self):
+        """Handler de captura no logger 'smartquest' (restaurado ao final)"""
+        from app.core.logging import shutdown_logging
+        
+        target = logging.getLogger("smartquest")
+        original = list(target.handlers)
+        handler = _CaptureHandler()
+        target.handlers = [handler]
+        yield handler
+        shutdown_logging()
+        target.handlers = original
+    
+    def test_records_rendered_on_listener_thread(self, captured):
+        """Request só enfileira; o JSON é renderizado pela thread do listener"""
+        import threading
+        from app.core.logging import configure_logging, shutdown_logging
+        
+        configure_logging(self._settings())
+        assert captured not in logging.getLogger("smartquest").handlers
+        
+        structured_logger.info("Phase completed", {"phase": "figures"})
+        shutdown_logging()
+        
+        [(message, thread_id)] = captured.messages
+        assert json.loads(message)["context"] == {"phase": "figures"}
+        assert thread_id != threading.get_ident()
+        assert logging.getLogger("smartquest").handlers == [captured]
+    
+    def test_full_queue_drops_without_blocking(self):
+        """Fila cheia descarta o record em vez de bloquear"""
+        import queue
+        from app.core.logging import LazyQueueHandler
+        from app.core.metrics import LOG_RECORDS_DROPPED
+        
+        handler = LazyQueueHandler(queue.Queue(maxsize=1))
+        dropped = LOG_RECORDS_DROPPED.labels(reason="queue_full")
+        before = dropped._value.get()
+        
+        for i in range(3):
+            handler.handle(logging.LogRecord("smartquest", logging.INFO, __file__, 1, f"m{i}", None, None))
+        
+        assert handler.queue.qsize() == 1
+        assert dropped._value.get() == before + 2
+    
+    def test_sampling_by_event_type(self, captured):
+        """Amostragem por tipo de evento; WARNING e eventos não configurados passam"""
+        from app.core.logging import configure_logging, shutdown_logging
+        
+        configure_logging(self._settings(async_enabled=False, sample_rates="Block parsed=0, azure_data_saved=0"))
+        
+        for _ in range(5):
+            structured_logger.info("Block parsed", {"block": 1})
+            logging.getLogger("smartquest").info({"event": "azure_data_saved"})
+        structured_logger.warning("Block parsed", {"block": 2})
+        structured_logger.info("Document analysis completed successfully")
+        shutdown_logging()
+        
+        messages = [message for message, _ in captured.messages]
+        assert len(messages) == 2
+        assert json.loads(messages[0])["level"] == "WARNING"
+        assert json.loads(messages[1])["message"] == "Document analysis completed successfully"
+    
+    def test_parse_sample_rates(self):
+        """Formato de LOG_SAMPLE_RATES"""
+        from app.core.logging import parse_sample_rates
+        
+        assert parse_sample_rates("") == {}
+        assert parse_sample_rates("Phase 2.1: done=0.1, event_x=2") == {"Phase 2.1: done": 0.1, "event_x": 1.0}
+
+
+class _CaptureHandler(logging.Handler):
+    """Guarda a mensagem formatada e a thread que a formatou"""
+    
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+    
+    def emit(self, record):
+        import threading
+        self.messages.append((record.getMessage(), threading.get_ident()))
+
+
 class TestHandleExceptionsDecorator:
     """Testes para o decorator de tratamento de exceções"""
     
@@ -5,8 +5,7 @@ Transferido do AnalyzeService para o orquestrador na Fase 2.5.
 
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from fastapi import UploadFile
-from io import BytesIO
+from app.core.document_buffer import DocumentBuffer
 from app.services.image.extraction import ImageExtractionOrchestrator
 
 
@@ -15,9 +14,7 @@ class TestImageExtractionOrchestrator:
     
     def setup_method(self):
         """Setup executado antes de cada teste"""
-        self.mock_file = MagicMock(spec=UploadFile)
-        self.mock_file.filename = "test_document.pdf"
-        self.mock_file.seek = AsyncMock()
+        self.mock_file = DocumentBuffer.from_bytes(b"%PDF-1.4 test", filename="test_document.pdf")
         
         self.sample_azure_result = {
             "analyze_result": {
@@ -52,9 +49,6 @@ class TestImageExtractionOrchestrator:
         # Assert
         assert result == expected_images
         assert mock_extract_method.call_count == 1
-        
-        # Verifica que o arquivo foi resetado
-        assert self.mock_file.seek.call_count >= 2  # seek(0) inicial + após sucesso
 
     @pytest.mark.asyncio
     @patch('app.services.image.extraction.image_extraction_orchestrator.ImageExtractionOrchestrator.extract_images_single_method')
@@ -115,13 +109,13 @@ class TestImageExtractionOrchestrator:
 
     @pytest.mark.asyncio  
     @patch('app.services.image.extraction.image_extraction_orchestrator.ImageExtractionOrchestrator.extract_images_single_method')
-    async def test_extract_with_fallback_file_seek_calls(self, mock_extract_method):
+    async def test_extract_with_fallback_reuses_same_buffer(self, mock_extract_method):
         """
-        Testa que o arquivo é resetado corretamente durante o processo
+        Testa que o mesmo buffer é repassado a cada método (sem releitura do upload)
         """
         # Arrange
         orchestrator = ImageExtractionOrchestrator()
-        mock_extract_method.return_value = {"image_1": "base64_image"}
+        mock_extract_method.side_effect = [{}, {"image_1": "base64_image"}]
         
         # Act
         await orchestrator.extract_with_fallback(
@@ -130,11 +124,10 @@ class TestImageExtractionOrchestrator:
             document_id=self.document_id
         )
         
-        # Assert - verifica que seek(0) foi chamado múltiplas vezes
-        assert self.mock_file.seek.call_count >= 2
-        # Todas as chamadas devem ser seek(0)
-        for call in self.mock_file.seek.call_args_list:
-            assert call[0][0] == 0
+        # Assert - ambos os métodos recebem o mesmo buffer
+        assert mock_extract_method.call_count == 2
+        for call in mock_extract_method.call_args_list:
+            assert call.kwargs["file"] is self.mock_file
 
     @pytest.mark.asyncio
     @patch('app.services.image.extraction.image_extraction_orchestrator.ImageExtractionOrchestrator.extract_images_single_method')